@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Benchmark adaptive-tiling region detection across occupancy grid sizes.
+
+Builds a synthetic dense sheet (thousands of small vector rects grouped into
+clusters, like a plan view with pipe runs and hatching) and times
+``_compute_content_regions`` at the default 24x16 grid and at finer grids
+(see ``--region-grid`` on the tiler).
+
+Usage:
+    python scripts/bench_adaptive_regions.py [--rects 20000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.intake import tiler  # noqa: E402
+from src.intake.text_layer import PageSpanIndex  # noqa: E402
+
+GRIDS = ((24, 16), (48, 32), (96, 64), (192, 128))
+
+
+def _synthetic_drawings(page_rect: fitz.Rect, count: int, seed: int) -> list[tuple[float, float, float, float]]:
+    rng = random.Random(seed)
+    clusters = [
+        (
+            rng.uniform(page_rect.x0, page_rect.x1 * 0.8),
+            rng.uniform(page_rect.y0, page_rect.y1 * 0.8),
+            rng.uniform(60.0, 400.0),
+            rng.uniform(60.0, 300.0),
+        )
+        for _ in range(6)
+    ]
+    bboxes = []
+    for _ in range(count):
+        cx, cy, cw, ch = rng.choice(clusters)
+        x0 = cx + rng.uniform(0.0, cw)
+        y0 = cy + rng.uniform(0.0, ch)
+        bboxes.append((x0, y0, x0 + rng.uniform(0.5, 12.0), y0 + rng.uniform(0.5, 12.0)))
+    return bboxes
+
+
+def _time(fn, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rects", type=int, default=20000, help="Synthetic drawing rects.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    doc = fitz.open()
+    page = doc.new_page(width=2592, height=1728)  # 36x24 in sheet
+    drawings = _synthetic_drawings(page.rect, args.rects, args.seed)
+    span_index = PageSpanIndex.from_page(page)
+
+    print(f"{args.rects} rects, best of {args.repeat}")
+    print(f"{'grid':>9}  {'ms':>7}  regions")
+    for grid_cols, grid_rows in GRIDS:
+        def run() -> list[fitz.Rect] | None:
+            return tiler._compute_content_regions(
+                page,
+                grid_cols=grid_cols,
+                grid_rows=grid_rows,
+                span_index=span_index,
+                drawing_bboxes=drawings,
+                max_regions=10_000,
+                min_area_pct=0.0,
+            )
+
+        seconds, regions = _time(run, args.repeat)
+        print(f"{grid_cols:>4}x{grid_rows:<4}  {seconds * 1000:>7.1f}  {len(regions or [])}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
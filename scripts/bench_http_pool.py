@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Benchmark pooled keep-alive sessions against per-call connections.
+
+Starts a local stand-in for the OpenRouter chat-completions endpoint and
+sends ``--calls`` requests through :func:`call_openrouter_vision` from
+``--workers`` threads, once without a session (a new connection per call,
+the old behaviour) and once with each worker's pooled session from
+:mod:`src.extraction.http_client`; then ``--workers`` concurrent tasks on
+one event loop, each borrowing a client from :class:`AsyncClientLanes` as
+the asyncio engine does.  The server holds every new connection
+for ``--handshake-ms`` before reading from it, standing in for the TCP and
+TLS setup a real provider charges, and answers after ``--latency-ms``.
+Reports the connections the server accepted and per-call p50/p95 latency.
+
+Usage:
+    python scripts/bench_http_pool.py [--calls 320] [--workers 16]
+        [--handshake-ms 30] [--latency-ms 20] [--payload-kb 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.extraction.config_models import ExtractionConfig  # noqa: E402
+from src.extraction.http_client import (  # noqa: E402
+    HttpPoolSettings,
+    close_thread_clients,
+    pooled_session,
+)
+from src.extraction.run_hybrid import call_openrouter_vision  # noqa: E402
+from src.extraction.run_hybrid_async import AsyncClientLanes  # noqa: E402
+
+_BODY = json.dumps({"choices": [{"message": {"content": '{"tile_id": "p1_r0_c0"}'}}]}).encode()
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, handshake_s: float, latency_s: float) -> None:
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.handshake_s = handshake_s
+        self.latency_s = latency_s
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _StandInServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake_s)
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(self.server.latency_s)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _run(server: _StandInServer, *, pooled: bool, calls: int, workers: int, image_data_url: str):
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    settings = HttpPoolSettings.from_config(ExtractionConfig(model="bench/model", timeout_sec=30))
+    server.connections = 0
+
+    def _call(_: int) -> float:
+        start = time.perf_counter()
+        call_openrouter_vision(
+            api_key="dummy",
+            model="bench/model",
+            prompt="prompt",
+            image_data_url=image_data_url,
+            referer="",
+            title="bench",
+            temperature=0.0,
+            max_tokens=16,
+            timeout_sec=30,
+            endpoint=endpoint,
+            use_structured_output=False,
+            session=pooled_session(settings) if pooled else None,
+            connect_timeout_sec=settings.connect_timeout_sec,
+        )
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = list(pool.map(_call, range(calls)))
+        list(pool.map(lambda _: close_thread_clients(), range(workers)))
+    wall = time.perf_counter() - start
+    return server.connections, latencies, wall
+
+
+async def _run_async(server: _StandInServer, *, calls: int, workers: int, image_data_url: str):
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    config = ExtractionConfig(model="bench/model", timeout_sec=30)
+    settings = HttpPoolSettings.from_config(config)
+    server.connections = 0
+    slots = asyncio.Semaphore(workers)
+
+    async def _call() -> float:
+        async with slots:
+            calls = lanes.acquire()
+            start = time.perf_counter()
+            await calls.openrouter(
+                settings,
+                api_key="dummy",
+                model="bench/model",
+                prompt="prompt",
+                image_data_url=image_data_url,
+                referer="",
+                title="bench",
+                temperature=0.0,
+                max_tokens=16,
+                timeout_sec=30,
+                endpoint=endpoint,
+                use_structured_output=False,
+            )
+            lanes.release(calls)
+            return time.perf_counter() - start
+
+    lanes = AsyncClientLanes(config)
+    start = time.perf_counter()
+    try:
+        latencies = await asyncio.gather(*(_call() for _ in range(calls)))
+    finally:
+        await lanes.aclose()
+    wall = time.perf_counter() - start
+    return server.connections, list(latencies), wall
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=320)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="Delay per new connection.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Delay per response.")
+    parser.add_argument("--payload-kb", type=int, default=200, help="Tile image size in the request.")
+    args = parser.parse_args()
+
+    image_data_url = "data:image/png;base64," + base64.b64encode(b"\0" * args.payload_kb * 1024).decode()
+    server = _StandInServer(args.handshake_ms / 1000, args.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        print(
+            f"{args.calls} calls, {args.workers} workers, handshake {args.handshake_ms:.0f} ms, "
+            f"latency {args.latency_ms:.0f} ms, {args.payload_kb} KB payload"
+        )
+        print(f"{'mode':>9} {'conns':>6} {'p50':>8} {'p95':>8} {'wall':>7}")
+        for label in ("per-call", "pooled", "asyncio"):
+            if label == "asyncio":
+                connections, latencies, wall = asyncio.run(
+                    _run_async(server, calls=args.calls, workers=args.workers, image_data_url=image_data_url)
+                )
+            else:
+                connections, latencies, wall = _run(
+                    server,
+                    pooled=label == "pooled",
+                    calls=args.calls,
+                    workers=args.workers,
+                    image_data_url=image_data_url,
+                )
+            p50 = statistics.median(latencies) * 1000
+            p95 = statistics.quantiles(latencies, n=20)[-1] * 1000
+            print(f"{label:>9} {connections:>6} {p50:>6.1f}ms {p95:>6.1f}ms {wall:>6.2f}s")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
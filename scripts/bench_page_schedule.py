@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark heaviest-first page scheduling: estimator accuracy and makespan.
+
+Tiles every selected page on its own, serially, so timings are not skewed by
+cores contending with each other.  Each page's cost is then estimated with
+:mod:`src.intake.page_cost`, and greedy list scheduling (what a process pool
+does: the next free worker takes the next queued page) is replayed for each
+``--workers`` count, in page order and in estimated longest-processing-time
+order.  The makespan is the time the last worker finishes.  LPT ordered by
+the measured times is shown as the achievable floor.  ``--fit`` prints
+least-squares weights for ``PAGE_COST_WEIGHTS``.
+
+Without ``--pdf`` a synthetic 24-sheet set is used, ordered the way plan
+sets usually are: notes sheets first, then plan views, with dense profile
+sheets last.
+
+Usage:
+    python scripts/bench_page_schedule.py [--pdf plans.pdf] [--pages 1-20] [--dpi 300]
+        [--workers 2,4,8] [--fit]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.intake.page_cost import estimate_page_cost, lpt_order  # noqa: E402
+from src.intake.tiler import tile_page  # noqa: E402
+from src.utils.cli import parse_pages_argument  # noqa: E402
+
+
+def _synthetic_set(seed: int) -> fitz.Document:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    kinds = sorted(
+        (rng.choice(("profile", "plan", "plan", "notes")) for _ in range(24)),
+        key=("notes", "plan", "profile").index,
+    )
+    for idx, kind in enumerate(kinds):
+        width, height = (2592, 1728) if kind != "notes" else rng.choice(((2592, 1728), (1224, 792)))
+        page = doc.new_page(width=width, height=height)
+        drawings = {"profile": 4000, "plan": 800, "notes": 20}[kind]
+        texts = {"profile": 600, "plan": 400, "notes": 150}[kind]
+        shape = page.new_shape()
+        for _ in range(int(drawings * rng.uniform(0.5, 1.5))):
+            x, y = rng.uniform(40, width - 40), rng.uniform(40, height - 40)
+            shape.draw_line((x, y), (x + rng.uniform(-80, 80), y + rng.uniform(-40, 40)))
+            shape.finish(width=0.5)
+        shape.commit()
+        writer = fitz.TextWriter(page.rect)
+        for n in range(int(texts * rng.uniform(0.5, 1.5))):
+            x, y = rng.uniform(40, width - 200), rng.uniform(40, height - 40)
+            writer.append((x, y), f"STA {idx}+{n:02d} INV 31{n % 10}.25", fontsize=6)
+        writer.write_text(page)
+    return doc
+
+
+def _makespan(order: list[int], times: dict[int, float], workers: int) -> float:
+    free_at = [0.0] * workers
+    for page in order:
+        start = heapq.heappop(free_at)
+        heapq.heappush(free_at, start + times[page])
+    return max(free_at)
+
+
+def _spearman(a: list[float], b: list[float]) -> float:
+    def ranks(values: list[float]) -> list[int]:
+        order = sorted(range(len(values)), key=values.__getitem__)
+        result = [0] * len(values)
+        for rank, index in enumerate(order):
+            result[index] = rank
+        return result
+
+    ra, rb = ranks(a), ranks(b)
+    n = len(a)
+    if n < 2:
+        return 1.0
+    return 1.0 - 6.0 * sum((x - y) ** 2 for x, y in zip(ra, rb)) / (n * (n * n - 1))
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", type=Path, default=None, help="Plan set (default: synthetic set).")
+    parser.add_argument("--pages", type=str, default=None, help="Page selection, e.g. '1-20'.")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--workers", type=str, default="2,4,8", help="Pool sizes to simulate.")
+    parser.add_argument("--fit", action="store_true", help="Print least-squares cost weights.")
+    args = parser.parse_args()
+
+    doc = fitz.open(args.pdf) if args.pdf else _synthetic_set(seed=7)
+    pages = parse_pages_argument(args.pages, total_pages=len(doc)) or list(range(1, len(doc) + 1))
+
+    times: dict[int, float] = {}
+    costs = {}
+    estimate_ms = 0.0
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for page_number in pages:
+            start = time.perf_counter()
+            costs[page_number] = estimate_page_cost(doc[page_number - 1], dpi=args.dpi)
+            estimate_ms += (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            tile_page(doc, page_number - 1, Path(tmpdir) / str(page_number), dpi=args.dpi)
+            times[page_number] = time.perf_counter() - start
+
+    total = sum(times.values())
+    print(
+        f"{len(pages)} pages, {total:.1f}s serial tiling at {args.dpi} DPI; "
+        f"estimates took {estimate_ms:.0f} ms total "
+        f"({estimate_ms / max(1, len(pages)):.1f} ms/page)"
+    )
+    print(
+        "rank correlation (estimate vs measured): "
+        f"{_spearman([costs[p].cost for p in pages], [times[p] for p in pages]):.2f}"
+    )
+    print(f"{'workers':>7} {'page order':>11} {'LPT (est.)':>11} {'LPT (ideal)':>12} {'gain':>6}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        fifo = _makespan(pages, times, workers)
+        lpt = _makespan(lpt_order(pages, lambda p: costs[p].cost), times, workers)
+        ideal = _makespan(lpt_order(pages, times), times, workers)
+        print(f"{workers:>7} {fifo:>10.2f}s {lpt:>10.2f}s {ideal:>11.2f}s {1 - lpt / fifo:>6.0%}")
+
+    if args.fit:
+        import numpy as np
+
+        features = np.array(
+            [
+                [1.0, c.drawings, c.spans, c.megapixels, c.image_megapixels]
+                for c in (costs[p] for p in pages)
+            ]
+        )
+        weights, *_ = np.linalg.lstsq(features, np.array([times[p] * 1000 for p in pages]), rcond=None)
+        names = ("base", "drawing", "span", "megapixel", "image_megapixel")
+        print("fitted weights (ms):", {n: round(float(w), 3) for n, w in zip(names, weights)})
+
+
+if __name__ == "__main__":
+    main()
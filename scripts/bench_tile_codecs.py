@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark tile image codecs: encoded bytes, encode time and calibration score.
+
+Renders the fixed 2x3 tile grid of the selected pages once, then encodes
+every tile with each codec in :mod:`src.utils.image_codec` and reports total
+bytes, base64 upload bytes and encode time (best of ``--repeat``).  Without
+``--pdf`` a synthetic ARCH D sheet of plan text and linework is used.
+
+Calibration scores need real extractions, so they are read rather than
+produced: run extraction once per codec (e.g. ``--image-codec png_gray`` on
+``run_hybrid_batch``) and pass each output directory as
+``--calibration CODEC=DIR``; :func:`score_calibration` is reported next to
+that codec's row.
+
+Usage:
+    python scripts/bench_tile_codecs.py [--pdf plans.pdf --pages 14,36] [--dpi 300]
+        [--calibration png=output/extractions/cal-png --calibration jpeg=...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import random
+import sys
+import time
+from pathlib import Path
+
+import fitz
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.extraction.score_calibration import score_calibration  # noqa: E402
+from src.intake.tiler import _compute_tile_clips  # noqa: E402
+from src.utils.cli import parse_pages_argument  # noqa: E402
+from src.utils.image_codec import ImageCodec, ImageEncoding, encode_pixmap  # noqa: E402
+
+ENCODINGS = (
+    ImageEncoding(codec=ImageCodec.PNG),
+    ImageEncoding(codec=ImageCodec.PNG_GRAY),
+    ImageEncoding(codec=ImageCodec.PNG_GRAY, gray_levels=4),
+    ImageEncoding(codec=ImageCodec.PNG_1BIT),
+    ImageEncoding(codec=ImageCodec.WEBP),
+    ImageEncoding(codec=ImageCodec.JPEG, jpeg_quality=90),
+    ImageEncoding(codec=ImageCodec.JPEG, jpeg_quality=75),
+)
+
+
+def _synthetic_sheet(seed: int) -> fitz.Document:
+    rng = random.Random(seed)
+    doc = fitz.open()
+    page = doc.new_page(width=2448, height=1584)
+    page.draw_rect(fitz.Rect(36, 36, 2412, 1548), width=2)
+    for _ in range(400):
+        x, y = rng.uniform(60, 2300), rng.uniform(60, 1520)
+        page.draw_line((x, y), (x + rng.uniform(-300, 300), y + rng.uniform(-200, 200)))
+    for idx in range(600):
+        x, y = rng.uniform(60, 2300), rng.uniform(60, 1520)
+        page.insert_text((x, y), f"SDMH-{idx} RIM 31{idx % 10}.25", fontsize=rng.choice((6, 8, 10)))
+    return doc
+
+
+def _label(encoding: ImageEncoding) -> str:
+    if encoding.codec == ImageCodec.JPEG:
+        return f"jpeg q{encoding.jpeg_quality}"
+    if encoding.codec == ImageCodec.PNG_GRAY:
+        return f"png_gray {encoding.gray_levels}"
+    return encoding.codec.value
+
+
+def _time_encode(pixmaps: list[fitz.Pixmap], encoding: ImageEncoding, repeat: int) -> tuple[float, list[bytes]]:
+    best = float("inf")
+    encoded: list[bytes] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = [encode_pixmap(pix, encoding) for pix in pixmaps]
+        best = min(best, time.perf_counter() - start)
+    return best, encoded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdf", type=Path, default=None, help="Plan set PDF (default: synthetic sheet).")
+    parser.add_argument("--pages", type=str, default=None, help="Pages to tile, e.g. 14,36.")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--calibration",
+        action="append",
+        default=[],
+        metavar="CODEC=DIR",
+        help="Extraction dir produced with CODEC; its calibration score is reported.",
+    )
+    args = parser.parse_args()
+
+    scores: dict[str, str] = {}
+    for entry in args.calibration:
+        codec, _, directory = entry.partition("=")
+        overall = score_calibration(Path(directory))["overall"]
+        scores[codec] = f"{overall['passed']}/{overall['total']}"
+
+    doc = fitz.open(args.pdf) if args.pdf else _synthetic_sheet(args.seed)
+    pages = parse_pages_argument(args.pages, total_pages=len(doc)) or [1]
+    pixmaps: list[fitz.Pixmap] = []
+    for page_number in pages:
+        page = doc[page_number - 1]
+        for _, _, clip in _compute_tile_clips(page.rect, grid_rows=2, grid_cols=3, overlap_pct=0.10):
+            pixmaps.append(page.get_pixmap(dpi=args.dpi, clip=clip, alpha=False))
+    megapixels = sum(pix.width * pix.height for pix in pixmaps) / 1e6
+
+    print(f"{len(pixmaps)} tiles, {megapixels:.1f} MP at {args.dpi} DPI, best of {args.repeat}")
+    print(f"{'codec':<12}  {'KB':>9}  {'upload KB':>9}  {'vs png':>6}  {'encode ms':>9}  calibration")
+    baseline: int | None = None
+    for encoding in ENCODINGS:
+        label = _label(encoding)
+        try:
+            seconds, encoded = _time_encode(pixmaps, encoding, args.repeat)
+        except RuntimeError as exc:
+            print(f"{label:<12}  {'n/a':>9}  ({exc})")
+            continue
+        total = sum(len(data) for data in encoded)
+        upload = sum(len(base64.b64encode(data)) for data in encoded)
+        baseline = baseline or total
+        print(
+            f"{label:<12}  {total / 1024:>9.0f}  {upload / 1024:>9.0f}  {total / baseline:>5.0%}"
+            f"  {seconds * 1000:>9.0f}  {scores.get(encoding.codec.value, '-')}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
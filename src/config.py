@@ -21,6 +21,99 @@ ESCALATION_COHERENCE_THRESHOLD: float = 0.70
 # Coherence threshold below which model tier is bumped to "premium".
 MODEL_TIER_COHERENCE_OVERRIDE: float = 0.50
 
+# Manifest-gated tiling: cheaper render settings for light-extraction sheets
+# (cover, notes, demolition, signing, erosion).
+LIGHT_TILE_DPI: int = 150
+LIGHT_TILE_GRID_ROWS: int = 1
+LIGHT_TILE_GRID_COLS: int = 2
+
+# Font-size adaptive DPI: each tile renders at the DPI that makes its smallest
+# text this many pixels tall, never below the floor.  The page DPI is the
+# ceiling.
+ADAPTIVE_DPI_MIN: int = 150
+ADAPTIVE_DPI_TARGET_TEXT_PX: float = 25.0
+
+# Adaptive tiling: content regions are found on an occupancy grid of this
+# many columns x rows over the page.  Finer grids keep nearby but separate
+# drawings apart; the NumPy path keeps grids such as 96x64 cheap.
+ADAPTIVE_REGION_GRID_COLS: int = 24
+ADAPTIVE_REGION_GRID_ROWS: int = 16
+
+# Perceptual tile dedup: a tile reuses a stored extraction when its text-layer
+# signature matches exactly and its 256-bit image difference hash is within
+# this many bits.
+DEDUP_MAX_HAMMING: int = 12
+
+# Rule-based fast path: tiles whose text layer is at least this coherent are
+# first parsed with regex rules (see src/extraction/rule_based.py), and the
+# API call is skipped when the rule extraction's confidence reaches the
+# floor.  Labels of one structure are grouped when their boxes lie within
+# this many font heights of each other.
+RULE_BASED_MIN_COHERENCE: float = 0.90
+RULE_BASED_MIN_CONFIDENCE: float = 0.90
+RULE_BASED_CLUSTER_GAP_EM: float = 1.5
+
+# Provider HTTP clients: each worker thread keeps one pooled session per
+# settings (see src/extraction/http_client.py) holding up to this many idle
+# keep-alive connections per host.  The connect timeout is separate from
+# ExtractionConfig.timeout_sec, which bounds the wait for the model's reply.
+HTTP_POOL_SIZE: int = 4
+HTTP_CONNECT_TIMEOUT_SEC: float = 10.0
+
+# Asyncio extraction engine (src/extraction/run_hybrid_async.py): tiles in
+# flight at once when no larger --max-concurrency is given.  Each waits on
+# one vision call, so this is bounded by the provider's rate limits rather
+# than by local threads.
+ASYNC_EXTRACTION_CONCURRENCY: int = 256
+
+# Provider rate limiting (src/extraction/rate_limit.py): one limiter per
+# provider and model, shared by every worker in the process.  Its window of
+# in-flight calls starts at the maximum, halves on each round of 429/503
+# responses and regrows by about one call per window of successes, never
+# below the minimum.  Throttles without a Retry-After header block all
+# workers for 1, 2, 4, ... seconds up to the backoff cap.  A requests-per-
+# minute budget is off unless set.
+RATE_LIMIT_MAX_CONCURRENCY: int = 256
+RATE_LIMIT_MIN_CONCURRENCY: int = 1
+RATE_LIMIT_REQUESTS_PER_MINUTE: float | None = None
+RATE_LIMIT_MAX_BACKOFF_SEC: float = 60.0
+
+# Model-aware tile planning: the largest image (long edge px, megapixels) each
+# model tier's vision endpoint takes without downscaling it server-side, and
+# the minimum strip (in PDF points) shared by neighbouring tiles.
+TILE_IMAGE_BUDGETS: dict[str, tuple[int, float]] = {
+    "fast": (1536, 2.4),
+    "standard": (2048, 4.2),
+    "premium": (3072, 9.4),
+}
+TILE_PLAN_OVERLAP_PT: float = 144.0
+# Planned tiles never drop below this DPI; the planner adds tiles instead.
+TILE_PLAN_MIN_DPI: int = 100
+
+# Shared tile render cache: least-recently-used entries are evicted above
+# this size.
+RENDER_CACHE_MAX_BYTES: int = 10 * 1024 * 1024 * 1024
+
+# Shared extraction cache (src/extraction/extraction_cache.py): validated
+# extractions reused across runs by cache key; least-recently-used entries
+# are evicted above this size.
+EXTRACTION_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+
+# Cap on one tile's uncompressed RGB raster.  A 36x48 in sheet rendered whole
+# at 300 DPI is ~450 MiB; tiles above the cap are band-rendered (PNG) or
+# split into sub-tiles (JPEG/WebP).
+MAX_RASTER_BYTES: int = 256 * 1024 * 1024
+
+# Page cost model for heaviest-first scheduling: estimated milliseconds per
+# page (or tile) on one core.  Fitted with scripts/bench_page_schedule.py.
+PAGE_COST_WEIGHTS: dict[str, float] = {
+    "base": 1.0,
+    "drawing": 0.15,
+    "span": 0.15,
+    "megapixel": 11.5,
+    "image_megapixel": 60.0,
+}
+
 # Crown/invert heuristics for gravity systems.
 CROWN_SPREAD_BUFFER_FT: float = 0.5
 CROWN_RATIO_THRESHOLD: float = 10.0
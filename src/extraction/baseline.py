@@ -0,0 +1,313 @@
+"""Incremental re-review: carry extractions forward from a baseline run.
+
+A revised plan set usually changes a handful of sheets, yet a fresh run
+re-extracts every tile.  With a baseline (an earlier run directory of the
+previous revision) each page of the new PDF is first matched to a baseline
+page:
+
+1. by content hash (:func:`~src.intake.render_cache.page_content_hash`), so
+   untouched sheets match wherever they moved in the set;
+2. then, for pages whose content changed, by the manifest's sheet label
+   (``C-101`` in both revisions), when that label is unique on both sides.
+
+A tile on a matched page reuses a baseline tile's extraction when their
+text-layer signatures are equal and their image difference hashes are
+within ``max_distance`` bits (the same test as :mod:`.tile_dedup`), or, for
+tiles without text, when the image bytes are identical.  The extraction is
+copied under the new tile id with ``source_text_ids`` remapped; everything
+else is extracted as usual.  Only ``ok`` baseline extractions made with the
+model the new tile would use are carried forward.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+import fitz
+
+from ..config import DEDUP_MAX_HAMMING
+from ..intake.manifest import load_manifest
+from ..intake.models import SheetInfo
+from ..intake.render_cache import page_content_hash
+from ..utils.io_json import read_json
+from ..utils.text_layer_pack import load_text_layer
+from .tile_dedup import fingerprint_tile, hamming_distance, remap_extraction
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CarriedExtraction:
+    """A baseline extraction remapped onto a new tile."""
+
+    source_tile_id: str
+    source_page_number: int
+    model: str
+    image_distance: int
+    extraction: dict[str, Any]
+
+
+@dataclass
+class _BaselineTile:
+    tile_id: str
+    model: str
+    extraction_path: Path
+    image_sha256: str
+    text_signature: str
+    text_ids: tuple[int, ...]
+    image_hash: int | None
+
+
+def page_hashes(pdf_path: Path) -> dict[int, str]:
+    """Content hash of every page of *pdf_path*, keyed by 1-based page number."""
+    with fitz.open(pdf_path) as doc:
+        return {index + 1: page_content_hash(doc, index) for index in range(len(doc))}
+
+
+def _tile_position(tile_id: str) -> str:
+    """Grid or region part of a tile id (``r0_c1`` of ``d2_p14_r0_c1``)."""
+    return tile_id.split("_", 2 if tile_id.startswith("d") else 1)[-1]
+
+
+def _normalize_label(label: str | None) -> str:
+    return " ".join((label or "").split()).upper()
+
+
+def match_pages(
+    baseline_sheets: list[SheetInfo],
+    new_sheets: list[SheetInfo],
+    *,
+    baseline_hashes: Mapping[int, str] | None = None,
+    new_hashes: Mapping[int, str] | None = None,
+) -> dict[int, int]:
+    """Map new page numbers to baseline page numbers (unmatched pages omitted).
+
+    Pages with identical content hashes match first (preferring the same
+    label, then the same page number, when a baseline page repeats); the
+    rest match by sheet label when the label is unique on both sides.
+    """
+    baseline_labels = {s.page_number: _normalize_label(s.sheet_label) for s in baseline_sheets}
+    new_labels = {s.page_number: _normalize_label(s.sheet_label) for s in new_sheets}
+    mapping: dict[int, int] = {}
+    used: set[int] = set()
+
+    if baseline_hashes and new_hashes:
+        by_hash: dict[str, list[int]] = {}
+        for page_number, digest in sorted(baseline_hashes.items()):
+            by_hash.setdefault(digest, []).append(page_number)
+        for page_number, digest in sorted(new_hashes.items()):
+            candidates = [p for p in by_hash.get(digest, []) if p not in used]
+            if not candidates:
+                continue
+            best = min(
+                candidates,
+                key=lambda p: (
+                    baseline_labels.get(p) != new_labels.get(page_number),
+                    p != page_number,
+                    p,
+                ),
+            )
+            mapping[page_number] = best
+            used.add(best)
+
+    def _unique(labels: Mapping[int, str], taken: set[int]) -> dict[str, int]:
+        counts: dict[str, list[int]] = {}
+        for page_number, label in labels.items():
+            if label and page_number not in taken:
+                counts.setdefault(label, []).append(page_number)
+        return {label: pages[0] for label, pages in counts.items() if len(pages) == 1}
+
+    baseline_by_label = _unique(baseline_labels, used)
+    for label, page_number in _unique(new_labels, set(mapping)).items():
+        if label in baseline_by_label:
+            mapping[page_number] = baseline_by_label[label]
+    return mapping
+
+
+def _rebase(path_value: str, intake_dir: Path, anchor: str) -> Path:
+    """*path_value* if it exists, else the same path re-rooted under *intake_dir*.
+
+    Lets a baseline run directory be moved or copied after it was written.
+    """
+    path = Path(path_value)
+    if path.exists() or anchor not in path.parts:
+        return path
+    index = path.parts.index(anchor)
+    return intake_dir.joinpath(*path.parts[index:])
+
+
+class BaselineIndex:
+    """Baseline tiles and extractions, looked up by matched page.
+
+    Baseline pages are fingerprinted lazily, once, on first lookup; lookups
+    are thread-safe so the batch runner's workers can share one index.
+    """
+
+    def __init__(
+        self,
+        baseline_run_dir: Path,
+        page_map: Mapping[int, int],
+        *,
+        max_distance: int = DEDUP_MAX_HAMMING,
+    ) -> None:
+        if max_distance < 0:
+            raise ValueError("max_distance must be non-negative.")
+        self.run_dir = Path(baseline_run_dir)
+        self.page_map = dict(page_map)
+        self.max_distance = max_distance
+        self._intake_dir = self.run_dir / "intake"
+        self._extractions_dir = self.run_dir / "extractions"
+        index_path = self._intake_dir / "tiles_index.json"
+        pages = read_json(index_path).get("pages", {}) if index_path.exists() else {}
+        self._index: dict[int, list[dict[str, Any]]] = {
+            int(page): list(tiles) for page, tiles in pages.items()
+        }
+        self._pages: dict[int, list[_BaselineTile]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_runs(
+        cls,
+        baseline_run_dir: Path,
+        *,
+        pdf_path: Path,
+        manifest_path: Path,
+        max_distance: int = DEDUP_MAX_HAMMING,
+    ) -> BaselineIndex:
+        """Match *pdf_path*'s pages (described by *manifest_path*) against a baseline run.
+
+        The baseline PDF is taken from the run's ``run_metadata.json``; when it
+        is no longer on disk pages are matched by sheet label only.
+        """
+        baseline_run_dir = Path(baseline_run_dir)
+        baseline_manifest = baseline_run_dir / "intake" / "manifest.json"
+        baseline_sheets = load_manifest(baseline_manifest) if baseline_manifest.exists() else []
+        new_sheets = load_manifest(manifest_path) if manifest_path.exists() else []
+
+        baseline_hashes: dict[int, str] | None = None
+        metadata_path = baseline_run_dir / "run_metadata.json"
+        baseline_pdf = (
+            Path(str(read_json(metadata_path).get("pdf_path", "")))
+            if metadata_path.exists()
+            else None
+        )
+        if baseline_pdf is not None and baseline_pdf.is_file():
+            baseline_hashes = page_hashes(baseline_pdf)
+        else:
+            logger.warning(
+                "Baseline PDF not found (%s); matching pages by sheet label only.", baseline_pdf
+            )
+        page_map = match_pages(
+            baseline_sheets,
+            new_sheets,
+            baseline_hashes=baseline_hashes,
+            new_hashes=page_hashes(pdf_path) if baseline_hashes is not None else None,
+        )
+        logger.info(
+            "Baseline %s: matched %s of %s page(s).",
+            baseline_run_dir.name,
+            len(page_map),
+            len(new_sheets),
+        )
+        return cls(baseline_run_dir, page_map, max_distance=max_distance)
+
+    def _load_page(self, page_number: int) -> list[_BaselineTile]:
+        with self._lock:
+            if page_number in self._pages:
+                return self._pages[page_number]
+            tiles: list[_BaselineTile] = []
+            for entry in self._index.get(page_number, []):
+                tile = self._load_tile(entry)
+                if tile is not None:
+                    tiles.append(tile)
+            self._pages[page_number] = tiles
+            return tiles
+
+    def _load_tile(self, entry: Mapping[str, Any]) -> _BaselineTile | None:
+        tile_id = str(entry.get("tile_id", ""))
+        extraction_path = self._extractions_dir / f"{tile_id}.json"
+        meta_path = self._extractions_dir / f"{tile_id}.json.meta.json"
+        try:
+            meta = read_json(meta_path)
+            if meta.get("status") != "ok" or not extraction_path.exists():
+                return None
+            image_bytes = _rebase(str(entry["image_path"]), self._intake_dir, "tiles").read_bytes()
+            text_layer = load_text_layer(
+                _rebase(str(entry["text_layer_path"]), self._intake_dir, "text_layers")
+            )
+        except (OSError, KeyError, ValueError) as exc:
+            logger.debug("Baseline tile %s unusable: %s", tile_id, exc)
+            return None
+        fingerprint = fingerprint_tile(image_bytes, text_layer)
+        return _BaselineTile(
+            tile_id=tile_id,
+            model=str(meta.get("model", "")),
+            extraction_path=extraction_path,
+            image_sha256=hashlib.sha256(image_bytes).hexdigest(),
+            text_signature=fingerprint.text_signature if fingerprint else "",
+            text_ids=fingerprint.text_ids if fingerprint else (),
+            image_hash=fingerprint.image_hash if fingerprint else None,
+        )
+
+    def lookup(
+        self,
+        *,
+        tile_id: str,
+        page_number: int,
+        image_bytes: bytes,
+        text_layer: Mapping[str, Any],
+        model: str,
+    ) -> CarriedExtraction | None:
+        """Baseline extraction to carry onto this tile, or ``None`` to extract it."""
+        baseline_page = self.page_map.get(page_number)
+        if baseline_page is None:
+            return None
+        candidates = [t for t in self._load_page(baseline_page) if t.model == model]
+        if not candidates:
+            return None
+
+        fingerprint = fingerprint_tile(image_bytes, text_layer)
+        best: tuple[int, bool, _BaselineTile] | None = None
+        suffix = _tile_position(tile_id)
+        if fingerprint is None:
+            digest = hashlib.sha256(image_bytes).hexdigest()
+            for tile in candidates:
+                if tile.image_sha256 == digest:
+                    best = (0, _tile_position(tile.tile_id) != suffix, tile)
+                    break
+            id_map: dict[int, int] = {}
+        else:
+            for tile in candidates:
+                if tile.text_signature != fingerprint.text_signature or tile.image_hash is None:
+                    continue
+                distance = hamming_distance(tile.image_hash, fingerprint.image_hash)
+                if distance > self.max_distance:
+                    continue
+                rank = (distance, _tile_position(tile.tile_id) != suffix, tile)
+                if best is None or rank[:2] < best[:2]:
+                    best = rank
+            if best is not None:
+                id_map = dict(zip(best[2].text_ids, fingerprint.text_ids))
+        if best is None:
+            return None
+
+        distance, _, source = best
+        try:
+            extraction = json.loads(source.extraction_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return CarriedExtraction(
+            source_tile_id=source.tile_id,
+            source_page_number=baseline_page,
+            model=source.model,
+            image_distance=distance,
+            extraction=remap_extraction(
+                extraction, id_map, tile_id=tile_id, page_number=page_number
+            ),
+        )
@@ -13,7 +13,12 @@ from ..config import (
     DEFAULT_ESCALATION_MODEL,
     DEFAULT_EXTRACTION_MODEL,
     ESCALATION_COHERENCE_THRESHOLD,
+    HTTP_CONNECT_TIMEOUT_SEC,
+    HTTP_POOL_SIZE,
+    RATE_LIMIT_MAX_CONCURRENCY,
+    RATE_LIMIT_REQUESTS_PER_MINUTE,
 )
+from ..utils.image_codec import ImageEncoding
 
 # Provider identifiers — canonical source for the whole extraction package.
 PROVIDER_OPENROUTER: str = "openrouter"
@@ -22,7 +27,20 @@ PROVIDER_ANTHROPIC: str = "anthropic"
 
 @dataclass(frozen=True)
 class ExtractionConfig:
-    """API call and provider settings for one extraction request."""
+    """API call and provider settings for one extraction request.
+
+    ``image_encoding`` re-encodes each tile image before upload (codec and
+    byte budget, see :mod:`src.utils.image_codec`); ``None`` sends the tile
+    file as stored.  ``rule_based_min_confidence`` enables the rule-based
+    fast path (see :mod:`src.extraction.rule_based`): tiles it extracts with at
+    least this confidence skip the API call.  ``None`` disables it.
+
+    ``http_pool_size``, ``http_keep_alive`` and ``connect_timeout_sec`` shape
+    the per-worker OpenRouter session (see :mod:`src.extraction.http_client`);
+    ``timeout_sec`` is the read timeout.  ``rate_limit_max_concurrency`` and
+    ``requests_per_minute`` configure the process-wide limiter for the
+    provider and model (see :mod:`src.extraction.rate_limit`).
+    """
 
     model: str = DEFAULT_EXTRACTION_MODEL
     api_key: str = ""
@@ -35,6 +53,13 @@ class ExtractionConfig:
     use_structured_output: bool = True
     use_json_schema: bool = True
     use_instructor: bool = True
+    image_encoding: ImageEncoding | None = None
+    rule_based_min_confidence: float | None = None
+    http_pool_size: int = HTTP_POOL_SIZE
+    http_keep_alive: bool = True
+    connect_timeout_sec: float = HTTP_CONNECT_TIMEOUT_SEC
+    rate_limit_max_concurrency: int = RATE_LIMIT_MAX_CONCURRENCY
+    requests_per_minute: float | None = RATE_LIMIT_REQUESTS_PER_MINUTE
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,313 @@
+"""Content-addressed extraction cache shared across runs.
+
+The cache in :func:`~src.extraction.run_hybrid.run_hybrid_extraction` only
+skips a tile when its output and meta already sit in the same out dir with a
+matching ``cache_key``, so every new run directory paid again for tiles an
+earlier run had extracted.  :class:`ExtractionCache` keeps successful
+extractions under that same key (prompt, image bytes, model, sampling and
+response format; see ``_compute_cache_key``) in one directory shared by every
+run:
+
+* ``index.sqlite`` holds one row per entry: model, size, token usage, when it
+  was stored and last used, and how many hits it has served;
+* ``<key[:2]>/<key>.json`` holds the validated extraction, the raw model
+  response and the result fields of its meta (usage, counts, corrections).
+
+Entries are evicted least-recently-used once the blobs exceed ``max_bytes``.
+Several runs and worker threads can share the directory: blobs are written
+atomically and SQLite serialises index updates.
+
+``python -m src.extraction.extraction_cache stats|prune|export --cache-dir DIR``
+reports, trims or dumps the cache (``export`` writes one JSON line per entry).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+from ..config import EXTRACTION_CACHE_MAX_BYTES
+from ..utils.io_json import read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_VERSION = 1
+
+_SCHEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    total_tokens INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+@dataclass(frozen=True)
+class CachedExtraction:
+    """One cache entry: the extraction and what the model call returned."""
+
+    key: str
+    model: str
+    extraction: dict[str, Any]
+    raw_text: str
+    result_meta: dict[str, Any]
+    created_at: float
+
+
+@dataclass(frozen=True)
+class ExtractionCacheStats:
+    entries: int
+    total_bytes: int
+    max_bytes: int
+    hits: int
+    tokens_saved: int
+    models: dict[str, int]
+    oldest_age_s: float | None
+    newest_age_s: float | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class ExtractionCache:
+    """Directory of validated extractions keyed by the extraction cache key."""
+
+    def __init__(self, cache_dir: Path, *, max_bytes: int = EXTRACTION_CACHE_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    @contextmanager
+    def _index(self) -> Iterator[sqlite3.Connection]:
+        """This cache's index connection, held by one thread at a time; commits on success.
+
+        The connection stays open: closing the last one checkpoints the
+        write-ahead log, which would cost a disk sync per tile.
+        """
+        with self._lock:
+            if self._conn is None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.cache_dir / "index.sqlite", timeout=30.0, check_same_thread=False)
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            with self._conn:
+                yield self._conn
+
+    def close(self) -> None:
+        """Close the index connection; the next operation reopens it."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _blob_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def fetch(self, key: str) -> CachedExtraction | None:
+        """The entry for *key*, marked as just used; ``None`` on a miss.
+
+        The blob is read outside the index lock so other workers' lookups do
+        not wait on this one's disk read.
+        """
+        try:
+            with self._index() as conn:
+                row = conn.execute("SELECT model, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            try:
+                blob = read_json(self._blob_path(key))
+            except (OSError, ValueError):
+                # Only drop the row that pointed at the unreadable blob, not
+                # one a concurrent store has since written.
+                with self._index() as conn:
+                    conn.execute("DELETE FROM entries WHERE key = ? AND created_at = ?", (key, row[1]))
+                return None
+            with self._index() as conn:
+                conn.execute(
+                    "UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                    (time.time(), key),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Extraction cache lookup failed: %s", exc)
+            return None
+        return CachedExtraction(
+            key=key,
+            model=row[0],
+            extraction=blob["extraction"],
+            raw_text=blob["raw_text"],
+            result_meta=blob.get("result_meta", {}),
+            created_at=row[1],
+        )
+
+    def store(
+        self,
+        key: str,
+        *,
+        model: str,
+        extraction: dict[str, Any],
+        raw_text: str,
+        result_meta: Mapping[str, Any],
+    ) -> None:
+        """Publish an extraction under *key*, replacing any earlier entry."""
+        blob_path = self._blob_path(key)
+        usage = result_meta.get("usage") or {}
+        try:
+            write_json_atomic(
+                blob_path,
+                {
+                    "version": EXTRACTION_CACHE_VERSION,
+                    "key": key,
+                    "model": model,
+                    "extraction": extraction,
+                    "raw_text": raw_text,
+                    "result_meta": dict(result_meta),
+                },
+                indent=None,
+            )
+            now = time.time()
+            with self._index() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, model, bytes, total_tokens, created_at, last_used, hits)"
+                    " VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (key, model, blob_path.stat().st_size, int(usage.get("total_tokens") or 0), now, now),
+                )
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("Could not store %s in extraction cache: %s", key, exc)
+
+    def stats(self) -> ExtractionCacheStats:
+        with self._index() as conn:
+            entries, total_bytes, hits, tokens_saved, oldest, newest = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0), COALESCE(SUM(hits), 0),"
+                " COALESCE(SUM(hits * total_tokens), 0), MIN(last_used), MAX(last_used) FROM entries"
+            ).fetchone()
+            models = dict(conn.execute("SELECT model, COUNT(*) FROM entries GROUP BY model ORDER BY model"))
+        now = time.time()
+        return ExtractionCacheStats(
+            entries=entries,
+            total_bytes=total_bytes,
+            max_bytes=self.max_bytes,
+            hits=hits,
+            tokens_saved=tokens_saved,
+            models=models,
+            oldest_age_s=round(now - oldest, 1) if oldest is not None else None,
+            newest_age_s=round(now - newest, 1) if newest is not None else None,
+        )
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Delete least-recently-used entries until the cache fits; returns entries removed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        removed: list[str] = []
+        with self._index() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+            if total <= limit:
+                return 0
+            for key, size in conn.execute("SELECT key, bytes FROM entries ORDER BY last_used"):
+                if total <= limit:
+                    break
+                removed.append(key)
+                total -= size
+            conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in removed])
+        for key in removed:
+            self._blob_path(key).unlink(missing_ok=True)
+        if removed:
+            logger.info("Extraction cache: evicted %d entr%s.", len(removed), "y" if len(removed) == 1 else "ies")
+        return len(removed)
+
+    def export(self, out: TextIO) -> int:
+        """Write every entry as one JSON line (index fields plus blob), oldest first; returns the count."""
+        with self._index() as conn:
+            rows = conn.execute(
+                "SELECT key, model, bytes, total_tokens, created_at, last_used, hits FROM entries ORDER BY created_at, key"
+            ).fetchall()
+        count = 0
+        for key, model, size, total_tokens, created_at, last_used, hits in rows:
+            try:
+                blob = read_json(self._blob_path(key))
+            except (OSError, ValueError):
+                continue
+            record = {
+                "key": key,
+                "model": model,
+                "bytes": size,
+                "total_tokens": total_tokens,
+                "created_at": created_at,
+                "last_used": last_used,
+                "hits": hits,
+                "extraction": blob["extraction"],
+                "raw_text": blob["raw_text"],
+                "result_meta": blob.get("result_meta", {}),
+            }
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+        return count
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Inspect, trim or export the shared extraction cache.")
+    parser.add_argument("command", choices=("stats", "prune", "export"))
+    parser.add_argument("--cache-dir", type=Path, required=True, help="Extraction cache directory.")
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=EXTRACTION_CACHE_MAX_BYTES / (1024 * 1024),
+        help="Size cap in MiB (prune trims to it; stats reports against it).",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        help="JSON Lines file for export. Defaults to stdout.",
+    )
+    return parser
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    args = _build_arg_parser().parse_args()
+    cache = ExtractionCache(args.cache_dir, max_bytes=int(args.max_mb * 1024 * 1024))
+    if args.command == "export":
+        if args.out is None:
+            count = cache.export(sys.stdout)
+        else:
+            args.out.parent.mkdir(parents=True, exist_ok=True)
+            with args.out.open("w", encoding="utf-8") as f:
+                count = cache.export(f)
+        logger.info("Exported %d entr%s.", count, "y" if count == 1 else "ies")
+        return
+    if args.command == "prune":
+        cache.evict()
+    stats = cache.stats()
+    print(
+        f"{stats.entries} entries, {stats.total_bytes / (1024 * 1024):.1f} MiB"
+        f" of {stats.max_bytes / (1024 * 1024):.0f} MiB"
+        f" ({stats.total_bytes / stats.max_bytes:.0%}) in {args.cache_dir}"
+    )
+    print(f"{stats.hits} hits served, {stats.tokens_saved} tokens saved")
+    for model, count in stats.models.items():
+        print(f"  {model}: {count} entries")
+    if stats.entries:
+        print(f"last used: newest {stats.newest_age_s:.0f}s ago, oldest {stats.oldest_age_s:.0f}s ago")
+
+
+if __name__ == "__main__":
+    main()
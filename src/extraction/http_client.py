@@ -0,0 +1,91 @@
+"""Pooled provider clients shared by extraction calls on the same thread.
+
+A bare ``requests.post`` opens a new connection (TCP and TLS handshake) for
+every tile and every retry.  :func:`pooled_session` instead hands each worker
+thread its own :class:`requests.Session`, so consecutive calls from that
+worker reuse keep-alive connections.  Sessions are not shared across
+threads, which keeps them safe under ``run_batch``'s thread pool.  Pool size,
+keep-alive and timeouts come from :class:`HttpPoolSettings`, built from an
+:class:`~src.extraction.config_models.ExtractionConfig`.
+
+:func:`thread_client` caches other per-thread clients (the Anthropic SDK
+client) in the same way.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config_models import ExtractionConfig
+
+_T = TypeVar("_T")
+
+_local = threading.local()
+
+
+@dataclass(frozen=True)
+class HttpPoolSettings:
+    """Connection pool settings for one provider session."""
+
+    pool_size: int
+    keep_alive: bool
+    connect_timeout_sec: float
+    read_timeout_sec: float
+
+    @classmethod
+    def from_config(cls, config: ExtractionConfig) -> HttpPoolSettings:
+        return cls(
+            pool_size=max(1, int(config.http_pool_size)),
+            keep_alive=config.http_keep_alive,
+            connect_timeout_sec=float(config.connect_timeout_sec),
+            read_timeout_sec=float(config.timeout_sec),
+        )
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """``(connect, read)`` timeout tuple for ``requests``."""
+        return (self.connect_timeout_sec, self.read_timeout_sec)
+
+
+def _new_session(settings: HttpPoolSettings) -> requests.Session:
+    session = requests.Session()
+    # Retries stay in call_openrouter_vision, which owns the backoff policy.
+    adapter = HTTPAdapter(pool_connections=settings.pool_size, pool_maxsize=settings.pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not settings.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def thread_client(key: Hashable, factory: Callable[[], _T]) -> _T:
+    """Return this thread's client for *key*, creating it with *factory* once."""
+    clients: dict[Hashable, Any] | None = getattr(_local, "clients", None)
+    if clients is None:
+        clients = _local.clients = {}
+    if key not in clients:
+        clients[key] = factory()
+    return clients[key]
+
+
+def pooled_session(settings: HttpPoolSettings) -> requests.Session:
+    """This thread's keep-alive session for *settings*."""
+    return thread_client(("requests", settings.pool_size, settings.keep_alive), lambda: _new_session(settings))
+
+
+def close_thread_clients() -> int:
+    """Close and forget this thread's clients; returns how many were closed."""
+    clients: dict[Hashable, Any] = getattr(_local, "clients", None) or {}
+    for client in clients.values():
+        close = getattr(client, "close", None)
+        if callable(close):
+            close()
+    count = len(clients)
+    clients.clear()
+    return count
@@ -12,17 +12,22 @@ from typing import Any, Mapping
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from ..utils.io_json import sha256_file
+from ..utils.text_layer_pack import split_member_path, text_layer_exists, text_layer_sha256
 from ..utils.parsing import to_float as _to_float
 
 CONTRACT_VERSION = "preanalysis.v1"
-# Accepts both grid tiles (pN_rX_cY) and adaptive tiles (pN_aM).
-TILE_ID_PATTERN = re.compile(r"^p(?P<page>\d+)_(?:r\d+_c\d+|a\d+)$", re.IGNORECASE)
+# Accepts both grid tiles (pN_rX_cY) and adaptive tiles (pN_aM), optionally
+# prefixed with the source document of a multi-PDF run (dK_pN_rX_cY).
+TILE_ID_PATTERN = re.compile(
+    r"^(?:d\d+_)?p(?P<page>\d+)_(?:r\d+_c\d+|a\d+)$", re.IGNORECASE
+)
 
 
 class ArtifactStatus(str, Enum):
     OK = "ok"
     DRY_RUN = "dry_run"
     SKIPPED_LOW_COHERENCE = "skipped_low_coherence"
+    SKIPPED_EMPTY = "skipped_empty"
     VALIDATION_ERROR = "validation_error"
     RUNTIME_ERROR = "runtime_error"
     MISSING_TEXT_LAYER = "missing_text_layer"
@@ -40,7 +45,7 @@ class CompatMode(str, Enum):
 
 
 def page_number_from_tile_id(tile_id: str) -> int | None:
-    """Extract page number from tile id shaped like pNN_rX_cY."""
+    """Extract the run page number from a tile id shaped like [dK_]pNN_rX_cY."""
     match = TILE_ID_PATTERN.match(tile_id.strip())
     if not match:
         return None
@@ -59,6 +64,8 @@ def normalize_status(raw_status: Any) -> ArtifactStatus:
         return ArtifactStatus.DRY_RUN
     if status == ArtifactStatus.SKIPPED_LOW_COHERENCE.value:
         return ArtifactStatus.SKIPPED_LOW_COHERENCE
+    if status == ArtifactStatus.SKIPPED_EMPTY.value:
+        return ArtifactStatus.SKIPPED_EMPTY
     if status == ArtifactStatus.VALIDATION_ERROR.value:
         return ArtifactStatus.VALIDATION_ERROR
     if status == ArtifactStatus.RUNTIME_ERROR.value:
@@ -106,6 +113,8 @@ class PackageCounts(ContractBaseModel):
     skipped_low_coherence: int = Field(ge=0)
     validation_error: int = Field(ge=0)
     runtime_error: int = Field(ge=0)
+    # Tiles the tiler marked empty; absent from packages written before it existed.
+    skipped_empty: int = Field(default=0, ge=0)
 
 
 class ArtifactPaths(ContractBaseModel):
@@ -141,7 +150,7 @@ class PackageArtifact(ContractBaseModel):
     def _validate_tile_id(cls, value: str) -> str:
         token = value.strip()
         if not TILE_ID_PATTERN.match(token):
-            raise ValueError("tile_id must match pNN_rX_cY")
+            raise ValueError("tile_id must match [dK_]pNN_rX_cY")
         return token
 
 
@@ -178,6 +187,8 @@ class AnalysisValidationReport(ContractBaseModel):
 
 
 def _safe_hash(path: Path | None) -> str | None:
+    if path is not None and split_member_path(path) is not None:
+        return text_layer_sha256(path) if text_layer_exists(path) else None
     if path is None or not path.exists() or not path.is_file():
         return None
     return sha256_file(path)
@@ -222,6 +233,7 @@ def build_analysis_package_from_summary(
         ),
         validation_error=_to_int(getattr(counts_raw, "get", lambda *_: 0)("validation_error")),
         runtime_error=_to_int(getattr(counts_raw, "get", lambda *_: 0)("runtime_error")),
+        skipped_empty=_to_int(getattr(counts_raw, "get", lambda *_: 0)("skipped_empty")),
     )
 
     artifacts: list[PackageArtifact] = []
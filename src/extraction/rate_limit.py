@@ -0,0 +1,498 @@
+"""Process-wide adaptive rate limiting for provider calls.
+
+Every OpenRouter attempt and every Anthropic call takes a permit from the
+:class:`ProviderLimiter` for its provider and model; the thread-pool engine,
+the asyncio engine and escalation calls share the same limiter through
+:func:`provider_limiter`.  A limiter combines:
+
+* a concurrency window adjusted by AIMD -- each successful call widens it by
+  ``increase / window`` (about ``increase`` per window's worth of calls) and a
+  throttled call (429/503) multiplies it by ``decrease``, at most once per
+  window of calls issued before the last decrease;
+* an optional token bucket for ``requests_per_minute``;
+* a shared block: ``Retry-After`` (or an exhausted ``*ratelimit-remaining*``
+  header with its reset time) closes the limiter for every worker until the
+  provider's reset.  A throttle without such a header blocks for an
+  exponential fallback instead.
+
+Waiters are admitted first-come first-served, so workers released by a block
+ending trickle back in through the narrowed window rather than all retrying
+at the same moment.  :func:`rate_limit_report` summarises limiter state and
+throttle events for ``batch_summary.json``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+from ..config import RATE_LIMIT_MAX_BACKOFF_SEC, RATE_LIMIT_MIN_CONCURRENCY
+from .config_models import ExtractionConfig
+
+_T = TypeVar("_T")
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+_FALLBACK_BACKOFF_SEC = 1.0
+_MAX_EVENTS = 50
+
+# (remaining, reset) header pairs, lower-cased: OpenRouter, OpenAI-style
+# per-request limits and Anthropic.
+_RATE_LIMIT_HEADERS = (
+    ("x-ratelimit-remaining", "x-ratelimit-reset"),
+    ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+)
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    """Concurrency window, AIMD factors and request rate for one limiter."""
+
+    max_concurrency: int
+    min_concurrency: int = RATE_LIMIT_MIN_CONCURRENCY
+    requests_per_minute: float | None = None
+    increase: float = 1.0
+    decrease: float = 0.5
+    max_backoff_sec: float = RATE_LIMIT_MAX_BACKOFF_SEC
+
+    @classmethod
+    def from_config(cls, config: ExtractionConfig) -> RateLimitSettings:
+        max_concurrency = max(1, int(config.rate_limit_max_concurrency))
+        return cls(
+            max_concurrency=max_concurrency,
+            min_concurrency=min(max_concurrency, RATE_LIMIT_MIN_CONCURRENCY),
+            requests_per_minute=config.requests_per_minute,
+        )
+
+
+def _parse_reset(value: str, now: float) -> float | None:
+    """Seconds from *now* (epoch) until a reset header value, or ``None``.
+
+    Accepts delta seconds, epoch seconds or milliseconds, Go-style durations
+    (``"1m30s"``, ``"250ms"``), RFC 3339 and HTTP dates.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        pass
+    else:
+        if number > 1e12:
+            return number / 1000.0 - now
+        if number > 1e9:
+            return number - now
+        return number
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return moment.timestamp() - now
+
+
+def header_delay(headers: Mapping[str, str] | None, *, now: float | None = None) -> float | None:
+    """Seconds the provider asks callers to wait, from response *headers*.
+
+    ``Retry-After`` wins; otherwise an exhausted remaining-requests header
+    yields the time until its reset.  ``None`` when neither applies.
+    """
+    if not headers:
+        return None
+    lowered = {str(k).lower(): str(v) for k, v in headers.items()}
+    now = time.time() if now is None else now
+    retry_after = lowered.get("retry-after")
+    if retry_after is not None:
+        delay = _parse_reset(retry_after, now)
+        if delay is not None:
+            return max(0.0, delay)
+    for remaining_name, reset_name in _RATE_LIMIT_HEADERS:
+        remaining = lowered.get(remaining_name)
+        reset = lowered.get(reset_name)
+        if remaining is None or reset is None:
+            continue
+        try:
+            exhausted = float(remaining) <= 0
+        except ValueError:
+            continue
+        if exhausted:
+            delay = _parse_reset(reset, now)
+            if delay is not None:
+                return max(0.0, delay)
+    return None
+
+
+class Permit:
+    """One admitted call; hand it back with :meth:`ProviderLimiter.release`."""
+
+    __slots__ = ("issued_at", "released")
+
+    def __init__(self, issued_at: float) -> None:
+        self.issued_at = issued_at
+        self.released = False
+
+
+class _Waiter:
+    """A queued caller, woken by a grant or by a change in the shared block."""
+
+    __slots__ = ("permit", "deadline", "_event", "_loop")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None) -> None:
+        self.permit: Permit | None = None
+        self.deadline: float | None = None
+        self._loop = loop
+        self._event: threading.Event | asyncio.Event = threading.Event() if loop is None else asyncio.Event()
+
+    def wake(self) -> None:
+        if self._loop is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._event.set)
+
+
+class ProviderLimiter:
+    """Concurrency window, token bucket and shared block for one provider and model.
+
+    Thread-safe; blocking callers use :meth:`acquire`, coroutines
+    :meth:`aacquire`, and both hand permits back with :meth:`release` or
+    :meth:`release_error`.
+    """
+
+    def __init__(self, key: str, settings: RateLimitSettings, *, clock: Any = time.monotonic) -> None:
+        self.key = key
+        self.settings = settings
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window = float(settings.max_concurrency)
+        self._in_flight = 0
+        rate = settings.requests_per_minute
+        self._rate = rate / 60.0 if rate else None
+        self._burst = max(1.0, self._rate or 1.0)
+        self._tokens = self._burst
+        self._refilled_at = clock()
+        self._blocked_until = 0.0
+        self._last_decrease = -math.inf
+        self._backoff_level = 0
+        self._queue: deque[_Waiter] = deque()
+        self._event_seq = itertools.count(1)
+        self._events: deque[dict[str, Any]] = deque(maxlen=_MAX_EVENTS)
+        self.stats = {"requests": 0, "throttled": 0, "decreases": 0, "waits": 0, "wait_sec": 0.0}
+
+    # -- admission -------------------------------------------------------
+
+    def _refill(self, now: float) -> None:
+        if self._rate is not None:
+            self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
+    def _admit(self, now: float) -> float:
+        """Take a permit slot: ``0.0`` when admitted, else the wait (``inf`` until a release)."""
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self._in_flight >= max(1, int(self._window)):
+            return math.inf
+        self._refill(now)
+        if self._rate is not None:
+            if self._tokens < 1.0:
+                return (1.0 - self._tokens) / self._rate
+            self._tokens -= 1.0
+        self._in_flight += 1
+        self.stats["requests"] += 1
+        return 0.0
+
+    def _grant(self) -> None:
+        """Admit queued waiters in order; arm the head's timer if time blocks it."""
+        now = self._clock()
+        while self._queue:
+            wait = self._admit(now)
+            head = self._queue[0]
+            if wait == 0.0:
+                self._queue.popleft()
+                head.permit = Permit(now)
+                head.wake()
+                continue
+            deadline = now + wait if math.isfinite(wait) else None
+            if head.deadline != deadline:
+                head.deadline = deadline
+                head.wake()
+            return
+
+    def _enqueue(self, loop: asyncio.AbstractEventLoop | None) -> Permit | _Waiter:
+        with self._lock:
+            if not self._queue:
+                now = self._clock()
+                if self._admit(now) == 0.0:
+                    return Permit(now)
+            waiter = _Waiter(loop)
+            self._queue.append(waiter)
+            self.stats["waits"] += 1
+            self._grant()
+            return waiter
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter.permit is not None:
+                self._release_locked(waiter.permit, status=None, headers=None)
+            elif waiter in self._queue:
+                self._queue.remove(waiter)
+                self._grant()
+
+    def acquire(self) -> Permit:
+        """Block until the limiter admits a call."""
+        entry = self._enqueue(None)
+        if isinstance(entry, Permit):
+            return entry
+        started = time.perf_counter()
+        event = entry._event
+        assert isinstance(event, threading.Event)
+        try:
+            while True:
+                with self._lock:
+                    if entry.permit is not None:
+                        break
+                    event.clear()
+                    self._grant()
+                    if entry.permit is not None:
+                        break
+                    timeout = None if entry.deadline is None else max(0.0, entry.deadline - self._clock())
+                event.wait(timeout)
+        except BaseException:
+            self._abandon(entry)
+            raise
+        self._add_wait(time.perf_counter() - started)
+        return entry.permit
+
+    async def aacquire(self) -> Permit:
+        """Wait, without blocking the event loop, until the limiter admits a call."""
+        entry = self._enqueue(asyncio.get_running_loop())
+        if isinstance(entry, Permit):
+            return entry
+        started = time.perf_counter()
+        event = entry._event
+        assert isinstance(event, asyncio.Event)
+        try:
+            while True:
+                with self._lock:
+                    if entry.permit is not None:
+                        break
+                    event.clear()
+                    self._grant()
+                    if entry.permit is not None:
+                        break
+                    timeout = None if entry.deadline is None else max(0.0, entry.deadline - self._clock())
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(entry)
+            raise
+        self._add_wait(time.perf_counter() - started)
+        return entry.permit
+
+    def _add_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.stats["wait_sec"] += seconds
+
+    # -- feedback --------------------------------------------------------
+
+    def release(
+        self,
+        permit: Permit,
+        *,
+        status: int | None = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        """Return *permit* with the call's HTTP *status* and response *headers*.
+
+        ``status=None`` (no response, e.g. a connection error) leaves the
+        window unchanged.
+        """
+        with self._lock:
+            self._release_locked(permit, status=status, headers=headers)
+
+    def release_error(self, permit: Permit, exc: BaseException) -> None:
+        """Return *permit* after *exc*, reading status and headers from it when it carries a response."""
+        status = getattr(exc, "status_code", None)
+        response = getattr(exc, "response", None)
+        if status is None and response is not None:
+            status = getattr(response, "status_code", None)
+        headers = getattr(response, "headers", None) if response is not None else None
+        self.release(permit, status=status if isinstance(status, int) else None, headers=headers)
+
+    def _release_locked(
+        self,
+        permit: Permit,
+        *,
+        status: int | None,
+        headers: Mapping[str, str] | None,
+    ) -> None:
+        if permit.released:
+            return
+        permit.released = True
+        self._in_flight -= 1
+        now = self._clock()
+        delay = header_delay(headers)
+        settings = self.settings
+        if status in THROTTLE_STATUSES:
+            self.stats["throttled"] += 1
+            if permit.issued_at >= self._last_decrease:
+                self._window = max(float(settings.min_concurrency), self._window * settings.decrease)
+                self._last_decrease = now
+                self._backoff_level += 1
+                self.stats["decreases"] += 1
+            if delay is None:
+                delay = min(settings.max_backoff_sec, _FALLBACK_BACKOFF_SEC * 2 ** max(0, self._backoff_level - 1))
+            self._block(now, delay, status)
+        elif status is not None and 200 <= status < 300:
+            self._backoff_level = 0
+            self._window = min(
+                float(settings.max_concurrency),
+                self._window + settings.increase / max(1.0, self._window),
+            )
+            if delay:
+                self._block(now, delay, status)
+        self._grant()
+
+    def _block(self, now: float, delay: float, status: int | None) -> None:
+        self._blocked_until = max(self._blocked_until, now + delay)
+        self._events.append(
+            {
+                "seq": next(self._event_seq),
+                "at": datetime.now(UTC).isoformat(),
+                "status": status,
+                "wait_sec": round(delay, 3),
+                "concurrency_limit": round(self._window, 2),
+            }
+        )
+
+    # -- reporting -------------------------------------------------------
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "concurrency_limit": round(self._window, 2),
+                "max_concurrency": self.settings.max_concurrency,
+                "min_concurrency": self.settings.min_concurrency,
+                "requests_per_minute": self.settings.requests_per_minute,
+                "in_flight": self._in_flight,
+                "blocked_for_sec": round(max(0.0, self._blocked_until - self._clock()), 3),
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats.items()},
+                "events": [dict(event) for event in self._events],
+            }
+
+
+def _response_status(result: Any) -> int:
+    status = getattr(result, "status_code", 200)
+    return status if isinstance(status, int) else 200
+
+
+def call_limited(limiter: ProviderLimiter | None, fn: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+    """Call *fn* under a permit from *limiter* (``None``: call it directly).
+
+    A returned response's ``status_code`` and ``headers`` feed the limiter;
+    any other return value counts as a success, and an exception is read by
+    :meth:`ProviderLimiter.release_error`.
+    """
+    if limiter is None:
+        return fn(*args, **kwargs)
+    permit = limiter.acquire()
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as exc:
+        limiter.release_error(permit, exc)
+        raise
+    limiter.release(permit, status=_response_status(result), headers=getattr(result, "headers", None))
+    return result
+
+
+async def acall_limited(
+    limiter: ProviderLimiter | None,
+    fn: Callable[..., Awaitable[_T]],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> _T:
+    """Awaitable :func:`call_limited` for a coroutine function *fn*."""
+    if limiter is None:
+        return await fn(*args, **kwargs)
+    permit = await limiter.aacquire()
+    try:
+        result = await fn(*args, **kwargs)
+    except BaseException as exc:
+        limiter.release_error(permit, exc)
+        raise
+    limiter.release(permit, status=_response_status(result), headers=getattr(result, "headers", None))
+    return result
+
+
+_registry: dict[tuple[str, str], ProviderLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def provider_limiter(provider: str, model: str, settings: RateLimitSettings) -> ProviderLimiter:
+    """The process-wide limiter for *provider* and *model*, created with *settings* on first use."""
+    key = (provider, model)
+    with _registry_lock:
+        limiter = _registry.get(key)
+        if limiter is None:
+            limiter = _registry[key] = ProviderLimiter(f"{provider}:{model}", settings)
+        return limiter
+
+
+def reset_limiters() -> None:
+    """Forget every limiter (tests, or a new run with different settings)."""
+    with _registry_lock:
+        _registry.clear()
+
+
+def rate_limit_checkpoint() -> dict[str, dict[str, Any]]:
+    """Counters of every limiter now, to pass to :func:`rate_limit_report` later."""
+    with _registry_lock:
+        limiters = list(_registry.values())
+    return {limiter.key: limiter.snapshot() for limiter in limiters}
+
+
+def rate_limit_report(since: Mapping[str, Mapping[str, Any]] | None = None) -> dict[str, dict[str, Any]]:
+    """State of each limiter used since the *since* checkpoint, keyed ``provider:model``.
+
+    Counters and throttle events count from the checkpoint; window and block
+    are current.  Limiters without requests since then are left out.
+    """
+    since = since or {}
+    report: dict[str, dict[str, Any]] = {}
+    for key, snap in rate_limit_checkpoint().items():
+        before = since.get(key, {})
+        requests = snap["requests"] - before.get("requests", 0)
+        if requests <= 0:
+            continue
+        last_seq = max((event["seq"] for event in before.get("events", [])), default=0)
+        entry = dict(snap)
+        for counter in ("requests", "throttled", "decreases", "waits", "wait_sec"):
+            entry[counter] = round(snap[counter] - before.get(counter, 0), 3)
+        entry["events"] = [
+            {k: v for k, v in event.items() if k != "seq"} for event in snap["events"] if event["seq"] > last_seq
+        ]
+        report[key] = entry
+    return report
@@ -0,0 +1,368 @@
+"""Deterministic text-layer extractor for tiles the model is not needed for.
+
+High-coherence profile tiles often describe every structure entirely in text:
+``SDMH NO. 3`` / ``STA 16+82.45`` / ``28.00' RT`` / ``RIM 312.45`` /
+``INV 12" N 305.10``.  :func:`extract_rule_based` parses each text item with
+regex rules (stations and offsets via :mod:`src.utils.parsing`), groups the
+label lines of one structure by proximity, and builds a
+:class:`~src.extraction.schemas.TileExtraction` from them.
+
+Every structure and pipe gets a confidence: ambiguous clusters (two types,
+two offsets, two rim elevations), an unknown structure type and inverts
+above the rim lower it.  Tile confidence is the lowest of these, halved for
+every numeric text item that did not end up in a structure or pipe (profile
+grid ticks such as bare elevations and ``16+00`` are not counted).  A tile
+whose text holds anything the rules do not understand, such as a crown
+elevation or a detail reference, therefore scores low and goes to the model
+as before.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import ValidationError
+
+from ..config import RULE_BASED_CLUSTER_GAP_EM
+from ..utils.parsing import STATION_PATTERN, parse_offset
+from .package_contract import page_number_from_tile_id
+from .schemas import InvertElevation, Pipe, Structure, TileExtraction
+
+# (structure_type, utility, pattern); checked in order.
+_STRUCTURE_TYPES: tuple[tuple[str, str, re.Pattern[str]], ...] = (
+    ("SDMH", "SD", re.compile(r"\bSDMH\b|\bSTORM\s+DRAIN\s+MANHOLE\b|\bSD\s+MH\b")),
+    ("SSMH", "SS", re.compile(r"\bSSMH\b|\bSANITARY\s+SEWER\s+MANHOLE\b|\bSEWER\s+MANHOLE\b|\bSS\s+MH\b")),
+    ("CB", "SD", re.compile(r"\bCB\b|\bCATCH\s+BASIN\b")),
+    ("inlet", "SD", re.compile(r"\bINLET\b|\bDI\b")),
+    ("cleanout", "SS", re.compile(r"\bCLEANOUT\b|\bSSCO\b")),
+    ("gate_valve", "W", re.compile(r"\bGATE\s+VALVE\b|\bGV\b")),
+    ("fire_hydrant", "W", re.compile(r"\bFIRE\s+HYDRANT\b|\bFH\b")),
+    ("air_valve", "W", re.compile(r"\bAIR\s+(?:RELEASE\s+)?VALVE\b|\bARV\b")),
+)
+_WATER_TYPES = frozenset(stype for stype, utility, _ in _STRUCTURE_TYPES if utility == "W")
+
+_STRUCTURE_ID = re.compile(
+    r"\b(?P<prefix>SDMH|SSMH|MH|CB|DI|GV|FH)\s*(?:NO\.?|#)?\s*-?\s*(?P<num>\d{1,3}[A-Z]?)\b"
+    r"(?!\s*(?:\"|IN\b|\.\d|\+))"
+)
+_OFFSET = re.compile(
+    r"(?<![\d.+])(?P<dist>\d+(?:\.\d+)?)\s*(?:(?:'|FT\.?)\s*(?P<dir1>LT|RT|L|R)|(?P<dir2>LT|RT))\b"
+)
+_ELEVATION = re.compile(r"\b(?P<kind>RIM|TC|FL)\s*(?:EL(?:EV)?\.?\s*)?[=:]?\s*(?P<value>\d+\.\d+)")
+_SIZE = r"(?P<{name}>\d+(?:\.\d+)?)\s*(?:\"|IN\b)\s*"
+_INVERT = re.compile(
+    r"\b(?:INV|IE)\.?\s*(?:" + _SIZE.format(name="size") + r")?(?P<type>SD|SS)?\s*"
+    r"(?P<dir>NE|NW|SE|SW|N|S|E|W)\b\s*(?:" + _SIZE.format(name="size2") + r")?"
+    r"[=:]?\s*(?P<value>\d+\.\d+)"
+)
+_PIPE_CALLOUT = re.compile(
+    r"(?P<length>\d+(?:\.\d+)?)\s*(?:LF|L\.F\.)\s*(?:OF\s+)?-?\s*" + _SIZE.format(name="size")
+    + r"(?P<type>SD|SS|W)?\s*(?P<material>RCP|PVC|DIP|HDPE|VCP|CMP|C900)?\s*(?P<type2>SD|SS|W)?\s*"
+    r"(?:(?:@|AT)\s*)?(?:S\s*=\s*)?(?P<slope>\d*\.\d+)?\s*(?P<pct>%)?"
+)
+_EXISTING = re.compile(r"\bEXIST(?:ING|\.)?(?=\W|$)|\(E\)")
+_PROFILE = re.compile(r"\bPROFILE\b")
+# Profile grid ticks: bare elevations and full stations carry no structure data.
+_GRID_TICK = re.compile(r"^(?:\d{1,4}(?:\.\d+)?|(?:STA\.?\s*)?\d{1,4}\s*\+\s*00(?:\.0+)?)$")
+_DIGIT = re.compile(r"\d")
+
+_MATERIAL_UTILITY = {"RCP": "SD", "CMP": "SD", "VCP": "SS", "DIP": "W", "C900": "W"}
+_UTILITY_ORDER = ("SD", "SS", "W")
+# Confidence multipliers.
+_AMBIGUOUS = 0.5
+_UNKNOWN_TYPE = 0.5
+_INFERRED_PIPE_TYPE = 0.9
+_UNEXPLAINED = 0.5
+
+
+@dataclass
+class _ItemFacts:
+    """What the rules read from one text item."""
+
+    text_id: int
+    bbox: tuple[float, float, float, float]
+    font_size: float
+    stations: list[str] = field(default_factory=list)
+    offsets: list[str] = field(default_factory=list)
+    elevations: dict[str, list[float]] = field(default_factory=dict)
+    inverts: list[InvertElevation] = field(default_factory=list)
+    types: list[tuple[str, str]] = field(default_factory=list)
+    ids: list[str] = field(default_factory=list)
+    existing: bool = False
+    pipe: Pipe | None = None
+    pipe_confidence: float = 1.0
+    informative: bool = False
+    unexplained: bool = False
+
+    @property
+    def structural(self) -> bool:
+        return bool(
+            self.stations or self.offsets or self.elevations or self.inverts or self.types or self.ids
+        )
+
+
+@dataclass(frozen=True)
+class RuleBasedExtraction:
+    """A rule-based :class:`TileExtraction` and how far to trust it.
+
+    ``coverage`` is the share of the tile's numeric text items the rules
+    explained; ``unexplained_text_ids`` lists the rest.
+    """
+
+    extraction: TileExtraction
+    confidence: float
+    coverage: float
+    item_confidences: tuple[float, ...]
+    unexplained_text_ids: tuple[int, ...]
+
+    def to_meta(self) -> dict[str, Any]:
+        return {
+            "confidence": round(self.confidence, 4),
+            "coverage": round(self.coverage, 4),
+            "item_confidences": [round(c, 4) for c in self.item_confidences],
+            "unexplained_text_ids": list(self.unexplained_text_ids),
+        }
+
+
+def _consume(pattern: re.Pattern[str], text: str) -> tuple[list[re.Match[str]], str]:
+    """All matches of *pattern* and *text* with them blanked out."""
+    matches = list(pattern.finditer(text))
+    for match in reversed(matches):
+        text = text[: match.start()] + " " * (match.end() - match.start()) + text[match.end():]
+    return matches, text
+
+
+def _parse_pipe(match: re.Match[str], text_id: int) -> tuple[Pipe, float] | None:
+    material = match.group("material")
+    pipe_type = match.group("type") or match.group("type2")
+    confidence = 1.0
+    if pipe_type is None:
+        pipe_type = _MATERIAL_UTILITY.get(material or "")
+        confidence = _INFERRED_PIPE_TYPE
+    if pipe_type is None:
+        return None
+    slope = float(match.group("slope")) if match.group("slope") else None
+    if slope is not None:
+        if match.group("pct"):
+            slope /= 100.0
+        elif slope > 0.2:
+            confidence *= _AMBIGUOUS  # a percent written without the sign?
+    return (
+        Pipe(
+            pipe_type=pipe_type,
+            size=f'{match.group("size")}"',
+            material=material,
+            length_lf=float(match.group("length")),
+            slope=slope,
+            source_text_ids=[text_id],
+        ),
+        confidence,
+    )
+
+
+def _parse_item(item: Mapping[str, Any]) -> _ItemFacts:
+    text = " ".join(str(item.get("text", "")).upper().split())
+    bbox = item.get("bbox_local") or item.get("bbox_global") or (0.0, 0.0, 0.0, 0.0)
+    facts = _ItemFacts(
+        text_id=int(item.get("text_id", -1)),
+        bbox=tuple(float(v) for v in bbox),  # type: ignore[arg-type]
+        font_size=float(item.get("font_size") or 8.0),
+    )
+    if not _DIGIT.search(text) or _GRID_TICK.match(text):
+        return facts
+    facts.informative = True
+
+    matches, rest = _consume(_PIPE_CALLOUT, text)
+    for match in matches:
+        parsed = _parse_pipe(match, facts.text_id)
+        if parsed is None:
+            facts.unexplained = True
+        else:
+            facts.pipe, facts.pipe_confidence = parsed
+
+    matches, rest = _consume(_INVERT, rest)
+    for match in matches:
+        size = match.group("size") or match.group("size2")
+        if size is None:
+            facts.unexplained = True
+            continue
+        facts.inverts.append(
+            InvertElevation(
+                direction=match.group("dir"),
+                pipe_size=f'{size}"',
+                pipe_type=match.group("type"),
+                elevation=float(match.group("value")),
+                source_text_ids=[facts.text_id],
+            )
+        )
+    matches, rest = _consume(_ELEVATION, rest)
+    for match in matches:
+        facts.elevations.setdefault(match.group("kind"), []).append(float(match.group("value")))
+    matches, rest = _consume(STATION_PATTERN, rest)
+    facts.stations = [f"{m.group(1)}+{m.group(2)}" for m in matches]
+    matches, rest = _consume(_OFFSET, rest)
+    for match in matches:
+        parsed = parse_offset(match.group(0))
+        if parsed is not None:
+            facts.offsets.append(f"{parsed[0]:.2f}' {parsed[1]}")
+    matches, rest = _consume(_STRUCTURE_ID, rest)
+    facts.ids = [f"{m.group('prefix')}-{m.group('num')}" for m in matches]
+    for stype, utility, pattern in _STRUCTURE_TYPES:
+        if pattern.search(text):
+            facts.types.append((stype, utility))
+    facts.existing = bool(_EXISTING.search(text))
+    facts.unexplained = facts.unexplained or bool(_DIGIT.search(rest))
+    return facts
+
+
+def _cluster(items: list[_ItemFacts], gap_em: float) -> list[list[_ItemFacts]]:
+    """Group items whose boxes, grown by ``gap_em`` font heights, touch."""
+    parent = list(range(len(items)))
+
+    def _find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, a in enumerate(items):
+        for j in range(i + 1, len(items)):
+            b = items[j]
+            gap = gap_em * max(a.font_size, b.font_size)
+            if (
+                a.bbox[0] - gap <= b.bbox[2]
+                and b.bbox[0] - gap <= a.bbox[2]
+                and a.bbox[1] - gap <= b.bbox[3]
+                and b.bbox[1] - gap <= a.bbox[3]
+            ):
+                parent[_find(j)] = _find(i)
+
+    clusters: dict[int, list[_ItemFacts]] = {}
+    for i, item in enumerate(items):
+        clusters.setdefault(_find(i), []).append(item)
+    return list(clusters.values())
+
+
+def _distinct(values: list[Any]) -> list[Any]:
+    return list(dict.fromkeys(values))
+
+
+def _build_structure(cluster: list[_ItemFacts]) -> tuple[Structure, set[str], float] | None:
+    """Structure described by *cluster*, the utilities it shows and its confidence."""
+    stations = _distinct([s for item in cluster for s in item.stations])
+    if len(stations) != 1:
+        return None
+    confidence = 1.0
+    types = _distinct([t for item in cluster for t in item.types])
+    if not types:
+        structure_type, utilities = "other", set()
+        confidence *= _UNKNOWN_TYPE
+    else:
+        structure_type, utilities = types[0][0], {types[0][1]}
+        if len(types) > 1:
+            confidence *= _AMBIGUOUS
+    offsets = _distinct([o for item in cluster for o in item.offsets])
+    if not offsets and structure_type not in _WATER_TYPES:
+        return None
+    if len(offsets) > 1:
+        confidence *= _AMBIGUOUS
+    elevations: dict[str, float] = {}
+    for kind in ("RIM", "TC", "FL"):
+        values = _distinct([v for item in cluster for v in item.elevations.get(kind, [])])
+        if values:
+            elevations[kind] = values[0]
+            if len(values) > 1:
+                confidence *= _AMBIGUOUS
+    inverts: list[InvertElevation] = []
+    seen: set[tuple[str, str, float]] = set()
+    for item in cluster:
+        for invert in item.inverts:
+            key = (invert.direction, invert.pipe_size, invert.elevation)
+            if key not in seen:
+                seen.add(key)
+                inverts.append(invert)
+                if invert.pipe_type:
+                    utilities.add(invert.pipe_type)
+    rim = elevations.get("RIM")
+    if rim is not None and any(inv.elevation >= rim for inv in inverts):
+        confidence *= _AMBIGUOUS
+    ids = _distinct([i for item in cluster for i in item.ids])
+    if len(ids) > 1:
+        confidence *= _AMBIGUOUS
+    try:
+        structure = Structure(
+            id=ids[0] if ids else None,
+            structure_type=structure_type,
+            station=stations[0],
+            offset=offsets[0] if offsets else None,
+            rim_elevation=rim,
+            tc_elevation=elevations.get("TC"),
+            fl_elevation=elevations.get("FL"),
+            inverts=inverts,
+            is_existing=any(item.existing for item in cluster),
+            source_text_ids=sorted(item.text_id for item in cluster),
+        )
+    except ValidationError:
+        return None
+    return structure, utilities, confidence
+
+
+def extract_rule_based(
+    text_layer: Mapping[str, Any], *, cluster_gap_em: float = RULE_BASED_CLUSTER_GAP_EM
+) -> RuleBasedExtraction | None:
+    """Rule-based extraction of *text_layer*; ``None`` when it yields no structure or pipe."""
+    items = [_parse_item(item) for item in text_layer.get("items", []) if isinstance(item, Mapping)]
+    explained: set[int] = set()
+    confidences: list[float] = []
+    utilities: set[str] = set()
+    structures: list[Structure] = []
+    pipes: list[Pipe] = []
+
+    for cluster in _cluster([item for item in items if item.structural], cluster_gap_em):
+        built = _build_structure(cluster)
+        if built is None:
+            continue
+        structure, structure_utilities, confidence = built
+        structures.append(structure)
+        utilities |= structure_utilities
+        confidences.append(confidence)
+        explained.update(item.text_id for item in cluster)
+    for item in items:
+        if item.pipe is not None:
+            pipes.append(item.pipe)
+            utilities.add(item.pipe.pipe_type)
+            confidences.append(item.pipe_confidence)
+            if not item.structural:
+                explained.add(item.text_id)
+    if not structures and not pipes:
+        return None
+
+    informative = [item for item in items if item.informative]
+    unexplained = sorted(
+        item.text_id for item in informative if item.unexplained or item.text_id not in explained
+    )
+    coverage = 1.0 - len(unexplained) / len(informative) if informative else 1.0
+
+    tile_id = str(text_layer.get("tile_id", "unknown"))
+    page_number = text_layer.get("page_number")
+    if not isinstance(page_number, int):
+        page_number = page_number_from_tile_id(tile_id) or 0
+    profile = any(_PROFILE.search(str(item.get("text", "")).upper()) for item in text_layer.get("items", []))
+    extraction = TileExtraction(
+        tile_id=tile_id,
+        page_number=page_number,
+        sheet_type="profile_view" if profile else "plan_view",
+        utility_types_present=[u for u in _UTILITY_ORDER if u in utilities],
+        structures=structures,
+        pipes=pipes,
+    )
+    return RuleBasedExtraction(
+        extraction=extraction,
+        confidence=min(confidences) * _UNEXPLAINED ** len(unexplained),
+        coverage=coverage,
+        item_confidences=tuple(confidences),
+        unexplained_text_ids=tuple(unexplained),
+    )
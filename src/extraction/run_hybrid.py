@@ -11,22 +11,37 @@ import os
 import re
 import time
 from pathlib import Path
-from typing import Any
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any, TypeVar
 
 import requests
 from dotenv import load_dotenv
 from pydantic import ValidationError
 
+from ..utils.image_codec import ImageCodec, ImageEncoding, codec_available, image_media_type, transcode_image
 from ..utils.io_json import read_json
+from ..utils.text_layer_pack import load_text_layer
 from .config_models import (
     EscalationConfig,
     ExtractionConfig,
     PROVIDER_ANTHROPIC,
     PROVIDER_OPENROUTER,
 )
+from .extraction_cache import CachedExtraction, ExtractionCache
+from .http_client import HttpPoolSettings, pooled_session, thread_client
 from .package_contract import page_number_from_tile_id
 from .prompts import build_hybrid_prompt, build_hybrid_prompt_split
+from .rate_limit import (
+    THROTTLE_STATUSES,
+    ProviderLimiter,
+    RateLimitSettings,
+    call_limited,
+    provider_limiter,
+)
+from .rule_based import extract_rule_based
+from .single_flight import SingleFlight
 from .schemas import TileExtraction, _WATER_STRUCTURE_TYPES, _normalize_structure_type
+from .tile_dedup import TileDedupIndex, TileFingerprint, fingerprint_tile, remap_extraction
 
 try:
     import anthropic as _anthropic_module
@@ -40,10 +55,13 @@ except ImportError:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 DEFAULT_OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 from ..config import DEFAULT_EXTRACTION_MODEL as DEFAULT_MODEL
 from ..config import DEFAULT_ESCALATION_MODEL
 from ..config import ESCALATION_COHERENCE_THRESHOLD as DEFAULT_ESCALATION_COHERENCE_THRESHOLD
+from ..config import RULE_BASED_MIN_COHERENCE, RULE_BASED_MIN_CONFIDENCE
 CACHE_SCHEMA_VERSION = "hybrid-cache-v2"
 _STRUCTURED_NONE = "none"
 _STRUCTURED_JSON_OBJECT = "json_object"
@@ -53,7 +71,7 @@ _STRUCTURED_JSON_SCHEMA = "json_schema"
 
 def _image_bytes_to_data_url(image_bytes: bytes) -> str:
     b64 = base64.b64encode(image_bytes).decode("ascii")
-    return f"data:image/png;base64,{b64}"
+    return f"data:{image_media_type(image_bytes)};base64,{b64}"
 
 
 def _compute_cache_key(
@@ -291,7 +309,11 @@ def _response_format_payload(mode: str) -> dict[str, Any]:
     return {}
 
 
-def call_openrouter_vision(
+_OPENROUTER_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+_OPENROUTER_MAX_RETRIES = 3
+
+
+def _openrouter_request(
     *,
     api_key: str,
     model: str,
@@ -301,12 +323,8 @@ def call_openrouter_vision(
     title: str,
     temperature: float,
     max_tokens: int,
-    timeout_sec: int,
-    endpoint: str = DEFAULT_OPENROUTER_URL,
-    use_structured_output: bool = True,
-    use_json_schema: bool = True,
-) -> tuple[str, dict[str, Any]]:
-    """Call OpenRouter vision model and return raw text + response JSON."""
+) -> tuple[dict[str, str], dict[str, Any]]:
+    """Headers and base payload (no response format) for an OpenRouter call."""
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
@@ -327,18 +345,83 @@ def call_openrouter_vision(
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
+    return headers, base_payload
+
+
+def _retry_wait(status_code: int, attempt: int, limiter: ProviderLimiter | None) -> int:
+    """Seconds to sleep before retrying *status_code*.
+
+    Throttles wait on the shared *limiter* (its next permit) rather than a
+    local backoff that every worker would sit out and end together.
+    """
+    if limiter is not None and status_code in THROTTLE_STATUSES:
+        return 0
+    return 3**attempt
 
-    structured_modes: list[str]
+
+def _structured_modes(use_structured_output: bool, use_json_schema: bool) -> list[str]:
+    """Response formats to try in order; each 400 falls back to the next."""
     if use_structured_output:
         if use_json_schema:
-            structured_modes = [_STRUCTURED_JSON_SCHEMA, _STRUCTURED_JSON_OBJECT, _STRUCTURED_NONE]
-        else:
-            structured_modes = [_STRUCTURED_JSON_OBJECT, _STRUCTURED_NONE]
-    else:
-        structured_modes = [_STRUCTURED_NONE]
+            return [_STRUCTURED_JSON_SCHEMA, _STRUCTURED_JSON_OBJECT, _STRUCTURED_NONE]
+        return [_STRUCTURED_JSON_OBJECT, _STRUCTURED_NONE]
+    return [_STRUCTURED_NONE]
+
+
+def _openrouter_content(response_json: dict[str, Any]) -> str:
+    try:
+        content = response_json["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as exc:
+        raise ValueError("Unexpected OpenRouter response structure.") from exc
+    return _flatten_message_content(content)
 
-    retryable_statuses = {429, 500, 502, 503, 504}
-    max_retries = 3
+
+def call_openrouter_vision(
+    *,
+    api_key: str,
+    model: str,
+    prompt: str,
+    image_data_url: str,
+    referer: str,
+    title: str,
+    temperature: float,
+    max_tokens: int,
+    timeout_sec: int,
+    endpoint: str = DEFAULT_OPENROUTER_URL,
+    use_structured_output: bool = True,
+    use_json_schema: bool = True,
+    session: requests.Session | None = None,
+    connect_timeout_sec: float | None = None,
+    limiter: ProviderLimiter | None = None,
+) -> tuple[str, dict[str, Any]]:
+    """Call OpenRouter vision model and return raw text + response JSON.
+
+    Pass a pooled *session* (see :func:`~src.extraction.http_client.pooled_session`)
+    to reuse keep-alive connections across calls; without one every attempt
+    opens a new connection.  *connect_timeout_sec* bounds the connection
+    handshake separately from *timeout_sec*.
+
+    With a *limiter* (see :mod:`src.extraction.rate_limit`) every attempt
+    waits for a permit, and a throttled attempt is retried once the shared
+    limiter reopens instead of after a local ``3**attempt`` sleep.
+    """
+    post = session.post if session is not None else requests.post
+    timeout: float | tuple[float, float] = (
+        timeout_sec if connect_timeout_sec is None else (connect_timeout_sec, timeout_sec)
+    )
+    headers, base_payload = _openrouter_request(
+        api_key=api_key,
+        model=model,
+        prompt=prompt,
+        image_data_url=image_data_url,
+        referer=referer,
+        title=title,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    structured_modes = _structured_modes(use_structured_output, use_json_schema)
+    retryable_statuses = _OPENROUTER_RETRYABLE_STATUSES
+    max_retries = _OPENROUTER_MAX_RETRIES
     last_response: requests.Response | None = None
 
     for mode_idx, structured_mode in enumerate(structured_modes):
@@ -347,7 +430,9 @@ def call_openrouter_vision(
 
         for attempt in range(max_retries):
             try:
-                last_response = requests.post(endpoint, headers=headers, json=payload, timeout=timeout_sec)
+                last_response = call_limited(
+                    limiter, post, endpoint, headers=headers, json=payload, timeout=timeout
+                )
                 if (
                     last_response.status_code == 400
                     and structured_mode != _STRUCTURED_NONE
@@ -363,13 +448,13 @@ def call_openrouter_vision(
                     break
 
                 if last_response.status_code in retryable_statuses and attempt < max_retries - 1:
-                    wait = 3**attempt
+                    wait = _retry_wait(last_response.status_code, attempt, limiter)
                     logger.warning(
-                        "Retryable status %s on attempt %s/%s. Waiting %ss.",
+                        "Retryable status %s on attempt %s/%s. Waiting %s.",
                         last_response.status_code,
                         attempt + 1,
                         max_retries,
-                        wait,
+                        f"{wait}s" if wait else "for the shared rate limiter",
                     )
                     time.sleep(wait)
                     continue
@@ -377,11 +462,7 @@ def call_openrouter_vision(
                 last_response.raise_for_status()
                 response_json = last_response.json()
                 response_json["_response_format_type"] = structured_mode
-                try:
-                    content = response_json["choices"][0]["message"]["content"]
-                except (KeyError, IndexError, TypeError) as exc:
-                    raise ValueError("Unexpected OpenRouter response structure.") from exc
-                return _flatten_message_content(content), response_json
+                return _openrouter_content(response_json), response_json
             except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as exc:
                 if attempt < max_retries - 1:
                     wait = 3**attempt
@@ -413,11 +494,7 @@ def call_openrouter_vision(
         raise
     response_json = last_response.json()
     response_json.setdefault("_response_format_type", _STRUCTURED_NONE)
-    try:
-        content = response_json["choices"][0]["message"]["content"]
-    except (KeyError, IndexError, TypeError) as exc:
-        raise ValueError("Unexpected OpenRouter response structure.") from exc
-    return _flatten_message_content(content), response_json
+    return _openrouter_content(response_json), response_json
 
 
 def call_anthropic_vision(
@@ -470,7 +547,7 @@ def call_anthropic_vision(
         b64_data = image_data_url
         media_type = "image/png"
 
-    client = _anthropic_module.Anthropic(api_key=api_key)
+    client = thread_client(("anthropic", api_key), lambda: _anthropic_module.Anthropic(api_key=api_key))
 
     message = client.messages.create(
         model=model,
@@ -601,7 +678,7 @@ def call_anthropic_vision_structured(
         b64_data = image_data_url
         media_type = "image/png"
 
-    client = _anthropic_module.Anthropic(api_key=api_key)
+    client = thread_client(("anthropic", api_key), lambda: _anthropic_module.Anthropic(api_key=api_key))
     instructor_client = _instructor_module.from_anthropic(client)
 
     extraction: TileExtraction = instructor_client.messages.create(
@@ -652,7 +729,77 @@ def call_anthropic_vision_structured(
     return extraction, response_dict
 
 
-def run_hybrid_extraction(
+class ProviderCalls:
+    """Blocking provider calls made by :func:`run_hybrid_extraction`.
+
+    The extraction body is a coroutine so that the asyncio engine (see
+    :mod:`src.extraction.run_hybrid_async`) can substitute non-blocking calls.
+    These never suspend, so :func:`_run_to_completion` finishes the coroutine
+    without an event loop.  Each call takes permits from *limiter*.
+    """
+
+    async def shared(
+        self,
+        flights: SingleFlight | None,
+        key: Hashable,
+        call: Callable[[], Coroutine[Any, Any, _T]],
+    ) -> tuple[_T, bool]:
+        """``await call()``, coalesced with any identical call in flight under *key*.
+
+        Returns the result and whether another tile's call produced it.
+        """
+        if flights is None:
+            return await call(), False
+        return flights.run(key, lambda: _run_to_completion(call()))
+
+    async def openrouter(
+        self,
+        http_settings: HttpPoolSettings,
+        *,
+        limiter: ProviderLimiter | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, dict[str, Any]]:
+        return call_openrouter_vision(
+            session=pooled_session(http_settings),
+            connect_timeout_sec=http_settings.connect_timeout_sec,
+            limiter=limiter,
+            **kwargs,
+        )
+
+    async def anthropic(self, *, limiter: ProviderLimiter | None = None, **kwargs: Any) -> tuple[str, dict[str, Any]]:
+        return call_limited(limiter, call_anthropic_vision, **kwargs)
+
+    async def anthropic_structured(
+        self,
+        *,
+        limiter: ProviderLimiter | None = None,
+        **kwargs: Any,
+    ) -> tuple[TileExtraction, dict[str, Any]]:
+        return call_limited(limiter, call_anthropic_vision_structured, **kwargs)
+
+    async def cache_fetch(self, cache: ExtractionCache, key: str) -> CachedExtraction | None:
+        """:meth:`ExtractionCache.fetch`; its disk and index I/O blocks."""
+        return cache.fetch(key)
+
+    async def cache_store(self, cache: ExtractionCache, key: str, **kwargs: Any) -> None:
+        """:meth:`ExtractionCache.store`; its disk and index I/O blocks."""
+        cache.store(key, **kwargs)
+
+
+_BLOCKING_CALLS = ProviderCalls()
+
+
+def _run_to_completion(coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run a coroutine that never suspends and return its result."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Blocking extraction suspended; use run_hybrid_extraction_async instead.")
+
+
+async def _extract_tile(
     *,
     tile_path: Path,
     text_layer_path: Path,
@@ -667,9 +814,13 @@ def run_hybrid_extraction(
     prompt_output_path: Path | None,
     attempted_models: list[str] | None = None,
     escalation_reason: str | None = None,
+    dedup_index: TileDedupIndex | None = None,
+    extraction_cache: ExtractionCache | None = None,
+    single_flight: SingleFlight | None = None,
     _escalated: bool = False,
+    calls: ProviderCalls,
 ) -> int:
-    """Execute one hybrid extraction call and persist outputs."""
+    """Body of :func:`run_hybrid_extraction`; provider calls go through *calls*."""
     # Unpack config for convenient local access (keeps the rest of the body unchanged).
     model = config.model
     api_key = config.api_key
@@ -679,18 +830,24 @@ def run_hybrid_extraction(
     temperature = config.temperature
     max_tokens = config.max_tokens
     timeout_sec = config.timeout_sec
+    http_settings = HttpPoolSettings.from_config(config)
+    limiter = provider_limiter(provider, model, RateLimitSettings.from_config(config))
     use_structured_output = config.use_structured_output
     use_json_schema = config.use_json_schema
     use_instructor = config.use_instructor
     escalation_model = escalation.model
     escalation_coherence_threshold = escalation.coherence_threshold
     escalation_enabled = escalation.enabled
-    text_layer = read_json(text_layer_path)
+    text_layer = load_text_layer(text_layer_path)
     coherence_score = float(text_layer.get("coherence_score", 0.0))
     is_hybrid_viable = bool(text_layer.get("is_hybrid_viable", True))
     tile_id = str(text_layer.get("tile_id", "unknown"))
     attempt_chain = list(attempted_models or [])
     attempt_chain.append(model)
+    dedup_meta: dict[str, Any] | None = None
+    rule_based_meta: dict[str, Any] | None = None
+    extraction_cache_meta: dict[str, Any] | None = None
+    single_flight_meta: dict[str, Any] | None = None
 
     def _can_escalate() -> bool:
         return (
@@ -702,7 +859,7 @@ def run_hybrid_extraction(
         )
 
     def _meta_common() -> dict[str, Any]:
-        return {
+        common: dict[str, Any] = {
             "tile_id": tile_id,
             "coherence_score": coherence_score,
             "is_hybrid_viable": is_hybrid_viable,
@@ -719,8 +876,17 @@ def run_hybrid_extraction(
                 else (_STRUCTURED_JSON_OBJECT if use_structured_output else _STRUCTURED_NONE)
             ),
         }
-
-    def _run_escalation(reason: str, *, force_allow_low_coherence: bool = False) -> int | None:
+        if dedup_meta is not None:
+            common["dedup"] = dedup_meta
+        if rule_based_meta is not None:
+            common["rule_based"] = rule_based_meta
+        if extraction_cache_meta is not None:
+            common["extraction_cache"] = extraction_cache_meta
+        if single_flight_meta is not None:
+            common["single_flight"] = single_flight_meta
+        return common
+
+    async def _run_escalation(reason: str, *, force_allow_low_coherence: bool = False) -> int | None:
         if not _can_escalate():
             return None
         escalation_target = str(escalation_model).strip()
@@ -732,7 +898,7 @@ def run_hybrid_extraction(
             reason,
         )
         from dataclasses import replace as _dc_replace
-        return run_hybrid_extraction(
+        return await _extract_tile(
             tile_path=tile_path,
             text_layer_path=text_layer_path,
             output_path=output_path,
@@ -746,12 +912,16 @@ def run_hybrid_extraction(
             prompt_output_path=prompt_output_path,
             attempted_models=attempt_chain,
             escalation_reason=reason,
+            dedup_index=dedup_index,
+            extraction_cache=extraction_cache,
+            single_flight=single_flight,
             _escalated=True,
+            calls=calls,
         )
 
     low_confidence = coherence_score < float(escalation_coherence_threshold)
     if low_confidence:
-        escalated_exit_code = _run_escalation(
+        escalated_exit_code = await _run_escalation(
             "low_coherence",
             force_allow_low_coherence=not is_hybrid_viable,
         )
@@ -770,6 +940,56 @@ def run_hybrid_extraction(
             json.dump(meta_payload, f, indent=2, ensure_ascii=False)
         return 0
 
+    min_rule_confidence = config.rule_based_min_confidence
+    if min_rule_confidence is not None:
+        rule_result = None
+        if coherence_score < RULE_BASED_MIN_COHERENCE:
+            rule_based_meta = {"decision": "low_coherence"}
+        else:
+            rule_result = extract_rule_based(text_layer)
+            rule_based_meta = {"decision": "no_match"}
+        if rule_result is not None:
+            accepted = rule_result.confidence >= min_rule_confidence
+            rule_based_meta = {
+                "decision": "accepted" if accepted else "below_gate",
+                "min_confidence": min_rule_confidence,
+                **rule_result.to_meta(),
+            }
+        if rule_result is not None and accepted:
+            extraction = rule_result.extraction
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("w", encoding="utf-8") as f:
+                json.dump(extraction.model_dump(), f, indent=2, ensure_ascii=False)
+            meta_output_path.parent.mkdir(parents=True, exist_ok=True)
+            with meta_output_path.open("w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "status": "ok",
+                        **_meta_common(),
+                        "extractor": "rule_based",
+                        "text_items_count": len(text_layer.get("items", [])),
+                        "structures_count": len(extraction.structures),
+                        "pipes_count": len(extraction.pipes),
+                        "callouts_count": len(extraction.callouts),
+                        "usage": {},
+                        "corrected_fields": [],
+                        "sanitized": False,
+                        "cache_hit": False,
+                    },
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+            logger.info(
+                "Rule-based extraction for %s (confidence=%.2f): structures=%s pipes=%s. "
+                "Skipping API call.",
+                tile_id,
+                rule_result.confidence,
+                len(extraction.structures),
+                len(extraction.pipes),
+            )
+            return 0
+
     # Build prompts.  For the Anthropic provider we keep the split form so the
     # system message can be sent with cache_control.  For OpenRouter we use the
     # legacy combined prompt string.
@@ -785,7 +1005,12 @@ def run_hybrid_extraction(
         prompt_output_path.parent.mkdir(parents=True, exist_ok=True)
         prompt_output_path.write_text(prompt, encoding="utf-8")
 
-    image_bytes = tile_path.read_bytes()
+    tile_bytes = tile_path.read_bytes()
+    image_bytes = (
+        transcode_image(tile_bytes, config.image_encoding)
+        if config.image_encoding is not None
+        else tile_bytes
+    )
     cache_key = _compute_cache_key(
         prompt=prompt,
         image_bytes=image_bytes,
@@ -814,7 +1039,7 @@ def run_hybrid_extraction(
             and existing_meta.get("status") in {"ok", "dry_run"}
         ):
             if bool(existing_meta.get("sanitized", False)):
-                escalated_exit_code = _run_escalation("sanitized_recovery_cached")
+                escalated_exit_code = await _run_escalation("sanitized_recovery_cached")
                 if escalated_exit_code is not None:
                     return escalated_exit_code
             logger.info("Cache hit for tile %s (cache_key=%s). Skipping API call.", tile_id, cache_key)
@@ -839,8 +1064,139 @@ def run_hybrid_extraction(
             )
         return 0
 
+    if extraction_cache is not None and not no_cache:
+        cached = await calls.cache_fetch(extraction_cache, cache_key)
+        extraction_cache_meta = {"decision": "miss" if cached is None else "hit"}
+        if cached is not None:
+            if bool(cached.result_meta.get("sanitized", False)):
+                escalated_exit_code = await _run_escalation("sanitized_recovery_cached")
+                if escalated_exit_code is not None:
+                    return escalated_exit_code
+            # The key covers the prompt and image but not the tile's identity, so
+            # an entry may come from another tile (a sheet that moved pages, or
+            # another document of a multi-PDF run).
+            expected_page_number = _coerce_int(text_layer.get("page_number"))
+            if expected_page_number is None:
+                expected_page_number = page_number_from_tile_id(tile_id) or 0
+            extraction_payload = {**cached.extraction, "tile_id": tile_id, "page_number": expected_page_number}
+            raw_output_path.parent.mkdir(parents=True, exist_ok=True)
+            raw_output_path.write_text(cached.raw_text, encoding="utf-8")
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("w", encoding="utf-8") as f:
+                json.dump(extraction_payload, f, indent=2, ensure_ascii=False)
+            meta_output_path.parent.mkdir(parents=True, exist_ok=True)
+            with meta_output_path.open("w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "status": "ok",
+                        **_meta_common(),
+                        **cached.result_meta,
+                        "cache_key": cache_key,
+                        "cache_hit": True,
+                    },
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+            logger.info(
+                "Extraction cache hit for tile %s (cache_key=%s). Skipping API call.", tile_id, cache_key
+            )
+            return 0
+
+    fingerprint: TileFingerprint | None = None
+    if dedup_index is not None:
+        fingerprint = fingerprint_tile(tile_bytes, text_layer)
+        if fingerprint is None:
+            dedup_meta = {"decision": "no_text"}
+        else:
+            dedup_meta = {
+                "decision": "miss",
+                "text_signature": fingerprint.text_signature,
+                "image_hash": fingerprint.image_hash_hex,
+            }
+            match = None if no_cache else dedup_index.lookup(fingerprint, model=model)
+            if match is not None:
+                expected_page_number = _coerce_int(text_layer.get("page_number"))
+                if expected_page_number is None:
+                    expected_page_number = page_number_from_tile_id(tile_id) or 0
+                extraction = TileExtraction.model_validate(
+                    remap_extraction(
+                        match.extraction,
+                        match.id_map,
+                        tile_id=tile_id,
+                        page_number=expected_page_number,
+                    )
+                )
+                dedup_meta.update(
+                    {
+                        "decision": "hit",
+                        "source_tile_id": match.source_tile_id,
+                        "source_page_number": match.source_page_number,
+                        "image_distance": match.distance,
+                        "max_distance": dedup_index.max_distance,
+                    }
+                )
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with output_path.open("w", encoding="utf-8") as f:
+                    json.dump(extraction.model_dump(), f, indent=2, ensure_ascii=False)
+                meta_output_path.parent.mkdir(parents=True, exist_ok=True)
+                with meta_output_path.open("w", encoding="utf-8") as f:
+                    json.dump(
+                        {
+                            "status": "ok",
+                            **_meta_common(),
+                            "prompt_chars": len(prompt),
+                            "text_items_count": len(text_layer.get("items", [])),
+                            "structures_count": len(extraction.structures),
+                            "pipes_count": len(extraction.pipes),
+                            "callouts_count": len(extraction.callouts),
+                            "usage": {},
+                            "corrected_fields": [],
+                            "sanitized": False,
+                            "cache_key": cache_key,
+                            "cache_hit": False,
+                        },
+                        f,
+                        indent=2,
+                        ensure_ascii=False,
+                    )
+                logger.info(
+                    "Dedup hit for tile %s: reusing %s (distance=%s). Skipping API call.",
+                    tile_id,
+                    match.source_tile_id,
+                    match.distance,
+                )
+                return 0
+
+    def _record_dedup(extraction: TileExtraction) -> None:
+        if dedup_index is None or fingerprint is None:
+            return
+        dedup_index.record(
+            fingerprint,
+            model=model,
+            tile_id=extraction.tile_id,
+            page_number=extraction.page_number,
+            extraction=extraction.model_dump(),
+        )
+
+    async def _cache_result(extraction: TileExtraction, raw_text: str, result_meta: dict[str, Any]) -> None:
+        if extraction_cache is not None:
+            await calls.cache_store(
+                extraction_cache,
+                cache_key,
+                model=model,
+                extraction=extraction.model_dump(),
+                raw_text=raw_text,
+                result_meta=result_meta,
+            )
+
     image_data_url = _image_bytes_to_data_url(image_bytes)
 
+    def _record_flight(coalesced: bool) -> None:
+        nonlocal single_flight_meta
+        if single_flight is not None:
+            single_flight_meta = {"decision": "coalesced" if coalesced else "leader"}
+
     # --- instructor-backed Anthropic path ---
     _use_instructor_path = (
         provider == PROVIDER_ANTHROPIC
@@ -849,15 +1205,20 @@ def run_hybrid_extraction(
     )
     if _use_instructor_path:
         try:
-            extraction, response_json = call_anthropic_vision_structured(
-                api_key=api_key,
-                model=model,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                image_data_url=image_data_url,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                timeout_sec=timeout_sec,
+            (extraction, response_json), coalesced = await calls.shared(
+                single_flight,
+                ("instructor", cache_key),
+                lambda: calls.anthropic_structured(
+                    limiter=limiter,
+                    api_key=api_key,
+                    model=model,
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    image_data_url=image_data_url,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout_sec=timeout_sec,
+                ),
             )
         except Exception as _instructor_exc:
             # Instructor failed (e.g. exhausted retries).  Log and fall through to
@@ -871,8 +1232,10 @@ def run_hybrid_extraction(
 
         if _use_instructor_path:
             # instructor returned a validated TileExtraction; write raw JSON and meta.
+            _record_flight(coalesced)
+            raw_text = extraction.model_dump_json()
             raw_output_path.parent.mkdir(parents=True, exist_ok=True)
-            raw_output_path.write_text(extraction.model_dump_json(), encoding="utf-8")
+            raw_output_path.write_text(raw_text, encoding="utf-8")
 
             # Post-validate tile metadata correctness (same logic as manual path).
             expected_tile_id = str(text_layer.get("tile_id", extraction.tile_id))
@@ -897,39 +1260,43 @@ def run_hybrid_extraction(
             with output_path.open("w", encoding="utf-8") as f:
                 json.dump(extraction.model_dump(), f, indent=2, ensure_ascii=False)
 
-            usage = response_json.get("usage", {})
+            usage = {} if coalesced else response_json.get("usage", {})
+            result_meta: dict[str, Any] = {
+                "prompt_chars": len(prompt),
+                "text_items_count": len(text_layer.get("items", [])),
+                "structures_count": len(extraction.structures),
+                "pipes_count": len(extraction.pipes),
+                "callouts_count": len(extraction.callouts),
+                "usage": usage,
+                "response_format_type": response_json.get("_response_format_type", _STRUCTURED_NONE),
+                "corrected_fields": sorted(corrected_fields.keys()),
+                "sanitized": False,
+                "dropped_invalid_counts": {
+                    "structures": 0,
+                    "inverts": 0,
+                    "pipes": 0,
+                    "callouts": 0,
+                },
+                "via_instructor": True,
+            }
             meta_output_path.parent.mkdir(parents=True, exist_ok=True)
             with meta_output_path.open("w", encoding="utf-8") as f:
                 json.dump(
                     {
                         "status": "ok",
                         **_meta_common(),
-                        "prompt_chars": len(prompt),
-                        "text_items_count": len(text_layer.get("items", [])),
-                        "structures_count": len(extraction.structures),
-                        "pipes_count": len(extraction.pipes),
-                        "callouts_count": len(extraction.callouts),
-                        "usage": usage,
-                        "response_format_type": response_json.get(
-                            "_response_format_type", _STRUCTURED_NONE
-                        ),
-                        "corrected_fields": sorted(corrected_fields.keys()),
-                        "sanitized": False,
-                        "dropped_invalid_counts": {
-                            "structures": 0,
-                            "inverts": 0,
-                            "pipes": 0,
-                            "callouts": 0,
-                        },
+                        **result_meta,
                         "cache_key": cache_key,
                         "cache_hit": False,
-                        "via_instructor": True,
                     },
                     f,
                     indent=2,
                     ensure_ascii=False,
                 )
 
+            _record_dedup(extraction)
+            if not coalesced:
+                await _cache_result(extraction, raw_text, result_meta)
             logger.info(
                 "Extraction complete for %s (instructor): structures=%s pipes=%s callouts=%s",
                 extraction.tile_id,
@@ -942,35 +1309,47 @@ def run_hybrid_extraction(
     # --- manual parsing path (OpenRouter, or Anthropic without instructor) ---
     try:
         if provider == PROVIDER_ANTHROPIC:
-            raw_text, response_json = call_anthropic_vision(
-                api_key=api_key,
-                model=model,
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                image_data_url=image_data_url,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                timeout_sec=timeout_sec,
+            (raw_text, response_json), coalesced = await calls.shared(
+                single_flight,
+                cache_key,
+                lambda: calls.anthropic(
+                    limiter=limiter,
+                    api_key=api_key,
+                    model=model,
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    image_data_url=image_data_url,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout_sec=timeout_sec,
+                ),
             )
         else:
-            raw_text, response_json = call_openrouter_vision(
-                api_key=api_key,
-                model=model,
-                prompt=prompt,
-                image_data_url=image_data_url,
-                referer=referer,
-                title=title,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                timeout_sec=timeout_sec,
-                use_structured_output=use_structured_output,
-                use_json_schema=use_json_schema,
+            (raw_text, response_json), coalesced = await calls.shared(
+                single_flight,
+                cache_key,
+                lambda: calls.openrouter(
+                    http_settings,
+                    limiter=limiter,
+                    api_key=api_key,
+                    model=model,
+                    prompt=prompt,
+                    image_data_url=image_data_url,
+                    referer=referer,
+                    title=title,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout_sec=timeout_sec,
+                    use_structured_output=use_structured_output,
+                    use_json_schema=use_json_schema,
+                ),
             )
     except Exception:
-        escalated_exit_code = _run_escalation("api_call_error")
+        escalated_exit_code = await _run_escalation("api_call_error")
         if escalated_exit_code is not None:
             return escalated_exit_code
         raise
+    _record_flight(coalesced)
 
     raw_output_path.parent.mkdir(parents=True, exist_ok=True)
     raw_output_path.write_text(raw_text, encoding="utf-8")
@@ -982,7 +1361,7 @@ def run_hybrid_extraction(
             json_candidate = _extract_json_candidate(raw_text)
             payload_obj = json.loads(json_candidate)
         except (ValueError, json.JSONDecodeError) as exc:
-            escalated_exit_code = _run_escalation("json_parse_error")
+            escalated_exit_code = await _run_escalation("json_parse_error")
             if escalated_exit_code is not None:
                 return escalated_exit_code
             logger.error("Model JSON parse failed for %s", tile_id)
@@ -1003,7 +1382,7 @@ def run_hybrid_extraction(
             return 2
 
     if not isinstance(payload_obj, dict):
-        escalated_exit_code = _run_escalation("non_object_json")
+        escalated_exit_code = await _run_escalation("non_object_json")
         if escalated_exit_code is not None:
             return escalated_exit_code
         logger.error("Model output for %s is not a JSON object.", tile_id)
@@ -1039,7 +1418,7 @@ def run_hybrid_extraction(
                 dropped_invalid_counts,
                 )
         except ValidationError:
-            escalated_exit_code = _run_escalation("schema_validation_error")
+            escalated_exit_code = await _run_escalation("schema_validation_error")
             if escalated_exit_code is not None:
                 return escalated_exit_code
             logger.error("Schema validation failed for %s", tile_id)
@@ -1061,7 +1440,7 @@ def run_hybrid_extraction(
             return 2
 
     if sanitized:
-        escalated_exit_code = _run_escalation("sanitized_recovery")
+        escalated_exit_code = await _run_escalation("sanitized_recovery")
         if escalated_exit_code is not None:
             return escalated_exit_code
 
@@ -1087,23 +1466,27 @@ def run_hybrid_extraction(
     with output_path.open("w", encoding="utf-8") as f:
         json.dump(extraction.model_dump(), f, indent=2, ensure_ascii=False)
 
-    usage = response_json.get("usage", {})
+    # A coalesced tile's tokens were spent (and reported) by the tile that made the call.
+    usage = {} if coalesced else response_json.get("usage", {})
+    result_meta = {
+        "prompt_chars": len(prompt),
+        "text_items_count": len(text_layer.get("items", [])),
+        "structures_count": len(extraction.structures),
+        "pipes_count": len(extraction.pipes),
+        "callouts_count": len(extraction.callouts),
+        "usage": usage,
+        "response_format_type": response_json.get("_response_format_type", _STRUCTURED_NONE),
+        "corrected_fields": sorted(corrected_fields.keys()),
+        "sanitized": sanitized,
+        "dropped_invalid_counts": dropped_invalid_counts,
+    }
     meta_output_path.parent.mkdir(parents=True, exist_ok=True)
     with meta_output_path.open("w", encoding="utf-8") as f:
         json.dump(
             {
                 "status": "ok",
                 **_meta_common(),
-                "prompt_chars": len(prompt),
-                "text_items_count": len(text_layer.get("items", [])),
-                "structures_count": len(extraction.structures),
-                "pipes_count": len(extraction.pipes),
-                "callouts_count": len(extraction.callouts),
-                "usage": usage,
-                "response_format_type": response_json.get("_response_format_type", _STRUCTURED_NONE),
-                "corrected_fields": sorted(corrected_fields.keys()),
-                "sanitized": sanitized,
-                "dropped_invalid_counts": dropped_invalid_counts,
+                **result_meta,
                 "cache_key": cache_key,
                 "cache_hit": False,
             },
@@ -1112,6 +1495,10 @@ def run_hybrid_extraction(
             ensure_ascii=False,
         )
 
+    if not sanitized:
+        _record_dedup(extraction)
+    if not coalesced:
+        await _cache_result(extraction, raw_text, result_meta)
     logger.info(
         "Extraction complete for %s: structures=%s pipes=%s callouts=%s",
         extraction.tile_id,
@@ -1122,12 +1509,82 @@ def run_hybrid_extraction(
     return 0
 
 
+def run_hybrid_extraction(
+    *,
+    tile_path: Path,
+    text_layer_path: Path,
+    output_path: Path,
+    raw_output_path: Path,
+    meta_output_path: Path,
+    config: ExtractionConfig,
+    escalation: EscalationConfig,
+    allow_low_coherence: bool,
+    dry_run: bool,
+    no_cache: bool,
+    prompt_output_path: Path | None,
+    attempted_models: list[str] | None = None,
+    escalation_reason: str | None = None,
+    dedup_index: TileDedupIndex | None = None,
+    extraction_cache: ExtractionCache | None = None,
+    single_flight: SingleFlight | None = None,
+    _escalated: bool = False,
+) -> int:
+    """Execute one hybrid extraction call and persist outputs.
+
+    With ``dedup_index`` set, a tile whose fingerprint matches a stored
+    extraction for the same model reuses it (text ids remapped) instead of
+    calling the API, and every successful unsanitized extraction is stored
+    for later tiles.  The decision is recorded under ``dedup`` in the meta.
+
+    With ``config.rule_based_min_confidence`` set, a tile whose text layer is
+    at least ``RULE_BASED_MIN_COHERENCE`` coherent is first parsed by
+    :func:`~src.extraction.rule_based.extract_rule_based`; when the result's
+    confidence reaches the floor it is written without calling the API and
+    the meta gets ``extractor: rule_based``.  The decision is recorded under
+    ``rule_based`` in the meta.
+
+    With ``extraction_cache`` set, a tile whose cache key has an entry from an
+    earlier run is written from it (meta ``cache_hit: true``) instead of
+    calling the API, and every successful API extraction is stored there (see
+    :mod:`src.extraction.extraction_cache`).  The lookup is recorded under
+    ``extraction_cache`` in the meta; ``no_cache`` skips the lookup.
+
+    With ``single_flight`` set, a provider call whose cache key is already
+    being requested by another tile waits for that call's response instead of
+    making its own (see :mod:`src.extraction.single_flight`).  The meta
+    records ``leader`` or ``coalesced`` under ``single_flight``; a coalesced
+    tile reports empty ``usage``.
+    """
+    return _run_to_completion(
+        _extract_tile(
+            tile_path=tile_path,
+            text_layer_path=text_layer_path,
+            output_path=output_path,
+            raw_output_path=raw_output_path,
+            meta_output_path=meta_output_path,
+            config=config,
+            escalation=escalation,
+            allow_low_coherence=allow_low_coherence,
+            dry_run=dry_run,
+            no_cache=no_cache,
+            prompt_output_path=prompt_output_path,
+            attempted_models=attempted_models,
+            escalation_reason=escalation_reason,
+            dedup_index=dedup_index,
+            extraction_cache=extraction_cache,
+            single_flight=single_flight,
+            _escalated=_escalated,
+            calls=_BLOCKING_CALLS,
+        )
+    )
+
+
 def _build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Run hybrid extraction for one tile image and one tile text-layer JSON."
     )
-    parser.add_argument("--tile", type=Path, required=True, help="Path to tile PNG.")
-    parser.add_argument("--text-layer", type=Path, required=True, help="Path to tile text layer JSON.")
+    parser.add_argument("--tile", type=Path, required=True, help="Path to tile image (PNG, JPEG or WebP).")
+    parser.add_argument("--text-layer", type=Path, required=True, help="Path to tile text layer JSON or .tlpk member path.")
     parser.add_argument("--out", type=Path, required=True, help="Path for validated extraction JSON.")
     parser.add_argument(
         "--raw-out",
@@ -1206,6 +1663,28 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Disable hash-based cache and force API calls.",
     )
+    parser.add_argument(
+        "--dedup-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Perceptual tile dedup index directory, shareable across runs and plan sets. "
+            "Near-identical tiles reuse a stored extraction instead of calling the API."
+        ),
+    )
+    parser.add_argument(
+        "--rule-based",
+        type=float,
+        nargs="?",
+        const=RULE_BASED_MIN_CONFIDENCE,
+        default=None,
+        metavar="MIN_CONFIDENCE",
+        help=(
+            "Parse high-coherence tiles with deterministic text-layer rules first and "
+            "skip the API call when the result's confidence reaches MIN_CONFIDENCE "
+            f"(default {RULE_BASED_MIN_CONFIDENCE})."
+        ),
+    )
     parser.add_argument(
         "--use-json-schema",
         action=argparse.BooleanOptionalAction,
@@ -1233,6 +1712,27 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         default="Plan Reviewer Hybrid Extraction",
         help="X-Title header for OpenRouter request.",
     )
+    parser.add_argument(
+        "--image-codec",
+        choices=[codec.value for codec in ImageCodec],
+        default=None,
+        help=(
+            "Re-encode tile images with this codec before upload "
+            "(default: send the stored tile as-is; webp needs Pillow)."
+        ),
+    )
+    parser.add_argument(
+        "--jpeg-quality",
+        type=int,
+        default=85,
+        help="JPEG quality for --image-codec jpeg.",
+    )
+    parser.add_argument(
+        "--max-image-kb",
+        type=float,
+        default=None,
+        help="Per-tile upload size budget for --image-codec; larger tiles are re-encoded smaller.",
+    )
     return parser
 
 
@@ -1241,6 +1741,8 @@ def main() -> None:
     load_dotenv()
     parser = _build_arg_parser()
     args = parser.parse_args()
+    if args.image_codec and not codec_available(ImageCodec(args.image_codec)):
+        parser.error(f"--image-codec {args.image_codec} requires Pillow (pip install pillow)")
 
     out_path = args.out
     raw_out = args.raw_out or out_path.with_suffix(out_path.suffix + ".raw.txt")
@@ -1267,6 +1769,16 @@ def main() -> None:
         timeout_sec=args.timeout_sec,
         use_json_schema=args.use_json_schema,
         use_instructor=not args.no_instructor,
+        rule_based_min_confidence=args.rule_based,
+        image_encoding=(
+            ImageEncoding(
+                codec=ImageCodec(args.image_codec),
+                jpeg_quality=args.jpeg_quality,
+                max_bytes=int(args.max_image_kb * 1024) if args.max_image_kb else None,
+            )
+            if args.image_codec
+            else None
+        ),
     )
     _escalation = EscalationConfig(
         enabled=args.escalation,
@@ -1285,6 +1797,7 @@ def main() -> None:
         dry_run=args.dry_run,
         no_cache=args.no_cache,
         prompt_output_path=args.prompt_out,
+        dedup_index=TileDedupIndex(args.dedup_dir) if args.dedup_dir else None,
     )
     raise SystemExit(exit_code)
 
@@ -0,0 +1,479 @@
+"""Asyncio extraction engine: hundreds of tiles in flight from one process.
+
+:func:`run_batch` gives each in-flight tile a thread, and each thread spends
+30-120 s blocked on a vision call.  :func:`run_batch_async` instead runs
+every tile as a task on one event loop, with OpenRouter calls made by
+:func:`acall_openrouter_vision` on an :class:`httpx.AsyncClient`.  Like the
+threads' per-worker sessions (see :mod:`src.extraction.http_client`), each
+in-flight tile borrows a small client of its own from :class:`AsyncClientLanes`:
+one client shared by hundreds of requests spends most of its time scanning
+its connection pool.  The per-tile work is the same coroutine that backs
+:func:`~src.extraction.run_hybrid.run_hybrid_extraction`, so output files,
+meta and ``batch_summary.json`` match the thread-pool engine.  Anthropic
+calls still use the blocking SDK; they run on an executor owned by the lanes
+and sized to ``max_concurrency``, so they are not capped by the loop's
+default executor, and a streamed pair source is read on a thread of its own.
+
+The first SIGINT stops taking new tiles and lets in-flight tiles finish; a
+second one cancels them.  Either way the summary covers the tiles that
+finished and is marked ``interrupted``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import signal
+import threading
+import time
+from collections.abc import Callable, Container, Coroutine, Hashable, Iterable, Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+from ..config import ASYNC_EXTRACTION_CONCURRENCY
+from . import run_hybrid as _run_hybrid
+from .baseline import BaselineIndex
+from .config_models import EscalationConfig, ExtractionConfig
+from .extraction_cache import CachedExtraction, ExtractionCache
+from .http_client import HttpPoolSettings
+from .run_hybrid import (
+    _OPENROUTER_MAX_RETRIES,
+    _OPENROUTER_RETRYABLE_STATUSES,
+    _BLOCKING_CALLS,
+    _STRUCTURED_NONE,
+    DEFAULT_OPENROUTER_URL,
+    _retry_wait,
+    ProviderCalls,
+    _extract_tile,
+    _openrouter_content,
+    _openrouter_request,
+    _response_format_payload,
+    _structured_modes,
+)
+from .rate_limit import ProviderLimiter, acall_limited
+from .run_hybrid_batch import _BatchRun, _TileJob
+from .schemas import TileExtraction
+from .single_flight import SingleFlight
+
+try:
+    import httpx as _httpx_module
+except ImportError:  # pragma: no cover
+    _httpx_module = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+def _require_httpx() -> None:
+    if _httpx_module is None:
+        raise ImportError(
+            "The 'httpx' package is required for the asyncio extraction engine. "
+            "Install it with: pip install httpx"
+        )
+
+
+async def acall_openrouter_vision(
+    *,
+    client: Any,
+    api_key: str,
+    model: str,
+    prompt: str,
+    image_data_url: str,
+    referer: str,
+    title: str,
+    temperature: float,
+    max_tokens: int,
+    timeout_sec: int,
+    endpoint: str = DEFAULT_OPENROUTER_URL,
+    use_structured_output: bool = True,
+    use_json_schema: bool = True,
+    connect_timeout_sec: float | None = None,
+    limiter: ProviderLimiter | None = None,
+) -> tuple[str, dict[str, Any]]:
+    """Awaitable :func:`~src.extraction.run_hybrid.call_openrouter_vision` on an ``httpx.AsyncClient``.
+
+    Same payloads, response-format fallback, retry policy and *limiter*
+    permits; waits between retries do not block the event loop.
+    """
+    httpx = _httpx_module
+    headers, base_payload = _openrouter_request(
+        api_key=api_key,
+        model=model,
+        prompt=prompt,
+        image_data_url=image_data_url,
+        referer=referer,
+        title=title,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+    timeout = httpx.Timeout(timeout_sec, connect=connect_timeout_sec)
+    structured_modes = _structured_modes(use_structured_output, use_json_schema)
+    last_response = None
+
+    for mode_idx, structured_mode in enumerate(structured_modes):
+        payload = {**base_payload, **_response_format_payload(structured_mode)}
+        can_fall_back = structured_mode != _STRUCTURED_NONE and mode_idx < len(structured_modes) - 1
+
+        for attempt in range(_OPENROUTER_MAX_RETRIES):
+            wait = 3**attempt
+            try:
+                last_response = await acall_limited(
+                    limiter, client.post, endpoint, headers=headers, json=payload, timeout=timeout
+                )
+            except httpx.TransportError as exc:
+                if attempt < _OPENROUTER_MAX_RETRIES - 1:
+                    logger.warning(
+                        "%s on attempt %s/%s. Waiting %ss.",
+                        exc.__class__.__name__,
+                        attempt + 1,
+                        _OPENROUTER_MAX_RETRIES,
+                        wait,
+                    )
+                    await asyncio.sleep(wait)
+                    continue
+                raise
+
+            if last_response.status_code == 400 and can_fall_back:
+                logger.warning(
+                    "Structured output mode '%s' rejected for %s; retrying with '%s'.",
+                    structured_mode,
+                    model,
+                    structured_modes[mode_idx + 1],
+                )
+                break
+            if (
+                last_response.status_code in _OPENROUTER_RETRYABLE_STATUSES
+                and attempt < _OPENROUTER_MAX_RETRIES - 1
+            ):
+                wait = _retry_wait(last_response.status_code, attempt, limiter)
+                logger.warning(
+                    "Retryable status %s on attempt %s/%s. Waiting %s.",
+                    last_response.status_code,
+                    attempt + 1,
+                    _OPENROUTER_MAX_RETRIES,
+                    f"{wait}s" if wait else "for the shared rate limiter",
+                )
+                await asyncio.sleep(wait)
+                continue
+
+            last_response.raise_for_status()
+            response_json = last_response.json()
+            response_json["_response_format_type"] = structured_mode
+            return _openrouter_content(response_json), response_json
+
+    if last_response is None:
+        raise RuntimeError("OpenRouter request did not produce a response.")
+    last_response.raise_for_status()
+    response_json = last_response.json()
+    response_json.setdefault("_response_format_type", _STRUCTURED_NONE)
+    return _openrouter_content(response_json), response_json
+
+
+class AsyncProviderCalls(ProviderCalls):
+    """Provider calls that yield to the event loop while waiting on the network."""
+
+    def __init__(self, client: Any, executor: Executor | None = None) -> None:
+        self.client = client
+        # Runs the blocking Anthropic SDK calls and extraction cache I/O;
+        # ``None`` is the loop's default executor.
+        self.executor = executor
+
+    async def _in_executor(self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def shared(
+        self,
+        flights: SingleFlight | None,
+        key: Hashable,
+        call: Callable[[], Coroutine[Any, Any, _T]],
+    ) -> tuple[_T, bool]:
+        if flights is None:
+            return await call(), False
+        return await flights.arun(key, call)
+
+    async def openrouter(
+        self,
+        http_settings: HttpPoolSettings,
+        *,
+        limiter: ProviderLimiter | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, dict[str, Any]]:
+        return await acall_openrouter_vision(
+            client=self.client,
+            connect_timeout_sec=http_settings.connect_timeout_sec,
+            limiter=limiter,
+            **kwargs,
+        )
+
+    async def anthropic(self, *, limiter: ProviderLimiter | None = None, **kwargs: Any) -> tuple[str, dict[str, Any]]:
+        return await acall_limited(limiter, self._in_executor, _run_hybrid.call_anthropic_vision, **kwargs)
+
+    async def anthropic_structured(
+        self,
+        *,
+        limiter: ProviderLimiter | None = None,
+        **kwargs: Any,
+    ) -> tuple[TileExtraction, dict[str, Any]]:
+        return await acall_limited(
+            limiter, self._in_executor, _run_hybrid.call_anthropic_vision_structured, **kwargs
+        )
+
+    async def cache_fetch(self, cache: ExtractionCache, key: str) -> CachedExtraction | None:
+        return await self._in_executor(cache.fetch, key)
+
+    async def cache_store(self, cache: ExtractionCache, key: str, **kwargs: Any) -> None:
+        await self._in_executor(cache.store, key, **kwargs)
+
+
+def async_http_client(config: ExtractionConfig, *, ssl_context: Any = None) -> Any:
+    """An ``httpx.AsyncClient`` with the pool size, keep-alive and timeouts of *config*."""
+    _require_httpx()
+    httpx = _httpx_module
+    settings = HttpPoolSettings.from_config(config)
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.pool_size,
+            max_keepalive_connections=settings.pool_size if settings.keep_alive else 0,
+        ),
+        timeout=httpx.Timeout(settings.read_timeout_sec, connect=settings.connect_timeout_sec, pool=None),
+        verify=ssl_context if ssl_context is not None else True,
+    )
+
+
+class AsyncClientLanes:
+    """Async HTTP clients lent to in-flight tiles, one tile per client at a time.
+
+    Clients are created on demand and kept for the next tile, so the number
+    of clients (and keep-alive connections) follows peak concurrency.  They
+    share one SSL context and one executor of ``max_workers`` threads for
+    blocking SDK calls.
+    """
+
+    def __init__(self, config: ExtractionConfig, max_workers: int = ASYNC_EXTRACTION_CONCURRENCY) -> None:
+        _require_httpx()
+        self.config = config
+        self._ssl_context = _httpx_module.create_ssl_context()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="provider-call")
+        self._clients: list[Any] = []
+        self._idle: list[AsyncProviderCalls] = []
+
+    def acquire(self) -> AsyncProviderCalls:
+        if self._idle:
+            return self._idle.pop()
+        client = async_http_client(self.config, ssl_context=self._ssl_context)
+        self._clients.append(client)
+        return AsyncProviderCalls(client, self._executor)
+
+    def release(self, calls: AsyncProviderCalls) -> None:
+        self._idle.append(calls)
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(client.aclose() for client in self._clients))
+        self._clients.clear()
+        self._idle.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_hybrid_extraction_async(*, calls: ProviderCalls, **kwargs: Any) -> int:
+    """Awaitable :func:`~src.extraction.run_hybrid.run_hybrid_extraction`.
+
+    Takes the same keyword arguments, plus the *calls* that reach the provider
+    (usually :class:`AsyncProviderCalls`).
+    """
+    return await _extract_tile(calls=calls, **kwargs)
+
+
+async def run_batch_async(
+    *,
+    tiles_dir: Path,
+    text_layers_dir: Path,
+    out_dir: Path,
+    tile_globs: list[str],
+    max_tiles: int | None,
+    config: ExtractionConfig,
+    escalation: EscalationConfig,
+    allow_low_coherence: bool,
+    dry_run: bool,
+    no_cache: bool,
+    prompt_dir: Path | None,
+    fail_fast: bool,
+    summary_out: Path,
+    max_concurrency: int = ASYNC_EXTRACTION_CONCURRENCY,
+    manifest_path: Path | None = None,
+    model_fast: str | None = None,
+    model_standard: str | None = None,
+    model_premium: str | None = None,
+    pair_source: Iterable[tuple[Path, Path]] | None = None,
+    empty_tile_ids: Container[str] | None = None,
+    dedup_dir: Path | None = None,
+    baseline: BaselineIndex | None = None,
+    tile_costs: Mapping[str, float] | None = None,
+    extraction_cache: ExtractionCache | None = None,
+    calls: ProviderCalls | None = None,
+    handle_signals: bool = True,
+) -> int:
+    """Asyncio counterpart of :func:`~src.extraction.run_hybrid_batch.run_batch`.
+
+    Takes the same arguments and writes the same files and summary.  Up to
+    ``max_concurrency`` tiles are in flight at once.  Each borrows provider
+    calls from :class:`AsyncClientLanes` unless ``calls`` is given, in which
+    case every tile uses it.
+    A streamed ``pair_source`` is read on a thread of its own so the loop
+    keeps serving in-flight tiles while the tiler works.
+
+    With ``handle_signals`` (and when running on the main thread), SIGINT
+    shuts the batch down gracefully; see the module docstring.  Cancelling
+    the task running this coroutine cancels every in-flight tile and writes
+    no summary.  On fail-fast the remaining in-flight tiles are cancelled.
+    """
+    run = _BatchRun(
+        tiles_dir=tiles_dir,
+        text_layers_dir=text_layers_dir,
+        out_dir=out_dir,
+        tile_globs=tile_globs,
+        max_tiles=max_tiles,
+        config=config,
+        escalation=escalation,
+        allow_low_coherence=allow_low_coherence,
+        dry_run=dry_run,
+        no_cache=no_cache,
+        prompt_dir=prompt_dir,
+        fail_fast=fail_fast,
+        summary_out=summary_out,
+        manifest_path=manifest_path,
+        model_fast=model_fast,
+        model_standard=model_standard,
+        model_premium=model_premium,
+        pair_source=pair_source,
+        empty_tile_ids=empty_tile_ids,
+        dedup_dir=dedup_dir,
+        baseline=baseline,
+        tile_costs=tile_costs,
+        extraction_cache=extraction_cache,
+    )
+    run.log_start(max_concurrency)
+    limit = max(1, int(max_concurrency or 1))
+    lanes = AsyncClientLanes(config, max_workers=limit) if calls is None and not dry_run else None
+
+    in_flight: dict[asyncio.Task[tuple[dict[str, Any], dict[str, int]]], tuple[int, str]] = {}
+    stopping = asyncio.Event()
+    cancelled = 0
+
+    def _on_sigint() -> None:
+        if not stopping.is_set():
+            logger.warning(
+                "Interrupted: finishing %s in-flight tiles; interrupt again to cancel them.",
+                len(in_flight),
+            )
+            stopping.set()
+            return
+        logger.warning("Interrupted again: cancelling %s in-flight tiles.", len(in_flight))
+        for task in in_flight:
+            task.cancel()
+
+    async def _process_one(
+        idx: int,
+        tile_path: Path,
+        text_layer_path: Path,
+    ) -> tuple[dict[str, Any], dict[str, int]]:
+        job = run.prepare(idx, tile_path, text_layer_path)
+        if not isinstance(job, _TileJob):
+            return job
+        lane = lanes.acquire() if lanes is not None else None
+        try:
+            exit_code = await run_hybrid_extraction_async(
+                calls=lane or calls or _BLOCKING_CALLS, **job.extraction_kwargs
+            )
+        except Exception as exc:
+            return job.failed(exc)
+        finally:
+            if lane is not None:
+                lanes.release(lane)
+        return job.finished(exit_code)
+
+    async def _collect() -> bool:
+        """Record the next finished tiles; return ``True`` when fail-fast should stop."""
+        nonlocal cancelled
+        done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        stop = False
+        for task in done:
+            idx, tile_stem = in_flight.pop(task)
+            if task.cancelled():
+                cancelled += 1
+                continue
+            exc = task.exception()
+            if exc is not None:
+                stop = run.record_worker_error(idx, tile_stem, exc) or stop
+                continue
+            result_row, local_counts = task.result()
+            if run.record(result_row, local_counts):
+                logger.error("Stopping early due to fail-fast after tile %s.", result_row.get("tile_stem"))
+                stop = True
+        return stop
+
+    pairs = run.iter_pairs(heaviest_first=True)
+    loop = asyncio.get_running_loop()
+    # A thread of its own, so waiting on the tiler never queues behind
+    # blocking calls on a shared executor.
+    pair_reader = (
+        ThreadPoolExecutor(max_workers=1, thread_name_prefix="pair-source") if pair_source is not None else None
+    )
+
+    async def _next_pair() -> tuple[Path, Path] | None:
+        if pair_reader is None:
+            return next(pairs, None)
+        return await loop.run_in_executor(pair_reader, next, pairs, None)
+
+    signals_installed = False
+    if handle_signals and threading.current_thread() is threading.main_thread():
+        try:
+            loop.add_signal_handler(signal.SIGINT, _on_sigint)
+            signals_installed = True
+        except (NotImplementedError, RuntimeError):  # pragma: no cover - e.g. Windows
+            pass
+
+    logger.info("Running batch on the asyncio engine (max_concurrency=%s)", limit)
+    started = time.perf_counter()
+    try:
+        stop = False
+        idx = 0
+        while not stop and not stopping.is_set():
+            while len(in_flight) >= limit and not stop:
+                stop = await _collect()
+            if stop or stopping.is_set():
+                break
+            pair = await _next_pair()
+            if pair is None:
+                break
+            idx += 1
+            tile_path, text_layer_path = pair
+            task = asyncio.create_task(_process_one(idx, tile_path, text_layer_path))
+            in_flight[task] = (idx, tile_path.stem)
+        if stop:
+            for task in in_flight:
+                task.cancel()
+        while in_flight:
+            stop = await _collect() or stop
+            if stop:
+                for task in in_flight:
+                    task.cancel()
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        if signals_installed:
+            loop.remove_signal_handler(signal.SIGINT)
+        if lanes is not None:
+            await lanes.aclose()
+        if pair_reader is not None:
+            pair_reader.shutdown(wait=False, cancel_futures=True)
+
+    if cancelled:
+        logger.warning("%s in-flight tiles were cancelled and are not in the summary.", cancelled)
+    logger.info("Asyncio engine finished %s tiles in %.1fs", len(run.processed), time.perf_counter() - started)
+    return run.finish(max_concurrency=limit, interrupted=stopping.is_set())
@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import base64
 import json
 import logging
 import os
 import re
+import threading
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Container, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, replace
 from datetime import datetime, UTC
 from pathlib import Path
 from typing import Any
@@ -18,7 +22,17 @@ from typing import Any
 from dotenv import load_dotenv
 from pydantic import ValidationError
 
+from ..utils.image_codec import (
+    TILE_IMAGE_GLOBS,
+    ImageCodec,
+    ImageEncoding,
+    codec_available,
+    image_media_type,
+    transcode_image,
+)
+from ..intake.page_cost import lpt_order, tile_costs_from_index
 from ..utils.io_json import write_json_atomic
+from ..utils.text_layer_pack import find_pack_members, load_text_layer
 from .package_contract import CONTRACT_VERSION, build_analysis_package_from_summary, page_number_from_tile_id
 from .prompts import build_hybrid_prompt_split
 from .config_models import (
@@ -37,10 +51,19 @@ from .run_hybrid import (
     run_hybrid_extraction,
 )
 from ..config import (
+    ASYNC_EXTRACTION_CONCURRENCY,
     DEFAULT_ESCALATION_MODEL,
     ESCALATION_COHERENCE_THRESHOLD as DEFAULT_ESCALATION_COHERENCE_THRESHOLD,
+    EXTRACTION_CACHE_MAX_BYTES,
+    RULE_BASED_MIN_CONFIDENCE,
 )
+from .baseline import BaselineIndex
+from .extraction_cache import ExtractionCache
+from .http_client import close_thread_clients
+from .rate_limit import rate_limit_checkpoint, rate_limit_report
 from .schemas import TileExtraction
+from .single_flight import SingleFlight
+from .tile_dedup import TileDedupIndex
 
 try:
     import anthropic as _anthropic_module
@@ -72,9 +95,12 @@ def _find_pairs(
 
     pairs: list[tuple[Path, Path]] = []
     missing_text_layers: list[dict[str, Any]] = []
+    pack_members = find_pack_members(text_layers_dir) if text_layers_dir.is_dir() else {}
     for tile_path in tiles:
         text_layer_path = text_layers_dir / f"{tile_path.stem}.json"
-        if not text_layer_path.exists():
+        if not text_layer_path.exists() and tile_path.stem in pack_members:
+            text_layer_path = pack_members[tile_path.stem]
+        elif not text_layer_path.exists():
             missing_text_layers.append(
                 {
                     "tile_stem": tile_path.stem,
@@ -102,284 +128,710 @@ def _build_page_to_model_tier(manifest_path: Path) -> dict[int, str]:
     return mapping
 
 
-def run_batch(
+def _load_empty_tile_ids(tiles_index_path: Path | None) -> set[str]:
+    """Tile ids marked ``skipped_empty`` in a ``tiles_index.json`` (empty if absent)."""
+    if tiles_index_path is None or not tiles_index_path.exists():
+        return set()
+    with tiles_index_path.open("r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return {
+        str(tile.get("tile_id"))
+        for tiles in payload.get("pages", {}).values()
+        for tile in tiles
+        if tile.get("status") == "skipped_empty"
+    }
+
+
+def _record_skipped_empty(
     *,
-    tiles_dir: Path,
-    text_layers_dir: Path,
+    tile_path: Path,
+    text_layer_path: Path,
     out_dir: Path,
-    tile_globs: list[str],
-    max_tiles: int | None,
-    config: ExtractionConfig,
-    escalation: EscalationConfig,
-    allow_low_coherence: bool,
-    dry_run: bool,
-    no_cache: bool,
-    prompt_dir: Path | None,
-    fail_fast: bool,
-    summary_out: Path,
-    max_concurrency: int = 1,
-    manifest_path: Path | None = None,
-    model_fast: str | None = None,
-    model_standard: str | None = None,
-    model_premium: str | None = None,
-) -> int:
-    # Unpack config for local access.
-    model = config.model
-    api_key = config.api_key
-    provider = config.provider
-    referer = config.referer
-    title = config.title
-    temperature = config.temperature
-    max_tokens = config.max_tokens
-    timeout_sec = config.timeout_sec
-    use_json_schema = config.use_json_schema
-    escalation_model = escalation.model
-    escalation_coherence_threshold = escalation.coherence_threshold
-    escalation_enabled = escalation.enabled
-
-    # Build page -> model_tier lookup when a manifest is provided.
-    page_to_model_tier: dict[int, str] = {}
-    if manifest_path is not None:
-        page_to_model_tier = _build_page_to_model_tier(manifest_path)
-        logger.info(
-            "Loaded manifest model tiers for %s pages from %s",
-            len(page_to_model_tier),
-            manifest_path,
-        )
-
-    # Resolve tier -> model mapping.  Falls back to the base model for any
-    # tier whose override was not explicitly supplied.
-    tier_to_model: dict[str, str] = {
-        "fast": model_fast or model,
-        "standard": model_standard or model,
-        "premium": model_premium or model,
+    model: str,
+) -> dict[str, Any]:
+    """Write the meta file for a tile intake marked empty and return its result row."""
+    stem = tile_path.stem
+    meta_out_path = out_dir / f"{stem}.json.meta.json"
+    meta_payload = {
+        "status": "skipped_empty",
+        "tile_id": stem,
+        "page_number": page_number_from_tile_id(stem),
+        "model": model,
+    }
+    meta_out_path.parent.mkdir(parents=True, exist_ok=True)
+    with meta_out_path.open("w", encoding="utf-8") as f:
+        json.dump(meta_payload, f, indent=2, ensure_ascii=False)
+    logger.info("Skipping tile %s: marked empty at intake.", stem)
+    return {
+        "tile_stem": stem,
+        "tile_path": str(tile_path),
+        "text_layer_path": str(text_layer_path),
+        "out_path": str(out_dir / f"{stem}.json"),
+        "meta_path": str(meta_out_path),
+        "raw_out_path": str(out_dir / f"{stem}.json.raw.txt"),
+        "status": "skipped_empty",
+        "exit_code": 0,
+        "meta": meta_payload,
     }
 
-    pairs, missing_items = _find_pairs(
-        tiles_dir=tiles_dir,
-        text_layers_dir=text_layers_dir,
-        tile_globs=tile_globs,
-        max_tiles=max_tiles,
+
+def _record_carried_forward(
+    *,
+    tile_path: Path,
+    text_layer_path: Path,
+    out_dir: Path,
+    baseline: BaselineIndex,
+    model: str,
+) -> dict[str, Any] | None:
+    """Write a baseline extraction carried onto this tile; ``None`` if it must be extracted."""
+    stem = tile_path.stem
+    text_layer = load_text_layer(text_layer_path)
+    page_number = _coerce_int(text_layer.get("page_number")) or page_number_from_tile_id(stem) or 0
+    carried = baseline.lookup(
+        tile_id=stem,
+        page_number=page_number,
+        image_bytes=tile_path.read_bytes(),
+        text_layer=text_layer,
+        model=model,
     )
+    if carried is None:
+        return None
+    try:
+        extraction = TileExtraction.model_validate(carried.extraction)
+    except ValidationError as exc:
+        logger.warning("Baseline extraction for %s no longer validates: %s", stem, exc)
+        return None
 
-    out_dir.mkdir(parents=True, exist_ok=True)
-    summary_out.parent.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"{stem}.json"
+    meta_out_path = out_dir / f"{stem}.json.meta.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8") as f:
+        json.dump(extraction.model_dump(), f, indent=2, ensure_ascii=False)
+    meta_payload = {
+        "status": "ok",
+        "tile_id": stem,
+        "page_number": page_number,
+        "coherence_score": float(text_layer.get("coherence_score", 0.0)),
+        "model": carried.model,
+        "text_items_count": len(text_layer.get("items", [])),
+        "structures_count": len(extraction.structures),
+        "pipes_count": len(extraction.pipes),
+        "callouts_count": len(extraction.callouts),
+        "usage": {},
+        "sanitized": False,
+        "cache_hit": False,
+        "carried_forward": {
+            "baseline_run": str(baseline.run_dir),
+            "source_tile_id": carried.source_tile_id,
+            "source_page_number": carried.source_page_number,
+            "image_distance": carried.image_distance,
+        },
+    }
+    with meta_out_path.open("w", encoding="utf-8") as f:
+        json.dump(meta_payload, f, indent=2, ensure_ascii=False)
+    logger.info(
+        "Carried %s forward from baseline tile %s. Skipping API call.",
+        stem,
+        carried.source_tile_id,
+    )
+    return {
+        "tile_stem": stem,
+        "tile_path": str(tile_path),
+        "text_layer_path": str(text_layer_path),
+        "out_path": str(out_path),
+        "meta_path": str(meta_out_path),
+        "raw_out_path": str(out_dir / f"{stem}.json.raw.txt"),
+        "status": "ok",
+        "exit_code": 0,
+        "meta": meta_payload,
+    }
 
-    if not pairs:
-        logger.warning("No tile/text-layer pairs found.")
 
-    started_at = datetime.now(UTC).isoformat()
-    run_id = str(uuid.uuid4())
-    results: list[dict[str, Any]] = []
-    results.extend(missing_items)
+_COUNT_KEYS = (
+    "ok",
+    "dry_run",
+    "skipped_low_coherence",
+    "skipped_empty",
+    "validation_error",
+    "runtime_error",
+)
 
-    ok_count = 0
-    dry_run_count = 0
-    skipped_count = 0
-    validation_error_count = 0
-    runtime_error_count = 0
 
-    total_pairs = len(pairs)
-    if total_pairs:
-        logger.info(
-            "Starting batch: %s tile/text-layer pairs (max_concurrency=%s, fail_fast=%s)",
-            total_pairs,
-            max(1, int(max_concurrency or 1)),
-            fail_fast,
+def _new_counts() -> dict[str, int]:
+    return dict.fromkeys(_COUNT_KEYS, 0)
+
+
+@dataclass
+class _TileJob:
+    """One tile that needs :func:`run_hybrid_extraction`, and how to report it."""
+
+    tile_path: Path
+    text_layer_path: Path
+    out_path: Path
+    raw_out_path: Path
+    meta_out_path: Path
+    model: str
+    model_tier: str
+    extraction_kwargs: dict[str, Any]
+
+    @property
+    def stem(self) -> str:
+        return self.tile_path.stem
+
+    def finished(self, exit_code: int) -> tuple[dict[str, Any], dict[str, int]]:
+        """Result row and counts for an extraction that returned *exit_code*."""
+        local_counts = _new_counts()
+        meta_payload: dict[str, Any] = {}
+        if self.meta_out_path.exists():
+            try:
+                with self.meta_out_path.open("r", encoding="utf-8") as f:
+                    meta_payload = json.load(f)
+            except Exception:
+                meta_payload = {}
+
+        status = str(meta_payload.get("status", "unknown"))
+        if status == "ok":
+            local_counts["ok"] += 1
+        elif status == "dry_run":
+            local_counts["dry_run"] += 1
+        elif status == "skipped_low_coherence":
+            local_counts["skipped_low_coherence"] += 1
+        elif status == "validation_error" or exit_code == 2:
+            local_counts["validation_error"] += 1
+        else:
+            if exit_code != 0:
+                local_counts["runtime_error"] += 1
+
+        result_row: dict[str, Any] = {
+            "tile_stem": self.stem,
+            "tile_path": str(self.tile_path),
+            "text_layer_path": str(self.text_layer_path),
+            "out_path": str(self.out_path),
+            "meta_path": str(self.meta_out_path),
+            "raw_out_path": str(self.raw_out_path),
+            "status": status,
+            "exit_code": exit_code,
+            "model_tier": self.model_tier,
+            "model_used": self.model,
+        }
+        if meta_payload:
+            result_row["meta"] = meta_payload
+        return result_row, local_counts
+
+    def failed(self, exc: BaseException) -> tuple[dict[str, Any], dict[str, int]]:
+        """Result row and counts for an extraction that raised *exc*."""
+        logger.error("Runtime error while processing %s", self.stem, exc_info=exc)
+        local_counts = _new_counts()
+        local_counts["runtime_error"] += 1
+        result_row = {
+            "tile_stem": self.stem,
+            "tile_path": str(self.tile_path),
+            "text_layer_path": str(self.text_layer_path),
+            "status": "runtime_error",
+            "error": str(exc),
+            "model_tier": self.model_tier,
+            "model_used": self.model,
+        }
+        return result_row, local_counts
+
+
+class _BatchRun:
+    """Setup, per-tile bookkeeping and summary shared by the batch engines.
+
+    :func:`run_batch` drives it from a thread pool and
+    :func:`~src.extraction.run_hybrid_async.run_batch_async` from an event
+    loop; both produce the same output files, meta and summary.
+    """
+
+    def __init__(
+        self,
+        *,
+        tiles_dir: Path,
+        text_layers_dir: Path,
+        out_dir: Path,
+        tile_globs: list[str],
+        max_tiles: int | None,
+        config: ExtractionConfig,
+        escalation: EscalationConfig,
+        allow_low_coherence: bool,
+        dry_run: bool,
+        no_cache: bool,
+        prompt_dir: Path | None,
+        fail_fast: bool,
+        summary_out: Path,
+        manifest_path: Path | None = None,
+        model_fast: str | None = None,
+        model_standard: str | None = None,
+        model_premium: str | None = None,
+        pair_source: Iterable[tuple[Path, Path]] | None = None,
+        empty_tile_ids: Container[str] | None = None,
+        dedup_dir: Path | None = None,
+        baseline: BaselineIndex | None = None,
+        tile_costs: Mapping[str, float] | None = None,
+        extraction_cache: ExtractionCache | None = None,
+    ) -> None:
+        if pair_source is not None and max_tiles is not None:
+            raise ValueError("max_tiles is not supported with pair_source.")
+
+        self.tiles_dir = tiles_dir
+        self.text_layers_dir = text_layers_dir
+        self.out_dir = out_dir
+        self.tile_globs = tile_globs
+        self.max_tiles = max_tiles
+        self.config = config
+        self.escalation = escalation
+        self.allow_low_coherence = allow_low_coherence
+        self.dry_run = dry_run
+        self.no_cache = no_cache
+        self.prompt_dir = prompt_dir
+        self.fail_fast = fail_fast
+        self.summary_out = summary_out
+        self.manifest_path = manifest_path
+        self.pair_source = pair_source
+        self.empty_tile_ids = empty_tile_ids
+        self.baseline = baseline
+        self.tile_costs = tile_costs
+
+        # Build page -> model_tier lookup when a manifest is provided.
+        self.page_to_model_tier: dict[int, str] = {}
+        if manifest_path is not None:
+            self.page_to_model_tier = _build_page_to_model_tier(manifest_path)
+            logger.info(
+                "Loaded manifest model tiers for %s pages from %s",
+                len(self.page_to_model_tier),
+                manifest_path,
+            )
+
+        # Resolve tier -> model mapping.  Falls back to the base model for any
+        # tier whose override was not explicitly supplied.
+        model = config.model
+        self.tier_to_model: dict[str, str] = {
+            "fast": model_fast or model,
+            "standard": model_standard or model,
+            "premium": model_premium or model,
+        }
+
+        self.pairs: list[tuple[Path, Path]]
+        self.missing_items: list[dict[str, Any]]
+        if pair_source is None:
+            self.pairs, self.missing_items = _find_pairs(
+                tiles_dir=tiles_dir,
+                text_layers_dir=text_layers_dir,
+                tile_globs=tile_globs,
+                max_tiles=max_tiles,
+            )
+            if not self.pairs:
+                logger.warning("No tile/text-layer pairs found.")
+        else:
+            self.pairs, self.missing_items = [], []
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        summary_out.parent.mkdir(parents=True, exist_ok=True)
+        self.dedup_index = TileDedupIndex(dedup_dir) if dedup_dir is not None else None
+        self.extraction_cache = extraction_cache
+        self.single_flight = SingleFlight()
+
+        self.started_at = datetime.now(UTC).isoformat()
+        self.run_id = str(uuid.uuid4())
+        self.rate_limit_mark = rate_limit_checkpoint()
+        self.processed: list[dict[str, Any]] = []
+        self.counts = _new_counts()
+        self.total_pairs: int | str = len(self.pairs) if pair_source is None else "?"
+
+    def log_start(self, max_concurrency: int) -> None:
+        if self.pair_source is not None:
+            logger.info(
+                "Starting streaming batch (max_concurrency=%s, fail_fast=%s)",
+                max(1, int(max_concurrency or 1)),
+                self.fail_fast,
+            )
+        elif self.pairs:
+            logger.info(
+                "Starting batch: %s tile/text-layer pairs (max_concurrency=%s, fail_fast=%s)",
+                self.total_pairs,
+                max(1, int(max_concurrency or 1)),
+                self.fail_fast,
+            )
+
+    def iter_pairs(self, *, heaviest_first: bool = False) -> Iterator[tuple[Path, Path]]:
+        if self.pair_source is None:
+            tile_costs = self.tile_costs
+            if heaviest_first and tile_costs:
+                yield from lpt_order(self.pairs, lambda pair: tile_costs.get(pair[0].stem, 0.0))
+            else:
+                yield from self.pairs
+            return
+        for pair in self.pair_source:
+            self.pairs.append(pair)
+            yield pair
+
+    def record(self, result_row: dict[str, Any], local_counts: dict[str, int]) -> bool:
+        """Accumulate one result; return ``True`` when fail-fast should stop."""
+        for key, value in local_counts.items():
+            self.counts[key] += value
+        self.processed.append(result_row)
+        return self.fail_fast and (
+            local_counts["validation_error"] > 0 or local_counts["runtime_error"] > 0
+        )
+
+    def record_worker_error(self, idx: int, tile_stem: str, exc: BaseException) -> bool:
+        """Record an exception that escaped a worker; return ``True`` when fail-fast should stop."""
+        logger.error("Unhandled error in worker for index %s: %s", idx, exc, exc_info=exc)
+        self.counts["runtime_error"] += 1
+        self.processed.append(
+            {
+                "tile_stem": tile_stem,
+                "status": "runtime_error",
+                "error": str(exc),
+            }
         )
+        if self.fail_fast:
+            logger.error("Stopping early due to fail-fast after worker exception.")
+        return self.fail_fast
 
-    def _resolve_tile_model(tile_stem: str) -> tuple[str, str]:
+    def resolve_tile_model(self, tile_stem: str) -> tuple[str, str]:
         """Return (resolved_model, model_tier) for the given tile stem."""
-        if not page_to_model_tier:
+        model = self.config.model
+        if not self.page_to_model_tier:
             return model, "standard"
         page_num = page_number_from_tile_id(tile_stem)
         if page_num is None:
             return model, "standard"
-        tier = page_to_model_tier.get(page_num, "standard")
-        return tier_to_model.get(tier, model), tier
+        tier = self.page_to_model_tier.get(page_num, "standard")
+        return self.tier_to_model.get(tier, model), tier
 
-    def _process_one(
+    def prepare(
+        self,
         idx: int,
         tile_path: Path,
         text_layer_path: Path,
-    ) -> tuple[dict[str, Any], dict[str, int]]:
+    ) -> _TileJob | tuple[dict[str, Any], dict[str, int]]:
+        """The extraction job for one tile, or its finished result when none is needed."""
         stem = tile_path.stem
+        out_dir = self.out_dir
         out_path = out_dir / f"{stem}.json"
         raw_out_path = out_dir / f"{stem}.json.raw.txt"
         meta_out_path = out_dir / f"{stem}.json.meta.json"
-        prompt_out_path = (prompt_dir / f"{stem}.prompt.txt") if prompt_dir else None
+        prompt_out_path = (self.prompt_dir / f"{stem}.prompt.txt") if self.prompt_dir else None
 
-        tile_model, model_tier = _resolve_tile_model(stem)
+        tile_model, model_tier = self.resolve_tile_model(stem)
         logger.info(
             "(%s/%s) Processing %s  [tier=%s model=%s]",
             idx,
-            total_pairs,
+            self.total_pairs,
             stem,
             model_tier,
             tile_model,
         )
 
-        local_counts = {
-            "ok": 0,
-            "dry_run": 0,
-            "skipped_low_coherence": 0,
-            "validation_error": 0,
-            "runtime_error": 0,
-        }
-
-        try:
-            from dataclasses import replace as _dc_replace
-            exit_code = run_hybrid_extraction(
+        local_counts = _new_counts()
+        if self.empty_tile_ids is not None and stem in self.empty_tile_ids:
+            local_counts["skipped_empty"] += 1
+            result_row = _record_skipped_empty(
                 tile_path=tile_path,
                 text_layer_path=text_layer_path,
-                output_path=out_path,
-                raw_output_path=raw_out_path,
-                meta_output_path=meta_out_path,
-                config=_dc_replace(config, model=tile_model),
-                escalation=escalation,
-                allow_low_coherence=allow_low_coherence,
-                dry_run=dry_run,
-                no_cache=no_cache,
-                prompt_output_path=prompt_out_path,
+                out_dir=out_dir,
+                model=tile_model,
             )
+            result_row.update({"model_tier": model_tier, "model_used": tile_model})
+            return result_row, local_counts
 
-            meta_payload: dict[str, Any] = {}
-            if meta_out_path.exists():
-                try:
-                    with meta_out_path.open("r", encoding="utf-8") as f:
-                        meta_payload = json.load(f)
-                except Exception:
-                    meta_payload = {}
-
-            status = str(meta_payload.get("status", "unknown"))
-            if status == "ok":
+        if self.baseline is not None:
+            try:
+                carried_row = _record_carried_forward(
+                    tile_path=tile_path,
+                    text_layer_path=text_layer_path,
+                    out_dir=out_dir,
+                    baseline=self.baseline,
+                    model=tile_model,
+                )
+            except Exception:
+                logger.warning("Baseline lookup failed for %s; extracting it.", stem, exc_info=True)
+                carried_row = None
+            if carried_row is not None:
                 local_counts["ok"] += 1
-            elif status == "dry_run":
-                local_counts["dry_run"] += 1
-            elif status == "skipped_low_coherence":
-                local_counts["skipped_low_coherence"] += 1
-            elif status == "validation_error" or exit_code == 2:
-                local_counts["validation_error"] += 1
-            else:
-                if exit_code != 0:
-                    local_counts["runtime_error"] += 1
+                carried_row.update({"model_tier": model_tier, "model_used": tile_model})
+                return carried_row, local_counts
+
+        return _TileJob(
+            tile_path=tile_path,
+            text_layer_path=text_layer_path,
+            out_path=out_path,
+            raw_out_path=raw_out_path,
+            meta_out_path=meta_out_path,
+            model=tile_model,
+            model_tier=model_tier,
+            extraction_kwargs={
+                "tile_path": tile_path,
+                "text_layer_path": text_layer_path,
+                "output_path": out_path,
+                "raw_output_path": raw_out_path,
+                "meta_output_path": meta_out_path,
+                "config": replace(self.config, model=tile_model),
+                "escalation": self.escalation,
+                "allow_low_coherence": self.allow_low_coherence,
+                "dry_run": self.dry_run,
+                "no_cache": self.no_cache,
+                "prompt_output_path": prompt_out_path,
+                "dedup_index": self.dedup_index,
+                "extraction_cache": self.extraction_cache,
+                "single_flight": self.single_flight,
+            },
+        )
 
-            result_row: dict[str, Any] = {
-                "tile_stem": stem,
-                "tile_path": str(tile_path),
-                "text_layer_path": str(text_layer_path),
-                "out_path": str(out_path),
-                "meta_path": str(meta_out_path),
-                "raw_out_path": str(raw_out_path),
-                "status": status,
-                "exit_code": exit_code,
-                "model_tier": model_tier,
-                "model_used": tile_model,
-            }
-            if meta_payload:
-                result_row["meta"] = meta_payload
-            return result_row, local_counts
+    def finish(self, *, max_concurrency: int, interrupted: bool = False) -> int:
+        """Order the results, write the summary and analysis package; return the exit code."""
+        # Order results by tile path regardless of completion or arrival order.
+        self.pairs.sort()
+        pair_order = {tile_path.stem: pos for pos, (tile_path, _) in enumerate(self.pairs)}
+        self.processed.sort(
+            key=lambda row: pair_order.get(str(row.get("tile_stem", "")), len(pair_order))
+        )
+        results: list[dict[str, Any]] = [*self.missing_items, *self.processed]
+        if self.extraction_cache is not None and not self.dry_run:
+            self.extraction_cache.evict()
+
+        completed_at = datetime.now(UTC).isoformat()
+        counts = self.counts
+        return _build_batch_summary(
+            run_id=self.run_id,
+            started_at=self.started_at,
+            completed_at=completed_at,
+            tiles_dir=self.tiles_dir,
+            text_layers_dir=self.text_layers_dir,
+            out_dir=self.out_dir,
+            tile_globs=self.tile_globs,
+            max_tiles=self.max_tiles,
+            model=self.config.model,
+            manifest_path=self.manifest_path,
+            tier_to_model=self.tier_to_model if self.page_to_model_tier else None,
+            escalation_model=self.escalation.model,
+            escalation_coherence_threshold=self.escalation.coherence_threshold,
+            escalation_enabled=self.escalation.enabled,
+            max_concurrency=max_concurrency,
+            dry_run=self.dry_run,
+            no_cache=self.no_cache,
+            use_json_schema=self.config.use_json_schema,
+            allow_low_coherence=self.allow_low_coherence,
+            provider=self.config.provider,
+            pairs=self.pairs,
+            missing_items=self.missing_items,
+            ok_count=counts["ok"],
+            dry_run_count=counts["dry_run"],
+            skipped_count=counts["skipped_low_coherence"],
+            skipped_empty_count=counts["skipped_empty"],
+            validation_error_count=counts["validation_error"],
+            runtime_error_count=counts["runtime_error"],
+            results=results,
+            summary_out=self.summary_out,
+            interrupted=interrupted,
+            rate_limits=rate_limit_report(self.rate_limit_mark),
+            single_flight=self.single_flight.snapshot(),
+        )
+
+
+def run_batch(
+    *,
+    tiles_dir: Path,
+    text_layers_dir: Path,
+    out_dir: Path,
+    tile_globs: list[str],
+    max_tiles: int | None,
+    config: ExtractionConfig,
+    escalation: EscalationConfig,
+    allow_low_coherence: bool,
+    dry_run: bool,
+    no_cache: bool,
+    prompt_dir: Path | None,
+    fail_fast: bool,
+    summary_out: Path,
+    max_concurrency: int = 1,
+    manifest_path: Path | None = None,
+    model_fast: str | None = None,
+    model_standard: str | None = None,
+    model_premium: str | None = None,
+    pair_source: Iterable[tuple[Path, Path]] | None = None,
+    empty_tile_ids: Container[str] | None = None,
+    dedup_dir: Path | None = None,
+    baseline: BaselineIndex | None = None,
+    tile_costs: Mapping[str, float] | None = None,
+    extraction_cache: ExtractionCache | None = None,
+) -> int:
+    """Run hybrid extraction over tile/text-layer pairs and write the summary.
+
+    Pairs are discovered from ``tiles_dir`` via ``tile_globs`` unless
+    ``pair_source`` is given, in which case pairs are consumed from it as they
+    arrive (streaming mode, e.g. straight from the tiler).  Either way,
+    ``results`` in the summary are ordered by tile path, so a streamed run
+    produces the same ``batch_summary.json`` as a phased one.
+
+    Tiles whose id is in ``empty_tile_ids`` (marked ``skipped_empty`` by the
+    tiler, see :func:`_load_empty_tile_ids`) get a meta file and a
+    ``skipped_empty`` result row without any model call.
+
+    ``dedup_dir`` enables the perceptual dedup index (see
+    :mod:`.tile_dedup`); it may be shared across runs and plan sets.
+    ``extraction_cache`` (see :mod:`.extraction_cache`) reuses extractions
+    with the same cache key from earlier runs and is trimmed to its size cap
+    when the batch finishes.
+
+    With a ``baseline`` (see :mod:`.baseline`) tiles unchanged since an
+    earlier run of the previous revision reuse that run's extraction under
+    their new tile id; their meta records ``carried_forward``.
+
+    ``tile_costs`` (tile id -> estimated cost, see
+    :func:`src.intake.page_cost.tile_costs_from_index`) makes the thread pool
+    take discovered tiles heaviest first; streamed pairs keep arrival order.
+
+    See :func:`~src.extraction.run_hybrid_async.run_batch_async` for the
+    asyncio engine, which takes the same arguments.
+    """
+    run = _BatchRun(
+        tiles_dir=tiles_dir,
+        text_layers_dir=text_layers_dir,
+        out_dir=out_dir,
+        tile_globs=tile_globs,
+        max_tiles=max_tiles,
+        config=config,
+        escalation=escalation,
+        allow_low_coherence=allow_low_coherence,
+        dry_run=dry_run,
+        no_cache=no_cache,
+        prompt_dir=prompt_dir,
+        fail_fast=fail_fast,
+        summary_out=summary_out,
+        manifest_path=manifest_path,
+        model_fast=model_fast,
+        model_standard=model_standard,
+        model_premium=model_premium,
+        pair_source=pair_source,
+        empty_tile_ids=empty_tile_ids,
+        dedup_dir=dedup_dir,
+        baseline=baseline,
+        tile_costs=tile_costs,
+        extraction_cache=extraction_cache,
+    )
+    run.log_start(max_concurrency)
+
+    def _process_one(
+        idx: int,
+        tile_path: Path,
+        text_layer_path: Path,
+    ) -> tuple[dict[str, Any], dict[str, int]]:
+        job = run.prepare(idx, tile_path, text_layer_path)
+        if not isinstance(job, _TileJob):
+            return job
+        try:
+            exit_code = run_hybrid_extraction(**job.extraction_kwargs)
         except Exception as exc:
-            logger.exception("Runtime error while processing %s", stem)
-            result_row = {
-                "tile_stem": stem,
-                "tile_path": str(tile_path),
-                "text_layer_path": str(text_layer_path),
-                "status": "runtime_error",
-                "error": str(exc),
-                "model_tier": model_tier,
-                "model_used": tile_model,
-            }
-            local_counts["runtime_error"] += 1
-            return result_row, local_counts
+            return job.failed(exc)
+        return job.finished(exit_code)
 
     if max_concurrency and max_concurrency > 1 and not dry_run:
-        # Concurrency is best-effort; fail_fast is honored once a failing
-        # result is observed, but in-flight tasks may still complete.
+        # Concurrency is best-effort; fail_fast stops new submissions once a
+        # failing result is observed, but in-flight tasks still complete.
+        # Submissions are bounded so a streaming source is pulled no faster
+        # than the workers drain it.
         workers = max(1, int(max_concurrency))
+        max_in_flight = workers * 2
         logger.info("Running batch with ThreadPoolExecutor (workers=%s)", workers)
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            future_to_idx = {
-                executor.submit(_process_one, idx, tile_path, text_layer_path): (idx, tile_path.stem)
-                for idx, (tile_path, text_layer_path) in enumerate(pairs, start=1)
-            }
-            for future in as_completed(future_to_idx):
-                idx, tile_stem = future_to_idx[future]
-                try:
-                    result_row, local_counts = future.result()
-                except Exception as exc:
-                    logger.exception("Unhandled error in worker for index %s: %s", idx, exc)
-                    runtime_error_count += 1
-                    results.append(
-                        {
-                            "tile_stem": tile_stem,
-                            "status": "runtime_error",
-                            "error": str(exc),
-                        }
-                    )
-                    if fail_fast:
-                        logger.error("Stopping early due to fail-fast after worker exception.")
-                        break
-                    continue
 
-                ok_count += local_counts["ok"]
-                dry_run_count += local_counts["dry_run"]
-                skipped_count += local_counts["skipped_low_coherence"]
-                validation_error_count += local_counts["validation_error"]
-                runtime_error_count += local_counts["runtime_error"]
-                results.append(result_row)
+        def _collect(future: Future[tuple[dict[str, Any], dict[str, int]]]) -> bool:
+            idx, tile_stem = in_flight.pop(future)
+            try:
+                result_row, local_counts = future.result()
+            except Exception as exc:
+                return run.record_worker_error(idx, tile_stem, exc)
+            if run.record(result_row, local_counts):
+                logger.error("Stopping early due to fail-fast after tile %s.", result_row.get("tile_stem"))
+                return True
+            return False
+
+        # Each worker keeps its own HTTP session and SDK clients (see
+        # src.extraction.http_client); they are closed on their own threads
+        # before the pool shuts down.  Cleanup tasks wait for each other, so
+        # every worker thread takes exactly one.
+        cleanup_barrier = threading.Barrier(workers)
+
+        def _close_worker_clients(_: int) -> int:
+            cleanup_barrier.wait()
+            return close_thread_clients()
 
-                if fail_fast and (
-                    local_counts["validation_error"] > 0 or local_counts["runtime_error"] > 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                in_flight: dict[Future[tuple[dict[str, Any], dict[str, int]]], tuple[int, str]] = {}
+                stop = False
+                for idx, (tile_path, text_layer_path) in enumerate(
+                    run.iter_pairs(heaviest_first=True), start=1
                 ):
-                    logger.error("Stopping early due to fail-fast after tile %s.", result_row.get("tile_stem"))
-                    break
+                    while len(in_flight) >= max_in_flight and not stop:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            stop = _collect(future) or stop
+                    if stop:
+                        break
+                    future = executor.submit(_process_one, idx, tile_path, text_layer_path)
+                    in_flight[future] = (idx, tile_path.stem)
+                if not stop:
+                    for future in as_completed(list(in_flight)):
+                        if _collect(future):
+                            break
+            finally:
+                list(executor.map(_close_worker_clients, range(workers)))
     else:
-        for idx, (tile_path, text_layer_path) in enumerate(pairs, start=1):
+        for idx, (tile_path, text_layer_path) in enumerate(run.iter_pairs(), start=1):
             result_row, local_counts = _process_one(idx, tile_path, text_layer_path)
-            ok_count += local_counts["ok"]
-            dry_run_count += local_counts["dry_run"]
-            skipped_count += local_counts["skipped_low_coherence"]
-            validation_error_count += local_counts["validation_error"]
-            runtime_error_count += local_counts["runtime_error"]
-            results.append(result_row)
-
-            if fail_fast and (local_counts["validation_error"] > 0 or local_counts["runtime_error"] > 0):
+            if run.record(result_row, local_counts):
                 logger.error("Stopping early due to fail-fast on %s.", result_row.get("tile_stem"))
                 break
 
-    completed_at = datetime.now(UTC).isoformat()
-    return _build_batch_summary(
-        run_id=run_id,
-        started_at=started_at,
-        completed_at=completed_at,
-        tiles_dir=tiles_dir,
-        text_layers_dir=text_layers_dir,
-        out_dir=out_dir,
-        tile_globs=tile_globs,
-        max_tiles=max_tiles,
-        model=model,
-        manifest_path=manifest_path,
-        tier_to_model=tier_to_model if page_to_model_tier else None,
-        escalation_model=escalation_model,
-        escalation_coherence_threshold=escalation_coherence_threshold,
-        escalation_enabled=escalation_enabled,
-        max_concurrency=max_concurrency,
-        dry_run=dry_run,
-        no_cache=no_cache,
-        use_json_schema=use_json_schema,
-        allow_low_coherence=allow_low_coherence,
-        provider=provider,
-        pairs=pairs,
-        missing_items=missing_items,
-        ok_count=ok_count,
-        dry_run_count=dry_run_count,
-        skipped_count=skipped_count,
-        validation_error_count=validation_error_count,
-        runtime_error_count=runtime_error_count,
-        results=results,
-        summary_out=summary_out,
-    )
+    return run.finish(max_concurrency=max_concurrency)
+
+
+def _meta_decisions(results: list[dict[str, Any]], key: str) -> dict[str, int]:
+    """Count ``meta[key]["decision"]`` values across per-tile results."""
+    decisions: dict[str, int] = {}
+    for row in results:
+        meta = row.get("meta")
+        section = meta.get(key) if isinstance(meta, dict) else None
+        if isinstance(section, dict):
+            decision = str(section.get("decision", "unknown"))
+            decisions[decision] = decisions.get(decision, 0) + 1
+    return decisions
+
+
+def _dedup_stats(results: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Dedup decision counts and hit rate from per-tile meta, or ``None`` if unused."""
+    decisions = _meta_decisions(results, "dedup")
+    if not decisions:
+        return None
+    lookups = decisions.get("hit", 0) + decisions.get("miss", 0)
+    return {
+        "decisions": dict(sorted(decisions.items())),
+        "hit_rate": round(decisions.get("hit", 0) / lookups, 4) if lookups else 0.0,
+    }
+
+
+def _extraction_cache_stats(results: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Shared extraction cache lookups and hit rate from per-tile meta, or ``None`` if unused."""
+    decisions = _meta_decisions(results, "extraction_cache")
+    if not decisions:
+        return None
+    return {
+        "decisions": dict(sorted(decisions.items())),
+        "hit_rate": round(decisions.get("hit", 0) / sum(decisions.values()), 4),
+    }
+
+
+def _rule_based_stats(results: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Rule-based fast-path decision counts and acceptance rate, or ``None`` if unused."""
+    decisions = _meta_decisions(results, "rule_based")
+    if not decisions:
+        return None
+    return {
+        "decisions": dict(sorted(decisions.items())),
+        "accepted_rate": round(decisions.get("accepted", 0) / sum(decisions.values()), 4),
+    }
 
 
 def _build_batch_summary(
@@ -413,9 +865,20 @@ def _build_batch_summary(
     runtime_error_count: int,
     results: list[dict[str, Any]],
     summary_out: Path,
+    skipped_empty_count: int = 0,
+    interrupted: bool = False,
+    rate_limits: dict[str, dict[str, Any]] | None = None,
+    single_flight: dict[str, int] | None = None,
 ) -> int:
     """Build batch summary and analysis package, write them to disk.
 
+    ``interrupted`` marks a run stopped early by a shutdown request; its
+    results cover only the tiles that finished.  ``rate_limits`` is the
+    provider limiter state and throttle events for the run (see
+    :func:`~src.extraction.rate_limit.rate_limit_report`).  ``single_flight``
+    counts the provider calls made and the tiles that shared another tile's
+    in-flight call (see :meth:`~src.extraction.single_flight.SingleFlight.snapshot`).
+
     Returns ``0`` on full success, ``2`` when any tile produced a validation
     or runtime error.
     """
@@ -452,11 +915,36 @@ def _build_batch_summary(
             "ok": ok_count,
             "dry_run": dry_run_count,
             "skipped_low_coherence": skipped_count,
+            "skipped_empty": skipped_empty_count,
             "validation_error": validation_error_count,
             "runtime_error": runtime_error_count,
         },
         "results": results,
     }
+    dedup_stats = _dedup_stats(results)
+    if dedup_stats is not None:
+        summary["dedup"] = dedup_stats
+    extraction_cache_stats = _extraction_cache_stats(results)
+    if extraction_cache_stats is not None:
+        summary["extraction_cache"] = extraction_cache_stats
+    rule_based_stats = _rule_based_stats(results)
+    if rule_based_stats is not None:
+        summary["rule_based"] = rule_based_stats
+    carried = [
+        row for row in results
+        if isinstance(row.get("meta"), dict) and "carried_forward" in row["meta"]
+    ]
+    if carried:
+        summary["carried_forward"] = {
+            "tiles": len(carried),
+            "baseline_run": carried[0]["meta"]["carried_forward"]["baseline_run"],
+        }
+    if rate_limits:
+        summary["rate_limits"] = rate_limits
+    if single_flight and single_flight.get("calls"):
+        summary["single_flight"] = single_flight
+    if interrupted:
+        summary["interrupted"] = True
     summary["analysis_package_path"] = str(out_dir / "analysis_package.json")
 
     with summary_out.open("w", encoding="utf-8") as f:
@@ -469,10 +957,12 @@ def _build_batch_summary(
     logger.info("Batch summary written: %s", summary_out)
     logger.info("Analysis package written: %s", package_path)
     logger.info(
-        "Counts: ok=%s dry_run=%s skipped=%s validation_error=%s runtime_error=%s missing_text_layers=%s",
+        "Counts: ok=%s dry_run=%s skipped=%s skipped_empty=%s validation_error=%s "
+        "runtime_error=%s missing_text_layers=%s",
         ok_count,
         dry_run_count,
         skipped_count,
+        skipped_empty_count,
         validation_error_count,
         runtime_error_count,
         len(missing_items),
@@ -488,7 +978,7 @@ def _build_batch_summary(
 
 
 def _image_bytes_to_b64(image_bytes: bytes) -> str:
-    """Return the raw base64 string for PNG image bytes (no data-URL prefix)."""
+    """Return the raw base64 string for tile image bytes (no data-URL prefix)."""
     return base64.b64encode(image_bytes).decode("ascii")
 
 
@@ -735,6 +1225,7 @@ def _write_batch_api_summary(
     allow_low_coherence: bool,
     summary_out: Path,
     batch_id: str | None = None,
+    skipped_empty_count: int = 0,
 ) -> None:
     """Write batch_summary.json and analysis_package.json for the batch-API path."""
     summary: dict[str, Any] = {
@@ -765,6 +1256,7 @@ def _write_batch_api_summary(
             "ok": ok_count,
             "dry_run": 0,
             "skipped_low_coherence": skipped_count,
+            "skipped_empty": skipped_empty_count,
             "validation_error": validation_error_count,
             "runtime_error": runtime_error_count,
         },
@@ -803,6 +1295,8 @@ def run_batch_api(
     allow_low_coherence: bool,
     summary_out: Path,
     poll_interval: int = 30,
+    empty_tile_ids: Container[str] | None = None,
+    image_encoding: ImageEncoding | None = None,
 ) -> int:
     """Submit all tile extraction requests as a single Anthropic Message Batch.
 
@@ -811,6 +1305,9 @@ def run_batch_api(
     API call, polled every ``poll_interval`` seconds until
     ``processing_status == "ended"``, then post-processed with the same JSON
     parsing, sanitization, and validation logic used by the synchronous path.
+    Tiles in ``empty_tile_ids`` are recorded as ``skipped_empty`` and never
+    submitted.  ``image_encoding`` re-encodes each tile before submission, as
+    :attr:`ExtractionConfig.image_encoding` does for the synchronous path.
 
     Returns:
         ``0`` on full success, ``2`` when any tile produced a validation or
@@ -842,6 +1339,7 @@ def run_batch_api(
 
     ok_count = 0
     skipped_count = 0
+    skipped_empty_count = 0
     validation_error_count = 0
     runtime_error_count = 0
 
@@ -858,9 +1356,19 @@ def run_batch_api(
 
     for tile_path, text_layer_path in pairs:
         stem = tile_path.stem
+        if empty_tile_ids is not None and stem in empty_tile_ids:
+            results.append(
+                _record_skipped_empty(
+                    tile_path=tile_path,
+                    text_layer_path=text_layer_path,
+                    out_dir=out_dir,
+                    model=model,
+                )
+            )
+            skipped_empty_count += 1
+            continue
         try:
-            with text_layer_path.open("r", encoding="utf-8") as f:
-                text_layer: dict[str, Any] = json.load(f)
+            text_layer: dict[str, Any] = load_text_layer(text_layer_path)
         except Exception as exc:
             logger.error("Failed to load text layer for %s: %s", stem, exc)
             results.append(
@@ -917,6 +1425,8 @@ def run_batch_api(
 
         try:
             image_bytes = tile_path.read_bytes()
+            if image_encoding is not None:
+                image_bytes = transcode_image(image_bytes, image_encoding)
         except Exception as exc:
             logger.error("Failed to read image for %s: %s", stem, exc)
             results.append(
@@ -956,7 +1466,7 @@ def run_batch_api(
                                     "type": "image",
                                     "source": {
                                         "type": "base64",
-                                        "media_type": "image/png",
+                                        "media_type": image_media_type(image_bytes),
                                         "data": b64_data,
                                     },
                                 },
@@ -978,9 +1488,10 @@ def run_batch_api(
         }
 
     logger.info(
-        "Collected %s batch requests (%s skipped, %s pre-submit errors).",
+        "Collected %s batch requests (%s skipped, %s empty, %s pre-submit errors).",
         len(batch_requests),
         skipped_count,
+        skipped_empty_count,
         runtime_error_count,
     )
 
@@ -1006,6 +1517,7 @@ def run_batch_api(
             results=results,
             allow_low_coherence=allow_low_coherence,
             summary_out=summary_out,
+            skipped_empty_count=skipped_empty_count,
         )
         return 2 if (validation_error_count + runtime_error_count) > 0 else 0
 
@@ -1220,13 +1732,15 @@ def run_batch_api(
         allow_low_coherence=allow_low_coherence,
         summary_out=summary_out,
         batch_id=batch_id,
+        skipped_empty_count=skipped_empty_count,
     )
 
     logger.info(
-        "Batch API run complete: ok=%s skipped=%s validation_error=%s "
+        "Batch API run complete: ok=%s skipped=%s skipped_empty=%s validation_error=%s "
         "runtime_error=%s missing_text_layers=%s",
         ok_count,
         skipped_count,
+        skipped_empty_count,
         validation_error_count,
         runtime_error_count,
         len(missing_items),
@@ -1238,7 +1752,7 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Run hybrid extraction in batch for matching tile/text-layer files."
     )
-    parser.add_argument("--tiles-dir", type=Path, required=True, help="Directory containing tile PNGs.")
+    parser.add_argument("--tiles-dir", type=Path, required=True, help="Directory containing tile images.")
     parser.add_argument(
         "--text-layers-dir",
         type=Path,
@@ -1270,6 +1784,16 @@ def _build_arg_parser() -> argparse.ArgumentParser:
             "to select the appropriate model tier (fast/standard/premium)."
         ),
     )
+    parser.add_argument(
+        "--tiles-index",
+        type=Path,
+        default=None,
+        help=(
+            "Optional tiles_index.json from the tiler. Tiles it marks skipped_empty "
+            "are recorded without an API call; with --max-concurrency the rest are "
+            "submitted heaviest first."
+        ),
+    )
     parser.add_argument(
         "--model-fast",
         type=str,
@@ -1360,6 +1884,43 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Disable hash-based cache and force API calls for every tile.",
     )
+    parser.add_argument(
+        "--dedup-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Perceptual tile dedup index directory, shareable across runs and plan sets. "
+            "Near-identical tiles reuse a stored extraction instead of calling the API."
+        ),
+    )
+    parser.add_argument(
+        "--extraction-cache",
+        type=Path,
+        default=None,
+        help=(
+            "Shared extraction cache directory. Tiles with the same cache key as an earlier "
+            "run's extraction reuse it instead of calling the API."
+        ),
+    )
+    parser.add_argument(
+        "--extraction-cache-mb",
+        type=float,
+        default=EXTRACTION_CACHE_MAX_BYTES / (1024 * 1024),
+        help="Size cap of --extraction-cache in MiB; least-recently-used entries are evicted.",
+    )
+    parser.add_argument(
+        "--rule-based",
+        type=float,
+        nargs="?",
+        const=RULE_BASED_MIN_CONFIDENCE,
+        default=None,
+        metavar="MIN_CONFIDENCE",
+        help=(
+            "Parse high-coherence tiles with deterministic text-layer rules first and "
+            "skip the API call when the result's confidence reaches MIN_CONFIDENCE "
+            f"(default {RULE_BASED_MIN_CONFIDENCE})."
+        ),
+    )
     parser.add_argument(
         "--use-json-schema",
         action=argparse.BooleanOptionalAction,
@@ -1401,6 +1962,25 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         default=1,
         help="Optional max number of tiles to process in parallel (>=1). Defaults to serial execution.",
     )
+    parser.add_argument(
+        "--async-engine",
+        action="store_true",
+        help=(
+            "Run tiles as asyncio tasks on one event loop with an async HTTP client instead of "
+            "a thread pool. --max-concurrency sets the tiles in flight "
+            f"(default {ASYNC_EXTRACTION_CONCURRENCY}). SIGINT stops taking new tiles; a second "
+            "SIGINT cancels in-flight ones."
+        ),
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        default=None,
+        help=(
+            "Cap provider calls per minute for each model, shared by all workers. "
+            "Throttling (429/503, Retry-After) is honoured either way."
+        ),
+    )
     parser.add_argument(
         "--batch-api",
         action="store_true",
@@ -1416,6 +1996,27 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         default=30,
         help="Seconds between Anthropic Batch API status polls. Only used with --batch-api.",
     )
+    parser.add_argument(
+        "--image-codec",
+        choices=[codec.value for codec in ImageCodec],
+        default=None,
+        help=(
+            "Re-encode tile images with this codec before upload "
+            "(default: send the stored tile as-is; webp needs Pillow)."
+        ),
+    )
+    parser.add_argument(
+        "--jpeg-quality",
+        type=int,
+        default=85,
+        help="JPEG quality for --image-codec jpeg.",
+    )
+    parser.add_argument(
+        "--max-image-kb",
+        type=float,
+        default=None,
+        help="Per-tile upload size budget for --image-codec; larger tiles are re-encoded smaller.",
+    )
     return parser
 
 
@@ -1424,6 +2025,8 @@ def main() -> None:
     load_dotenv()
     parser = _build_arg_parser()
     args = parser.parse_args()
+    if args.image_codec and not codec_available(ImageCodec(args.image_codec)):
+        parser.error(f"--image-codec {args.image_codec} requires Pillow (pip install pillow)")
 
     # Validate --batch-api constraints before touching the API key
     if args.batch_api:
@@ -1434,6 +2037,10 @@ def main() -> None:
             )
         if args.dry_run:
             raise SystemExit("--batch-api is incompatible with --dry-run.")
+        if args.rule_based is not None:
+            raise SystemExit("--batch-api is incompatible with --rule-based.")
+        if args.async_engine:
+            raise SystemExit("--batch-api is incompatible with --async-engine.")
 
     api_key_env = args.api_key_env or (
         "ANTHROPIC_API_KEY" if args.provider == PROVIDER_ANTHROPIC else "OPENROUTER_API_KEY"
@@ -1446,7 +2053,17 @@ def main() -> None:
         )
 
     summary_out = args.summary_out or (args.out_dir / "batch_summary.json")
-    tile_globs = args.tile_glob or ["*.png"]
+    tile_globs = args.tile_glob or list(TILE_IMAGE_GLOBS)
+    image_encoding = (
+        ImageEncoding(
+            codec=ImageCodec(args.image_codec),
+            jpeg_quality=args.jpeg_quality,
+            max_bytes=int(args.max_image_kb * 1024) if args.max_image_kb else None,
+        )
+        if args.image_codec
+        else None
+    )
+    empty_tile_ids = _load_empty_tile_ids(args.tiles_index)
 
     if args.batch_api:
         exit_code = run_batch_api(
@@ -1462,6 +2079,8 @@ def main() -> None:
             allow_low_coherence=args.allow_low_coherence,
             summary_out=summary_out,
             poll_interval=args.batch_poll_interval,
+            empty_tile_ids=empty_tile_ids,
+            image_encoding=image_encoding,
         )
     else:
         _ext_config = ExtractionConfig(
@@ -1474,13 +2093,16 @@ def main() -> None:
             max_tokens=args.max_tokens,
             timeout_sec=args.timeout_sec,
             use_json_schema=args.use_json_schema,
+            image_encoding=image_encoding,
+            rule_based_min_confidence=args.rule_based,
+            requests_per_minute=args.requests_per_minute,
         )
         _esc_config = EscalationConfig(
             enabled=args.escalation,
             model=args.escalation_model,
             coherence_threshold=args.escalation_coherence_threshold,
         )
-        exit_code = run_batch(
+        batch_kwargs: dict[str, Any] = dict(
             tiles_dir=args.tiles_dir,
             text_layers_dir=args.text_layers_dir,
             out_dir=args.out_dir,
@@ -1494,12 +2116,32 @@ def main() -> None:
             prompt_dir=args.prompt_dir,
             fail_fast=args.fail_fast,
             summary_out=summary_out,
-            max_concurrency=args.max_concurrency,
             manifest_path=args.manifest,
             model_fast=args.model_fast,
             model_standard=args.model_standard,
             model_premium=args.model_premium,
+            empty_tile_ids=empty_tile_ids,
+            dedup_dir=args.dedup_dir,
+            tile_costs=tile_costs_from_index(args.tiles_index) if args.tiles_index else None,
+            extraction_cache=(
+                ExtractionCache(args.extraction_cache, max_bytes=int(args.extraction_cache_mb * 1024 * 1024))
+                if args.extraction_cache is not None
+                else None
+            ),
         )
+        if args.async_engine:
+            from .run_hybrid_async import run_batch_async
+
+            exit_code = asyncio.run(
+                run_batch_async(
+                    **batch_kwargs,
+                    max_concurrency=(
+                        args.max_concurrency if args.max_concurrency > 1 else ASYNC_EXTRACTION_CONCURRENCY
+                    ),
+                )
+            )
+        else:
+            exit_code = run_batch(**batch_kwargs, max_concurrency=args.max_concurrency)
     raise SystemExit(exit_code)
 
 
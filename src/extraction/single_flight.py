@@ -0,0 +1,116 @@
+"""Single-flight coalescing of identical in-flight provider calls.
+
+The extraction caches are consulted before a call, so two workers holding
+the same prompt and image (a duplicated tile, a re-queued escalation, the
+same sheet in two PDFs of one batch) both miss and both pay for the call.
+:class:`SingleFlight` closes that window: the first caller of a key runs the
+call and concurrent callers of the same key wait for its result (or its
+exception) instead of making their own.  The key is forgotten as soon as the
+call settles, so later callers go back to the caches.
+
+Thread-pool workers block on the shared future; asyncio tasks await it
+without blocking the loop.  A leader cancelled mid-call hands the key to the
+next waiter rather than cancelling the others; a cancelled waiter only stops
+waiting.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import CancelledError, Future
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key; one registry per batch run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, Future[Any]] = {}
+        self._calls = 0
+        self._coalesced = 0
+        self._coalesced_keys: set[Hashable] = set()
+
+    def _join(self, key: Hashable) -> tuple[Future[Any], bool]:
+        """The flight for *key* and whether the caller leads it."""
+        with self._lock:
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self._coalesced += 1
+                self._coalesced_keys.add(key)
+                return flight, False
+            flight = Future()
+            self._in_flight[key] = flight
+            self._calls += 1
+            return flight, True
+
+    def _settle(self, key: Hashable, flight: Future[Any], result: Any = None, exc: BaseException | None = None) -> None:
+        with self._lock:
+            del self._in_flight[key]
+        if flight.done():
+            return
+        if exc is None:
+            flight.set_result(result)
+        elif isinstance(exc, Exception):
+            flight.set_exception(exc)
+        else:
+            # Cancelled or interrupted: waiters retry the call themselves.
+            flight.cancel()
+
+    def run(self, key: Hashable, fn: Callable[[], _T]) -> tuple[_T, bool]:
+        """``fn()`` or the result of the call already in flight for *key*.
+
+        Returns the result and whether it came from another caller's call.
+        """
+        while True:
+            flight, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return flight.result(), True
+            except CancelledError:
+                continue
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._settle(key, flight, exc=exc)
+            raise
+        self._settle(key, flight, result)
+        return result, False
+
+    async def arun(self, key: Hashable, fn: Callable[[], Awaitable[_T]]) -> tuple[_T, bool]:
+        """Awaitable :meth:`run` for a coroutine function."""
+        while True:
+            flight, leader = self._join(key)
+            if leader:
+                break
+            try:
+                # Shielded so that cancelling this waiter leaves the shared
+                # future, and every other caller of the key, untouched.
+                return await asyncio.shield(asyncio.wrap_future(flight)), True
+            except asyncio.CancelledError:
+                # Retry only when the leader went away, not when this task is
+                # being cancelled itself.
+                task = asyncio.current_task()
+                if not flight.cancelled() or (task is not None and task.cancelling()):
+                    raise
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self._settle(key, flight, exc=exc)
+            raise
+        self._settle(key, flight, result)
+        return result, False
+
+    def snapshot(self) -> dict[str, int]:
+        """Calls made, callers served by another's call, and keys that had such callers."""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "coalesced": self._coalesced,
+                "coalesced_keys": len(self._coalesced_keys),
+            }
@@ -0,0 +1,335 @@
+"""Perceptual tile fingerprints and a cross-run extraction dedup index.
+
+Standard details, typical sections and repeated sheet fragments produce tiles
+that are near-identical across pages and across plan sets, but the exact-byte
+cache key in :mod:`run_hybrid` only catches byte-identical PNGs.  A
+:class:`TileFingerprint` pairs a 256-bit difference hash of the downscaled
+tile image with a canonical signature of the tile's text layer.  Two tiles
+match when the text signatures are equal and the image hashes are within
+``max_distance`` bits; the stored extraction is then reused with its
+``source_text_ids`` remapped onto the new tile's text layer.
+
+Text must match exactly (after whitespace/case normalization and snapping
+positions to a small grid) because every extracted value is read from the
+text layer; the image hash only guards against identical text over different
+linework.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+import fitz
+
+from ..config import DEDUP_MAX_HAMMING
+from ..utils.io_json import read_json
+
+logger = logging.getLogger(__name__)
+
+DEDUP_SCHEMA_VERSION = "tile-dedup-v1"
+_HASH_SIZE = 16
+_POSITION_QUANTUM_PT = 2.0
+# Stored candidates per text signature; the oldest are dropped beyond this.
+_MAX_ENTRIES_PER_SIGNATURE = 8
+
+_SCHEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+CREATE TABLE IF NOT EXISTS candidates (
+    text_signature TEXT NOT NULL,
+    model TEXT NOT NULL,
+    image_hash TEXT NOT NULL,
+    tile_id TEXT NOT NULL,
+    page_number INTEGER,
+    text_ids TEXT NOT NULL,
+    extraction TEXT NOT NULL,
+    PRIMARY KEY (text_signature, model, image_hash)
+);
+"""
+
+
+@dataclass(frozen=True)
+class TileFingerprint:
+    """Image hash plus text-layer signature of one tile.
+
+    ``text_ids`` lists the tile's text ids in canonical item order, so two
+    tiles with equal ``text_signature`` pair their ids position by position.
+    """
+
+    image_hash: int
+    text_signature: str
+    text_ids: tuple[int, ...]
+
+    @property
+    def image_hash_hex(self) -> str:
+        return f"{self.image_hash:0{_HASH_SIZE * _HASH_SIZE // 4}x}"
+
+
+@dataclass(frozen=True)
+class DedupMatch:
+    """A stored extraction that a new tile can reuse."""
+
+    source_tile_id: str
+    source_page_number: int | None
+    model: str
+    distance: int
+    extraction: dict[str, Any]
+    id_map: dict[int, int]
+
+
+def image_dhash(image_bytes: bytes, *, hash_size: int = _HASH_SIZE) -> int:
+    """Difference hash of a PNG: ``hash_size**2`` bits of horizontal gradient sign."""
+    pix = fitz.Pixmap(image_bytes)
+    if pix.alpha or pix.n != 1:
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+    # Halve with box averaging first so the final resample sees no aliasing.
+    while pix.width >= 4 * (hash_size + 1) and pix.height >= 4 * hash_size:
+        pix.shrink(1)
+    small = fitz.Pixmap(pix, hash_size + 1, hash_size, None)
+    samples = small.samples
+    stride = small.stride
+    value = 0
+    for row in range(hash_size):
+        base = row * stride
+        for col in range(hash_size):
+            value = (value << 1) | (samples[base + col] > samples[base + col + 1])
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split()).upper()
+
+
+def text_layer_signature(
+    text_layer: Mapping[str, Any],
+    *,
+    quantum: float = _POSITION_QUANTUM_PT,
+) -> tuple[str, tuple[int, ...]]:
+    """Canonical signature of a tile's text and layout, plus text ids in that order.
+
+    Positions are taken relative to the top-left-most item and snapped to
+    ``quantum`` points, so the same detail placed at a different offset
+    within the tile still matches.
+    """
+    rows: list[tuple[str, int, int, int]] = []
+    for item in text_layer.get("items", []):
+        if not isinstance(item, Mapping):
+            continue
+        text = _normalize_text(str(item.get("text", "")))
+        bbox = item.get("bbox_local") or item.get("bbox_global") or (0.0, 0.0, 0.0, 0.0)
+        try:
+            x0, y0 = float(bbox[0]), float(bbox[1])
+            text_id = int(item["text_id"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+        if text:
+            rows.append((text, round(x0 / quantum), round(y0 / quantum), text_id))
+    if not rows:
+        return "", ()
+    min_x = min(row[1] for row in rows)
+    min_y = min(row[2] for row in rows)
+    keyed = sorted((text, qx - min_x, qy - min_y, text_id) for text, qx, qy, text_id in rows)
+    canonical = json.dumps([row[:3] for row in keyed], separators=(",", ":"), ensure_ascii=False)
+    signature = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return signature, tuple(row[3] for row in keyed)
+
+
+def fingerprint_tile(image_bytes: bytes, text_layer: Mapping[str, Any]) -> TileFingerprint | None:
+    """Fingerprint one tile, or ``None`` when it has no usable text.
+
+    Text-free tiles are never deduplicated: with nothing to anchor the
+    match, only the coarse image hash would decide.  Images MuPDF cannot
+    decode (e.g. WebP tiles) are not deduplicated either.
+    """
+    signature, text_ids = text_layer_signature(text_layer)
+    if not signature:
+        return None
+    try:
+        image_hash = image_dhash(image_bytes)
+    except Exception as exc:  # MuPDF raises its own FzError* types
+        logger.debug("Cannot fingerprint tile image: %s", exc)
+        return None
+    return TileFingerprint(
+        image_hash=image_hash,
+        text_signature=signature,
+        text_ids=text_ids,
+    )
+
+
+def _remap_ids(values: Any, id_map: Mapping[int, int]) -> list[int]:
+    if not isinstance(values, list):
+        return []
+    return [id_map[v] for v in values if isinstance(v, int) and v in id_map]
+
+
+def remap_extraction(
+    extraction: Mapping[str, Any],
+    id_map: Mapping[int, int],
+    *,
+    tile_id: str,
+    page_number: int,
+) -> dict[str, Any]:
+    """Copy *extraction* onto another tile, rewriting tile metadata and text ids."""
+    payload = json.loads(json.dumps(extraction))
+    payload["tile_id"] = tile_id
+    payload["page_number"] = page_number
+    for key in ("structures", "pipes", "callouts"):
+        for item in payload.get(key) or []:
+            if not isinstance(item, dict):
+                continue
+            item["source_text_ids"] = _remap_ids(item.get("source_text_ids"), id_map)
+            for invert in item.get("inverts") or []:
+                if isinstance(invert, dict):
+                    invert["source_text_ids"] = _remap_ids(invert.get("source_text_ids"), id_map)
+    return payload
+
+
+class TileDedupIndex:
+    """Directory of stored extractions keyed by text-layer signature.
+
+    ``index.sqlite`` holds up to a few candidates per signature (image hash,
+    model, source tile, extraction).  The directory can be shared across runs,
+    plan sets and concurrent processes: SQLite serialises writers, so records
+    from parallel runs are never lost to a read-modify-write race.
+    """
+
+    def __init__(self, index_dir: Path, *, max_distance: int = DEDUP_MAX_HAMMING) -> None:
+        if max_distance < 0:
+            raise ValueError("max_distance must be non-negative.")
+        self.index_dir = Path(index_dir)
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    @contextmanager
+    def _index(self) -> Iterator[sqlite3.Connection]:
+        """This index's connection, held by one thread at a time; commits on success."""
+        with self._lock:
+            if self._conn is None:
+                self.index_dir.mkdir(parents=True, exist_ok=True)
+                db_path = self.index_dir / "index.sqlite"
+                created = not db_path.exists()
+                conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+                conn.executescript(_SCHEMA)
+                if created:
+                    with conn:
+                        self._import_json_entries(conn)
+                self._conn = conn
+            with self._conn:
+                yield self._conn
+
+    def close(self) -> None:
+        """Close the index connection; the next operation reopens it."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _import_json_entries(self, conn: sqlite3.Connection) -> None:
+        """Carry over ``<sig[:2]>/<sig>.json`` entries written by earlier versions."""
+        for path in sorted(self.index_dir.glob("??/*.json")):
+            try:
+                payload = read_json(path)
+            except Exception:
+                logger.warning("Ignoring unreadable dedup entry %s", path)
+                continue
+            entries = payload.get("entries")
+            if payload.get("schema_version") != DEDUP_SCHEMA_VERSION or not isinstance(entries, list):
+                continue
+            conn.executemany(
+                "INSERT OR IGNORE INTO candidates"
+                " (text_signature, model, image_hash, tile_id, page_number, text_ids, extraction)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        path.stem,
+                        str(entry.get("model")),
+                        str(entry.get("image_hash")),
+                        str(entry.get("tile_id", "")),
+                        entry.get("page_number") if isinstance(entry.get("page_number"), int) else None,
+                        json.dumps(entry.get("text_ids")),
+                        json.dumps(entry.get("extraction")),
+                    )
+                    for entry in entries
+                    if isinstance(entry, dict)
+                ],
+            )
+
+    def lookup(self, fingerprint: TileFingerprint, *, model: str) -> DedupMatch | None:
+        """Closest stored extraction for *model* within ``max_distance`` bits."""
+        with self._index() as conn:
+            rows = conn.execute(
+                "SELECT image_hash, tile_id, page_number, text_ids, extraction FROM candidates"
+                " WHERE text_signature = ? AND model = ? ORDER BY rowid",
+                (fingerprint.text_signature, model),
+            ).fetchall()
+        best: DedupMatch | None = None
+        for image_hash, tile_id, page_number, text_ids, extraction in rows:
+            try:
+                distance = hamming_distance(int(image_hash, 16), fingerprint.image_hash)
+            except ValueError:
+                continue
+            if distance > self.max_distance or (best is not None and distance >= best.distance):
+                continue
+            source_ids = json.loads(text_ids)
+            extraction = json.loads(extraction)
+            if not isinstance(source_ids, list) or len(source_ids) != len(fingerprint.text_ids):
+                continue
+            if not isinstance(extraction, dict):
+                continue
+            best = DedupMatch(
+                source_tile_id=tile_id,
+                source_page_number=page_number,
+                model=model,
+                distance=distance,
+                extraction=extraction,
+                id_map=dict(zip((int(v) for v in source_ids), fingerprint.text_ids)),
+            )
+        return best
+
+    def record(
+        self,
+        fingerprint: TileFingerprint,
+        *,
+        model: str,
+        tile_id: str,
+        page_number: int | None,
+        extraction: Mapping[str, Any],
+    ) -> None:
+        """Store *extraction* as a reusable candidate for this fingerprint."""
+        signature = fingerprint.text_signature
+        with self._index() as conn:
+            # REPLACE gives the row a new rowid, so a re-recorded candidate
+            # counts as the newest when older ones are trimmed.
+            conn.execute(
+                "INSERT OR REPLACE INTO candidates"
+                " (text_signature, model, image_hash, tile_id, page_number, text_ids, extraction)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    signature,
+                    model,
+                    fingerprint.image_hash_hex,
+                    tile_id,
+                    page_number,
+                    json.dumps(list(fingerprint.text_ids)),
+                    json.dumps(dict(extraction), ensure_ascii=False),
+                ),
+            )
+            conn.execute(
+                "DELETE FROM candidates WHERE text_signature = ? AND rowid NOT IN"
+                " (SELECT rowid FROM candidates WHERE text_signature = ? ORDER BY rowid DESC LIMIT ?)",
+                (signature, signature, _MAX_ENTRIES_PER_SIGNATURE),
+            )
@@ -12,7 +12,8 @@ import uuid
 
 from pydantic import ValidationError
 
-from ..utils.io_json import sha256_file, write_json_atomic
+from ..utils.io_json import write_json_atomic
+from ..utils.text_layer_pack import text_layer_exists, text_layer_sha256
 from .package_contract import (
     CONTRACT_VERSION,
     AnalysisPackage,
@@ -53,10 +54,12 @@ def _verify_hash(
 ) -> None:
     if not expected_sha256:
         return
-    if path is None or not path.exists():
+    # The text-layer helpers treat plain paths as files and also resolve
+    # .tlpk member paths, so every artifact kind goes through them.
+    if path is None or not text_layer_exists(path):
         critical_errors.append(f"{label} hash provided but file is missing: {path}")
         return
-    actual = sha256_file(path)
+    actual = text_layer_sha256(path)
     if actual != expected_sha256:
         critical_errors.append(
             f"{label} hash mismatch for {path}: expected={expected_sha256} actual={actual}"
@@ -85,9 +88,9 @@ def _validate_path_consistency(
         if status != "missing_text_layer":
             critical_errors.append(f"{artifact.tile_id}: missing text_layer_path for status={status}")
     elif status == "missing_text_layer":
-        if text_layer_path.exists():
+        if text_layer_exists(text_layer_path):
             warnings.append(f"{artifact.tile_id}: status=missing_text_layer but text layer exists")
-    elif not text_layer_path.exists():
+    elif not text_layer_exists(text_layer_path):
         critical_errors.append(f"{artifact.tile_id}: text layer not found at {text_layer_path}")
 
     if meta_path is None:
@@ -98,7 +101,7 @@ def _validate_path_consistency(
     if status == "ok":
         if extraction_path is None or not extraction_path.exists():
             critical_errors.append(f"{artifact.tile_id}: status=ok requires extraction JSON")
-    elif status in {"dry_run", "skipped_low_coherence", "missing_text_layer"}:
+    elif status in {"dry_run", "skipped_low_coherence", "skipped_empty", "missing_text_layer"}:
         if extraction_path is not None and extraction_path.exists():
             warnings.append(
                 f"{artifact.tile_id}: status={status} has extraction file present ({extraction_path})"
@@ -170,6 +173,7 @@ def _reconcile_counts(
         "ok": 0,
         "dry_run": 0,
         "skipped_low_coherence": 0,
+        "skipped_empty": 0,
         "validation_error": 0,
         "runtime_error": 0,
         "missing_text_layer": 0,
@@ -205,6 +209,11 @@ def _reconcile_counts(
             "counts.skipped_low_coherence mismatch "
             f"({package.counts.skipped_low_coherence} vs {status_counts['skipped_low_coherence']})"
         )
+    if package.counts.skipped_empty != status_counts["skipped_empty"]:
+        warnings.append(
+            "counts.skipped_empty mismatch "
+            f"({package.counts.skipped_empty} vs {status_counts['skipped_empty']})"
+        )
     if package.counts.validation_error != status_counts["validation_error"]:
         warnings.append(
             "counts.validation_error mismatch "
@@ -230,9 +239,14 @@ def _compute_quality(
     skipped_low = sum(
         1 for artifact in package.artifacts if artifact.status.value == "skipped_low_coherence"
     )
+    # Tiles intake marked empty were never extraction candidates.
+    skipped_empty = sum(
+        1 for artifact in package.artifacts if artifact.status.value == "skipped_empty"
+    )
+    extractable_tiles = paired_tiles - skipped_empty
     bad_ratio = (
-        (sanitized_tiles + skipped_low) / paired_tiles
-        if paired_tiles > 0
+        (sanitized_tiles + skipped_low) / extractable_tiles
+        if extractable_tiles > 0
         else 0.0
     )
     return ValidationQuality(
@@ -23,8 +23,8 @@ from .merge import MergedStructure, merge_structures
 
 logger = logging.getLogger(__name__)
 
-_TILE_JSON_RE = re.compile(r"^p\d+_(?:r\d+_c\d+|a\d+)\.json$")
-_TILE_META_RE = re.compile(r"^p\d+_(?:r\d+_c\d+|a\d+)\.json\.meta\.json$")
+_TILE_JSON_RE = re.compile(r"^(?:d\d+_)?p\d+_(?:r\d+_c\d+|a\d+)\.json$")
+_TILE_META_RE = re.compile(r"^(?:d\d+_)?p\d+_(?:r\d+_c\d+|a\d+)\.json\.meta\.json$")
 
 _CONFIDENCE_ORDER = {"none": 0, "low": 1, "medium": 2, "high": 3}
 _REFERENCE_SHEET_TYPES: frozenset[str] = frozenset({"signing_striping"})
@@ -103,6 +103,13 @@ def build_quality_summary(
 ) -> dict[str, Any]:
     """Build extraction quality summary from meta files and extraction records."""
     tile_ids = {extraction.tile_id for extraction in extractions} | set(tile_meta_by_id.keys())
+    # Tiles intake marked empty carry no content and do not count toward quality.
+    empty_tile_ids = {
+        tile_id
+        for tile_id, meta in tile_meta_by_id.items()
+        if meta.get("status") == "skipped_empty"
+    }
+    tile_ids -= empty_tile_ids
     total_tiles = len(tile_ids)
     if total_tiles == 0:
         return {
@@ -110,6 +117,7 @@ def build_quality_summary(
             "ok_tiles": 0,
             "sanitized_tiles": 0,
             "skipped_tiles": 0,
+            "empty_tiles": len(empty_tile_ids),
             "quality_grade": "D",
             "warnings": ["No extraction tiles were loaded."],
         }
@@ -141,6 +149,7 @@ def build_quality_summary(
         "ok_tiles": ok_tiles,
         "sanitized_tiles": sanitized_tiles,
         "skipped_tiles": skipped_tiles,
+        "empty_tiles": len(empty_tile_ids),
         "quality_grade": _quality_grade(bad_ratio),
         "warnings": warnings,
     }
@@ -0,0 +1,162 @@
+"""Multi-PDF intake: several source PDFs reviewed as one run.
+
+A submittal often arrives as several PDFs (civil set, utility set, details).
+:func:`combine_pdfs` concatenates them into one ``combined.pdf`` in the
+run's intake directory, so a single tiling pool, extraction pool, manifest
+and set of utility graphs cover every sheet.  Pages are numbered run-wide:
+the first document's pages come first, then the second's, and so on.
+
+Each document's place in that sequence is recorded in ``documents.json``
+(see :class:`SourceDocument`).  Tile ids gain a ``d{index}_`` prefix naming
+the source document, so ``d2_p14_r0_c1`` is run page 14, which came from
+the second PDF.  Single-PDF runs have no ``documents.json`` and keep their
+unprefixed ids.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import fitz
+
+from ..utils.io_json import read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS_FILENAME = "documents.json"
+COMBINED_PDF_FILENAME = "combined.pdf"
+
+
+@dataclass(frozen=True)
+class SourceDocument:
+    """One source PDF and the run-wide pages it occupies."""
+
+    index: int  # 1-based, in intake order
+    path: Path
+    page_offset: int  # run page number = page_offset + page number in this PDF
+    page_count: int
+
+    @property
+    def first_page(self) -> int:
+        return self.page_offset + 1
+
+    @property
+    def last_page(self) -> int:
+        return self.page_offset + self.page_count
+
+    @property
+    def tile_id_prefix(self) -> str:
+        return f"d{self.index}_"
+
+    def contains(self, page_number: int) -> bool:
+        return self.first_page <= page_number <= self.last_page
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "path": str(self.path),
+            "page_offset": self.page_offset,
+            "page_count": self.page_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SourceDocument:
+        return cls(
+            index=int(data["index"]),
+            path=Path(data["path"]),
+            page_offset=int(data["page_offset"]),
+            page_count=int(data["page_count"]),
+        )
+
+
+def collect_pdfs(pdf_paths: Iterable[Path] = (), pdf_dir: Path | None = None) -> list[Path]:
+    """Resolved source PDFs: *pdf_paths* in the given order, then *pdf_dir*'s PDFs by name.
+
+    Duplicates are dropped, keeping the first occurrence.
+    """
+    candidates = list(pdf_paths)
+    if pdf_dir is not None:
+        candidates.extend(
+            sorted(
+                (p for p in pdf_dir.iterdir() if p.is_file() and p.suffix.lower() == ".pdf"),
+                key=lambda p: p.name.lower(),
+            )
+        )
+    collected: list[Path] = []
+    for path in candidates:
+        resolved = path.resolve()
+        if resolved not in collected:
+            collected.append(resolved)
+    return collected
+
+
+def load_documents(intake_dir: Path) -> list[SourceDocument]:
+    """Source documents of a multi-PDF run; empty for a single-PDF run."""
+    path = intake_dir / DOCUMENTS_FILENAME
+    if not path.exists():
+        return []
+    return [SourceDocument.from_dict(d) for d in read_json(path).get("documents", [])]
+
+
+def combine_pdfs(pdf_paths: list[Path], intake_dir: Path) -> tuple[Path, list[SourceDocument]]:
+    """Concatenate *pdf_paths* into ``intake_dir/combined.pdf``.
+
+    Writes ``documents.json`` alongside.  When both already exist for the
+    same source files (a resumed run) they are reused as-is, so page numbers
+    and tile ids stay stable.
+    """
+    if not pdf_paths:
+        raise ValueError("At least one PDF is required.")
+    intake_dir.mkdir(parents=True, exist_ok=True)
+    combined_path = intake_dir / COMBINED_PDF_FILENAME
+
+    existing = load_documents(intake_dir)
+    if combined_path.exists() and [d.path for d in existing] == list(pdf_paths):
+        logger.info("Reusing %s (%d source PDFs)", combined_path, len(existing))
+        return combined_path, existing
+
+    documents: list[SourceDocument] = []
+    with fitz.open() as combined:
+        for index, pdf_path in enumerate(pdf_paths, start=1):
+            with fitz.open(pdf_path) as source:
+                documents.append(
+                    SourceDocument(
+                        index=index,
+                        path=pdf_path,
+                        page_offset=len(combined),
+                        page_count=len(source),
+                    )
+                )
+                combined.insert_pdf(source)
+        combined.save(str(combined_path), garbage=1)
+    write_json_atomic(
+        intake_dir / DOCUMENTS_FILENAME,
+        {"combined_pdf": str(combined_path), "documents": [d.to_dict() for d in documents]},
+    )
+    logger.info(
+        "Combined %d PDFs into %s (%d pages)",
+        len(documents),
+        combined_path,
+        sum(d.page_count for d in documents),
+    )
+    return combined_path, documents
+
+
+def document_for_page(documents: list[SourceDocument], page_number: int) -> SourceDocument | None:
+    for document in documents:
+        if document.contains(page_number):
+            return document
+    return None
+
+
+def page_tile_prefixes(documents: list[SourceDocument]) -> dict[int, str]:
+    """Map run page number -> tile id prefix (``d{index}_``) for every page."""
+    return {
+        page_number: document.tile_id_prefix
+        for document in documents
+        for page_number in range(document.first_page, document.last_page + 1)
+    }
@@ -10,7 +10,9 @@ from pathlib import Path
 
 import fitz
 
-from .models import SheetInfo, TitleBlockCrop
+from .documents import SourceDocument
+from .models import PageAnalysis, SheetInfo, TilePlan, TitleBlockCrop
+from .page_analysis import TITLE_STRIP_RATIO, title_strip_rect
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,10 @@ SHEET_TYPE_KEYWORDS: dict[str, list[str]] = {
 EXTRACT_SHEET_TYPES = {"plan_view", "profile", "detail"}
 LIGHT_EXTRACT_TYPES = {"cover", "notes", "demolition", "signing", "erosion"}
 
+TILING_FULL = "full"
+TILING_LIGHT = "light"
+TILING_SKIP = "skip"
+
 SHEET_LABEL_PATTERN = re.compile(r"\b([A-Z]{1,4})\s*[-]?\s*(\d{1,3}[A-Z]?)\b")
 
 
@@ -121,10 +127,8 @@ def _extract_utility_types(*texts: str) -> list[str]:
     return utility_types
 
 
-def _extract_title_block_text(page: fitz.Page, right_strip_ratio: float = 0.15) -> str:
-    rect = page.rect
-    clip = fitz.Rect(rect.width * (1.0 - right_strip_ratio), 0.0, rect.width, rect.height)
-    return page.get_text("text", clip=clip)
+def _extract_title_block_text(page: fitz.Page, right_strip_ratio: float = TITLE_STRIP_RATIO) -> str:
+    return page.get_text("text", clip=title_strip_rect(page.rect, right_strip_ratio))
 
 
 def _parse_cover_sheet_index(index_text: str) -> dict[str, str]:
@@ -160,6 +164,9 @@ def _parse_cover_sheet_index(index_text: str) -> dict[str, str]:
 def build_manifest(
     pdf_path: Path,
     title_block_crops: list[TitleBlockCrop] | None = None,
+    *,
+    page_analyses: dict[int, PageAnalysis] | None = None,
+    documents: list[SourceDocument] | None = None,
 ) -> list[SheetInfo]:
     """Build sheet manifest from cover sheet index + page title blocks.
 
@@ -170,23 +177,51 @@ def build_manifest(
             the image path is stored on each :class:`SheetInfo` for future
             vision-based classification.  The existing text-based classification
             logic is unchanged.
+        page_analyses: Optional cached page analyses (from
+            :func:`~intake.page_analysis.load_page_analyses`).  Pages present
+            here reuse the cached full and title-strip text instead of
+            re-extracting it.
+        documents: Source documents of a multi-PDF run whose ``pdf_path``
+            is the combined PDF (see :mod:`~intake.documents`).  Each
+            document's cover sheet index is read from its own first two
+            pages, and every sheet records its :attr:`SheetInfo.document`.
     """
     # Index crops by page number for O(1) lookup.
     crop_by_page: dict[int, TitleBlockCrop] = (
         {c.page_number: c for c in title_block_crops} if title_block_crops else {}
     )
+    analyses = page_analyses or {}
+
+    def _full_text(page: fitz.Page, page_number: int) -> str:
+        analysis = analyses.get(page_number)
+        return analysis.full_text if analysis is not None else page.get_text("text")
 
     manifest: list[SheetInfo] = []
     with fitz.open(pdf_path) as doc:
-        cover_index_text = ""
-        for page_idx in range(min(2, len(doc))):
-            cover_index_text += "\n" + doc[page_idx].get_text("text")
-        cover_index_map = _parse_cover_sheet_index(cover_index_text)
+        # (first page, last page, document index) per source document.
+        spans = [(d.first_page, d.last_page, d.index) for d in documents or []]
+        if not spans:
+            spans = [(1, len(doc), None)]
+        cover_index_maps: list[dict[str, str]] = []
+        for first_page, last_page, _ in spans:
+            cover_index_text = ""
+            for page_number in range(first_page, min(first_page + 1, last_page) + 1):
+                cover_index_text += "\n" + _full_text(doc[page_number - 1], page_number)
+            cover_index_maps.append(_parse_cover_sheet_index(cover_index_text))
 
         for page_idx, page in enumerate(doc):
             page_number = page_idx + 1
-            title_block_text = _extract_title_block_text(page)
-            full_text = page.get_text("text")
+            span_idx = next(
+                (i for i, (first, last, _) in enumerate(spans) if first <= page_number <= last), 0
+            )
+            cover_index_map = cover_index_maps[span_idx]
+            analysis = analyses.get(page_number)
+            title_block_text = (
+                analysis.title_strip_text
+                if analysis is not None
+                else _extract_title_block_text(page)
+            )
+            full_text = _full_text(page, page_number)
             label = _extract_sheet_label(title_block_text) or _extract_sheet_label(full_text)
 
             description = cover_index_map.get(label) if label else None
@@ -206,12 +241,67 @@ def build_manifest(
                     needs_deep_extraction=sheet_type in EXTRACT_SHEET_TYPES,
                     model_tier=model_tier,
                     title_block_image_path=crop.image_path if crop is not None else None,
+                    document=spans[span_idx][2],
                 )
             )
 
     return manifest
 
 
+def tiling_profile(sheet: SheetInfo) -> str:
+    """Return how a sheet should be tiled: ``"full"``, ``"light"`` or ``"skip"``.
+
+    Deep-extraction sheets get the full tiling.  Light-extraction sheet types,
+    and unclassified sheets that still mention a utility, get the cheaper
+    light tiling.  Everything else is never rendered.
+    """
+    if sheet.needs_deep_extraction:
+        return TILING_FULL
+    if sheet.sheet_type in LIGHT_EXTRACT_TYPES or sheet.utility_types:
+        return TILING_LIGHT
+    return TILING_SKIP
+
+
+def plan_tiling_from_manifest(
+    manifest: list[SheetInfo],
+    *,
+    full_plan: TilePlan,
+    light_plan: TilePlan,
+) -> dict[int, TilePlan]:
+    """Map page_number -> tile plan for every sheet that should be tiled."""
+    plans: dict[int, TilePlan] = {}
+    for sheet in manifest:
+        profile = tiling_profile(sheet)
+        if profile == TILING_FULL:
+            plans[sheet.page_number] = full_plan
+        elif profile == TILING_LIGHT:
+            plans[sheet.page_number] = light_plan
+    return plans
+
+
+def load_manifest(manifest_path: Path) -> list[SheetInfo]:
+    """Read a manifest written by :func:`save_manifest`."""
+    with manifest_path.open("r", encoding="utf-8") as f:
+        entries = json.load(f)
+    manifest: list[SheetInfo] = []
+    for entry in entries:
+        image_path = entry.get("title_block_image_path")
+        manifest.append(
+            SheetInfo(
+                page_number=int(entry["page_number"]),
+                sheet_label=entry.get("sheet_label"),
+                sheet_type=str(entry.get("sheet_type", "other")),
+                description=entry.get("description"),
+                utility_types=list(entry.get("utility_types", [])),
+                needs_deep_extraction=bool(entry.get("needs_deep_extraction", False)),
+                model_tier=str(entry.get("model_tier", "standard")),
+                title_block_image_path=Path(image_path) if image_path else None,
+                document=int(entry["document"]) if entry.get("document") is not None else None,
+            )
+        )
+    return manifest
+
+
 def save_manifest(manifest: list[SheetInfo], output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     payload = [sheet.to_dict() for sheet in manifest]
@@ -0,0 +1,100 @@
+"""Title-block and sheet-border masking for tile clips and text layers.
+
+Every sheet of a plan set repeats the same title block and border.  Left in
+the tiles, the title block's text goes into the prompt of the right-hand
+column of tiles and its pixels into their images on every page.  This module
+locates that furniture from the page's vector drawings so the tilers can
+confine clips and text layers to the remaining content rectangle.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import fitz
+
+from .models import BBox, MaskPolicy, PageMask
+
+_EDGE_SNAP_PT = 2.0
+
+
+def _detect_border(
+    page_rect: fitz.Rect,
+    drawing_bboxes: Sequence[BBox],
+    policy: MaskPolicy,
+) -> fitz.Rect | None:
+    page_area = page_rect.width * page_rect.height
+    best: fitz.Rect | None = None
+    for bbox in drawing_bboxes:
+        rect = fitz.Rect(bbox) & page_rect
+        area = rect.width * rect.height
+        # A drawing spanning the whole page is a background fill, not a frame.
+        if area < page_area * policy.frame_area_ratio or area >= page_area * 0.995:
+            continue
+        if best is None or area > best.width * best.height:
+            best = rect
+    return best
+
+
+def _covered_length(spans: list[tuple[float, float]]) -> float:
+    total = 0.0
+    reach = float("-inf")
+    for y0, y1 in sorted(spans):
+        if y1 <= reach:
+            continue
+        total += y1 - max(y0, reach)
+        reach = y1
+    return total
+
+
+def _detect_title_strip(
+    page_rect: fitz.Rect,
+    drawing_bboxes: Sequence[BBox],
+    policy: MaskPolicy,
+) -> fitz.Rect | None:
+    """Right-edge title strip: the leftmost x where strip drawings line up tall enough.
+
+    Title blocks are drawn either as one long rule or as a column of stacked
+    boxes sharing a left edge, so drawings inside the strip are grouped by
+    left edge (snapped to :data:`_EDGE_SNAP_PT`) and an edge counts once the union of
+    its drawings' vertical extents reaches ``min_rule_height_ratio`` of the
+    page height.  Scattered plan linework never lines up like that.
+    """
+    strip_x0 = page_rect.x1 - page_rect.width * policy.strip_ratio
+    min_height = page_rect.height * policy.min_rule_height_ratio
+    edges: dict[int, list[tuple[float, float]]] = {}
+    lefts: dict[int, float] = {}
+    for x0, y0, x1, y1 in drawing_bboxes:
+        if x0 < strip_x0 or x1 > page_rect.x1 + 1.0 or y1 <= y0:
+            continue
+        key = round(x0 / _EDGE_SNAP_PT)
+        edges.setdefault(key, []).append((y0, y1))
+        lefts[key] = min(lefts.get(key, x0), x0)
+    found = [lefts[key] for key, spans in edges.items() if _covered_length(spans) >= min_height]
+    if not found:
+        return None
+    return fitz.Rect(min(found), page_rect.y0, page_rect.x1, page_rect.y1)
+
+
+def detect_page_mask(
+    page_rect: fitz.Rect,
+    drawing_bboxes: Sequence[BBox],
+    policy: MaskPolicy,
+) -> PageMask:
+    """Locate the sheet border and title-block strip and the content left between them."""
+    content = fitz.Rect(page_rect)
+    border = _detect_border(page_rect, drawing_bboxes, policy) if policy.border else None
+    if border is not None:
+        content = fitz.Rect(border)
+    title_block = (
+        _detect_title_strip(page_rect, drawing_bboxes, policy)
+        if policy.title_block
+        else None
+    )
+    if title_block is not None and title_block.x0 > content.x0:
+        content.x1 = min(content.x1, title_block.x0)
+    return PageMask(
+        content_rect=(content.x0, content.y0, content.x1, content.y1),
+        title_block=tuple(title_block) if title_block is not None else None,
+        border=tuple(border) if border is not None else None,
+    )
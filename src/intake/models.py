@@ -16,6 +16,149 @@ class TilingStrategy(str, Enum):
     ADAPTIVE = "adaptive"
 
 
+class RenderMode(str, Enum):
+    CLIP = "clip"
+    DISPLAY_LIST = "display_list"
+
+
+class TextLayerFormat(str, Enum):
+    JSON = "json"
+    PACK = "pack"
+
+
+class TileStatus(str, Enum):
+    OK = "ok"
+    SKIPPED_EMPTY = "skipped_empty"
+
+
+@dataclass(frozen=True)
+class TilePlan:
+    """Tiling geometry for one page: render DPI, grid shape and overlap."""
+
+    dpi: int = 300
+    grid_rows: int = 2
+    grid_cols: int = 3
+    overlap_pct: float = 0.10
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ImageBudget:
+    """Largest tile image a vision model takes at native resolution.
+
+    Endpoints downscale images beyond ``max_long_edge_px`` on the long side
+    or ``max_megapixels`` in area before the model sees them, so tiles are
+    planned and rendered to stay within both.
+    """
+
+    max_long_edge_px: int = 2048
+    max_megapixels: float = 4.2
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class DpiPolicy:
+    """Per-tile render DPI bounds driven by the tile's text-layer font sizes.
+
+    Each tile renders at the DPI that makes its smallest text
+    ``target_text_px`` pixels tall, rounded up to ``dpi_step`` and clamped to
+    ``[min_dpi, max_dpi]``.  Spans smaller than ``outlier_ratio`` times the
+    tile's median font size (stray superscripts, leader dots) do not count
+    as the smallest text.
+    """
+
+    min_dpi: int = 150
+    max_dpi: int = 300
+    target_text_px: float = 25.0
+    outlier_ratio: float = 0.5
+    dpi_step: int = 25
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class EmptyTilePolicy:
+    """Thresholds below which a tile is treated as blank and not extracted.
+
+    A tile is empty only when all three signals are at or below their
+    limits: text items in its text layer, vector drawings intersecting its
+    clip, and ink coverage (mean ink density) of an ``ink_dpi``
+    preview.  Drawings whose bbox covers at least ``frame_area_ratio`` of the
+    page (the sheet border frame) are not counted.
+    """
+
+    max_text_items: int = 2
+    max_drawings: int = 2
+    max_ink_coverage: float = 0.02
+    ink_dpi: int = 24
+    frame_area_ratio: float = 0.5
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class TileContentScore:
+    """Content signals for one tile.
+
+    ``drawings`` stops counting at ``max_drawings + 1``; ``ink_coverage`` is
+    ``None`` when text or drawings already rule the tile non-empty.
+    """
+
+    text_items: int
+    drawings: int
+    ink_coverage: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class MaskPolicy:
+    """Which sheet furniture to exclude from tile clips and text layers.
+
+    The title block is looked for as a vertical strip at the right edge:
+    vector drawings lying entirely within the right ``strip_ratio`` of the
+    page width that share a left edge and together span at least
+    ``min_rule_height_ratio`` of the page height.  The leftmost such edge
+    marks the strip.  With ``border`` the largest drawing
+    covering at least ``frame_area_ratio`` of the page (the sheet frame)
+    bounds the content, masking the margin outside it.  Nothing is masked
+    when a feature is not found.
+    """
+
+    title_block: bool = True
+    border: bool = False
+    strip_ratio: float = 0.12
+    min_rule_height_ratio: float = 0.6
+    frame_area_ratio: float = 0.5
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class PageMask:
+    """Masked regions of one page, recorded on every tile for provenance.
+
+    ``content_rect`` is the area tiles and text layers are confined to;
+    ``title_block`` and ``border`` are the detected features (``None`` when
+    not masked).
+    """
+
+    content_rect: BBox
+    title_block: BBox | None = None
+    border: BBox | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
 @dataclass
 class TileInfo:
     """Metadata for a single extracted tile."""
@@ -29,11 +172,17 @@ class TileInfo:
     text_layer_path: Path
     image_width_px: int
     image_height_px: int
+    dpi: int = 300
+    status: TileStatus = TileStatus.OK
+    content: TileContentScore | None = None
+    mask: PageMask | None = None
+    plan: TilePlan | None = None
 
     def to_dict(self) -> dict[str, Any]:
         data = asdict(self)
         data["image_path"] = str(self.image_path)
         data["text_layer_path"] = str(self.text_layer_path)
+        data["status"] = self.status.value
         return data
 
 
@@ -96,6 +245,58 @@ class TitleBlockCrop:
         return data
 
 
+@dataclass
+class PageAnalysis:
+    """Text, geometry and coherence for one page, computed in a single pass.
+
+    ``spans`` keeps the raw ``text``/``bbox``/``font``/``size`` of every span
+    with non-empty cleaned text, which is all a
+    :class:`~src.intake.text_layer.PageSpanIndex` needs to be rebuilt.
+    ``drawing_bboxes`` is ``None`` when the page was analyzed without its
+    vector drawings.
+    """
+
+    page_number: int
+    page_rect: BBox
+    full_text: str
+    title_strip_text: str
+    spans: list[dict[str, Any]] = field(default_factory=list)
+    block_bboxes: list[BBox] = field(default_factory=list)
+    drawing_bboxes: list[BBox] | None = None
+    coherence_score: float = 0.0
+    total_spans: int = 0
+    multi_char_spans: int = 0
+    numeric_spans: int = 0
+    primary_font: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PageAnalysis":
+        def _bbox(raw: Any) -> BBox:
+            return (float(raw[0]), float(raw[1]), float(raw[2]), float(raw[3]))
+
+        return cls(
+            page_number=int(data["page_number"]),
+            page_rect=_bbox(data["page_rect"]),
+            full_text=str(data.get("full_text", "")),
+            title_strip_text=str(data.get("title_strip_text", "")),
+            spans=[dict(span) for span in data.get("spans", [])],
+            block_bboxes=[_bbox(b) for b in data.get("block_bboxes", [])],
+            drawing_bboxes=(
+                [_bbox(b) for b in data["drawing_bboxes"]]
+                if data.get("drawing_bboxes") is not None
+                else None
+            ),
+            coherence_score=float(data.get("coherence_score", 0.0)),
+            total_spans=int(data.get("total_spans", 0)),
+            multi_char_spans=int(data.get("multi_char_spans", 0)),
+            numeric_spans=int(data.get("numeric_spans", 0)),
+            primary_font=str(data.get("primary_font", "")),
+        )
+
+
 @dataclass
 class SheetInfo:
     """Manifest metadata for a sheet/page."""
@@ -108,11 +309,14 @@ class SheetInfo:
     needs_deep_extraction: bool
     model_tier: str = "standard"  # "fast", "standard", or "premium"
     title_block_image_path: Path | None = None
+    document: int | None = None  # source document index in a multi-PDF run
 
     def to_dict(self) -> dict[str, Any]:
         data = asdict(self)
         data["title_block_image_path"] = (
             str(self.title_block_image_path) if self.title_block_image_path is not None else None
         )
+        if self.document is None:
+            del data["document"]
         return data
 
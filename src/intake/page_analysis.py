@@ -0,0 +1,191 @@
+"""Per-page analysis cache shared by tiling, coherence scoring and the manifest.
+
+Intake used to re-open the PDF and re-extract the same page text in every
+consumer: the tiler's coherence gate, :func:`score_pdf_coherence` and
+:func:`build_manifest` (full text plus the title-block strip).  This module
+extracts everything those consumers need in one visit per page and persists
+it as ``page_analysis.json`` next to the other intake artifacts.  The file is
+keyed by the PDF's SHA-256, so a resumed run reuses it and a different PDF
+invalidates it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import fitz
+
+from .models import BBox, PageAnalysis
+from .text_layer import calculate_coherence_from_spans, iter_block_bboxes, iter_spans
+from ..utils.io_json import sha256_file
+from ..utils.unicode import clean_unicode
+
+logger = logging.getLogger(__name__)
+
+PAGE_ANALYSIS_FILENAME = "page_analysis.json"
+PAGE_ANALYSIS_VERSION = 1
+
+# Width fraction of the right-hand strip holding the sheet title block.
+TITLE_STRIP_RATIO = 0.15
+
+
+def title_strip_rect(page_rect: fitz.Rect, right_strip_ratio: float = TITLE_STRIP_RATIO) -> fitz.Rect:
+    """Right-hand strip of the page that holds the title block text."""
+    return fitz.Rect(
+        page_rect.width * (1.0 - right_strip_ratio), 0.0, page_rect.width, page_rect.height
+    )
+
+
+def _page_drawing_bboxes(page: fitz.Page) -> list[BBox]:
+    """Bboxes of every vector drawing on *page* (empty when unreadable)."""
+    bboxes: list[BBox] = []
+    try:
+        for drawing in page.get_drawings():
+            rect = drawing.get("rect") or fitz.Rect()
+            bboxes.append((rect.x0, rect.y0, rect.x1, rect.y1))
+    except Exception:  # pragma: no cover – defensive for unusual PDFs
+        return []
+    return bboxes
+
+
+def analyze_page(page: fitz.Page, page_number: int, *, drawings: bool = False) -> PageAnalysis:
+    """Extract text, spans and coherence metrics for one page.
+
+    The full-page ``"text"`` and ``"dict"`` extractions share one
+    :class:`fitz.TextPage`, which gives output identical to separate
+    ``page.get_text`` calls.  The title strip needs its own clipped pass
+    because clipping a shared text page changes line assembly.
+
+    ``page.get_drawings()`` is costly on dense plan sheets and only empty-tile
+    scoring, masking and adaptive region detection use its bboxes, so they
+    are collected only with ``drawings``; otherwise ``drawing_bboxes`` is
+    ``None``.
+    """
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_DICT)
+    full_text = page.get_text("text", textpage=textpage)
+    text_dict = page.get_text("dict", textpage=textpage)
+    title_strip_text = page.get_text("text", clip=title_strip_rect(page.rect))
+
+    spans: list[dict[str, Any]] = []
+    for span in iter_spans(text_dict):
+        text = str(span.get("text", ""))
+        if not clean_unicode(text).strip():
+            continue
+        bbox = span.get("bbox", (0.0, 0.0, 0.0, 0.0))
+        spans.append(
+            {
+                "text": text,
+                "bbox": [float(v) for v in bbox],
+                "font": str(span.get("font", "")),
+                "size": float(span.get("size", 0.0)),
+            }
+        )
+
+    coherence_score, total_spans, multi_char_spans, numeric_spans, primary_font = (
+        calculate_coherence_from_spans(spans)
+    )
+    rect = page.rect
+    return PageAnalysis(
+        page_number=page_number,
+        page_rect=(rect.x0, rect.y0, rect.x1, rect.y1),
+        full_text=full_text,
+        title_strip_text=title_strip_text,
+        spans=spans,
+        block_bboxes=iter_block_bboxes(text_dict),
+        drawing_bboxes=_page_drawing_bboxes(page) if drawings else None,
+        coherence_score=coherence_score,
+        total_spans=total_spans,
+        multi_char_spans=multi_char_spans,
+        numeric_spans=numeric_spans,
+        primary_font=primary_font,
+    )
+
+
+def _read_cache(cache_path: Path, pdf_hash: str) -> dict[int, PageAnalysis]:
+    if not cache_path.exists():
+        return {}
+    try:
+        with cache_path.open("r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Ignoring unreadable page analysis cache %s: %s", cache_path, exc)
+        return {}
+    if payload.get("version") != PAGE_ANALYSIS_VERSION or payload.get("pdf_sha256") != pdf_hash:
+        logger.info("Page analysis cache %s is stale; rebuilding.", cache_path)
+        return {}
+    return {
+        int(page_number): PageAnalysis.from_dict(entry)
+        for page_number, entry in payload.get("pages", {}).items()
+    }
+
+
+def _write_cache(cache_path: Path, pdf_hash: str, analyses: dict[int, PageAnalysis]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": PAGE_ANALYSIS_VERSION,
+        "pdf_sha256": pdf_hash,
+        "pages": {
+            str(page_number): analysis.to_dict()
+            for page_number, analysis in sorted(analyses.items())
+        },
+    }
+    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    tmp_path.replace(cache_path)
+
+
+def load_page_analyses(
+    pdf_path: Path,
+    cache_path: Path,
+    *,
+    pages: list[int] | None = None,
+    drawings: bool = False,
+) -> dict[int, PageAnalysis]:
+    """Return page analyses for *pages*, computing only what the cache lacks.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        cache_path: JSON cache location, normally
+            ``{intake_dir}/page_analysis.json``.  Entries are reused only when
+            the stored SHA-256 matches *pdf_path*.
+        pages: 1-based page numbers.  ``None`` analyzes every page.
+        drawings: Also collect vector drawing bboxes (see
+            :func:`analyze_page`).  Cached entries analyzed without them
+            gain them in place instead of being re-analyzed.
+
+    Returns:
+        Mapping of page_number -> :class:`PageAnalysis` in page order.
+    """
+    pdf_hash = sha256_file(pdf_path)
+    cached = _read_cache(cache_path, pdf_hash)
+
+    with fitz.open(pdf_path) as doc:
+        selected = pages or list(range(1, len(doc) + 1))
+        missing = [page_number for page_number in selected if page_number not in cached]
+        for page_number in missing:
+            if page_number < 1 or page_number > len(doc):
+                raise ValueError(f"Invalid page number: {page_number}")
+            cached[page_number] = analyze_page(
+                doc[page_number - 1], page_number, drawings=drawings
+            )
+        lacking_drawings = [
+            page_number
+            for page_number in selected
+            if drawings and cached[page_number].drawing_bboxes is None
+        ]
+        for page_number in lacking_drawings:
+            cached[page_number].drawing_bboxes = _page_drawing_bboxes(doc[page_number - 1])
+
+    if missing or lacking_drawings:
+        _write_cache(cache_path, pdf_hash, cached)
+        logger.info(
+            "Analyzed %s page(s) (%s reused from %s)",
+            len(missing),
+            len(selected) - len(missing),
+            cache_path.name,
+        )
+    return {page_number: cached[page_number] for page_number in sorted(selected)}
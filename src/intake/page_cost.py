@@ -0,0 +1,121 @@
+"""Millisecond page and tile cost estimates for heaviest-first scheduling.
+
+Tiling time varies by more than an order of magnitude across a plan set: a
+profile sheet with thousands of vector drawings against a sparse notes page.
+Pools fed in page order leave a long tail when a heavy page is picked up
+last.  :func:`estimate_page_cost` predicts a page's tiling time from what
+PyMuPDF reports in a few milliseconds: the vector drawing and text span
+counts, the pixel count of embedded raster images (decoded on every
+render) and the page's own rendered pixel count.  :func:`lpt_order` then
+sorts work longest-processing-time first.  The same formula over a tile's
+own text items and pixels (:func:`tile_costs_from_index`) orders extraction.
+
+Weights are in milliseconds on a single core (see
+``scripts/bench_page_schedule.py``); only the ordering they produce matters.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+import fitz
+
+from ..config import PAGE_COST_WEIGHTS
+from ..utils.io_json import read_json
+from ..utils.text_layer_pack import load_text_layer
+from .models import PageAnalysis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def estimate_cost(
+    *, drawings: int, spans: int, megapixels: float, image_megapixels: float = 0.0
+) -> float:
+    """Estimated processing time in milliseconds for the given content counts."""
+    w = PAGE_COST_WEIGHTS
+    return (
+        w["base"]
+        + w["drawing"] * drawings
+        + w["span"] * spans
+        + w["megapixel"] * megapixels
+        + w["image_megapixel"] * image_megapixels
+    )
+
+
+@dataclass(frozen=True)
+class PageCost:
+    page_number: int
+    drawings: int
+    spans: int
+    megapixels: float
+    image_megapixels: float = 0.0
+
+    @property
+    def cost(self) -> float:
+        return estimate_cost(
+            drawings=self.drawings,
+            spans=self.spans,
+            megapixels=self.megapixels,
+            image_megapixels=self.image_megapixels,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "cost": round(self.cost, 1)}
+
+
+def estimate_page_cost(
+    page: fitz.Page, *, dpi: int, analysis: PageAnalysis | None = None
+) -> PageCost:
+    """Cost of tiling *page* at *dpi*; counts come from *analysis* when cached."""
+    if analysis is not None and analysis.drawing_bboxes is not None:
+        drawings = len(analysis.drawing_bboxes)
+    else:
+        drawings = len(page.get_cdrawings())
+    spans = analysis.total_spans if analysis is not None else len(page.get_texttrace())
+    rect = page.rect
+    return PageCost(
+        page_number=page.number + 1,
+        drawings=drawings,
+        spans=spans,
+        megapixels=rect.width * rect.height * (dpi / 72.0) ** 2 / 1e6,
+        image_megapixels=sum(img[2] * img[3] for img in page.get_images(full=True)) / 1e6,
+    )
+
+
+def tile_costs_from_index(tiles_index_path: Path) -> dict[str, float]:
+    """Estimated extraction cost per tile id in a ``tiles_index.json``.
+
+    Uses each tile's text-item count (what drives the model's output
+    length) and pixel size.  Tiles whose text layer cannot be read are
+    omitted, and so scheduled last.
+    """
+    if not tiles_index_path.exists():
+        return {}
+    costs: dict[str, float] = {}
+    for tiles in read_json(tiles_index_path).get("pages", {}).values():
+        for tile in tiles:
+            tile_id = str(tile.get("tile_id", ""))
+            try:
+                spans = len(load_text_layer(Path(tile["text_layer_path"])).get("items", []))
+            except (OSError, KeyError, ValueError):
+                continue
+            costs[tile_id] = estimate_cost(
+                drawings=0,
+                spans=spans,
+                megapixels=int(tile.get("image_width_px", 0))
+                * int(tile.get("image_height_px", 0))
+                / 1e6,
+            )
+    return costs
+
+
+def lpt_order(items: Iterable[T], cost: Callable[[T], float] | Mapping[T, float]) -> list[T]:
+    """*items* heaviest first; equal (or unknown, treated as 0) costs keep input order."""
+    lookup = cost.get if isinstance(cost, Mapping) else cost
+    return sorted(items, key=lambda item: -(lookup(item) or 0.0))  # type: ignore[operator]
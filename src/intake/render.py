@@ -0,0 +1,282 @@
+"""Tile rasterization helpers shared by the grid and adaptive tilers."""
+
+from __future__ import annotations
+
+import logging
+import math
+import statistics
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import fitz
+
+from .models import DpiPolicy, RenderMode
+from .render_cache import RenderCache, page_content_hash
+from ..utils.image_codec import (
+    ImageEncoding,
+    encode_within_budget,
+    png_scanlines,
+    write_png,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderedTile:
+    """Pixel size and encoded size of one rendered tile.
+
+    ``scale`` is below 1.0 when the byte budget forced a downscale after
+    rendering.  ``cached`` tiles were placed from the render cache.
+    """
+
+    width: int
+    height: int
+    banded: bool = False
+    nbytes: int = 0
+    scale: float = 1.0
+    cached: bool = False
+
+
+def raster_bytes(width: int, height: int, channels: int = 3) -> int:
+    """Bytes needed for one uncompressed ``width x height`` raster."""
+    return max(0, width) * max(0, height) * channels
+
+
+def choose_tile_dpi(
+    font_sizes: Iterable[float],
+    policy: DpiPolicy,
+    *,
+    ceiling: int | None = None,
+) -> int:
+    """DPI at which a tile's smallest text reaches ``policy.target_text_px``.
+
+    ``ceiling`` (normally the page DPI) further caps ``policy.max_dpi`` so a
+    cheaper page plan is never rendered above its own resolution.  Tiles
+    without text render at the floor.
+    """
+    max_dpi = policy.max_dpi if ceiling is None else min(policy.max_dpi, ceiling)
+    min_dpi = min(policy.min_dpi, max_dpi)
+    sizes = sorted(size for size in font_sizes if size > 0)
+    if not sizes:
+        return min_dpi
+    floor_size = statistics.median(sizes) * policy.outlier_ratio
+    smallest = next(size for size in sizes if size >= floor_size)
+    wanted = policy.target_text_px * 72.0 / smallest
+    stepped = math.ceil(wanted / policy.dpi_step) * policy.dpi_step
+    return max(min_dpi, min(max_dpi, stepped))
+
+
+class PageRenderer:
+    """Render tile clips from one page, by default at one DPI.
+
+    ``RenderMode.CLIP`` calls ``page.get_pixmap`` for every clip, which
+    re-interprets the page content stream each time.  ``RenderMode.DISPLAY_LIST``
+    records the page once into a :class:`fitz.DisplayList` and rasterizes every
+    clip from it; output pixels are identical to the per-clip render.
+    ``dpi`` is the default resolution; individual clips may pass their own
+    (see :func:`choose_tile_dpi`) and still share the display list.
+
+    When ``max_raster_bytes`` is set, any clip whose RGB raster would exceed
+    it is rendered in horizontal bands and streamed straight into the PNG
+    encoder, so no more than one band is ever held in memory.  Band edges
+    are pixel-aligned, but MuPDF anti-aliasing depends on the clip, so a
+    banded tile can differ from a single-pass render by a few levels along
+    diagonal linework.  Banding is only used above the cap, and only for the
+    PNG codecs; JPEG and WebP tiles are always encoded from one raster, so
+    the tiler splits their oversized clips into sub-tiles instead (see
+    :attr:`can_band`).  ``peak_raster_bytes`` and ``banded_tiles`` record
+    the largest raster allocated and the number of banded renders.
+
+    ``encoding`` selects the tile codec and byte budget (see
+    :mod:`src.utils.image_codec`); the default is plain RGB PNG.  Banded
+    tiles are never re-encoded to meet the budget.
+
+    With a ``cache`` (:class:`~src.intake.render_cache.RenderCache`) each
+    clip is first looked up by the page's content hash and render settings;
+    hits are linked into place without touching the page, misses are
+    rendered and published to the cache.
+    """
+
+    def __init__(
+        self,
+        page: fitz.Page,
+        *,
+        dpi: int,
+        mode: RenderMode = RenderMode.DISPLAY_LIST,
+        max_raster_bytes: int | None = None,
+        encoding: ImageEncoding | None = None,
+        cache: RenderCache | None = None,
+    ) -> None:
+        if dpi <= 0:
+            raise ValueError("dpi must be positive.")
+        if max_raster_bytes is not None and max_raster_bytes <= 0:
+            raise ValueError("max_raster_bytes must be positive when set.")
+        self.page = page
+        self.dpi = dpi
+        self.mode = RenderMode(mode)
+        self.max_raster_bytes = max_raster_bytes
+        self.encoding = encoding or ImageEncoding()
+        self.zoom = dpi / 72.0
+        self.matrix = fitz.Matrix(self.zoom, self.zoom)
+        self.cache = cache
+        self.cache_hits = 0
+        self.peak_raster_bytes = 0
+        self.banded_tiles = 0
+        self._display_list: fitz.DisplayList | None = None
+        self._page_hash: str | None = None
+
+    @property
+    def can_band(self) -> bool:
+        """Whether clips over ``max_raster_bytes`` can be band-rendered."""
+        return self.encoding.is_png
+
+    def _note_raster(self, width: int, height: int) -> None:
+        self.peak_raster_bytes = max(self.peak_raster_bytes, raster_bytes(width, height))
+
+    def _matrix(self, dpi: int | None) -> fitz.Matrix:
+        if dpi is None or dpi == self.dpi:
+            return self.matrix
+        if dpi <= 0:
+            raise ValueError("dpi must be positive.")
+        return fitz.Matrix(dpi / 72.0, dpi / 72.0)
+
+    def _source(self) -> fitz.Page | fitz.DisplayList:
+        if self.mode == RenderMode.CLIP:
+            return self.page
+        if self._display_list is None:
+            self._display_list = self.page.get_displaylist()
+        return self._display_list
+
+    def pixel_rect(self, clip: fitz.Rect, *, dpi: int | None = None) -> fitz.IRect:
+        """Integer pixel rectangle MuPDF allocates for *clip*."""
+        return (fitz.Rect(clip) * self._matrix(dpi)).irect
+
+    def render(self, clip: fitz.Rect, *, dpi: int | None = None) -> fitz.Pixmap:
+        """Rasterize *clip* in one pass."""
+        pix = self._source().get_pixmap(matrix=self._matrix(dpi), clip=clip, alpha=False)
+        self._note_raster(pix.width, pix.height)
+        return pix
+
+    def render_to_image(
+        self, clip: fitz.Rect, image_path: Path, *, dpi: int | None = None
+    ) -> RenderedTile:
+        """Rasterize *clip* at *dpi* (default: the renderer's) and encode it to *image_path*."""
+        matrix = self._matrix(dpi)
+        irect = self.pixel_rect(clip, dpi=dpi)
+        banded = (
+            self.max_raster_bytes is not None
+            and self.can_band
+            and raster_bytes(irect.width, irect.height) > self.max_raster_bytes
+        )
+        if self.cache is None:
+            return self._render_to_image(clip, image_path, matrix, irect, banded)
+
+        if self._page_hash is None:
+            self._page_hash = page_content_hash(self.page.parent, self.page.number)
+        key = self.cache.key(
+            self._page_hash, clip, dpi or self.dpi, self.encoding, banded=banded
+        )
+        meta = self.cache.fetch(key, self.encoding.suffix, image_path)
+        if meta is not None:
+            self.cache_hits += 1
+            return RenderedTile(
+                width=int(meta["width"]),
+                height=int(meta["height"]),
+                banded=bool(meta.get("banded", False)),
+                nbytes=image_path.stat().st_size,
+                scale=float(meta.get("scale", 1.0)),
+                cached=True,
+            )
+        rendered = self._render_to_image(clip, image_path, matrix, irect, banded)
+        self.cache.store(
+            key,
+            image_path,
+            {
+                "width": rendered.width,
+                "height": rendered.height,
+                "banded": rendered.banded,
+                "scale": rendered.scale,
+            },
+        )
+        return rendered
+
+    def _render_to_image(
+        self,
+        clip: fitz.Rect,
+        image_path: Path,
+        matrix: fitz.Matrix,
+        irect: fitz.IRect,
+        banded: bool,
+    ) -> RenderedTile:
+        # A previous tile at this path may be hard-linked to a cache entry;
+        # unlink it so the write below never modifies the cached file.
+        image_path.unlink(missing_ok=True)
+        if banded:
+            logger.debug(
+                "Banded render for %s: %dx%d px exceeds %d raster bytes.",
+                image_path.name,
+                irect.width,
+                irect.height,
+                self.max_raster_bytes,
+            )
+            with image_path.open("wb") as f:
+                write_png(
+                    f,
+                    irect.width,
+                    irect.height,
+                    self._iter_band_rows(clip, irect, matrix),
+                    self.encoding,
+                )
+            self.banded_tiles += 1
+            return RenderedTile(
+                width=irect.width,
+                height=irect.height,
+                banded=True,
+                nbytes=image_path.stat().st_size,
+            )
+
+        pix = self._source().get_pixmap(matrix=matrix, clip=clip, alpha=False)
+        self._note_raster(pix.width, pix.height)
+        data, encoded = encode_within_budget(pix, self.encoding)
+        image_path.write_bytes(data)
+        return RenderedTile(
+            width=encoded.width,
+            height=encoded.height,
+            nbytes=len(data),
+            scale=encoded.width / pix.width if pix.width else 1.0,
+        )
+
+    def _iter_band_rows(
+        self, clip: fitz.Rect, irect: fitz.IRect, matrix: fitz.Matrix
+    ) -> Iterator[bytes]:
+        """Yield filtered PNG scanlines in the renderer's codec, one band at a time."""
+        assert self.max_raster_bytes is not None
+        zoom = matrix.a
+        row_bytes = irect.width * 3
+        band_rows = max(1, self.max_raster_bytes // max(1, row_bytes))
+        source = self._source()
+
+        y = irect.y0
+        while y < irect.y1:
+            y_end = min(irect.y1, y + band_rows)
+            # Interior band edges sit exactly on pixel rows so the bands tile
+            # the clip's pixel rectangle without gaps or overlap.
+            band_clip = fitz.Rect(
+                clip.x0,
+                clip.y0 if y == irect.y0 else y / zoom,
+                clip.x1,
+                clip.y1 if y_end == irect.y1 else y_end / zoom,
+            )
+            pix = source.get_pixmap(matrix=matrix, clip=band_clip, alpha=False)
+            if pix.width != irect.width or pix.height != y_end - y:
+                raise RuntimeError(
+                    f"Band render misaligned: got {pix.width}x{pix.height}, "
+                    f"expected {irect.width}x{y_end - y}."
+                )
+            self._note_raster(pix.width, pix.height)
+            yield png_scanlines(pix, self.encoding)
+            del pix
+            y = y_end
+
@@ -0,0 +1,314 @@
+"""Content-addressed tile render cache shared across pipeline runs.
+
+Every pipeline run tiles into a fresh ``run_*`` directory, so re-running a
+plan set (a new model, a tweaked extraction prompt, a resubmittal where only
+a few sheets changed) used to rasterize every tile again even though the
+pixels could not have changed.  :class:`RenderCache` stores encoded tile
+images under a key built from:
+
+* the page's content hash (:func:`page_content_hash`: content streams and
+  every object they reach through ``/Resources`` and ``/Annots``, hashed
+  without object numbers, so an identical sheet in a re-saved or reordered
+  PDF still matches),
+* the clip rectangle, DPI and whether the tile is band-rendered,
+* the :class:`~src.utils.image_codec.ImageEncoding` (codec, quality, budget).
+
+A hit is hard-linked into the run's ``tiles/`` directory (copied when the
+cache is on another filesystem).  Entries are evicted least-recently-used
+once the cache exceeds ``max_bytes``; a hit refreshes the entry's mtime.
+Text layers are not cached: they are rebuilt from the page's span index in
+a few milliseconds per page, against roughly a second per page to render.
+
+``python -m src.intake.render_cache stats|prune --cache-dir DIR`` reports
+and trims the cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import fitz
+
+from ..config import RENDER_CACHE_MAX_BYTES
+from ..utils.image_codec import ImageEncoding
+from ..utils.io_json import canonical_json_sha256, read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_VERSION = 1
+
+_REF = re.compile(r"(\d+) (\d+) R")
+# Back-references (to the page tree, the owning page, structure and thumbnail
+# objects) do not change what the page draws and would pull the whole
+# document into the hash.
+_BACKREF_KEYS = frozenset(
+    {"Parent", "P", "Thumb", "B", "StructParent", "StructParents", "PieceInfo", "Metadata"}
+)
+_BACKREF = re.compile(
+    r"/(?:" + "|".join(sorted(_BACKREF_KEYS)) + r")\b\s*(?:\d+ \d+ R|\d+|\[[^\]]*\])"
+)
+# Streams are hashed decoded, so re-compressing a PDF on save does not change
+# the hash.  Image codecs stay encoded: decoding them is slow and saving
+# never re-encodes them.
+_STREAM_ENCODING_KEYS = frozenset({"Length", "Filter", "DecodeParms"})
+_IMAGE_FILTERS = ("DCTDecode", "JPXDecode", "JBIG2Decode", "CCITTFaxDecode")
+_INHERITED_KEYS = ("Resources", "MediaBox", "CropBox", "Rotate")
+
+
+class _ObjectHasher:
+    """Merkle hash of PDF objects with references replaced by target hashes.
+
+    Top-level dictionary keys are hashed in sorted order, since writers
+    (including PyMuPDF's own page copying) do not preserve key order.
+    """
+
+    def __init__(self, doc: fitz.Document) -> None:
+        self.doc = doc
+        self._memo: dict[int, str] = {}
+        self._active: set[int] = set()
+
+    def resolve(self, text: str) -> str:
+        return _REF.sub(lambda m: f"<{self.xref(int(m.group(1)))}>", _BACKREF.sub("", text))
+
+    def dictionary(self, xref: int, *, skip: frozenset[str] = frozenset()) -> str:
+        keys = self.doc.xref_get_keys(xref)
+        if not keys:
+            return self.resolve(self.doc.xref_object(xref, compressed=True))
+        return "".join(
+            f"/{key} {self.resolve(self.doc.xref_get_key(xref, key)[1])}"
+            for key in sorted(keys)
+            if key not in _BACKREF_KEYS and key not in skip
+        )
+
+    def xref(self, xref: int) -> str:
+        if xref in self._memo:
+            return self._memo[xref]
+        if xref in self._active or not (0 < xref < self.doc.xref_length()):
+            # Reference cycle or dangling reference: hash the position only.
+            return "cycle" if xref in self._active else "null"
+        self._active.add(xref)
+        try:
+            data = b""
+            skip: frozenset[str] = frozenset()
+            if self.doc.xref_is_stream(xref):
+                if any(name in self.doc.xref_get_key(xref, "Filter")[1] for name in _IMAGE_FILTERS):
+                    data = self.doc.xref_stream_raw(xref) or b""
+                else:
+                    skip = _STREAM_ENCODING_KEYS
+                    data = self.doc.xref_stream(xref) or b""
+            digest = hashlib.sha256(self.dictionary(xref, skip=skip).encode())
+            digest.update(data)
+            value = digest.hexdigest()
+        finally:
+            self._active.discard(xref)
+        self._memo[xref] = value
+        return value
+
+
+def page_content_hash(doc: fitz.Document, page_index: int) -> str:
+    """SHA-256 of everything that determines how page *page_index* renders.
+
+    Covers the page dictionary (content streams, resources, annotations,
+    boxes and rotation, including values inherited from the page tree) and
+    all objects reachable from it, with object numbers replaced by the
+    referenced object's hash.
+    """
+    page = doc[page_index]
+    hasher = _ObjectHasher(doc)
+    digest = hashlib.sha256(f"v{RENDER_CACHE_VERSION}".encode())
+    digest.update(hasher.dictionary(page.xref).encode())
+    present = set(doc.xref_get_keys(page.xref))
+    for key in _INHERITED_KEYS:
+        if key in present:
+            continue
+        node = page.xref
+        for _ in range(64):
+            kind, value = doc.xref_get_key(node, "Parent")
+            if kind != "xref":
+                break
+            node = int(value.split()[0])
+            kind, value = doc.xref_get_key(node, key)
+            if kind != "null":
+                digest.update(f"/{key} {hasher.resolve(value)}".encode())
+                break
+    digest.update(f"{tuple(page.rect)} {page.rotation}".encode())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class RenderCacheStats:
+    entries: int
+    total_bytes: int
+    max_bytes: int
+    oldest_age_s: float | None
+    newest_age_s: float | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class RenderCache:
+    """Directory of encoded tile images keyed by page content and render settings.
+
+    Each entry is ``<key[:2]>/<key><suffix>`` plus a ``<key>.json`` sidecar
+    holding the pixel size and budget scale.  The directory can be shared by
+    concurrent runs and tiling worker processes: entries are published with
+    an atomic rename and a key always maps to the same pixels, so racing
+    writers are harmless.
+    """
+
+    def __init__(self, cache_dir: Path, *, max_bytes: int = RENDER_CACHE_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(
+        page_hash: str,
+        clip: fitz.Rect,
+        dpi: int,
+        encoding: ImageEncoding,
+        *,
+        banded: bool = False,
+    ) -> str:
+        return canonical_json_sha256(
+            {
+                "version": RENDER_CACHE_VERSION,
+                "page": page_hash,
+                "clip": [round(v, 3) for v in fitz.Rect(clip)],
+                "dpi": dpi,
+                "banded": banded,
+                "encoding": encoding.to_dict(),
+            }
+        )
+
+    def _paths(self, key: str, suffix: str) -> tuple[Path, Path]:
+        folder = self.cache_dir / key[:2]
+        return folder / f"{key}{suffix}", folder / f"{key}.json"
+
+    def fetch(self, key: str, suffix: str, dest: Path) -> dict[str, Any] | None:
+        """Place the cached image for *key* at *dest*; its metadata, or ``None`` on a miss."""
+        image_path, meta_path = self._paths(key, suffix)
+        try:
+            meta = read_json(meta_path)
+            dest.unlink(missing_ok=True)
+            _link_or_copy(image_path, dest)
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        try:
+            os.utime(meta_path, (now, now))
+        except OSError:
+            pass
+        return meta
+
+    def store(self, key: str, source: Path, meta: dict[str, Any]) -> None:
+        """Publish the freshly rendered *source* image under *key*."""
+        image_path, meta_path = self._paths(key, source.suffix)
+        if meta_path.exists():
+            return
+        image_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = image_path.with_name(f".{image_path.name}.{os.getpid()}.tmp")
+        try:
+            _link_or_copy(source, tmp_path)
+            os.replace(tmp_path, image_path)
+            write_json_atomic(meta_path, meta, indent=None)
+        except OSError as exc:
+            logger.warning("Could not store %s in render cache: %s", source.name, exc)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _entries(self) -> list[tuple[float, int, list[Path]]]:
+        """``(last_used, bytes, files)`` per entry."""
+        entries = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for meta_path in self.cache_dir.glob("??/*.json"):
+            files = [meta_path] + [
+                path for path in meta_path.parent.glob(f"{meta_path.stem}.*") if path != meta_path
+            ]
+            try:
+                last_used = meta_path.stat().st_mtime
+                size = sum(path.stat().st_size for path in files)
+            except OSError:
+                continue
+            entries.append((last_used, size, files))
+        return entries
+
+    def stats(self) -> RenderCacheStats:
+        entries = self._entries()
+        now = time.time()
+        return RenderCacheStats(
+            entries=len(entries),
+            total_bytes=sum(size for _, size, _ in entries),
+            max_bytes=self.max_bytes,
+            oldest_age_s=round(now - min(e[0] for e in entries), 1) if entries else None,
+            newest_age_s=round(now - max(e[0] for e in entries), 1) if entries else None,
+        )
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Delete least-recently-used entries until the cache fits; returns entries removed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, files in entries:
+            if total <= limit:
+                break
+            for path in files:
+                path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info("Render cache: evicted %d entr%s.", removed, "y" if removed == 1 else "ies")
+        return removed
+
+
+def _link_or_copy(source: Path, dest: Path) -> None:
+    try:
+        os.link(source, dest)
+    except OSError:
+        shutil.copyfile(source, dest)
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Inspect or trim the shared tile render cache.")
+    parser.add_argument("command", choices=("stats", "prune"))
+    parser.add_argument("--cache-dir", type=Path, required=True, help="Render cache directory.")
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=RENDER_CACHE_MAX_BYTES / (1024 * 1024),
+        help="Size cap in MiB (prune trims to it; stats reports against it).",
+    )
+    return parser
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    args = _build_arg_parser().parse_args()
+    cache = RenderCache(args.cache_dir, max_bytes=int(args.max_mb * 1024 * 1024))
+    if args.command == "prune":
+        cache.evict()
+    stats = cache.stats()
+    print(
+        f"{stats.entries} entries, {stats.total_bytes / (1024 * 1024):.1f} MiB"
+        f" of {stats.max_bytes / (1024 * 1024):.0f} MiB"
+        f" ({stats.total_bytes / stats.max_bytes:.0%}) in {args.cache_dir}"
+    )
+    if stats.entries:
+        print(f"last used: newest {stats.newest_age_s:.0f}s ago, oldest {stats.oldest_age_s:.0f}s ago")
+
+
+if __name__ == "__main__":
+    main()
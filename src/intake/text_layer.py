@@ -5,15 +5,18 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import math
 from collections import Counter
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
 import fitz
 
-from .models import TextItem, TextLayer
+from .models import BBox, PageAnalysis, TextItem, TextLayer, TextLayerFormat
 from .. import config as _config
 from ..utils.cli import parse_pages_argument
+from ..utils.text_layer_pack import PACK_SUFFIX, pack_member_path, write_text_layer_pack
 from ..utils.unicode import clean_unicode
 
 COHERENCE_THRESHOLD = _config.COHERENCE_THRESHOLD
@@ -21,7 +24,8 @@ COHERENCE_THRESHOLD = _config.COHERENCE_THRESHOLD
 logger = logging.getLogger(__name__)
 
 
-def _iter_spans(text_dict: dict[str, Any]) -> list[dict[str, Any]]:
+def iter_spans(text_dict: dict[str, Any]) -> list[dict[str, Any]]:
+    """Every span of a PyMuPDF ``"dict"`` extraction, in reading order."""
     spans: list[dict[str, Any]] = []
     for block in text_dict.get("blocks", []):
         for line in block.get("lines", []):
@@ -30,17 +34,27 @@ def _iter_spans(text_dict: dict[str, Any]) -> list[dict[str, Any]]:
     return spans
 
 
-def _calculate_coherence_from_spans(
-    spans: list[dict[str, Any]],
+def iter_block_bboxes(text_dict: dict[str, Any]) -> list[BBox]:
+    """Bboxes of every block in a PyMuPDF ``"dict"`` extraction."""
+    block_bboxes: list[BBox] = []
+    for block in text_dict.get("blocks", []):
+        bbox = block.get("bbox")
+        if bbox and len(bbox) == 4:
+            block_bboxes.append((float(bbox[0]), float(bbox[1]), float(bbox[2]), float(bbox[3])))
+    return block_bboxes
+
+
+def _calculate_coherence_from_texts(
+    texts: Iterable[str],
+    fonts: Iterable[str],
 ) -> tuple[float, int, int, int, str]:
+    """Coherence metrics over already-cleaned span texts and their fonts."""
     total_spans = 0
     multi_char_spans = 0
     numeric_spans = 0
     font_counter: Counter[str] = Counter()
 
-    for span in spans:
-        raw_text = str(span.get("text", ""))
-        text = clean_unicode(raw_text).strip()
+    for text, raw_font in zip(texts, fonts):
         if not text:
             continue
 
@@ -50,7 +64,7 @@ def _calculate_coherence_from_spans(
         if len(text) > 1 and any(ch.isdigit() for ch in text):
             numeric_spans += 1
 
-        font = str(span.get("font", "")).strip()
+        font = raw_font.strip()
         if font:
             font_counter[font] += 1
 
@@ -59,13 +73,106 @@ def _calculate_coherence_from_spans(
     return coherence_score, total_spans, multi_char_spans, numeric_spans, primary_font
 
 
+def calculate_coherence_from_spans(
+    spans: list[dict[str, Any]],
+) -> tuple[float, int, int, int, str]:
+    """Coherence metrics over raw span dicts (see :func:`calculate_coherence`)."""
+    return _calculate_coherence_from_texts(
+        (clean_unicode(str(span.get("text", ""))).strip() for span in spans),
+        (str(span.get("font", "")) for span in spans),
+    )
+
+
 def calculate_coherence(text_dict: dict[str, Any]) -> tuple[float, int, int, int, str]:
     """
     Calculate text coherence from a PyMuPDF text dict.
 
     Coherence = multi_char_spans / total_spans
     """
-    return _calculate_coherence_from_spans(_iter_spans(text_dict))
+    return calculate_coherence_from_spans(iter_spans(text_dict))
+
+
+class PageSpanIndex:
+    """Text spans of one page, parsed once and bucketed for clip queries.
+
+    ``page.get_text("dict")`` is the expensive call in text-layer extraction.
+    The index runs it once per page and keeps each non-empty span's cleaned
+    text, bbox, font and size, plus the raw block bboxes used by adaptive
+    tiling.  Spans are registered in every cell of a uniform grid that their
+    bbox touches, so a clip query only tests spans from nearby cells.
+
+    Spans whose cleaned text is empty are dropped at build time; every
+    consumer (coherence scoring and text items) skips them anyway.
+    """
+
+    def __init__(
+        self,
+        spans: list[dict[str, Any]],
+        *,
+        block_bboxes: list[BBox] | None = None,
+        cell_size: float = 72.0,
+    ) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive.")
+        self.cell_size = cell_size
+        self.texts: list[str] = []
+        self.bboxes: list[BBox] = []
+        self.fonts: list[str] = []
+        self.sizes: list[float] = []
+        self.block_bboxes: list[BBox] = list(block_bboxes or [])
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+
+        for span in spans:
+            text = clean_unicode(str(span.get("text", ""))).strip()
+            if not text:
+                continue
+            raw_bbox = span.get("bbox", (0.0, 0.0, 0.0, 0.0))
+            bbox = (float(raw_bbox[0]), float(raw_bbox[1]), float(raw_bbox[2]), float(raw_bbox[3]))
+            idx = len(self.texts)
+            self.texts.append(text)
+            self.bboxes.append(bbox)
+            self.fonts.append(str(span.get("font", "")))
+            self.sizes.append(float(span.get("size", 0.0)))
+            for cell in self._cells(bbox):
+                self._buckets.setdefault(cell, []).append(idx)
+
+    @classmethod
+    def from_page(cls, page: fitz.Page, *, cell_size: float = 72.0) -> "PageSpanIndex":
+        """Parse *page* once and build its span index."""
+        text_dict = page.get_text("dict")
+        return cls(
+            iter_spans(text_dict),
+            block_bboxes=iter_block_bboxes(text_dict),
+            cell_size=cell_size,
+        )
+
+    @classmethod
+    def from_analysis(
+        cls, analysis: PageAnalysis, *, cell_size: float = 72.0
+    ) -> "PageSpanIndex":
+        """Rebuild the index from a cached :class:`PageAnalysis` without the page."""
+        return cls(analysis.spans, block_bboxes=analysis.block_bboxes, cell_size=cell_size)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _cells(self, bbox: BBox) -> list[tuple[int, int]]:
+        size = self.cell_size
+        x0, y0, x1, y1 = bbox
+        cx0, cx1 = math.floor(min(x0, x1) / size), math.floor(max(x0, x1) / size)
+        cy0, cy1 = math.floor(min(y0, y1) / size), math.floor(max(y0, y1) / size)
+        return [(cx, cy) for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1)]
+
+    def query(self, rect: fitz.Rect) -> list[int]:
+        """Return indices of spans intersecting *rect*, in page order.
+
+        Uses :meth:`fitz.Rect.intersects` on each candidate, so results match
+        a linear scan over the full-page spans exactly.
+        """
+        candidates: set[int] = set()
+        for cell in self._cells((rect.x0, rect.y0, rect.x1, rect.y1)):
+            candidates.update(self._buckets.get(cell, ()))
+        return [idx for idx in sorted(candidates) if fitz.Rect(self.bboxes[idx]).intersects(rect)]
 
 
 def extract_text_layer(
@@ -75,42 +182,55 @@ def extract_text_layer(
     *,
     tile_id: str | None = None,
     page_number: int | None = None,
+    span_index: PageSpanIndex | None = None,
+    bounds: fitz.Rect | None = None,
 ) -> TextLayer:
     """
     Extract all text spans from a page (or clipped region) with bounding boxes.
+
+    Pass a prebuilt ``span_index`` when slicing several regions from the same
+    page so the page text is parsed only once.  With ``bounds`` (the unmasked
+    content area, see :mod:`src.intake.masking`) spans whose centre falls
+    outside it are dropped.
     """
-    text_dict = page.get_text("dict", clip=clip)
+    if span_index is None:
+        span_index = PageSpanIndex.from_page(page)
 
     if clip is None:
-        combined_spans = list(_iter_spans(text_dict))
+        selected = list(range(len(span_index)))
     else:
         # Build tile spans from full-page text and spatial intersection only.
         # This avoids clip-induced truncation like "TALL 342..." at boundaries.
         padded = fitz.Rect(clip.x0 - 5.0, clip.y0 - 5.0, clip.x1 + 5.0, clip.y1 + 5.0)
-        full_text_dict = page.get_text("dict")
-        combined_spans = []
+        selected = []
         seen_keys: set[tuple[str, tuple[float, float, float, float]]] = set()
-        for span in _iter_spans(full_text_dict):
-            raw_bbox = span.get("bbox", (0.0, 0.0, 0.0, 0.0))
-            x0 = float(raw_bbox[0])
-            y0 = float(raw_bbox[1])
-            x1 = float(raw_bbox[2])
-            y1 = float(raw_bbox[3])
-            span_rect = fitz.Rect(x0, y0, x1, y1)
-            if not span_rect.intersects(padded):
-                continue
-
+        for idx in span_index.query(padded):
+            x0, y0, x1, y1 = span_index.bboxes[idx]
             key = (
-                clean_unicode(str(span.get("text", ""))).strip(),
+                span_index.texts[idx],
                 (round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2)),
             )
             if key in seen_keys:
                 continue
             seen_keys.add(key)
-            combined_spans.append(span)
+            selected.append(idx)
+    if bounds is not None:
+        selected = [
+            idx
+            for idx in selected
+            if bounds.contains(
+                fitz.Point(
+                    (span_index.bboxes[idx][0] + span_index.bboxes[idx][2]) / 2.0,
+                    (span_index.bboxes[idx][1] + span_index.bboxes[idx][3]) / 2.0,
+                )
+            )
+        ]
 
     coherence_score, total_spans, multi_char_spans, numeric_spans, primary_font = (
-        _calculate_coherence_from_spans(combined_spans)
+        _calculate_coherence_from_texts(
+            (span_index.texts[idx] for idx in selected),
+            (span_index.fonts[idx] for idx in selected),
+        )
     )
 
     if page_number is None:
@@ -120,29 +240,19 @@ def extract_text_layer(
 
     origin_x, origin_y = clip_origin
     items: list[TextItem] = []
-    text_id = 0
-
-    for span in combined_spans:
-        text = clean_unicode(str(span.get("text", ""))).strip()
-        if not text:
-            continue
-
-        raw_bbox = span.get("bbox", (0.0, 0.0, 0.0, 0.0))
-        x0, y0, x1, y1 = (float(raw_bbox[0]), float(raw_bbox[1]), float(raw_bbox[2]), float(raw_bbox[3]))
-        bbox_global = (x0, y0, x1, y1)
-        bbox_local = (x0 - origin_x, y0 - origin_y, x1 - origin_x, y1 - origin_y)
 
+    for text_id, idx in enumerate(selected):
+        x0, y0, x1, y1 = span_index.bboxes[idx]
         items.append(
             TextItem(
                 text_id=text_id,
-                text=text,
-                bbox_local=bbox_local,
-                bbox_global=bbox_global,
-                font=str(span.get("font", "")),
-                font_size=float(span.get("size", 0.0)),
+                text=span_index.texts[idx],
+                bbox_local=(x0 - origin_x, y0 - origin_y, x1 - origin_x, y1 - origin_y),
+                bbox_global=(x0, y0, x1, y1),
+                font=span_index.fonts[idx],
+                font_size=span_index.sizes[idx],
             )
         )
-        text_id += 1
 
     return TextLayer(
         tile_id=tile_id,
@@ -164,14 +274,53 @@ def save_text_layer_json(text_layer: TextLayer, output_path: Path) -> None:
         json.dump(text_layer.to_dict(), f, indent=2, ensure_ascii=False)
 
 
+class TextLayerWriter:
+    """Persist one page's tile text layers as JSON files or a single pack.
+
+    With :attr:`TextLayerFormat.JSON` each layer is written immediately to
+    ``{tile_id}.json``.  With :attr:`TextLayerFormat.PACK` layers are buffered
+    and written to ``p{page}.tlpk`` on :meth:`close`; :meth:`add` returns the
+    member path that addresses the tile inside that pack.
+    """
+
+    def __init__(
+        self,
+        text_layers_dir: Path,
+        page_number: int,
+        text_layer_format: TextLayerFormat = TextLayerFormat.JSON,
+    ) -> None:
+        self.text_layers_dir = text_layers_dir
+        self.text_layer_format = TextLayerFormat(text_layer_format)
+        self.pack_path = text_layers_dir / f"p{page_number}{PACK_SUFFIX}"
+        self._pending: list[dict[str, Any]] = []
+
+    def add(self, text_layer: TextLayer) -> Path:
+        if self.text_layer_format == TextLayerFormat.PACK:
+            self._pending.append(text_layer.to_dict())
+            return pack_member_path(self.pack_path, text_layer.tile_id)
+        output_path = self.text_layers_dir / f"{text_layer.tile_id}.json"
+        save_text_layer_json(text_layer, output_path)
+        return output_path
+
+    def close(self) -> None:
+        if self._pending:
+            write_text_layer_pack(self._pending, self.pack_path)
+            self._pending = []
+
+
 def score_pdf_coherence(
     pdf_path: Path,
     *,
     pages: list[int] | None = None,
     output_dir: Path | None = None,
     write_page_json: bool = True,
+    page_analyses: dict[int, PageAnalysis] | None = None,
 ) -> list[dict[str, Any]]:
-    """Score page-level text coherence across a PDF."""
+    """Score page-level text coherence across a PDF.
+
+    Pages present in *page_analyses* reuse the cached spans instead of
+    re-parsing the page text.
+    """
     results: list[dict[str, Any]] = []
     with fitz.open(pdf_path) as doc:
         page_numbers = pages or list(range(1, len(doc) + 1))
@@ -185,12 +334,14 @@ def score_pdf_coherence(
 
         for page_number in page_numbers:
             page = doc[page_number - 1]
+            analysis = (page_analyses or {}).get(page_number)
             text_layer = extract_text_layer(
                 page,
                 clip=None,
                 clip_origin=(0.0, 0.0),
                 tile_id=f"p{page_number}_full",
                 page_number=page_number,
+                span_index=PageSpanIndex.from_analysis(analysis) if analysis else None,
             )
 
             if page_output_dir and write_page_json:
@@ -0,0 +1,91 @@
+"""Blank and near-empty tile detection ahead of extraction.
+
+Grid tiling routinely produces tiles that hold only margin, white space or a
+piece of the sheet border.  Each would still cost a vision call, so the tiler
+scores every tile on three cheap signals and marks near-empty ones
+``skipped_empty`` in ``tiles_index.json``; the batch runner then records them
+without calling the model.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import fitz
+
+from .models import BBox, EmptyTilePolicy, TextLayer, TileContentScore
+from .render import PageRenderer
+
+
+def count_clip_drawings(
+    drawing_bboxes: Sequence[BBox],
+    clip: fitz.Rect,
+    page_rect: fitz.Rect,
+    *,
+    frame_area_ratio: float,
+    limit: int | None = None,
+) -> int:
+    """Count drawings whose bbox touches *clip*, ignoring page-sized frames.
+
+    Counting stops once ``limit`` is exceeded, so dense tiles cost only a few
+    comparisons.
+    """
+    frame_area = page_rect.width * page_rect.height * frame_area_ratio
+    count = 0
+    for x0, y0, x1, y1 in drawing_bboxes:
+        if x0 > clip.x1 or x1 < clip.x0 or y0 > clip.y1 or y1 < clip.y0:
+            continue
+        if (x1 - x0) * (y1 - y0) >= frame_area:
+            continue
+        count += 1
+        if limit is not None and count > limit:
+            break
+    return count
+
+
+def ink_coverage(renderer: PageRenderer, clip: fitz.Rect, *, dpi: int) -> float:
+    """Mean ink density (0 = white, 1 = solid black) of a low-resolution render of *clip*.
+
+    Density rather than a non-white pixel count keeps thin linework such as
+    the sheet border from being inflated by anti-aliasing at preview DPI.
+    """
+    pix = renderer.render(clip, dpi=dpi)
+    samples = pix.samples
+    if not samples:
+        return 0.0
+    return 1.0 - sum(samples) / (255.0 * len(samples))
+
+
+def score_tile_content(
+    renderer: PageRenderer,
+    clip: fitz.Rect,
+    text_layer: TextLayer,
+    drawing_bboxes: Sequence[BBox],
+    policy: EmptyTilePolicy,
+) -> TileContentScore:
+    """Score one tile; the ink preview is only rendered when text and drawings are sparse."""
+    text_items = len(text_layer.items)
+    drawings = count_clip_drawings(
+        drawing_bboxes,
+        clip,
+        renderer.page.rect,
+        frame_area_ratio=policy.frame_area_ratio,
+        limit=policy.max_drawings,
+    )
+    if text_items > policy.max_text_items or drawings > policy.max_drawings:
+        return TileContentScore(text_items=text_items, drawings=drawings)
+    return TileContentScore(
+        text_items=text_items,
+        drawings=drawings,
+        ink_coverage=round(ink_coverage(renderer, clip, dpi=policy.ink_dpi), 6),
+    )
+
+
+def is_empty_tile(score: TileContentScore, policy: EmptyTilePolicy) -> bool:
+    """``True`` when every content signal is at or below the policy limits."""
+    return (
+        score.text_items <= policy.max_text_items
+        and score.drawings <= policy.max_drawings
+        and score.ink_coverage is not None
+        and score.ink_coverage <= policy.max_ink_coverage
+    )
@@ -0,0 +1,112 @@
+"""Model-aware tile geometry: grid, overlap and DPI sized to a model's image budget.
+
+Vision endpoints downscale any image larger than their native input size
+before the model sees it, so pixels rendered beyond that are uploaded and
+paid for but never read.  A 2x3 grid at 300 DPI on an ARCH D sheet yields
+~15 MP tiles, which a 2048 px endpoint shrinks to an effective ~150 DPI.
+:func:`plan_tile_geometry` instead picks, per page, the grid and DPI whose
+tiles arrive at the model's native resolution: the highest DPI that fits
+the :class:`ImageBudget` within the page's tile-count limit, adding tiles
+only when even the DPI floor would not fit.
+"""
+
+from __future__ import annotations
+
+import math
+
+import fitz
+
+from ..config import TILE_IMAGE_BUDGETS, TILE_PLAN_MIN_DPI, TILE_PLAN_OVERLAP_PT
+from .models import ImageBudget, TilePlan
+
+# Larger grids are never needed: at 150 DPI a 36x48 in sheet fits the
+# smallest budget with 6x5 tiles.
+_MAX_GRID_SIDE = 12
+
+
+def image_budget_for_tier(model_tier: str) -> ImageBudget:
+    """:class:`ImageBudget` for a manifest model tier (``standard`` when unknown)."""
+    long_edge, megapixels = TILE_IMAGE_BUDGETS.get(model_tier, TILE_IMAGE_BUDGETS["standard"])
+    return ImageBudget(max_long_edge_px=long_edge, max_megapixels=megapixels)
+
+
+def fit_dpi(width_pt: float, height_pt: float, budget: ImageBudget) -> int:
+    """Highest whole DPI at which a ``width_pt x height_pt`` clip fits *budget*.
+
+    One pixel of slack is left on the long edge because rendered sizes round
+    up.
+    """
+    if width_pt <= 0 or height_pt <= 0:
+        raise ValueError("Clip dimensions must be positive.")
+    by_edge = (budget.max_long_edge_px - 1) * 72.0 / max(width_pt, height_pt)
+    by_area = math.sqrt(budget.max_megapixels * 1_000_000 / (width_pt * height_pt)) * 72.0
+    return max(1, math.floor(min(by_edge, by_area)))
+
+
+def _overlap_pct(base_w: float, base_h: float, overlap_pt: float) -> float:
+    # _compute_tile_clips extends each interior edge by base * overlap_pct, so
+    # neighbours share 2 * base * overlap_pct; size it on the shorter base so
+    # both axes share at least overlap_pt.
+    return round(min(0.25, overlap_pt / (2.0 * min(base_w, base_h))), 4)
+
+
+def _largest_tile(
+    page_rect: fitz.Rect,
+    rows: int,
+    cols: int,
+    overlap_pct: float,
+) -> tuple[float, float]:
+    base_w = page_rect.width / cols
+    base_h = page_rect.height / rows
+    # Interior tiles carry overlap on both sides, edge tiles on one.
+    return (
+        base_w * (1.0 + overlap_pct * min(2, cols - 1)),
+        base_h * (1.0 + overlap_pct * min(2, rows - 1)),
+    )
+
+
+def plan_tile_geometry(
+    page_rect: fitz.Rect,
+    budget: ImageBudget,
+    *,
+    max_dpi: int,
+    max_tiles: int,
+    min_dpi: int = TILE_PLAN_MIN_DPI,
+    overlap_pt: float = TILE_PLAN_OVERLAP_PT,
+) -> TilePlan:
+    """Grid, overlap and DPI whose tiles fit *budget* at the highest useful DPI.
+
+    Among grids of at most ``max_tiles`` tiles, picks the one allowing the
+    highest DPI (capped at ``max_dpi``), preferring fewer tiles on ties.  When
+    no such grid reaches ``min_dpi`` the smallest grid that does is used, so
+    text never drops below the floor just to hold the tile count.  Adjacent
+    tiles share at least ``overlap_pt`` points.
+    """
+    if max_tiles < 1:
+        raise ValueError("max_tiles must be >= 1.")
+    min_dpi = min(min_dpi, max_dpi)
+    candidates: list[tuple[int, int, int, float]] = []
+    for rows in range(1, _MAX_GRID_SIDE + 1):
+        for cols in range(1, _MAX_GRID_SIDE + 1):
+            base_w = page_rect.width / cols
+            base_h = page_rect.height / rows
+            overlap = _overlap_pct(base_w, base_h, overlap_pt) if rows * cols > 1 else 0.0
+            tile_w, tile_h = _largest_tile(page_rect, rows, cols, overlap)
+            dpi = min(max_dpi, fit_dpi(tile_w, tile_h, budget))
+            candidates.append((rows, cols, dpi, overlap))
+
+    def _rank(candidate: tuple[int, int, int, float]) -> tuple[int, int, int]:
+        rows, cols, dpi, _ = candidate
+        # Highest DPI, then fewest tiles, then the squarer grid.
+        return (-dpi, rows * cols, abs(rows - cols))
+
+    within = [c for c in candidates if c[0] * c[1] <= max_tiles and c[2] >= min_dpi]
+    if within:
+        rows, cols, dpi, overlap = min(within, key=_rank)
+    else:
+        reaching = [c for c in candidates if c[2] >= min_dpi]
+        pool = reaching or candidates
+        rows, cols, dpi, overlap = min(
+            pool, key=lambda c: (c[0] * c[1], -c[2], abs(c[0] - c[1]))
+        )
+    return TilePlan(dpi=dpi, grid_rows=rows, grid_cols=cols, overlap_pct=overlap)
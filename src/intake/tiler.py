@@ -5,17 +5,63 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import math
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
 import fitz
-
-from .models import TileInfo, TilingStrategy, TitleBlockCrop
-from .text_layer import COHERENCE_THRESHOLD, extract_text_layer, save_text_layer_json
+import numpy as np
+
+from .models import (
+    BBox,
+    DpiPolicy,
+    EmptyTilePolicy,
+    ImageBudget,
+    MaskPolicy,
+    PageAnalysis,
+    PageMask,
+    RenderMode,
+    TextLayer,
+    TextLayerFormat,
+    TileContentScore,
+    TileInfo,
+    TilePlan,
+    TileStatus,
+    TilingStrategy,
+    TitleBlockCrop,
+)
+from .masking import detect_page_mask
+from .page_cost import estimate_page_cost, lpt_order
+from .render import PageRenderer, choose_tile_dpi, raster_bytes
+from .render_cache import RenderCache
+from .text_layer import (
+    COHERENCE_THRESHOLD,
+    PageSpanIndex,
+    TextLayerWriter,
+    extract_text_layer,
+)
+from .tile_filter import is_empty_tile, score_tile_content
+from .tile_planner import fit_dpi, image_budget_for_tier, plan_tile_geometry
+from ..config import (
+    ADAPTIVE_DPI_MIN,
+    ADAPTIVE_DPI_TARGET_TEXT_PX,
+    ADAPTIVE_REGION_GRID_COLS,
+    ADAPTIVE_REGION_GRID_ROWS,
+    MAX_RASTER_BYTES,
+    RENDER_CACHE_MAX_BYTES,
+    TILE_IMAGE_BUDGETS,
+)
 from ..utils.cli import parse_pages_argument
+from ..utils.image_codec import ImageCodec, ImageEncoding, codec_available
+from ..utils.memory import peak_rss_bytes, reset_peak_rss
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the sub-tiles one clip is split into to fit the raster cap.
+_MAX_SPLIT_TILES = 256
+
 
 def _compute_tile_clips(
     page_rect: fitz.Rect,
@@ -26,6 +72,8 @@ def _compute_tile_clips(
 ) -> list[tuple[int, int, fitz.Rect]]:
     page_width = page_rect.width
     page_height = page_rect.height
+    left = page_rect.x0
+    top = page_rect.y0
 
     base_w = page_width / grid_cols
     base_h = page_height / grid_rows
@@ -35,20 +83,163 @@ def _compute_tile_clips(
     clips: list[tuple[int, int, fitz.Rect]] = []
     for row in range(grid_rows):
         for col in range(grid_cols):
-            x0 = col * base_w - (overlap_w if col > 0 else 0.0)
-            y0 = row * base_h - (overlap_h if row > 0 else 0.0)
-            x1 = (col + 1) * base_w + (overlap_w if col < grid_cols - 1 else 0.0)
-            y1 = (row + 1) * base_h + (overlap_h if row < grid_rows - 1 else 0.0)
-
-            x0 = max(0.0, x0)
-            y0 = max(0.0, y0)
-            x1 = min(page_width, x1)
-            y1 = min(page_height, y1)
+            x0 = left + col * base_w - (overlap_w if col > 0 else 0.0)
+            y0 = top + row * base_h - (overlap_h if row > 0 else 0.0)
+            x1 = left + (col + 1) * base_w + (overlap_w if col < grid_cols - 1 else 0.0)
+            y1 = top + (row + 1) * base_h + (overlap_h if row < grid_rows - 1 else 0.0)
+
+            x0 = max(left, x0)
+            y0 = max(top, y0)
+            x1 = min(page_rect.x1, x1)
+            y1 = min(page_rect.y1, y1)
             clips.append((row, col, fitz.Rect(x0, y0, x1, y1)))
 
     return clips
 
 
+def _fit_grid_to_raster(
+    rect: fitz.Rect,
+    *,
+    grid_rows: int,
+    grid_cols: int,
+    overlap_pct: float,
+    dpi: int,
+    max_raster_bytes: int,
+) -> tuple[int, int]:
+    """Refine a ``grid_rows x grid_cols`` grid over *rect* until every cell fits the cap.
+
+    Cells are sized as :func:`_compute_tile_clips` cuts them, overlap
+    included, at *dpi*.  Rows or columns are added one at a time across the
+    cells' longer side so sub-tiles stay close to square.
+    """
+    zoom = dpi / 72.0
+    rows, cols = grid_rows, grid_cols
+    while rows * cols < _MAX_SPLIT_TILES:
+        clips = [
+            clip
+            for _, _, clip in _compute_tile_clips(
+                rect, grid_rows=rows, grid_cols=cols, overlap_pct=overlap_pct
+            )
+        ]
+        width = max(clip.width for clip in clips) * zoom
+        height = max(clip.height for clip in clips) * zoom
+        # +1: MuPDF's pixel rect can round outward on both edges.
+        if raster_bytes(math.ceil(width) + 1, math.ceil(height) + 1) <= max_raster_bytes:
+            break
+        if height >= width:
+            rows += 1
+        else:
+            cols += 1
+    return rows, cols
+
+
+def _split_regions_for_raster(
+    regions: list[fitz.Rect],
+    *,
+    overlap_pct: float,
+    dpi: int,
+    max_raster_bytes: int,
+) -> list[fitz.Rect]:
+    """Replace each region whose raster exceeds the cap with overlapping sub-regions."""
+    split: list[fitz.Rect] = []
+    for region in regions:
+        rows, cols = _fit_grid_to_raster(
+            region,
+            grid_rows=1,
+            grid_cols=1,
+            overlap_pct=overlap_pct,
+            dpi=dpi,
+            max_raster_bytes=max_raster_bytes,
+        )
+        split.extend(
+            clip
+            for _, _, clip in _compute_tile_clips(
+                region, grid_rows=rows, grid_cols=cols, overlap_pct=overlap_pct
+            )
+        )
+    return split
+
+
+def _tile_dpi(
+    text_layer: TextLayer,
+    dpi: int,
+    dpi_policy: DpiPolicy | None,
+    clip: fitz.Rect | None = None,
+    image_budget: ImageBudget | None = None,
+) -> int:
+    """Render DPI for one tile: *dpi*, or the policy's choice capped at *dpi*.
+
+    With an *image_budget* the result is further capped so *clip* renders
+    within it.
+    """
+    if dpi_policy is not None:
+        dpi = choose_tile_dpi(
+            (item.font_size for item in text_layer.items), dpi_policy, ceiling=dpi
+        )
+    if image_budget is not None and clip is not None and not clip.is_empty:
+        dpi = min(dpi, fit_dpi(clip.width, clip.height, image_budget))
+    return dpi
+
+
+def _tile_content_status(
+    renderer: PageRenderer,
+    clip: fitz.Rect,
+    text_layer: TextLayer,
+    drawing_bboxes: list[BBox] | None,
+    policy: EmptyTilePolicy | None,
+) -> tuple[TileStatus, TileContentScore | None]:
+    """Score a tile against *policy*; ``(OK, None)`` when no policy is set."""
+    if policy is None:
+        return TileStatus.OK, None
+    score = score_tile_content(renderer, clip, text_layer, drawing_bboxes or [], policy)
+    if is_empty_tile(score, policy):
+        logger.debug("Tile %s marked skipped_empty: %s", text_layer.tile_id, score)
+        return TileStatus.SKIPPED_EMPTY, score
+    return TileStatus.OK, score
+
+
+def _log_page_render(
+    renderer: PageRenderer, page_number: int, tile_count: int, *, split_tiles: int = 0
+) -> None:
+    """Report render-cache hits and the page's memory high-water marks.
+
+    Peak RSS is measured since the page started (see
+    :func:`~src.utils.memory.reset_peak_rss`); the raster figure is the
+    largest single pixmap the renderer allocated.
+    """
+    if renderer.cache is not None:
+        logger.debug(
+            "Page %s: %d/%d tile(s) from render cache.",
+            page_number,
+            renderer.cache_hits,
+            tile_count,
+        )
+    peak = peak_rss_bytes()
+    logger.info(
+        "Page %s: peak RSS %s, largest raster %.1f MiB (%d banded, %d split tile(s)).",
+        page_number,
+        f"{peak / (1024 * 1024):.0f} MiB" if peak is not None else "n/a",
+        renderer.peak_raster_bytes / (1024 * 1024),
+        renderer.banded_tiles,
+        split_tiles,
+    )
+
+
+def _page_mask(
+    page: fitz.Page,
+    drawing_bboxes: list[BBox] | None,
+    policy: MaskPolicy | None,
+) -> tuple[PageMask | None, fitz.Rect | None]:
+    """Detected :class:`PageMask` and its content rect, or ``(None, None)`` unmasked."""
+    if policy is None:
+        return None, None
+    mask = detect_page_mask(page.rect, drawing_bboxes or [], policy)
+    if mask.title_block is None and mask.border is None:
+        return mask, None
+    logger.debug("Page %s masked to %s", page.number + 1, mask.content_rect)
+    return mask, fitz.Rect(mask.content_rect)
+
+
 def tile_page(
     doc: fitz.Document,
     page_index: int,
@@ -57,8 +248,46 @@ def tile_page(
     grid_rows: int = 2,
     grid_cols: int = 3,
     overlap_pct: float = 0.10,
+    *,
+    span_index: PageSpanIndex | None = None,
+    render_mode: RenderMode = RenderMode.DISPLAY_LIST,
+    max_raster_bytes: int | None = None,
+    text_layer_format: TextLayerFormat = TextLayerFormat.JSON,
+    dpi_policy: DpiPolicy | None = None,
+    empty_tile_policy: EmptyTilePolicy | None = None,
+    drawing_bboxes: list[BBox] | None = None,
+    mask_policy: MaskPolicy | None = None,
+    image_budget: ImageBudget | None = None,
+    image_encoding: ImageEncoding | None = None,
+    render_cache: RenderCache | None = None,
+    tile_id_prefix: str = "",
 ) -> list[TileInfo]:
-    """Extract PNG + text-layer tiles from one page."""
+    """Extract PNG + text-layer tiles from one page.
+
+    ``span_index`` is the page's parsed text; it is built here when omitted
+    and shared by every tile so the page text is parsed once.
+    ``render_mode`` and ``max_raster_bytes`` are passed to
+    :class:`~src.intake.render.PageRenderer`.  ``text_layer_format`` selects
+    per-tile JSON files or one ``p{page}.tlpk`` pack per page (see
+    :class:`~src.intake.text_layer.TextLayerWriter`).  With a ``dpi_policy``
+    each tile renders at the DPI its text layer's font sizes call for, capped
+    at ``dpi`` (see :func:`~src.intake.render.choose_tile_dpi`).  With an
+    ``empty_tile_policy`` near-empty tiles are marked
+    :attr:`TileStatus.SKIPPED_EMPTY`; ``drawing_bboxes`` (cached vector
+    drawing bboxes) saves re-reading the page's drawings for that check.
+    With a ``mask_policy`` the grid covers only the content left after
+    masking the title block (and border), text outside it is dropped from
+    the text layers, and the :class:`PageMask` is recorded on every tile.
+    With an ``image_budget`` no tile renders larger than the budget allows
+    (see :func:`~src.intake.tile_planner.fit_dpi`).  ``image_encoding``
+    selects the tile codec and per-tile byte budget (default: RGB PNG).
+    With a ``render_cache`` tiles already rendered by an earlier run are
+    linked in instead of re-rendered.  ``tile_id_prefix`` is prepended to
+    every tile id (``d2_`` for a multi-PDF run's second document, see
+    :mod:`src.intake.documents`).  When ``max_raster_bytes`` is set and
+    the codec cannot be band-rendered (JPEG, WebP) the grid is refined until
+    every tile's raster fits the cap.
+    """
     if grid_rows <= 0 or grid_cols <= 0:
         raise ValueError("grid_rows and grid_cols must be positive.")
     if not (0.0 <= overlap_pct < 1.0):
@@ -66,29 +295,58 @@ def tile_page(
 
     page = doc[page_index]
     page_number = page_index + 1
+    if span_index is None:
+        span_index = PageSpanIndex.from_page(page)
+    if (empty_tile_policy is not None or mask_policy is not None) and drawing_bboxes is None:
+        drawing_bboxes = _page_drawing_bboxes(page)
+    mask, content_rect = _page_mask(page, drawing_bboxes, mask_policy)
 
     tiles_dir = output_dir / "tiles"
     text_layers_dir = output_dir / "text_layers"
     tiles_dir.mkdir(parents=True, exist_ok=True)
     text_layers_dir.mkdir(parents=True, exist_ok=True)
 
-    zoom = dpi / 72.0
-    matrix = fitz.Matrix(zoom, zoom)
+    renderer = PageRenderer(
+        page,
+        dpi=dpi,
+        mode=render_mode,
+        max_raster_bytes=max_raster_bytes,
+        encoding=image_encoding,
+        cache=render_cache,
+    )
+    grid_rect = content_rect or page.rect
+    split_tiles = 0
+    if max_raster_bytes is not None and not renderer.can_band:
+        fitted = _fit_grid_to_raster(
+            grid_rect,
+            grid_rows=grid_rows,
+            grid_cols=grid_cols,
+            overlap_pct=overlap_pct,
+            dpi=dpi,
+            max_raster_bytes=max_raster_bytes,
+        )
+        if fitted != (grid_rows, grid_cols):
+            split_tiles = fitted[0] * fitted[1] - grid_rows * grid_cols
+            logger.debug(
+                "Page %s: grid refined from %dx%d to %dx%d to fit the raster cap.",
+                page_number,
+                grid_rows,
+                grid_cols,
+                *fitted,
+            )
+            grid_rows, grid_cols = fitted
     clips = _compute_tile_clips(
-        page.rect,
+        grid_rect,
         grid_rows=grid_rows,
         grid_cols=grid_cols,
         overlap_pct=overlap_pct,
     )
 
+    writer = TextLayerWriter(text_layers_dir, page_number, text_layer_format)
     tile_infos: list[TileInfo] = []
     for row, col, clip in clips:
-        tile_id = f"p{page_number}_r{row}_c{col}"
-        image_path = tiles_dir / f"{tile_id}.png"
-        text_layer_path = text_layers_dir / f"{tile_id}.json"
-
-        pix = page.get_pixmap(matrix=matrix, clip=clip, alpha=False)
-        pix.save(str(image_path))
+        tile_id = f"{tile_id_prefix}p{page_number}_r{row}_c{col}"
+        image_path = tiles_dir / f"{tile_id}{renderer.encoding.suffix}"
 
         text_layer = extract_text_layer(
             page,
@@ -96,8 +354,15 @@ def tile_page(
             clip_origin=(clip.x0, clip.y0),
             tile_id=tile_id,
             page_number=page_number,
+            span_index=span_index,
+            bounds=content_rect,
+        )
+        tile_dpi = _tile_dpi(text_layer, dpi, dpi_policy, clip, image_budget)
+        rendered = renderer.render_to_image(clip, image_path, dpi=tile_dpi)
+        text_layer_path = writer.add(text_layer)
+        status, content = _tile_content_status(
+            renderer, clip, text_layer, drawing_bboxes, empty_tile_policy
         )
-        save_text_layer_json(text_layer, text_layer_path)
 
         tile_infos.append(
             TileInfo(
@@ -108,134 +373,189 @@ def tile_page(
                 clip_rect=(clip.x0, clip.y0, clip.x1, clip.y1),
                 image_path=image_path,
                 text_layer_path=text_layer_path,
-                image_width_px=pix.width,
-                image_height_px=pix.height,
+                image_width_px=rendered.width,
+                image_height_px=rendered.height,
+                dpi=round(tile_dpi * rendered.scale),
+                status=status,
+                content=content,
+                mask=mask,
             )
         )
 
+    writer.close()
+    _log_page_render(renderer, page_number, len(tile_infos), split_tiles=split_tiles)
     return tile_infos
 
 
-def _build_occupancy_grid(
+def _page_drawing_bboxes(page: fitz.Page) -> list[BBox]:
+    """Bboxes of every vector drawing on *page* (empty when unreadable)."""
+    bboxes: list[BBox] = []
+    try:
+        for drawing in page.get_drawings():
+            r = drawing.get("rect") or fitz.Rect()
+            bboxes.append((r.x0, r.y0, r.x1, r.y1))
+    except Exception:  # pragma: no cover – defensive for unusual PDFs
+        pass
+    return bboxes
+
+
+def _collect_content_bboxes(
     page: fitz.Page,
     *,
-    grid_cols: int,
-    grid_rows: int,
-) -> tuple[list[list[bool]], fitz.Rect, float, float]:
-    """Build boolean occupancy grid from drawings and text blocks.
+    span_index: PageSpanIndex | None = None,
+    drawing_bboxes: list[BBox] | None = None,
+) -> list[BBox]:
+    """Vector drawing bboxes followed by text block bboxes for one page.
 
     Args:
         page: Open fitz.Page.
-        grid_cols: Number of horizontal cells in the occupancy grid.
-        grid_rows: Number of vertical cells in the occupancy grid.
-
-    Returns:
-        A 4-tuple of ``(occupied, page_rect, cell_w, cell_h)`` where
-        ``occupied`` is a ``grid_rows x grid_cols`` boolean grid.
+        span_index: Parsed page text supplying the text block bboxes.  Built
+            from *page* when omitted.
+        drawing_bboxes: Cached vector drawing bboxes (see
+            :class:`PageAnalysis`).  Read from ``page.get_drawings()`` when
+            omitted.
     """
-    page_rect = page.rect
-    page_w = page_rect.width
-    page_h = page_rect.height
-
-    cell_w = page_w / grid_cols if grid_cols > 0 else 1.0
-    cell_h = page_h / grid_rows if grid_rows > 0 else 1.0
-
-    occupied: list[list[bool]] = [[False] * grid_cols for _ in range(grid_rows)]
-
-    def _mark_rect(r: fitz.Rect) -> None:
-        """Mark all cells overlapped by rect *r* as occupied."""
-        if r.is_empty or r.is_infinite:
-            return
-        # Clamp to page bounds.
-        x0 = max(r.x0, page_rect.x0)
-        y0 = max(r.y0, page_rect.y0)
-        x1 = min(r.x1, page_rect.x1)
-        y1 = min(r.y1, page_rect.y1)
-        if x0 >= x1 or y0 >= y1:
-            return
-        col0 = max(0, int((x0 - page_rect.x0) / cell_w))
-        col1 = min(grid_cols - 1, int((x1 - page_rect.x0 - 1e-9) / cell_w))
-        row0 = max(0, int((y0 - page_rect.y0) / cell_h))
-        row1 = min(grid_rows - 1, int((y1 - page_rect.y0 - 1e-9) / cell_h))
-        for r_idx in range(row0, row1 + 1):
-            for c_idx in range(col0, col1 + 1):
-                occupied[r_idx][c_idx] = True
-
-    # Mark cells from vector drawings.
-    try:
-        for drawing in page.get_drawings():
-            _mark_rect(drawing.get("rect") or fitz.Rect())
-    except Exception:  # pragma: no cover – defensive for unusual PDFs
-        pass
+    bboxes: list[BBox] = list(
+        drawing_bboxes if drawing_bboxes is not None else _page_drawing_bboxes(page)
+    )
 
-    # Mark cells from text blocks.
     try:
-        text_dict = page.get_text("dict")
-        for block in text_dict.get("blocks", []):
-            bbox = block.get("bbox")
-            if bbox and len(bbox) == 4:
-                _mark_rect(fitz.Rect(bbox))
+        if span_index is None:
+            span_index = PageSpanIndex.from_page(page)
+        bboxes.extend(span_index.block_bboxes)
     except Exception:  # pragma: no cover
         pass
-
-    return occupied, page_rect, cell_w, cell_h
+    return bboxes
 
 
-def _flood_fill_regions(
-    occupied: list[list[bool]],
+def _occupancy_grid(
+    bboxes: list[BBox],
+    page_rect: fitz.Rect,
     *,
-    grid_rows: int,
     grid_cols: int,
-) -> tuple[list[list[int]], int]:
-    """Label connected components via flood fill.
-
-    Args:
-        occupied: Boolean occupancy grid (``grid_rows x grid_cols``).
-        grid_rows: Number of rows in the grid.
-        grid_cols: Number of columns in the grid.
+    grid_rows: int,
+) -> np.ndarray:
+    """Boolean ``(grid_rows, grid_cols)`` grid of the cells *bboxes* overlap.
 
-    Returns:
-        A 2-tuple ``(labels, num_labels)`` where ``labels`` has the same
-        shape as *occupied* and each occupied cell carries its component id.
-        Unoccupied cells are ``-1``.
+    Every rect is clamped to the page and reduced to an inclusive cell range,
+    then all ranges are rasterized at once with a 2-D difference array
+    (+1/-1 at the four corners followed by a cumulative sum along both axes).
+    Empty, infinite and off-page rects mark nothing.
     """
-    labels: list[list[int]] = [[-1] * grid_cols for _ in range(grid_rows)]
-    num_labels = 0
-
-    def _flood_fill(start_r: int, start_c: int, label: int) -> None:
-        stack = [(start_r, start_c)]
-        while stack:
-            cr, cc = stack.pop()
-            if cr < 0 or cr >= grid_rows or cc < 0 or cc >= grid_cols:
-                continue
-            if labels[cr][cc] != -1 or not occupied[cr][cc]:
-                continue
-            labels[cr][cc] = label
-            stack.extend([(cr - 1, cc), (cr + 1, cc), (cr, cc - 1), (cr, cc + 1)])
-
-    for row in range(grid_rows):
-        for col in range(grid_cols):
-            if occupied[row][col] and labels[row][col] == -1:
-                _flood_fill(row, col, num_labels)
-                num_labels += 1
-
-    return labels, num_labels
+    occupied = np.zeros((grid_rows, grid_cols), dtype=bool)
+    if not bboxes or grid_rows <= 0 or grid_cols <= 0:
+        return occupied
+
+    cell_w = page_rect.width / grid_cols
+    cell_h = page_rect.height / grid_rows
+    rects = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    x0, y0, x1, y1 = rects.T
+
+    infinite = fitz.INFINITE_RECT()
+    keep = (x0 < x1) & (y0 < y1) & ~(
+        (x0 == infinite.x0) & (y0 == infinite.y0) & (x1 == infinite.x1) & (y1 == infinite.y1)
+    )
+    cx0 = np.maximum(x0[keep], page_rect.x0)
+    cy0 = np.maximum(y0[keep], page_rect.y0)
+    cx1 = np.minimum(x1[keep], page_rect.x1)
+    cy1 = np.minimum(y1[keep], page_rect.y1)
+    inside = (cx0 < cx1) & (cy0 < cy1)
+    cx0, cy0, cx1, cy1 = cx0[inside], cy0[inside], cx1[inside], cy1[inside]
+    if cx0.size == 0:
+        return occupied
+
+    # astype(int64) truncates toward zero, like int().
+    col0 = np.maximum(0, ((cx0 - page_rect.x0) / cell_w).astype(np.int64))
+    col1 = np.minimum(grid_cols - 1, ((cx1 - page_rect.x0 - 1e-9) / cell_w).astype(np.int64))
+    row0 = np.maximum(0, ((cy0 - page_rect.y0) / cell_h).astype(np.int64))
+    row1 = np.minimum(grid_rows - 1, ((cy1 - page_rect.y0 - 1e-9) / cell_h).astype(np.int64))
+    valid = (col0 <= col1) & (row0 <= row1)
+    col0, col1, row0, row1 = col0[valid], col1[valid], row0[valid], row1[valid]
+
+    diff = np.zeros((grid_rows + 1, grid_cols + 1), dtype=np.int64)
+    np.add.at(diff, (row0, col0), 1)
+    np.add.at(diff, (row0, col1 + 1), -1)
+    np.add.at(diff, (row1 + 1, col0), -1)
+    np.add.at(diff, (row1 + 1, col1 + 1), 1)
+    coverage = diff.cumsum(axis=0).cumsum(axis=1)
+    return coverage[:grid_rows, :grid_cols] > 0
+
+
+def _component_bounds(occupied: np.ndarray) -> list[tuple[int, int, int, int]]:
+    """``(row0, col0, row1, col1)`` cell bounds of each 4-connected component.
+
+    Each occupied cell starts labelled with its row-major index.  Labels are
+    relaxed to the minimum over 4-neighbours, with pointer jumping
+    (``label = label[label]``) to collapse long chains, until stable.  The
+    surviving label of a component is its first cell in row-major order, so
+    components come out ordered by their first cell, as a row-major flood
+    fill would find them.
+    """
+    grid_rows, grid_cols = occupied.shape
+    flat_occ = occupied.ravel()
+    if not flat_occ.any():
+        return []
+
+    sentinel = grid_rows * grid_cols
+    labels = np.where(flat_occ, np.arange(sentinel), sentinel)
+    pointer = np.append(labels, sentinel)
+    while True:
+        grid = pointer[:-1].reshape(grid_rows, grid_cols)
+        relaxed = grid.copy()
+        np.minimum(relaxed[1:, :], grid[:-1, :], out=relaxed[1:, :])
+        np.minimum(relaxed[:-1, :], grid[1:, :], out=relaxed[:-1, :])
+        np.minimum(relaxed[:, 1:], grid[:, :-1], out=relaxed[:, 1:])
+        np.minimum(relaxed[:, :-1], grid[:, 1:], out=relaxed[:, :-1])
+        relaxed = np.where(flat_occ, relaxed.ravel(), sentinel)
+        relaxed = np.append(relaxed, sentinel)
+        # Pointer jumping: follow each label to its own label until fixed.
+        while True:
+            jumped = relaxed[relaxed]
+            if np.array_equal(jumped, relaxed):
+                break
+            relaxed = jumped
+        if np.array_equal(relaxed, pointer):
+            break
+        pointer = relaxed
+
+    cell_labels = pointer[:-1][flat_occ]
+    cells = np.flatnonzero(flat_occ)
+    rows = cells // grid_cols
+    cols = cells % grid_cols
+    roots, inverse = np.unique(cell_labels, return_inverse=True)
+    count = roots.size
+    r0 = np.full(count, grid_rows)
+    c0 = np.full(count, grid_cols)
+    r1 = np.full(count, -1)
+    c1 = np.full(count, -1)
+    np.minimum.at(r0, inverse, rows)
+    np.minimum.at(c0, inverse, cols)
+    np.maximum.at(r1, inverse, rows)
+    np.maximum.at(c1, inverse, cols)
+    return [
+        (int(a), int(b), int(c), int(d)) for a, b, c, d in zip(r0, c0, r1, c1)
+    ]
 
 
 def _compute_content_regions(
     page: fitz.Page,
     *,
-    grid_cols: int = 24,
-    grid_rows: int = 16,
+    grid_cols: int = ADAPTIVE_REGION_GRID_COLS,
+    grid_rows: int = ADAPTIVE_REGION_GRID_ROWS,
     padding_pct: float = 0.05,
     min_area_pct: float = 0.05,
     max_regions: int = 8,
+    span_index: PageSpanIndex | None = None,
+    drawing_bboxes: list[BBox] | None = None,
+    bounds: fitz.Rect | None = None,
 ) -> list[fitz.Rect] | None:
     """Identify content-dense regions on a page using drawings and text blocks.
 
-    Uses a boolean occupancy grid and connected-component flood-fill to group
-    nearby drawing/text bounding boxes into rectangular regions.  Fast enough
-    for real-time use (O(drawings + text_blocks)).
+    Uses a boolean occupancy grid and connected-component labelling to group
+    nearby drawing/text bounding boxes into rectangular regions.  The grid is
+    rasterized and labelled with array operations (:func:`_occupancy_grid`,
+    :func:`_component_bounds`), which keeps fine grids such as 96x64 cheap on
+    sheets with tens of thousands of drawings.
 
     Args:
         page: Open fitz.Page.
@@ -247,6 +567,12 @@ def _compute_content_regions(
             total page area are discarded.
         max_regions: Fall back to fixed grid when more regions than this are
             found (avoids generating more tiles than the standard 3×2 grid).
+        span_index: Parsed page text; built from *page* when omitted.
+        drawing_bboxes: Cached vector drawing bboxes; read from *page* when
+            omitted.
+        bounds: Unmasked content area (see :mod:`src.intake.masking`).
+            Content whose centre lies outside it is ignored and regions are
+            clamped to it.  ``None`` uses the whole page.
 
     Returns:
         A list of :class:`fitz.Rect` objects, or ``None`` when the page has
@@ -258,61 +584,42 @@ def _compute_content_regions(
     if page_w <= 0 or page_h <= 0:
         return None
 
-    occupied, page_rect, cell_w, cell_h = _build_occupancy_grid(
-        page, grid_cols=grid_cols, grid_rows=grid_rows,
-    )
+    cell_w = page_w / grid_cols if grid_cols > 0 else 1.0
+    cell_h = page_h / grid_rows if grid_rows > 0 else 1.0
 
-    # Count occupied cells.
-    total_occupied = sum(occupied[r][c] for r in range(grid_rows) for c in range(grid_cols))
-    if total_occupied == 0:
-        logger.debug("Adaptive tiling: no content found, falling back to grid.")
-        return None
+    content_bboxes = _collect_content_bboxes(page, span_index=span_index, drawing_bboxes=drawing_bboxes)
+    limit = page_rect
+    if bounds is not None:
+        limit = bounds
+        content_bboxes = [
+            bbox
+            for bbox in content_bboxes
+            if bounds.contains(fitz.Point((bbox[0] + bbox[2]) / 2.0, (bbox[1] + bbox[3]) / 2.0))
+        ]
 
-    labels, num_labels = _flood_fill_regions(
-        occupied, grid_rows=grid_rows, grid_cols=grid_cols,
-    )
+    occupied = _occupancy_grid(content_bboxes, page_rect, grid_cols=grid_cols, grid_rows=grid_rows)
+    cell_bounds = _component_bounds(occupied)
 
-    if num_labels == 0:
+    if not cell_bounds:
+        logger.debug("Adaptive tiling: no content found, falling back to grid.")
         return None
 
-    # Compute bounding cell-range for each component, then convert to page coords.
-    comp_r0 = [grid_rows] * num_labels
-    comp_c0 = [grid_cols] * num_labels
-    comp_r1 = [-1] * num_labels
-    comp_c1 = [-1] * num_labels
-
-    for row in range(grid_rows):
-        for col in range(grid_cols):
-            lbl = labels[row][col]
-            if lbl == -1:
-                continue
-            if row < comp_r0[lbl]:
-                comp_r0[lbl] = row
-            if row > comp_r1[lbl]:
-                comp_r1[lbl] = row
-            if col < comp_c0[lbl]:
-                comp_c0[lbl] = col
-            if col > comp_c1[lbl]:
-                comp_c1[lbl] = col
-
     pad_w = page_w * padding_pct
     pad_h = page_h * padding_pct
     min_area = page_w * page_h * min_area_pct
 
     regions: list[fitz.Rect] = []
-    for lbl in range(num_labels):
-        if comp_r1[lbl] < 0 or comp_c1[lbl] < 0:
-            continue
+    for row0, col0, row1, col1 in cell_bounds:
         # Convert grid cells to page coordinates.
-        x0 = page_rect.x0 + comp_c0[lbl] * cell_w - pad_w
-        y0 = page_rect.y0 + comp_r0[lbl] * cell_h - pad_h
-        x1 = page_rect.x0 + (comp_c1[lbl] + 1) * cell_w + pad_w
-        y1 = page_rect.y0 + (comp_r1[lbl] + 1) * cell_h + pad_h
-        # Clamp to page.
-        x0 = max(x0, page_rect.x0)
-        y0 = max(y0, page_rect.y0)
-        x1 = min(x1, page_rect.x1)
-        y1 = min(y1, page_rect.y1)
+        x0 = page_rect.x0 + col0 * cell_w - pad_w
+        y0 = page_rect.y0 + row0 * cell_h - pad_h
+        x1 = page_rect.x0 + (col1 + 1) * cell_w + pad_w
+        y1 = page_rect.y0 + (row1 + 1) * cell_h + pad_h
+        # Clamp to the page, or to the unmasked content.
+        x0 = max(x0, limit.x0)
+        y0 = max(y0, limit.y0)
+        x1 = min(x1, limit.x1)
+        y1 = min(y1, limit.y1)
         region = fitz.Rect(x0, y0, x1, y1)
         if region.is_empty or region.get_area() < min_area:
             continue
@@ -345,6 +652,21 @@ def tile_page_adaptive(
     grid_rows: int = 2,
     grid_cols: int = 3,
     overlap_pct: float = 0.10,
+    *,
+    span_index: PageSpanIndex | None = None,
+    render_mode: RenderMode = RenderMode.DISPLAY_LIST,
+    max_raster_bytes: int | None = None,
+    drawing_bboxes: list[BBox] | None = None,
+    text_layer_format: TextLayerFormat = TextLayerFormat.JSON,
+    dpi_policy: DpiPolicy | None = None,
+    empty_tile_policy: EmptyTilePolicy | None = None,
+    mask_policy: MaskPolicy | None = None,
+    image_budget: ImageBudget | None = None,
+    image_encoding: ImageEncoding | None = None,
+    render_cache: RenderCache | None = None,
+    tile_id_prefix: str = "",
+    region_grid_cols: int = ADAPTIVE_REGION_GRID_COLS,
+    region_grid_rows: int = ADAPTIVE_REGION_GRID_ROWS,
 ) -> list[TileInfo]:
     """Extract PNG + text-layer tiles using content-aware adaptive regions.
 
@@ -353,7 +675,7 @@ def tile_page_adaptive(
     to the regular fixed-grid :func:`tile_page` when content detection finds
     sparse or ambiguous content.
 
-    Tile ids use the format ``p{page_number}_a{region_index}`` to distinguish
+    Tile ids use the format ``{tile_id_prefix}p{page_number}_a{region_index}`` to distinguish
     adaptive tiles from fixed-grid tiles.  ``row`` and ``col`` in the
     :class:`TileInfo` are both set to the region index and ``0``, respectively.
 
@@ -367,19 +689,62 @@ def tile_page_adaptive(
         grid_rows: Passed to :func:`tile_page` when falling back.
         grid_cols: Passed to :func:`tile_page` when falling back.
         overlap_pct: Passed to :func:`tile_page` when falling back.
+        span_index: Parsed page text shared by region detection and every
+            tile's text layer.  Built from the page when omitted.
+        render_mode: Rasterization mode, see :class:`RenderMode`.
+        max_raster_bytes: Per-tile raster cap above which tiles are
+            band-rendered, or, for codecs that cannot be banded, regions are
+            split into overlapping sub-regions.  ``None`` disables the cap.
+        drawing_bboxes: Cached vector drawing bboxes for region detection;
+            read from the page when omitted.
+        text_layer_format: Per-tile JSON files or one pack per page.
+        dpi_policy: Per-tile DPI from text-layer font sizes, capped at
+            ``dpi``.  ``None`` renders every tile at ``dpi``.
+        empty_tile_policy: Marks near-empty tiles
+            :attr:`TileStatus.SKIPPED_EMPTY`.  ``None`` disables the check.
+        mask_policy: Masks the title block (and border) before region
+            detection, so they neither form regions nor reach text layers.
+            ``None`` disables masking.
+        image_budget: Caps each region's DPI so its image fits the model's
+            native input size.  ``None`` leaves the DPI uncapped.
+        image_encoding: Tile codec and byte budget, see
+            :class:`~src.utils.image_codec.ImageEncoding`.  ``None`` writes
+            RGB PNG.
+        render_cache: Shared :class:`~src.intake.render_cache.RenderCache`
+            consulted before rendering each region.
+        tile_id_prefix: Prepended to every tile id, e.g. ``d2_`` for the
+            second document of a multi-PDF run.
+        region_grid_cols: Columns of the occupancy grid used to find
+            content regions.
+        region_grid_rows: Rows of the occupancy grid used to find content
+            regions.
 
     Returns:
         List of :class:`TileInfo` objects for the rendered tiles.
     """
     if grid_rows <= 0 or grid_cols <= 0:
         raise ValueError("grid_rows and grid_cols must be positive.")
+    if region_grid_rows <= 0 or region_grid_cols <= 0:
+        raise ValueError("region_grid_rows and region_grid_cols must be positive.")
     if not (0.0 <= overlap_pct < 1.0):
         raise ValueError("overlap_pct must be in [0.0, 1.0).")
 
     page = doc[page_index]
     page_number = page_index + 1
-
-    regions = _compute_content_regions(page)
+    if span_index is None:
+        span_index = PageSpanIndex.from_page(page)
+
+    if drawing_bboxes is None and (empty_tile_policy is not None or mask_policy is not None):
+        drawing_bboxes = _page_drawing_bboxes(page)
+    mask, content_rect = _page_mask(page, drawing_bboxes, mask_policy)
+    regions = _compute_content_regions(
+        page,
+        grid_cols=region_grid_cols,
+        grid_rows=region_grid_rows,
+        span_index=span_index,
+        drawing_bboxes=drawing_bboxes,
+        bounds=content_rect,
+    )
     if regions is None:
         logger.debug(
             "Page %s: adaptive region detection fell back to fixed grid.", page_number
@@ -392,6 +757,18 @@ def tile_page_adaptive(
             grid_rows=grid_rows,
             grid_cols=grid_cols,
             overlap_pct=overlap_pct,
+            span_index=span_index,
+            render_mode=render_mode,
+            max_raster_bytes=max_raster_bytes,
+            text_layer_format=text_layer_format,
+            dpi_policy=dpi_policy,
+            empty_tile_policy=empty_tile_policy,
+            drawing_bboxes=drawing_bboxes,
+            mask_policy=mask_policy,
+            image_budget=image_budget,
+            image_encoding=image_encoding,
+            render_cache=render_cache,
+            tile_id_prefix=tile_id_prefix,
         )
 
     tiles_dir = output_dir / "tiles"
@@ -399,17 +776,27 @@ def tile_page_adaptive(
     tiles_dir.mkdir(parents=True, exist_ok=True)
     text_layers_dir.mkdir(parents=True, exist_ok=True)
 
-    zoom = dpi / 72.0
-    matrix = fitz.Matrix(zoom, zoom)
+    renderer = PageRenderer(
+        page,
+        dpi=dpi,
+        mode=render_mode,
+        max_raster_bytes=max_raster_bytes,
+        encoding=image_encoding,
+        cache=render_cache,
+    )
+    split_tiles = 0
+    if max_raster_bytes is not None and not renderer.can_band:
+        fitted_regions = _split_regions_for_raster(
+            regions, overlap_pct=overlap_pct, dpi=dpi, max_raster_bytes=max_raster_bytes
+        )
+        split_tiles = len(fitted_regions) - len(regions)
+        regions = fitted_regions
 
+    writer = TextLayerWriter(text_layers_dir, page_number, text_layer_format)
     tile_infos: list[TileInfo] = []
     for region_idx, clip in enumerate(regions):
-        tile_id = f"p{page_number}_a{region_idx}"
-        image_path = tiles_dir / f"{tile_id}.png"
-        text_layer_path = text_layers_dir / f"{tile_id}.json"
-
-        pix = page.get_pixmap(matrix=matrix, clip=clip, alpha=False)
-        pix.save(str(image_path))
+        tile_id = f"{tile_id_prefix}p{page_number}_a{region_idx}"
+        image_path = tiles_dir / f"{tile_id}{renderer.encoding.suffix}"
 
         text_layer = extract_text_layer(
             page,
@@ -417,8 +804,15 @@ def tile_page_adaptive(
             clip_origin=(clip.x0, clip.y0),
             tile_id=tile_id,
             page_number=page_number,
+            span_index=span_index,
+            bounds=content_rect,
+        )
+        tile_dpi = _tile_dpi(text_layer, dpi, dpi_policy, clip, image_budget)
+        rendered = renderer.render_to_image(clip, image_path, dpi=tile_dpi)
+        text_layer_path = writer.add(text_layer)
+        status, content = _tile_content_status(
+            renderer, clip, text_layer, drawing_bboxes, empty_tile_policy
         )
-        save_text_layer_json(text_layer, text_layer_path)
 
         tile_infos.append(
             TileInfo(
@@ -429,17 +823,160 @@ def tile_page_adaptive(
                 clip_rect=(clip.x0, clip.y0, clip.x1, clip.y1),
                 image_path=image_path,
                 text_layer_path=text_layer_path,
-                image_width_px=pix.width,
-                image_height_px=pix.height,
+                image_width_px=rendered.width,
+                image_height_px=rendered.height,
+                dpi=round(tile_dpi * rendered.scale),
+                status=status,
+                content=content,
+                mask=mask,
             )
         )
 
+    writer.close()
+    _log_page_render(renderer, page_number, len(tile_infos), split_tiles=split_tiles)
     logger.debug(
         "Page %s: adaptive tiling produced %d tile(s).", page_number, len(tile_infos)
     )
     return tile_infos
 
 
+def _tile_selected_page(
+    doc: fitz.Document,
+    page_number: int,
+    output_dir: Path,
+    *,
+    dpi: int,
+    grid_rows: int,
+    grid_cols: int,
+    overlap_pct: float,
+    skip_low_coherence: bool,
+    coherence_threshold: float,
+    strategy: TilingStrategy,
+    render_mode: RenderMode,
+    max_raster_bytes: int | None,
+    text_layer_format: TextLayerFormat = TextLayerFormat.JSON,
+    analysis: PageAnalysis | None = None,
+    dpi_policy: DpiPolicy | None = None,
+    empty_tile_policy: EmptyTilePolicy | None = None,
+    mask_policy: MaskPolicy | None = None,
+    image_budget: ImageBudget | None = None,
+    image_encoding: ImageEncoding | None = None,
+    render_cache: RenderCache | None = None,
+    tile_id_prefix: str = "",
+    region_grid_cols: int = ADAPTIVE_REGION_GRID_COLS,
+    region_grid_rows: int = ADAPTIVE_REGION_GRID_ROWS,
+) -> list[TileInfo] | None:
+    """Apply the coherence gate and tile one page.
+
+    Returns ``None`` when the page is skipped for low coherence.  The page
+    text is parsed once and shared by the gate and every tile; with a cached
+    *analysis* it is not parsed at all.  With an *image_budget* the grid,
+    overlap and DPI come from :func:`plan_tile_geometry` (``dpi`` and
+    ``grid_rows * grid_cols`` become its ceilings) and the plan is recorded
+    on every tile.
+    """
+    reset_peak_rss()
+    page = doc[page_number - 1]
+    if analysis is not None:
+        span_index = PageSpanIndex.from_analysis(analysis)
+        coherence_score = analysis.coherence_score
+    else:
+        span_index = PageSpanIndex.from_page(page)
+        coherence_score = None
+
+    if skip_low_coherence:
+        if coherence_score is None:
+            coherence_score = extract_text_layer(
+                page,
+                clip=None,
+                clip_origin=(0.0, 0.0),
+                tile_id=f"p{page_number}_full",
+                page_number=page_number,
+                span_index=span_index,
+            ).coherence_score
+        if coherence_score < coherence_threshold:
+            logger.warning(
+                "Skipping page %s: coherence %.3f < %.2f",
+                page_number,
+                coherence_score,
+                coherence_threshold,
+            )
+            return None
+
+    plan: TilePlan | None = None
+    if image_budget is not None:
+        plan = plan_tile_geometry(
+            page.rect,
+            image_budget,
+            max_dpi=dpi,
+            max_tiles=grid_rows * grid_cols,
+        )
+        dpi, grid_rows, grid_cols, overlap_pct = (
+            plan.dpi, plan.grid_rows, plan.grid_cols, plan.overlap_pct,
+        )
+        logger.debug("Page %s planned as %s", page_number, plan)
+
+    tile_kwargs: dict[str, Any] = {
+        "dpi": dpi,
+        "grid_rows": grid_rows,
+        "grid_cols": grid_cols,
+        "overlap_pct": overlap_pct,
+        "span_index": span_index,
+        "render_mode": render_mode,
+        "max_raster_bytes": max_raster_bytes,
+        "text_layer_format": text_layer_format,
+        "dpi_policy": dpi_policy,
+        "empty_tile_policy": empty_tile_policy,
+        "mask_policy": mask_policy,
+        "image_budget": image_budget,
+        "image_encoding": image_encoding,
+        "render_cache": render_cache,
+        "tile_id_prefix": tile_id_prefix,
+        "drawing_bboxes": analysis.drawing_bboxes if analysis is not None else None,
+    }
+    if strategy == TilingStrategy.ADAPTIVE:
+        tiles = tile_page_adaptive(
+            doc,
+            page_number - 1,
+            output_dir,
+            region_grid_cols=region_grid_cols,
+            region_grid_rows=region_grid_rows,
+            **tile_kwargs,
+        )
+    else:
+        tiles = tile_page(doc, page_number - 1, output_dir, **tile_kwargs)
+    for tile in tiles:
+        tile.plan = plan
+    return tiles
+
+
+# Per-process document handle for the tiling pool.  Each worker opens the PDF
+# once in its initializer instead of pickling a document per task.
+_worker_doc: fitz.Document | None = None
+
+
+def _page_options(options: dict[str, Any], plan: TilePlan | None) -> dict[str, Any]:
+    """Overlay a page's :class:`TilePlan` geometry on the call-level options."""
+    if plan is None:
+        return options
+    return {**options, **plan.to_dict()}
+
+
+def _init_tile_worker(pdf_path: str) -> None:
+    global _worker_doc
+    _worker_doc = fitz.open(pdf_path)
+
+
+def _tile_page_in_worker(
+    page_number: int,
+    output_dir: Path,
+    options: dict[str, Any],
+) -> tuple[int, list[TileInfo] | None]:
+    if _worker_doc is None:  # pragma: no cover – initializer always runs first
+        raise RuntimeError("Tiling worker was not initialized.")
+    return page_number, _tile_selected_page(_worker_doc, page_number, output_dir, **options)
+
+
 def tile_pdf(
     pdf_path: Path,
     output_dir: Path,
@@ -452,6 +989,23 @@ def tile_pdf(
     skip_low_coherence: bool = True,
     coherence_threshold: float = COHERENCE_THRESHOLD,
     strategy: TilingStrategy = TilingStrategy.GRID,
+    workers: int = 1,
+    render_mode: RenderMode = RenderMode.DISPLAY_LIST,
+    max_raster_bytes: int | None = None,
+    on_page_tiled: Callable[[int, list[TileInfo]], None] | None = None,
+    page_plans: dict[int, TilePlan] | None = None,
+    page_analyses: dict[int, PageAnalysis] | None = None,
+    text_layer_format: TextLayerFormat = TextLayerFormat.JSON,
+    dpi_policy: DpiPolicy | None = None,
+    empty_tile_policy: EmptyTilePolicy | None = None,
+    mask_policy: MaskPolicy | None = None,
+    image_budget: ImageBudget | None = None,
+    page_image_budgets: dict[int, ImageBudget] | None = None,
+    image_encoding: ImageEncoding | None = None,
+    render_cache: RenderCache | None = None,
+    page_tile_prefixes: dict[int, str] | None = None,
+    region_grid_cols: int = ADAPTIVE_REGION_GRID_COLS,
+    region_grid_rows: int = ADAPTIVE_REGION_GRID_ROWS,
 ) -> dict[int, list[TileInfo]]:
     """Tile an entire PDF (or selected pages).
 
@@ -471,14 +1025,112 @@ def tile_pdf(
         strategy: Tiling strategy — :attr:`TilingStrategy.GRID` for the fixed
             grid or :attr:`TilingStrategy.ADAPTIVE` for content-aware regions
             via :func:`tile_page_adaptive`.
+        workers: Number of worker processes.  ``1`` tiles pages serially in
+            this process; larger values fan pages out to a process pool where
+            each worker opens its own :class:`fitz.Document`.  Pages are
+            submitted heaviest first by :func:`~src.intake.page_cost.estimate_page_cost`
+            and merged back in page-selection order, so tile ids and
+            ``tiles_index.json`` are identical to the serial path.
+        render_mode: :attr:`RenderMode.DISPLAY_LIST` (default) records each
+            page once and rasterizes every tile from that display list;
+            :attr:`RenderMode.CLIP` re-interprets the page per tile.  Both
+            produce identical pixels.
+        max_raster_bytes: Cap on one tile's uncompressed RGB raster.  Larger
+            tiles are rendered in horizontal bands streamed to the PNG
+            encoder; with JPEG or WebP, which need the whole raster, they are
+            split into sub-tiles (a finer grid, or more adaptive regions)
+            instead.  Each page's peak RSS and largest raster are logged.
+            ``None`` disables the cap.
+        on_page_tiled: Optional callback invoked in this process with
+            ``(page_number, tiles)`` as soon as a page's PNGs and text layers
+            are on disk.  With ``workers > 1`` pages are reported in
+            completion order; the returned mapping is still in selection
+            order.  Skipped pages are not reported.
+        page_plans: Optional per-page :class:`TilePlan` overriding ``dpi``,
+            ``grid_rows``, ``grid_cols`` and ``overlap_pct`` for that page
+            (see :func:`src.intake.manifest.plan_tiling_from_manifest`).
+            Pages without a plan use the call-level settings.
+        page_analyses: Optional cached :class:`PageAnalysis` per page (see
+            :func:`src.intake.page_analysis.load_page_analyses`).  Pages
+            present here reuse the cached spans, coherence and drawing bboxes
+            instead of re-parsing the page; output is unchanged.
+        text_layer_format: :attr:`TextLayerFormat.JSON` (default) writes one
+            ``{tile_id}.json`` per tile; :attr:`TextLayerFormat.PACK` writes
+            one columnar ``p{page}.tlpk`` per page and records member paths
+            (``text_layers/p14.tlpk/p14_r0_c1``) in each :class:`TileInfo`.
+        dpi_policy: Optional :class:`DpiPolicy`.  Each tile then renders at
+            the DPI that brings its smallest text to the policy's target
+            pixel height, within the policy bounds and never above the
+            page's ``dpi``; sparse large-text tiles come out much smaller.
+            The chosen DPI is recorded in :attr:`TileInfo.dpi`.
+        empty_tile_policy: Optional :class:`EmptyTilePolicy`.  Every tile is
+            scored on text items, vector drawings in its clip and ink
+            coverage (see :mod:`src.intake.tile_filter`); near-empty tiles
+            are still written but get :attr:`TileStatus.SKIPPED_EMPTY` and
+            their :class:`TileContentScore`, so extraction can skip them.
+        mask_policy: Optional :class:`MaskPolicy`.  The right-edge title
+            block strip (and, if enabled, the margin outside the sheet
+            border) is detected from the page's drawings (see
+            :mod:`src.intake.masking`); tiles and text layers are confined
+            to the remaining content and the :class:`PageMask` is recorded
+            in :attr:`TileInfo.mask`.  Pages where nothing is detected tile
+            as before.
+        image_budget: Optional :class:`ImageBudget` of the extraction model
+            (see :func:`src.intake.tile_planner.image_budget_for_tier`).  Each
+            page's grid, overlap and DPI are then planned so tiles arrive at
+            the model's native resolution (see
+            :func:`src.intake.tile_planner.plan_tile_geometry`), with the
+            page's ``dpi`` and ``grid_rows * grid_cols`` as ceilings; the
+            chosen :class:`TilePlan` is recorded in :attr:`TileInfo.plan`.
+        page_image_budgets: Optional per-page budgets overriding
+            ``image_budget``, e.g. from each sheet's manifest model tier.
+        image_encoding: Optional :class:`~src.utils.image_codec.ImageEncoding`
+            choosing the tile codec (RGB/quantized-gray/1-bit PNG, lossless
+            WebP or JPEG) and a per-tile byte budget.  Image files take the
+            codec's suffix; a tile the budget downscales records its
+            effective :attr:`TileInfo.dpi`.  ``None`` writes RGB PNG.
+        render_cache: Optional :class:`~src.intake.render_cache.RenderCache`
+            shared across runs.  Tiles whose page content, clip, DPI and
+            encoding match an earlier render are hard-linked (or copied)
+            from the cache instead of rendered; new renders are added to it,
+            and least-recently-used entries are evicted once the run
+            finishes.  Tile files and the index are unchanged.
+        page_tile_prefixes: Optional tile id prefix per page.  A multi-PDF
+            run maps each page of its combined PDF to its source document's
+            ``d{index}_`` (see :func:`src.intake.documents.page_tile_prefixes`),
+            so ``d2_p14_r0_c1`` is run page 14, from the second PDF.
+        region_grid_cols: Occupancy grid columns for adaptive region
+            detection (see :func:`_compute_content_regions`).  Finer grids
+            keep nearby but separate drawings in separate regions.
+        region_grid_rows: Occupancy grid rows for adaptive region detection.
 
     Returns:
         Mapping of page_number -> list of :class:`TileInfo`.
     """
+    if workers < 1:
+        raise ValueError("workers must be >= 1.")
+
     output_dir.mkdir(parents=True, exist_ok=True)
     results: dict[int, list[TileInfo]] = {}
-
-    tiler = tile_page_adaptive if strategy == TilingStrategy.ADAPTIVE else tile_page
+    options: dict[str, Any] = {
+        "dpi": dpi,
+        "grid_rows": grid_rows,
+        "grid_cols": grid_cols,
+        "overlap_pct": overlap_pct,
+        "skip_low_coherence": skip_low_coherence,
+        "coherence_threshold": coherence_threshold,
+        "strategy": strategy,
+        "render_mode": render_mode,
+        "max_raster_bytes": max_raster_bytes,
+        "text_layer_format": text_layer_format,
+        "dpi_policy": dpi_policy,
+        "empty_tile_policy": empty_tile_policy,
+        "mask_policy": mask_policy,
+        "image_encoding": image_encoding,
+        "render_cache": render_cache,
+        "region_grid_cols": region_grid_cols,
+        "region_grid_rows": region_grid_rows,
+    }
 
     with fitz.open(pdf_path) as doc:
         selected_pages = page_numbers or list(range(1, len(doc) + 1))
@@ -486,35 +1138,65 @@ def tile_pdf(
             if page_number < 1 or page_number > len(doc):
                 raise ValueError(f"Invalid page number: {page_number}")
 
-            if skip_low_coherence:
-                page = doc[page_number - 1]
-                full_text_layer = extract_text_layer(
-                    page,
-                    clip=None,
-                    clip_origin=(0.0, 0.0),
-                    tile_id=f"p{page_number}_full",
-                    page_number=page_number,
+        page_options = {
+            page_number: {
+                **_page_options(options, (page_plans or {}).get(page_number)),
+                "analysis": (page_analyses or {}).get(page_number),
+                "image_budget": (page_image_budgets or {}).get(page_number, image_budget),
+                "tile_id_prefix": (page_tile_prefixes or {}).get(page_number, ""),
+            }
+            for page_number in selected_pages
+        }
+
+        serial = workers == 1 or len(selected_pages) <= 1
+        schedule = selected_pages
+        if not serial:
+            # Heaviest pages first, so a dense sheet is not picked up last.
+            costs = {
+                page_number: estimate_page_cost(
+                    doc[page_number - 1],
+                    dpi=page_options[page_number]["dpi"],
+                    analysis=page_options[page_number]["analysis"],
+                ).cost
+                for page_number in selected_pages
+            }
+            schedule = lpt_order(selected_pages, costs)
+        if serial:
+            for page_number in selected_pages:
+                tiles = _tile_selected_page(
+                    doc, page_number, output_dir, **page_options[page_number]
                 )
-                if full_text_layer.coherence_score < coherence_threshold:
-                    logger.warning(
-                        "Skipping page %s: coherence %.3f < %.2f",
-                        page_number,
-                        full_text_layer.coherence_score,
-                        coherence_threshold,
-                    )
-                    continue
-
-            tiles = tiler(
-                doc,
-                page_number - 1,
-                output_dir,
-                dpi=dpi,
-                grid_rows=grid_rows,
-                grid_cols=grid_cols,
-                overlap_pct=overlap_pct,
-            )
-            results[page_number] = tiles
+                if tiles is not None:
+                    results[page_number] = tiles
+                    if on_page_tiled is not None:
+                        on_page_tiled(page_number, tiles)
+
+    if not serial:
+        # Parallel path: one task per page.  Pages are reported as they finish,
+        # then merged in selection order so the mapping matches the serial path.
+        page_results: dict[int, list[TileInfo] | None] = {}
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(selected_pages)),
+            initializer=_init_tile_worker,
+            initargs=(str(pdf_path),),
+        ) as pool:
+            futures = [
+                pool.submit(_tile_page_in_worker, page_number, output_dir, page_options[page_number])
+                for page_number in schedule
+            ]
+            for future in as_completed(futures):
+                page_number, tiles = future.result()
+                page_results[page_number] = tiles
+                if tiles is not None and on_page_tiled is not None:
+                    on_page_tiled(page_number, tiles)
 
+        for page_number in selected_pages:
+            tiles = page_results[page_number]
+            if tiles is not None:
+                results[page_number] = tiles
+
+    if render_cache is not None:
+        render_cache.evict()
     return results
 
 
@@ -674,6 +1356,132 @@ def _build_arg_parser() -> argparse.ArgumentParser:
             "content is sparse or detection produces too many regions."
         ),
     )
+    parser.add_argument(
+        "--region-grid",
+        type=str,
+        default=f"{ADAPTIVE_REGION_GRID_COLS}x{ADAPTIVE_REGION_GRID_ROWS}",
+        help=(
+            "Occupancy grid COLSxROWS used by --adaptive to find content regions, "
+            "e.g. 96x64 to keep nearby drawings apart. Default: %(default)s."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for page tiling. Default: 1 (serial).",
+    )
+    parser.add_argument(
+        "--render-mode",
+        type=str,
+        choices=[mode.value for mode in RenderMode],
+        default=RenderMode.DISPLAY_LIST.value,
+        help=(
+            "Tile rasterization mode. 'display_list' records each page once "
+            "and renders all tiles from it; 'clip' re-renders the page per "
+            "tile. Output pixels are identical."
+        ),
+    )
+    parser.add_argument(
+        "--max-raster-mb",
+        type=float,
+        default=MAX_RASTER_BYTES / (1024 * 1024),
+        help=(
+            "Cap on a single tile's uncompressed raster in MB. Larger PNG tiles "
+            "are rendered in horizontal bands; JPEG/WebP tiles are split into "
+            "sub-tiles. 0 disables the cap. Default: %(default).0f."
+        ),
+    )
+    parser.add_argument(
+        "--text-layer-format",
+        type=str,
+        choices=[fmt.value for fmt in TextLayerFormat],
+        default=TextLayerFormat.JSON.value,
+        help=(
+            "Text layer storage. 'json' writes one file per tile; 'pack' writes "
+            "one columnar p{page}.tlpk per page. Default: json."
+        ),
+    )
+    parser.add_argument(
+        "--adaptive-dpi",
+        action="store_true",
+        help=(
+            "Choose each tile's DPI from its text-layer font sizes so the "
+            "smallest text reaches --target-text-px, between --min-dpi and --dpi."
+        ),
+    )
+    parser.add_argument(
+        "--min-dpi",
+        type=int,
+        default=ADAPTIVE_DPI_MIN,
+        help=f"Lowest per-tile DPI with --adaptive-dpi. Default: {ADAPTIVE_DPI_MIN}.",
+    )
+    parser.add_argument(
+        "--target-text-px",
+        type=float,
+        default=ADAPTIVE_DPI_TARGET_TEXT_PX,
+        help=(
+            "Pixel height the smallest text should reach with --adaptive-dpi. "
+            f"Default: {ADAPTIVE_DPI_TARGET_TEXT_PX}."
+        ),
+    )
+    parser.add_argument(
+        "--skip-empty-tiles",
+        action="store_true",
+        help=(
+            "Score tiles on text, drawings and ink coverage and mark near-empty "
+            "ones skipped_empty in tiles_index.json."
+        ),
+    )
+    parser.add_argument(
+        "--mask-title-block",
+        action="store_true",
+        help="Keep the detected right-edge title block strip out of tiles and text layers.",
+    )
+    parser.add_argument(
+        "--mask-border",
+        action="store_true",
+        help="Confine tiles and text layers to the detected sheet border frame.",
+    )
+    parser.add_argument(
+        "--plan-for-tier",
+        choices=sorted(TILE_IMAGE_BUDGETS),
+        default=None,
+        help=(
+            "Plan each page's grid, overlap and DPI so tiles fit this model tier's "
+            "native image size (--dpi and --grid-rows x --grid-cols become ceilings)."
+        ),
+    )
+    parser.add_argument(
+        "--codec",
+        choices=[codec.value for codec in ImageCodec],
+        default=ImageCodec.PNG.value,
+        help="Tile image codec (png_gray: 16-level palette PNG; webp needs Pillow).",
+    )
+    parser.add_argument(
+        "--jpeg-quality",
+        type=int,
+        default=85,
+        help="JPEG quality for --codec jpeg.",
+    )
+    parser.add_argument(
+        "--max-tile-kb",
+        type=float,
+        default=None,
+        help="Per-tile encoded size budget; larger tiles are re-encoded smaller.",
+    )
+    parser.add_argument(
+        "--render-cache",
+        type=Path,
+        default=None,
+        help="Shared render cache directory; tiles rendered by earlier runs are reused.",
+    )
+    parser.add_argument(
+        "--render-cache-mb",
+        type=float,
+        default=RENDER_CACHE_MAX_BYTES / (1024 * 1024),
+        help="Render cache size cap in MiB (least-recently-used entries are evicted).",
+    )
     return parser
 
 
@@ -695,6 +1503,13 @@ def main() -> None:
     parser = _build_arg_parser()
     args = parser.parse_args()
 
+    try:
+        region_grid_cols, region_grid_rows = (int(v) for v in args.region_grid.lower().split("x"))
+    except ValueError:
+        parser.error(f"--region-grid must look like 96x64, got {args.region_grid!r}")
+    if not codec_available(ImageCodec(args.codec)):
+        parser.error(f"--codec {args.codec} requires Pillow (pip install pillow)")
+
     with fitz.open(args.pdf) as doc:
         page_numbers = parse_pages_argument(args.pages, total_pages=len(doc))
 
@@ -709,14 +1524,57 @@ def main() -> None:
         skip_low_coherence=args.skip_low_coherence,
         coherence_threshold=args.coherence_threshold,
         strategy=TilingStrategy.ADAPTIVE if args.adaptive else TilingStrategy.GRID,
+        workers=max(1, args.workers),
+        render_mode=RenderMode(args.render_mode),
+        max_raster_bytes=(
+            int(args.max_raster_mb * 1024 * 1024) if args.max_raster_mb else None
+        ),
+        text_layer_format=TextLayerFormat(args.text_layer_format),
+        dpi_policy=(
+            DpiPolicy(
+                min_dpi=args.min_dpi,
+                max_dpi=args.dpi,
+                target_text_px=args.target_text_px,
+            )
+            if args.adaptive_dpi
+            else None
+        ),
+        empty_tile_policy=EmptyTilePolicy() if args.skip_empty_tiles else None,
+        mask_policy=(
+            MaskPolicy(title_block=args.mask_title_block, border=args.mask_border)
+            if args.mask_title_block or args.mask_border
+            else None
+        ),
+        image_budget=(
+            image_budget_for_tier(args.plan_for_tier) if args.plan_for_tier else None
+        ),
+        image_encoding=ImageEncoding(
+            codec=ImageCodec(args.codec),
+            jpeg_quality=args.jpeg_quality,
+            max_bytes=int(args.max_tile_kb * 1024) if args.max_tile_kb else None,
+        ),
+        render_cache=(
+            RenderCache(args.render_cache, max_bytes=int(args.render_cache_mb * 1024 * 1024))
+            if args.render_cache
+            else None
+        ),
+        region_grid_cols=region_grid_cols,
+        region_grid_rows=region_grid_rows,
     )
     index_path = _write_tiles_index(results, args.output)
 
     total_tiles = sum(len(tiles) for tiles in results.values())
+    empty_tiles = sum(
+        1
+        for tiles in results.values()
+        for tile in tiles
+        if tile.status == TileStatus.SKIPPED_EMPTY
+    )
     logger.info(
-        "Tiled %s page(s) into %s tile(s). Index: %s",
+        "Tiled %s page(s) into %s tile(s) (%s empty). Index: %s",
         len(results),
         total_tiles,
+        empty_tiles,
         index_path,
     )
 
@@ -11,24 +11,50 @@ Orchestrates all phases end-to-end:
   7. Report       — generate self-contained HTML report
 
 Supports --resume to skip already-completed phases when re-running a
-partially-finished run directory.
+partially-finished run directory.  With --streaming, the manifest is built
+first and tiling (1) overlaps extraction (3): tiles are extracted as soon as
+their page is rendered.  With --selective-tiling, the manifest is also built
+first and only pages it marks for extraction are tiled; light sheets are
+rendered at a lower DPI with fewer tiles.  With --baseline RUN_DIR (an
+earlier run of the previous revision), tiles unchanged since that run carry
+their extractions forward and only changed tiles reach the API; graphs,
+checks and the report are rebuilt from the combined extractions.
+
+Several PDFs (repeated --pdf paths and/or --pdf-dir) are reviewed as one
+run: they are combined into intake/combined.pdf, tiled and extracted by the
+same pools, and feed one manifest, one set of utility graphs and one report.
+Tile ids are prefixed with their source document (d2_p14_r0_c1), see
+src/intake/documents.py.
 
 Usage:
     python -m src.pipeline --pdf path/to/plans.pdf --output-dir ./runs
     python -m src.pipeline --pdf path/to/plans.pdf --output-dir ./runs --resume ./runs/run_20260306_143022
+    python -m src.pipeline --pdf path/to/plans_rev2.pdf --output-dir ./runs --baseline ./runs/run_20260306_143022
+    python -m src.pipeline --pdf civil.pdf utility.pdf --output-dir ./runs
+    python -m src.pipeline --pdf-dir path/to/submittal/ --output-dir ./runs
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import logging
 import os
+import queue
 import re
 import sys
+import threading
+from collections.abc import Container, Iterable, Iterator
 from datetime import datetime, UTC
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .extraction.baseline import BaselineIndex
+    from .extraction.config_models import ExtractionConfig
+    from .extraction.extraction_cache import ExtractionCache
+    from .intake.models import TilePlan
 
 logger = logging.getLogger(__name__)
 
@@ -145,26 +171,212 @@ def _detect_utilities_from_manifest(manifest_path: Path) -> list[str]:
 # Phase 1: Tiling
 # ---------------------------------------------------------------------------
 
-def run_phase_tiling(
+def _plan_selective_tiling(manifest_path: Path, *, dpi: int) -> dict[int, TilePlan]:
+    """Per-page tile plans for manifest-gated tiling.
+
+    Deep-extraction sheets keep the full grid at ``dpi``; light sheets use the
+    cheaper ``LIGHT_TILE_*`` settings from :mod:`src.config`; all other sheets
+    are left out and never rendered.
+    """
+    from .config import LIGHT_TILE_DPI, LIGHT_TILE_GRID_COLS, LIGHT_TILE_GRID_ROWS
+    from .intake.manifest import load_manifest, plan_tiling_from_manifest
+    from .intake.models import TilePlan
+
+    manifest = load_manifest(manifest_path)
+    full_plan = TilePlan(dpi=dpi, grid_rows=2, grid_cols=3, overlap_pct=0.10)
+    light_plan = TilePlan(
+        dpi=min(dpi, LIGHT_TILE_DPI),
+        grid_rows=LIGHT_TILE_GRID_ROWS,
+        grid_cols=LIGHT_TILE_GRID_COLS,
+        overlap_pct=0.10,
+    )
+    plans = plan_tiling_from_manifest(manifest, full_plan=full_plan, light_plan=light_plan)
+    light_count = sum(1 for plan in plans.values() if plan == light_plan)
+    logger.info(
+        "  Selective tiling — %s full, %s light, %s skipped (of %s sheets)",
+        len(plans) - light_count,
+        light_count,
+        len(manifest) - len(plans),
+        len(manifest),
+    )
+    return plans
+
+
+def _load_page_analyses(
+    pdf_path: Path,
+    intake_dir: Path,
+    *,
+    pages: list[int] | None = None,
+    drawings: bool = False,
+) -> dict[int, Any]:
+    """Load (or build) the shared per-page analysis cache in ``intake_dir``."""
+    from .intake.page_analysis import PAGE_ANALYSIS_FILENAME, load_page_analyses
+
+    return load_page_analyses(
+        pdf_path, intake_dir / PAGE_ANALYSIS_FILENAME, pages=pages, drawings=drawings
+    )
+
+
+def _tile_for_pipeline(
     *,
     pdf_path: Path,
     intake_dir: Path,
     dpi: int,
-) -> int:
-    """Tile PDF pages.  Returns total tile count."""
+    tile_workers: int,
+    page_plans: dict[int, TilePlan] | None,
+    on_page_tiled: Any = None,
+    text_layer_format: str = "json",
+    adaptive_dpi: bool = False,
+    skip_empty_tiles: bool = False,
+    mask_title_block: bool = False,
+    mask_border: bool = False,
+    plan_tiles: bool = False,
+    tile_codec: str = "png",
+    max_tile_bytes: int | None = None,
+    render_cache_dir: Path | None = None,
+    render_cache_max_bytes: int | None = None,
+    max_raster_bytes: int | None = None,
+) -> dict[int, list[Any]]:
+    """Run tile_pdf with pipeline defaults and write ``tiles_index.json``.
+
+    With ``adaptive_dpi`` each tile's DPI comes from its font sizes, between
+    ``ADAPTIVE_DPI_MIN`` and the page DPI.  With ``skip_empty_tiles``
+    near-empty tiles are marked ``skipped_empty`` in the index.
+    ``mask_title_block`` and ``mask_border`` confine tiles and text layers to
+    the sheet content (see :mod:`src.intake.masking`).  With ``plan_tiles``
+    each page's grid, overlap and DPI are sized to its model tier's image
+    budget (see :mod:`src.intake.tile_planner`); tiers come from
+    ``manifest.json`` when it already exists and default to ``standard``.
+    ``tile_codec`` and ``max_tile_bytes`` choose the tile image codec and
+    per-tile byte budget (see :mod:`src.utils.image_codec`).  With a
+    ``render_cache_dir`` tiles rendered by earlier runs are reused from the
+    shared cache (see :mod:`src.intake.render_cache`), capped at
+    ``render_cache_max_bytes``.  ``max_raster_bytes`` caps any one tile's
+    uncompressed raster (banded PNG renders, sub-tiles for other codecs).
+    In a multi-PDF run (``documents.json`` in ``intake_dir``) tile ids are
+    prefixed with their source document, see :mod:`src.intake.documents`.
+    """
+    from .config import ADAPTIVE_DPI_MIN, ADAPTIVE_DPI_TARGET_TEXT_PX, RENDER_CACHE_MAX_BYTES
+    from .intake.documents import load_documents, page_tile_prefixes
+    from .intake.manifest import load_manifest
+    from .intake.models import DpiPolicy, EmptyTilePolicy, MaskPolicy, TextLayerFormat
+    from .intake.render_cache import RenderCache
+    from .intake.tile_planner import image_budget_for_tier
     from .intake.tiler import tile_pdf, _write_tiles_index
+    from .utils.image_codec import ImageCodec, ImageEncoding
 
-    logger.info("Phase 1/7: Tiling PDF at %s DPI ...", dpi)
-    results = tile_pdf(
-        pdf_path,
-        intake_dir,
+    page_image_budgets = None
+    manifest_path = intake_dir / "manifest.json"
+    if plan_tiles and manifest_path.exists():
+        page_image_budgets = {
+            sheet.page_number: image_budget_for_tier(sheet.model_tier)
+            for sheet in load_manifest(manifest_path)
+        }
+
+    if page_plans is not None and not page_plans:
+        results: dict[int, list[Any]] = {}
+    else:
+        page_numbers = sorted(page_plans) if page_plans is not None else None
+        results = tile_pdf(
+            pdf_path,
+            intake_dir,
+            page_numbers=page_numbers,
+            dpi=dpi,
+            grid_rows=2,
+            grid_cols=3,
+            overlap_pct=0.10,
+            skip_low_coherence=True,
+            workers=tile_workers,
+            on_page_tiled=on_page_tiled,
+            page_plans=page_plans,
+            page_analyses=_load_page_analyses(
+                pdf_path,
+                intake_dir,
+                pages=page_numbers,
+                drawings=skip_empty_tiles or mask_title_block or mask_border,
+            ),
+            text_layer_format=TextLayerFormat(text_layer_format),
+            dpi_policy=(
+                DpiPolicy(
+                    min_dpi=ADAPTIVE_DPI_MIN,
+                    max_dpi=dpi,
+                    target_text_px=ADAPTIVE_DPI_TARGET_TEXT_PX,
+                )
+                if adaptive_dpi
+                else None
+            ),
+            empty_tile_policy=EmptyTilePolicy() if skip_empty_tiles else None,
+            mask_policy=(
+                MaskPolicy(title_block=mask_title_block, border=mask_border)
+                if mask_title_block or mask_border
+                else None
+            ),
+            image_budget=image_budget_for_tier("standard") if plan_tiles else None,
+            page_image_budgets=page_image_budgets,
+            image_encoding=ImageEncoding(codec=ImageCodec(tile_codec), max_bytes=max_tile_bytes),
+            render_cache=(
+                RenderCache(render_cache_dir, max_bytes=render_cache_max_bytes or RENDER_CACHE_MAX_BYTES)
+                if render_cache_dir is not None
+                else None
+            ),
+            max_raster_bytes=max_raster_bytes,
+            page_tile_prefixes=page_tile_prefixes(load_documents(intake_dir)) or None,
+        )
+    _write_tiles_index(results, intake_dir)
+    return results
+
+
+def run_phase_tiling(
+    *,
+    pdf_path: Path,
+    intake_dir: Path,
+    dpi: int,
+    tile_workers: int = 1,
+    page_plans: dict[int, TilePlan] | None = None,
+    text_layer_format: str = "json",
+    adaptive_dpi: bool = False,
+    skip_empty_tiles: bool = False,
+    mask_title_block: bool = False,
+    mask_border: bool = False,
+    plan_tiles: bool = False,
+    tile_codec: str = "png",
+    max_tile_bytes: int | None = None,
+    render_cache_dir: Path | None = None,
+    render_cache_max_bytes: int | None = None,
+    max_raster_bytes: int | None = None,
+) -> int:
+    """Tile PDF pages.  Returns total tile count.
+
+    When ``page_plans`` is given (see :func:`_plan_selective_tiling`) only
+    those pages are tiled, each with its own plan.  ``text_layer_format`` is
+    ``"json"`` or ``"pack"`` (one ``.tlpk`` per page).  ``adaptive_dpi``
+    picks each tile's DPI from its font sizes; ``skip_empty_tiles`` marks
+    near-empty tiles so extraction skips them; ``mask_title_block`` and
+    ``mask_border`` keep sheet furniture out of tiles and prompts;
+    ``plan_tiles`` sizes tiles to the model's native image resolution;
+    ``tile_codec`` and ``max_tile_bytes`` set the tile codec and byte budget;
+    ``render_cache_dir`` reuses tiles rendered by earlier runs;
+    ``max_raster_bytes`` bounds each tile's raster memory.
+    """
+    logger.info("Phase 1/7: Tiling PDF at %s DPI (workers=%s) ...", dpi, tile_workers)
+    results = _tile_for_pipeline(
+        pdf_path=pdf_path,
+        intake_dir=intake_dir,
         dpi=dpi,
-        grid_rows=2,
-        grid_cols=3,
-        overlap_pct=0.10,
-        skip_low_coherence=True,
+        tile_workers=tile_workers,
+        page_plans=page_plans,
+        text_layer_format=text_layer_format,
+        adaptive_dpi=adaptive_dpi,
+        skip_empty_tiles=skip_empty_tiles,
+        mask_title_block=mask_title_block,
+        mask_border=mask_border,
+        plan_tiles=plan_tiles,
+        tile_codec=tile_codec,
+        max_tile_bytes=max_tile_bytes,
+        render_cache_dir=render_cache_dir,
+        render_cache_max_bytes=render_cache_max_bytes,
+        max_raster_bytes=max_raster_bytes,
     )
-    _write_tiles_index(results, intake_dir)
     total_tiles = sum(len(tiles) for tiles in results.values())
     logger.info("  Tiling done — %s page(s), %s tiles", len(results), total_tiles)
     return total_tiles
@@ -179,11 +391,20 @@ def run_phase_manifest(
     pdf_path: Path,
     intake_dir: Path,
 ) -> Path:
-    """Build sheet manifest.  Returns path to manifest.json."""
+    """Build sheet manifest.  Returns path to manifest.json.
+
+    Page text comes from the shared ``page_analysis.json`` cache, so pages
+    already analyzed during tiling (or a previous run) are not re-read.
+    """
+    from .intake.documents import load_documents
     from .intake.manifest import build_manifest, save_manifest
 
     logger.info("Phase 2/7: Building sheet manifest ...")
-    manifest = build_manifest(pdf_path)
+    manifest = build_manifest(
+        pdf_path,
+        page_analyses=_load_page_analyses(pdf_path, intake_dir),
+        documents=load_documents(intake_dir) or None,
+    )
     manifest_path = intake_dir / "manifest.json"
     save_manifest(manifest, manifest_path)
     deep_count = sum(1 for s in manifest if s.needs_deep_extraction)
@@ -199,23 +420,16 @@ def run_phase_manifest(
 # Phase 3: Extraction
 # ---------------------------------------------------------------------------
 
-def run_phase_extraction(
-    *,
-    intake_dir: Path,
-    extractions_dir: Path,
-    manifest_path: Path,
-    model: str,
-    provider: str,
-    workers: int,
-    dry_run: bool,
-) -> int:
-    """Run hybrid batch extraction.  Returns exit code from run_batch (0 or 2)."""
-    from .extraction.run_hybrid_batch import run_batch
-    from .extraction.config_models import EscalationConfig, ExtractionConfig, PROVIDER_ANTHROPIC
+def _build_extraction_config(
+    *, model: str, provider: str, dry_run: bool, rule_based: bool = False
+) -> ExtractionConfig:
+    """Build the pipeline's ExtractionConfig, resolving the API key from env.
 
-    tiles_dir = intake_dir / "tiles"
-    text_layers_dir = intake_dir / "text_layers"
-    summary_out = extractions_dir / "batch_summary.json"
+    ``rule_based`` enables the rule-based fast path at
+    ``RULE_BASED_MIN_CONFIDENCE`` (see :mod:`src.extraction.rule_based`).
+    """
+    from .config import RULE_BASED_MIN_CONFIDENCE
+    from .extraction.config_models import ExtractionConfig, PROVIDER_ANTHROPIC
 
     # Resolve API key from environment.
     if provider == PROVIDER_ANTHROPIC:
@@ -230,15 +444,7 @@ def run_phase_extraction(
             provider,
         )
 
-    logger.info(
-        "Phase 3/7: Extraction — model=%s provider=%s workers=%s dry_run=%s ...",
-        model,
-        provider,
-        workers,
-        dry_run,
-    )
-
-    ext_config = ExtractionConfig(
+    return ExtractionConfig(
         model=model,
         api_key=api_key,
         provider=provider,
@@ -248,26 +454,292 @@ def run_phase_extraction(
         max_tokens=4096,
         timeout_sec=120,
         use_json_schema=False,
+        rule_based_min_confidence=RULE_BASED_MIN_CONFIDENCE if rule_based else None,
     )
 
-    exit_code = run_batch(
-        tiles_dir=tiles_dir,
-        text_layers_dir=text_layers_dir,
+
+def _run_extraction_batch(
+    *,
+    intake_dir: Path,
+    extractions_dir: Path,
+    manifest_path: Path,
+    model: str,
+    provider: str,
+    workers: int,
+    dry_run: bool,
+    pair_source: Iterable[tuple[Path, Path]] | None = None,
+    empty_tile_ids: Container[str] | None = None,
+    dedup_dir: Path | None = None,
+    baseline: BaselineIndex | None = None,
+    rule_based: bool = False,
+    async_engine: bool = False,
+    extraction_cache: ExtractionCache | None = None,
+) -> int:
+    """Call run_batch with the pipeline's fixed extraction settings.
+
+    Tiles marked ``skipped_empty`` in ``tiles_index.json`` are not extracted;
+    streaming runs pass ``empty_tile_ids`` directly because the index is only
+    written once tiling finishes.  With a ``baseline`` unchanged tiles carry
+    their extraction forward from an earlier run (see
+    :mod:`src.extraction.baseline`).  Phased runs submit tiles heaviest first
+    (see :func:`src.intake.page_cost.tile_costs_from_index`).  With
+    ``rule_based`` easy high-coherence tiles are extracted from their text
+    layer without an API call (see :mod:`src.extraction.rule_based`).
+    ``async_engine`` runs tiles on the asyncio engine (see
+    :mod:`src.extraction.run_hybrid_async`) with ``workers`` tiles in flight,
+    or ``ASYNC_EXTRACTION_CONCURRENCY`` when ``workers`` is 1.  With an
+    ``extraction_cache`` tiles extracted by earlier runs are reused by cache
+    key (see :mod:`src.extraction.extraction_cache`).
+    """
+    from .config import ASYNC_EXTRACTION_CONCURRENCY
+    from .extraction.run_hybrid_batch import _load_empty_tile_ids, run_batch
+    from .extraction.config_models import EscalationConfig
+    from .intake.page_cost import tile_costs_from_index
+    from .utils.image_codec import TILE_IMAGE_GLOBS
+
+    if empty_tile_ids is None:
+        empty_tile_ids = _load_empty_tile_ids(intake_dir / "tiles_index.json")
+
+    batch_kwargs: dict[str, Any] = dict(
+        tiles_dir=intake_dir / "tiles",
+        text_layers_dir=intake_dir / "text_layers",
         out_dir=extractions_dir,
-        tile_globs=["*.png"],
+        tile_globs=list(TILE_IMAGE_GLOBS),
         max_tiles=None,
-        config=ext_config,
+        config=_build_extraction_config(
+            model=model, provider=provider, dry_run=dry_run, rule_based=rule_based
+        ),
         escalation=EscalationConfig(),
         allow_low_coherence=False,
         dry_run=dry_run,
         no_cache=False,
         prompt_dir=None,
         fail_fast=False,
-        summary_out=summary_out,
-        max_concurrency=workers,
+        summary_out=extractions_dir / "batch_summary.json",
         manifest_path=manifest_path if manifest_path.exists() else None,
+        pair_source=pair_source,
+        empty_tile_ids=empty_tile_ids,
+        dedup_dir=dedup_dir,
+        baseline=baseline,
+        tile_costs=(
+            tile_costs_from_index(intake_dir / "tiles_index.json") if pair_source is None else None
+        ),
+        extraction_cache=extraction_cache,
+    )
+    if async_engine:
+        from .extraction.run_hybrid_async import run_batch_async
+
+        return asyncio.run(
+            run_batch_async(
+                **batch_kwargs,
+                max_concurrency=workers if workers > 1 else ASYNC_EXTRACTION_CONCURRENCY,
+            )
+        )
+    return run_batch(**batch_kwargs, max_concurrency=workers)
+
+
+def run_phase_extraction(
+    *,
+    intake_dir: Path,
+    extractions_dir: Path,
+    manifest_path: Path,
+    model: str,
+    provider: str,
+    workers: int,
+    dry_run: bool,
+    dedup_dir: Path | None = None,
+    baseline: BaselineIndex | None = None,
+    rule_based: bool = False,
+    async_engine: bool = False,
+    extraction_cache: ExtractionCache | None = None,
+) -> int:
+    """Run hybrid batch extraction.  Returns exit code from run_batch (0 or 2).
+
+    ``baseline`` carries extractions of unchanged tiles forward from an
+    earlier run of the previous revision instead of re-extracting them.
+    ``rule_based`` enables the rule-based fast path for easy tiles,
+    ``async_engine`` selects the asyncio extraction engine, and
+    ``extraction_cache`` reuses extractions from earlier runs.
+    """
+    logger.info(
+        "Phase 3/7: Extraction — model=%s provider=%s workers=%s dry_run=%s ...",
+        model,
+        provider,
+        workers,
+        dry_run,
+    )
+
+    exit_code = _run_extraction_batch(
+        intake_dir=intake_dir,
+        extractions_dir=extractions_dir,
+        manifest_path=manifest_path,
+        model=model,
+        provider=provider,
+        workers=workers,
+        dry_run=dry_run,
+        dedup_dir=dedup_dir,
+        baseline=baseline,
+        rule_based=rule_based,
+        async_engine=async_engine,
+        extraction_cache=extraction_cache,
+    )
+
+    status_label = "dry-run complete" if dry_run else ("done" if exit_code == 0 else "done with errors")
+    logger.info("  Extraction %s (exit_code=%s)", status_label, exit_code)
+    return exit_code
+
+
+# ---------------------------------------------------------------------------
+# Streaming mode: Phases 1 + 3 overlapped
+# ---------------------------------------------------------------------------
+
+_STREAM_DONE = object()
+
+
+def run_phase_streaming(
+    *,
+    pdf_path: Path,
+    intake_dir: Path,
+    extractions_dir: Path,
+    manifest_path: Path,
+    dpi: int,
+    tile_workers: int,
+    model: str,
+    provider: str,
+    workers: int,
+    dry_run: bool,
+    queue_size: int = 32,
+    page_plans: dict[int, TilePlan] | None = None,
+    text_layer_format: str = "json",
+    adaptive_dpi: bool = False,
+    skip_empty_tiles: bool = False,
+    mask_title_block: bool = False,
+    mask_border: bool = False,
+    plan_tiles: bool = False,
+    tile_codec: str = "png",
+    max_tile_bytes: int | None = None,
+    render_cache_dir: Path | None = None,
+    render_cache_max_bytes: int | None = None,
+    max_raster_bytes: int | None = None,
+    dedup_dir: Path | None = None,
+    baseline: BaselineIndex | None = None,
+    rule_based: bool = False,
+    async_engine: bool = False,
+    extraction_cache: ExtractionCache | None = None,
+) -> int:
+    """Tile and extract concurrently.  Returns exit code from run_batch.
+
+    The tiler runs in a background thread and pushes each tile/text-layer
+    pair onto a bounded queue as soon as its page is written; extraction
+    workers consume the queue immediately.  ``tiles_index.json`` is written
+    once tiling finishes, and ``batch_summary.json`` matches the phased run.
+    ``page_plans``, ``adaptive_dpi``, ``skip_empty_tiles``, the mask flags,
+    ``plan_tiles``, the codec settings and ``render_cache_dir`` apply as in
+    :func:`run_phase_tiling`; ``dedup_dir``, ``baseline``, ``rule_based``,
+    ``async_engine`` and ``extraction_cache`` as in :func:`run_phase_extraction`.
+    """
+
+    logger.info(
+        "Phases 1+3/7: Streaming tiling (%s DPI, workers=%s) into extraction "
+        "(model=%s provider=%s workers=%s dry_run=%s) ...",
+        dpi,
+        tile_workers,
+        model,
+        provider,
+        workers,
+        dry_run,
     )
 
+    pair_queue: queue.Queue[Any] = queue.Queue(maxsize=max(1, queue_size))
+    consumer_stopped = threading.Event()
+    producer_error: list[BaseException] = []
+    tile_totals = {"pages": 0, "tiles": 0}
+    # Filled before each pair is queued, so the consumer always sees a tile's
+    # status before the tile itself.
+    empty_tile_ids: set[str] = set()
+
+    def _put(item: Any) -> None:
+        # Blocks while the queue is full, but gives up once the consumer has
+        # returned so the producer can never deadlock on an abandoned queue.
+        while not consumer_stopped.is_set():
+            try:
+                pair_queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _on_page_tiled(page_number: int, tiles: list[Any]) -> None:
+        for tile in tiles:
+            if tile.status == "skipped_empty":
+                empty_tile_ids.add(tile.tile_id)
+            _put((tile.image_path, tile.text_layer_path))
+
+    def _produce() -> None:
+        try:
+            results = _tile_for_pipeline(
+                pdf_path=pdf_path,
+                intake_dir=intake_dir,
+                dpi=dpi,
+                tile_workers=tile_workers,
+                page_plans=page_plans,
+                on_page_tiled=_on_page_tiled,
+                text_layer_format=text_layer_format,
+                adaptive_dpi=adaptive_dpi,
+                skip_empty_tiles=skip_empty_tiles,
+                mask_title_block=mask_title_block,
+                mask_border=mask_border,
+                plan_tiles=plan_tiles,
+                tile_codec=tile_codec,
+                max_tile_bytes=max_tile_bytes,
+                render_cache_dir=render_cache_dir,
+                render_cache_max_bytes=render_cache_max_bytes,
+                max_raster_bytes=max_raster_bytes,
+            )
+            tile_totals["pages"] = len(results)
+            tile_totals["tiles"] = sum(len(tiles) for tiles in results.values())
+        except BaseException as exc:  # re-raised in the calling thread
+            producer_error.append(exc)
+        finally:
+            _put(_STREAM_DONE)
+
+    def _consume() -> Iterator[tuple[Path, Path]]:
+        while True:
+            item = pair_queue.get()
+            if item is _STREAM_DONE:
+                return
+            yield item
+
+    producer = threading.Thread(target=_produce, name="pipeline-tiler", daemon=True)
+    producer.start()
+    try:
+        exit_code = _run_extraction_batch(
+            intake_dir=intake_dir,
+            extractions_dir=extractions_dir,
+            manifest_path=manifest_path,
+            model=model,
+            provider=provider,
+            workers=workers,
+            dry_run=dry_run,
+            pair_source=_consume(),
+            empty_tile_ids=empty_tile_ids,
+            dedup_dir=dedup_dir,
+            baseline=baseline,
+            rule_based=rule_based,
+            async_engine=async_engine,
+            extraction_cache=extraction_cache,
+        )
+    finally:
+        consumer_stopped.set()
+        producer.join()
+
+    if producer_error:
+        raise producer_error[0]
+
+    logger.info(
+        "  Tiling done — %s page(s), %s tiles",
+        tile_totals["pages"],
+        tile_totals["tiles"],
+    )
     status_label = "dry-run complete" if dry_run else ("done" if exit_code == 0 else "done with errors")
     logger.info("  Extraction %s (exit_code=%s)", status_label, exit_code)
     return exit_code
@@ -512,8 +984,21 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--pdf",
         type=Path,
-        required=True,
-        help="Path to the input PDF plan set.",
+        nargs="+",
+        default=[],
+        help=(
+            "Path to the input PDF plan set.  Several paths are reviewed as one "
+            "run, in the order given, with document-prefixed tile ids."
+        ),
+    )
+    parser.add_argument(
+        "--pdf-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory of PDFs (sorted by name, after any --pdf paths) to review "
+            "as one run."
+        ),
     )
     parser.add_argument(
         "--output-dir",
@@ -562,6 +1047,170 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         default=1,
         help="Concurrent extraction workers. Default: 1.",
     )
+    parser.add_argument(
+        "--tile-workers",
+        type=int,
+        default=1,
+        help="Worker processes for page tiling (phase 1). Default: 1 (serial).",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        default=False,
+        help=(
+            "Overlap tiling with extraction: build the manifest first, then feed "
+            "tiles to extraction workers as soon as each page is rendered."
+        ),
+    )
+    parser.add_argument(
+        "--selective-tiling",
+        action="store_true",
+        default=False,
+        help=(
+            "Build the manifest first and only tile sheets it marks for extraction; "
+            "light sheets (cover, notes, ...) get a lower DPI and fewer tiles."
+        ),
+    )
+    parser.add_argument(
+        "--text-layer-format",
+        type=str,
+        default="json",
+        choices=["json", "pack"],
+        help=(
+            "Tile text layer storage: 'json' (one file per tile) or 'pack' "
+            "(one columnar .tlpk per page). Default: json."
+        ),
+    )
+    parser.add_argument(
+        "--adaptive-dpi",
+        action="store_true",
+        default=False,
+        help=(
+            "Render each tile at the DPI its smallest text needs (from the text "
+            "layer font sizes), between ADAPTIVE_DPI_MIN and --dpi."
+        ),
+    )
+    parser.add_argument(
+        "--skip-empty-tiles",
+        action="store_true",
+        default=False,
+        help=(
+            "Mark near-empty tiles (no text, drawings or ink beyond small limits) "
+            "skipped_empty at tiling so extraction makes no API call for them."
+        ),
+    )
+    parser.add_argument(
+        "--mask-title-block",
+        action="store_true",
+        default=False,
+        help=(
+            "Detect the right-edge title block strip and keep it out of tile clips "
+            "and text layers (fewer prompt tokens per tile)."
+        ),
+    )
+    parser.add_argument(
+        "--mask-border",
+        action="store_true",
+        default=False,
+        help="Also confine tiles to the detected sheet border frame.",
+    )
+    parser.add_argument(
+        "--plan-tiles",
+        action="store_true",
+        default=False,
+        help=(
+            "Size each page's tile grid, overlap and DPI to the model tier's native "
+            "image resolution instead of the fixed 2x3 grid at --dpi."
+        ),
+    )
+    parser.add_argument(
+        "--tile-codec",
+        choices=["png", "png_gray", "png_1bit", "webp", "jpeg"],
+        default="png",
+        help="Tile image codec (png_gray: 16-level palette PNG; webp needs Pillow).",
+    )
+    parser.add_argument(
+        "--max-tile-kb",
+        type=float,
+        default=None,
+        help="Per-tile encoded size budget; larger tiles are re-encoded smaller.",
+    )
+    parser.add_argument(
+        "--render-cache",
+        type=Path,
+        default=None,
+        help=(
+            "Render cache directory shared across runs. Tiles whose page content, clip, "
+            "DPI and codec match an earlier run are linked in instead of re-rendered."
+        ),
+    )
+    parser.add_argument(
+        "--render-cache-mb",
+        type=float,
+        default=10240,
+        help="Render cache size cap in MiB; least-recently-used entries are evicted.",
+    )
+    parser.add_argument(
+        "--max-raster-mb",
+        type=float,
+        default=256,
+        help=(
+            "Cap on one tile's uncompressed raster in MiB. Larger PNG tiles are rendered "
+            "in bands; JPEG/WebP tiles are split into sub-tiles. 0 disables the cap."
+        ),
+    )
+    parser.add_argument(
+        "--dedup-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Perceptual tile dedup index directory, shareable across runs and plan "
+            "sets. Near-identical tiles reuse a stored extraction instead of an API call."
+        ),
+    )
+    parser.add_argument(
+        "--extraction-cache",
+        type=Path,
+        default=None,
+        help=(
+            "Extraction cache directory shared across runs. Tiles whose prompt, image and "
+            "model match an earlier run's extraction reuse it instead of an API call."
+        ),
+    )
+    parser.add_argument(
+        "--extraction-cache-mb",
+        type=float,
+        default=1024,
+        help="Extraction cache size cap in MiB; least-recently-used entries are evicted.",
+    )
+    parser.add_argument(
+        "--rule-based",
+        action="store_true",
+        help=(
+            "Extract high-coherence tiles whose text fully describes their structures "
+            "(STA, offset, RIM, INV labels) with deterministic rules instead of an API call."
+        ),
+    )
+    parser.add_argument(
+        "--async-engine",
+        action="store_true",
+        help=(
+            "Run extraction on one asyncio event loop with an async HTTP client instead of a "
+            "thread pool; --workers sets the tiles in flight (default "
+            "ASYNC_EXTRACTION_CONCURRENCY when --workers is 1)."
+        ),
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        metavar="RUN_DIR",
+        help=(
+            "Earlier run of the previous plan revision. Pages are matched by content "
+            "hash and sheet label; tiles whose text layer is unchanged carry their "
+            "extraction forward and only changed tiles are re-extracted."
+        ),
+    )
     parser.add_argument(
         "--prefix",
         type=str,
@@ -611,16 +1260,30 @@ def main() -> None:
     parser = _build_arg_parser()
     args = parser.parse_args()
 
-    pdf_path: Path = args.pdf.resolve()
-    if not pdf_path.exists():
-        logger.error("PDF not found: %s", pdf_path)
+    from .intake.documents import collect_pdfs, combine_pdfs
+    from .utils.image_codec import ImageCodec, codec_available
+
+    if not codec_available(ImageCodec(args.tile_codec)):
+        parser.error(f"--tile-codec {args.tile_codec} requires Pillow (pip install pillow)")
+
+    if args.pdf_dir is not None and not args.pdf_dir.is_dir():
+        logger.error("PDF directory not found: %s", args.pdf_dir)
         sys.exit(1)
+    source_pdfs = collect_pdfs(args.pdf, args.pdf_dir)
+    if not source_pdfs:
+        parser.error("at least one PDF is required (--pdf and/or --pdf-dir)")
+    for source_pdf in source_pdfs:
+        if not source_pdf.exists():
+            logger.error("PDF not found: %s", source_pdf)
+            sys.exit(1)
+    pdf_path: Path = source_pdfs[0]
 
     model = args.model or _default_model()
     provider: str = args.provider
     dpi: int = args.dpi
     dry_run: bool = args.dry_run
     workers: int = max(1, args.workers)
+    tile_workers: int = max(1, args.tile_workers)
 
     # Resolve run directory.
     if args.resume is not None:
@@ -636,25 +1299,55 @@ def main() -> None:
         run_dir.mkdir(parents=True, exist_ok=True)
         logger.info("Starting new run: %s", run_dir)
 
+    if args.baseline is not None and not (args.baseline / "intake" / "tiles_index.json").exists():
+        logger.error("Baseline run has no tiles_index.json: %s", args.baseline)
+        sys.exit(1)
+
     dirs = _run_dirs(run_dir)
     _ensure_dirs(dirs)
 
-    prefix = _resolve_prefix(pdf_path, args.prefix)
+    if len(source_pdfs) > 1:
+        # One run over every source PDF: tiling, extraction, graphs and the
+        # report all see the combined, run-wide page sequence.
+        pdf_path, _ = combine_pdfs(source_pdfs, dirs["intake"])
+
+    prefix = _resolve_prefix(args.pdf_dir or source_pdfs[0], args.prefix)
     start_time = datetime.now(UTC).isoformat()
     phases_completed: list[str] = []
 
+    # Streaming and selective tiling both need the manifest first, so tiling
+    # is deferred; in streaming mode it then runs alongside extraction.
+    defer_tiling = (args.streaming or args.selective_tiling) and not _tiling_complete(run_dir)
+    stream_tiling = args.streaming and defer_tiling
+
     # ------------------------------------------------------------------
     # Phase 1: Tiling
     # ------------------------------------------------------------------
     if _tiling_complete(run_dir):
         logger.info("Phase 1/7: Tiling — SKIPPED (tiles_index.json already exists)")
         phases_completed.append("tiling:skipped")
+    elif stream_tiling:
+        logger.info("Phase 1/7: Tiling — DEFERRED (streaming into extraction)")
+    elif defer_tiling:
+        logger.info("Phase 1/7: Tiling — DEFERRED (selective tiling runs after the manifest)")
     else:
         try:
             run_phase_tiling(
                 pdf_path=pdf_path,
                 intake_dir=dirs["intake"],
                 dpi=dpi,
+                tile_workers=tile_workers,
+                text_layer_format=args.text_layer_format,
+                adaptive_dpi=args.adaptive_dpi,
+                skip_empty_tiles=args.skip_empty_tiles,
+                mask_title_block=args.mask_title_block,
+                mask_border=args.mask_border,
+                plan_tiles=args.plan_tiles,
+                tile_codec=args.tile_codec,
+                max_tile_bytes=int(args.max_tile_kb * 1024) if args.max_tile_kb else None,
+                render_cache_dir=args.render_cache,
+                render_cache_max_bytes=int(args.render_cache_mb * 1024 * 1024),
+                max_raster_bytes=int(args.max_raster_mb * 1024 * 1024) if args.max_raster_mb else None,
             )
             phases_completed.append("tiling:done")
         except Exception:
@@ -701,6 +1394,47 @@ def main() -> None:
             )
             sys.exit(1)
 
+    page_plans = (
+        _plan_selective_tiling(manifest_path, dpi=dpi)
+        if defer_tiling and args.selective_tiling
+        else None
+    )
+    if defer_tiling and not stream_tiling:
+        try:
+            run_phase_tiling(
+                pdf_path=pdf_path,
+                intake_dir=dirs["intake"],
+                dpi=dpi,
+                tile_workers=tile_workers,
+                page_plans=page_plans,
+                text_layer_format=args.text_layer_format,
+                adaptive_dpi=args.adaptive_dpi,
+                skip_empty_tiles=args.skip_empty_tiles,
+                mask_title_block=args.mask_title_block,
+                mask_border=args.mask_border,
+                plan_tiles=args.plan_tiles,
+                tile_codec=args.tile_codec,
+                max_tile_bytes=int(args.max_tile_kb * 1024) if args.max_tile_kb else None,
+                render_cache_dir=args.render_cache,
+                render_cache_max_bytes=int(args.render_cache_mb * 1024 * 1024),
+                max_raster_bytes=int(args.max_raster_mb * 1024 * 1024) if args.max_raster_mb else None,
+            )
+            phases_completed.append("tiling:done")
+        except Exception:
+            logger.exception("Phase 1 (tiling) failed")
+            _write_run_metadata(
+                run_dir,
+                run_id=run_id,
+                pdf_path=pdf_path,
+                start_time=start_time,
+                end_time=datetime.now(UTC).isoformat(),
+                phases_completed=phases_completed + ["tiling:error"],
+                utilities=[],
+                model=model,
+                provider=provider,
+            )
+            sys.exit(1)
+
     # Resolve utility types now that we have the manifest.
     if args.utilities:
         utilities: list[str] = [u.strip().upper() for u in args.utilities.split(",") if u.strip()]
@@ -731,21 +1465,73 @@ def main() -> None:
     # ------------------------------------------------------------------
     # Phase 3: Extraction
     # ------------------------------------------------------------------
+    baseline = None
+    if args.baseline is not None and not _extraction_complete(run_dir):
+        from .extraction.baseline import BaselineIndex
+
+        baseline = BaselineIndex.from_runs(
+            args.baseline.resolve(), pdf_path=pdf_path, manifest_path=manifest_path
+        )
+    extraction_cache = None
+    if args.extraction_cache is not None:
+        from .extraction.extraction_cache import ExtractionCache
+
+        extraction_cache = ExtractionCache(
+            args.extraction_cache, max_bytes=int(args.extraction_cache_mb * 1024 * 1024)
+        )
+
     if _extraction_complete(run_dir):
         logger.info("Phase 3/7: Extraction — SKIPPED (analysis_package.json / batch_summary.json exists)")
         phases_completed.append("extraction:skipped")
         extraction_exit_code = 0
     else:
         try:
-            extraction_exit_code = run_phase_extraction(
-                intake_dir=dirs["intake"],
-                extractions_dir=dirs["extractions"],
-                manifest_path=manifest_path,
-                model=model,
-                provider=provider,
-                workers=workers,
-                dry_run=dry_run,
-            )
+            if stream_tiling:
+                extraction_exit_code = run_phase_streaming(
+                    pdf_path=pdf_path,
+                    intake_dir=dirs["intake"],
+                    extractions_dir=dirs["extractions"],
+                    manifest_path=manifest_path,
+                    dpi=dpi,
+                    tile_workers=tile_workers,
+                    model=model,
+                    provider=provider,
+                    workers=workers,
+                    dry_run=dry_run,
+                    page_plans=page_plans,
+                    text_layer_format=args.text_layer_format,
+                    adaptive_dpi=args.adaptive_dpi,
+                    skip_empty_tiles=args.skip_empty_tiles,
+                    mask_title_block=args.mask_title_block,
+                    mask_border=args.mask_border,
+                    plan_tiles=args.plan_tiles,
+                    tile_codec=args.tile_codec,
+                    max_tile_bytes=int(args.max_tile_kb * 1024) if args.max_tile_kb else None,
+                    render_cache_dir=args.render_cache,
+                    render_cache_max_bytes=int(args.render_cache_mb * 1024 * 1024),
+                    max_raster_bytes=int(args.max_raster_mb * 1024 * 1024) if args.max_raster_mb else None,
+                    dedup_dir=args.dedup_dir,
+                    rule_based=args.rule_based,
+                    async_engine=args.async_engine,
+                    baseline=baseline,
+                    extraction_cache=extraction_cache,
+                )
+                phases_completed.append("tiling:done")
+            else:
+                extraction_exit_code = run_phase_extraction(
+                    intake_dir=dirs["intake"],
+                    extractions_dir=dirs["extractions"],
+                    manifest_path=manifest_path,
+                    model=model,
+                    provider=provider,
+                    workers=workers,
+                    dry_run=dry_run,
+                    dedup_dir=args.dedup_dir,
+                    rule_based=args.rule_based,
+                    async_engine=args.async_engine,
+                    baseline=baseline,
+                    extraction_cache=extraction_cache,
+                )
             phases_completed.append(
                 "extraction:done" if extraction_exit_code == 0 else "extraction:done_with_errors"
             )
@@ -854,7 +1640,7 @@ def main() -> None:
         phases_completed.append("report:skipped")
     else:
         try:
-            report_title = f"Plan Review — {pdf_path.name}"
+            report_title = f"Plan Review — {', '.join(p.name for p in source_pdfs)}"
             run_phase_report(
                 graphs_dir=dirs["graphs"],
                 report_dir=dirs["report"],
@@ -552,6 +552,8 @@ def render_html_report(
     ok_tiles = int(_to_float(quality_summary.get("ok_tiles")) or 0)
     sanitized_tiles = int(_to_float(quality_summary.get("sanitized_tiles")) or 0)
     skipped_tiles = int(_to_float(quality_summary.get("skipped_tiles")) or 0)
+    empty_tiles = int(_to_float(quality_summary.get("empty_tiles")) or 0)
+    empty_tiles_note = f", {empty_tiles} empty (not extracted)" if empty_tiles else ""
     bad_ratio = _quality_ratio(quality_summary)
 
     pages = _collect_pages_from_batch(batch_summary)
@@ -841,7 +843,7 @@ def render_html_report(
       <h2>Extraction Quality</h2>
       <p>
         <strong>Grade { _escape(quality_grade) }</strong><br>
-        {_escape(str(total_tiles))} tiles processed, {_escape(str(ok_tiles))} ok, {_escape(str(sanitized_tiles))} sanitized, {_escape(str(skipped_tiles))} skipped
+        {_escape(str(total_tiles))} tiles processed, {_escape(str(ok_tiles))} ok, {_escape(str(sanitized_tiles))} sanitized, {_escape(str(skipped_tiles))} skipped{_escape(empty_tiles_note)}
       </p>
       {quality_warning_list}
       {_render_batch_results_table(batch_summary)}
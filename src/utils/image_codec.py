@@ -0,0 +1,308 @@
+"""Tile image codecs: PNG variants, WebP and JPEG with an optional byte budget.
+
+Tiles are line art on white, so most of an RGB PNG's bytes encode colour and
+anti-aliasing levels the extraction model does not need.  The codecs here
+trade those away:
+
+* ``png`` — 8-bit RGB PNG (the original tile format).
+* ``png_gray`` — grayscale quantized to ``gray_levels`` evenly spaced levels,
+  stored as a palette PNG at the smallest bit depth that holds them.
+* ``png_1bit`` — black/white at ``bilevel_threshold``, 1 bit per pixel.
+* ``webp`` — lossless WebP (needs Pillow).
+* ``jpeg`` — baseline JPEG at ``jpeg_quality``.
+
+With ``max_bytes`` set, a tile that encodes larger is re-encoded at lower
+JPEG quality (JPEG only) and then downscaled until it fits.  The media type
+sent to the model is sniffed from the encoded bytes (:func:`image_media_type`),
+so stored tiles of any codec can be extracted without extra metadata.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import math
+import struct
+import zlib
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import IO, Any
+
+import fitz
+import numpy as np
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG colour types.
+_GRAY = 0
+_RGB = 2
+_PALETTE = 3
+# Budget fitting: JPEG quality floor and step, then at most this many
+# downscales, each aiming a little under the budget.
+_JPEG_MIN_QUALITY = 40
+_JPEG_QUALITY_STEP = 10
+_MAX_DOWNSCALES = 6
+_DOWNSCALE_MARGIN = 0.92
+
+
+class ImageCodec(str, Enum):
+    PNG = "png"
+    PNG_GRAY = "png_gray"
+    PNG_1BIT = "png_1bit"
+    WEBP = "webp"
+    JPEG = "jpeg"
+
+
+_SUFFIXES: dict[ImageCodec, str] = {
+    ImageCodec.PNG: ".png",
+    ImageCodec.PNG_GRAY: ".png",
+    ImageCodec.PNG_1BIT: ".png",
+    ImageCodec.WEBP: ".webp",
+    ImageCodec.JPEG: ".jpg",
+}
+
+# Globs matching tile images of every codec, for tile discovery.
+TILE_IMAGE_GLOBS: tuple[str, ...] = ("*.png", "*.jpg", "*.webp")
+
+
+@dataclass(frozen=True)
+class ImageEncoding:
+    """How tile rasters are encoded, and the per-tile byte budget."""
+
+    codec: ImageCodec = ImageCodec.PNG
+    jpeg_quality: int = 85
+    gray_levels: int = 16
+    bilevel_threshold: int = 160
+    max_bytes: int | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "codec", ImageCodec(self.codec))
+        if not (1 <= self.jpeg_quality <= 100):
+            raise ValueError("jpeg_quality must be in [1, 100].")
+        if not (2 <= self.gray_levels <= 256):
+            raise ValueError("gray_levels must be in [2, 256].")
+        if self.max_bytes is not None and self.max_bytes <= 0:
+            raise ValueError("max_bytes must be positive when set.")
+
+    @property
+    def suffix(self) -> str:
+        return _SUFFIXES[self.codec]
+
+    @property
+    def is_png(self) -> bool:
+        return self.suffix == ".png"
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["codec"] = self.codec.value
+        return data
+
+
+def image_media_type(data: bytes) -> str:
+    """MIME type of encoded image bytes (``image/png`` when unrecognized)."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "image/png"
+
+
+# ---------------------------------------------------------------------------
+# PNG family
+# ---------------------------------------------------------------------------
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    )
+
+
+def _png_layout(encoding: ImageEncoding) -> tuple[int, int, bytes | None]:
+    """``(bit_depth, colour_type, palette)`` for a PNG-family codec."""
+    if encoding.codec == ImageCodec.PNG_1BIT:
+        return 1, _GRAY, None
+    if encoding.codec == ImageCodec.PNG_GRAY:
+        levels = encoding.gray_levels
+        depth = next(d for d in (1, 2, 4, 8) if levels <= 1 << d)
+        step = 255 / (levels - 1)
+        palette = b"".join(bytes((round(i * step),) * 3) for i in range(levels))
+        return depth, _PALETTE, palette
+    return 8, _RGB, None
+
+
+def _gray_samples(pix: fitz.Pixmap) -> fitz.Pixmap:
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if pix.n != 1:
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+    return pix
+
+
+def _quantize_table(encoding: ImageEncoding) -> bytes:
+    """Byte translation table from 8-bit gray to the codec's sample values."""
+    if encoding.codec == ImageCodec.PNG_1BIT:
+        return bytes(1 if g >= encoding.bilevel_threshold else 0 for g in range(256))
+    levels = encoding.gray_levels
+    return bytes(round(g * (levels - 1) / 255) for g in range(256))
+
+
+def _pack_rows(samples: bytes, width: int, height: int, depth: int) -> bytes:
+    """Pack one-sample-per-byte rows to *depth* bits and prefix filter bytes."""
+    if depth == 8:
+        return b"".join(
+            b"\x00" + samples[row * width : (row + 1) * width] for row in range(height)
+        )
+    per_byte = 8 // depth
+    arr = np.frombuffer(samples, dtype=np.uint8).reshape(height, width)
+    padded = -width % per_byte
+    if padded:
+        arr = np.pad(arr, ((0, 0), (0, padded)))
+    groups = arr.reshape(height, -1, per_byte).astype(np.uint8)
+    packed = np.zeros(groups.shape[:2], dtype=np.uint8)
+    for i in range(per_byte):
+        packed |= groups[:, :, i] << (8 - depth * (i + 1))
+    rows = np.zeros((height, packed.shape[1] + 1), dtype=np.uint8)
+    rows[:, 1:] = packed
+    return rows.tobytes()
+
+
+def png_scanlines(pix: fitz.Pixmap, encoding: ImageEncoding) -> bytes:
+    """Filtered PNG rows for *pix* in the layout :func:`write_png` declares.
+
+    Rows of separate horizontal bands of one image can be concatenated, so
+    band-rendered tiles stream through the same encoding.
+    """
+    depth, colour_type, _ = _png_layout(encoding)
+    if colour_type == _RGB:
+        if pix.alpha:
+            pix = fitz.Pixmap(pix, 0)
+        row_bytes = pix.width * 3
+        samples = pix.samples_mv
+        return b"".join(
+            b"\x00" + samples[row * pix.stride : row * pix.stride + row_bytes]
+            for row in range(pix.height)
+        )
+    gray = _gray_samples(pix)
+    samples = bytes(gray.samples_mv).translate(_quantize_table(encoding))
+    if gray.stride != gray.width:
+        samples = b"".join(
+            samples[row * gray.stride : row * gray.stride + gray.width]
+            for row in range(gray.height)
+        )
+    return _pack_rows(samples, gray.width, gray.height, depth)
+
+
+def write_png(
+    out: IO[bytes],
+    width: int,
+    height: int,
+    scanlines: Iterable[bytes],
+    encoding: ImageEncoding,
+    *,
+    compress_level: int = 6,
+) -> None:
+    """Stream filtered scanlines (see :func:`png_scanlines`) into a PNG."""
+    depth, colour_type, palette = _png_layout(encoding)
+    compressor = zlib.compressobj(compress_level)
+    out.write(_PNG_SIGNATURE)
+    out.write(
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, depth, colour_type, 0, 0, 0))
+    )
+    if palette is not None:
+        out.write(_png_chunk(b"PLTE", palette))
+    for chunk in scanlines:
+        data = compressor.compress(chunk)
+        if data:
+            out.write(_png_chunk(b"IDAT", data))
+    out.write(_png_chunk(b"IDAT", compressor.flush()))
+    out.write(_png_chunk(b"IEND", b""))
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+
+def codec_available(codec: ImageCodec) -> bool:
+    """Whether *codec*'s optional dependency is installed (WebP needs Pillow).
+
+    Lets command lines reject ``webp`` at argument parsing instead of on the
+    first rendered tile.
+    """
+    if codec == ImageCodec.WEBP:
+        return importlib.util.find_spec("PIL") is not None
+    return True
+
+
+def _encode_webp(pix: fitz.Pixmap) -> bytes:
+    try:
+        from PIL import Image
+    except ImportError as exc:  # pragma: no cover – depends on optional Pillow
+        raise RuntimeError("The webp codec requires Pillow (pip install pillow).") from exc
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    mode = "L" if pix.n == 1 else "RGB"
+    image = Image.frombytes(mode, (pix.width, pix.height), pix.samples, "raw", mode, pix.stride)
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", lossless=True, method=4)
+    return buffer.getvalue()
+
+
+def encode_pixmap(pix: fitz.Pixmap, encoding: ImageEncoding, *, jpeg_quality: int | None = None) -> bytes:
+    """Encode *pix* with *encoding*'s codec (ignoring the byte budget)."""
+    if encoding.codec == ImageCodec.PNG:
+        return pix.tobytes("png")
+    if encoding.codec == ImageCodec.JPEG:
+        if pix.alpha:
+            pix = fitz.Pixmap(pix, 0)
+        return pix.tobytes("jpeg", jpg_quality=jpeg_quality or encoding.jpeg_quality)
+    if encoding.codec == ImageCodec.WEBP:
+        return _encode_webp(pix)
+    buffer = io.BytesIO()
+    write_png(buffer, pix.width, pix.height, [png_scanlines(pix, encoding)], encoding)
+    return buffer.getvalue()
+
+
+def encode_within_budget(pix: fitz.Pixmap, encoding: ImageEncoding) -> tuple[bytes, fitz.Pixmap]:
+    """Encode *pix*, stepping down quality and size until ``max_bytes`` fits.
+
+    Returns the encoded bytes and the pixmap they were encoded from (a
+    downscaled copy when the budget forced one).  If even the smallest
+    attempt is over budget, that attempt is returned.
+    """
+    data = encode_pixmap(pix, encoding)
+    budget = encoding.max_bytes
+    if budget is None or len(data) <= budget:
+        return data, pix
+    quality = encoding.jpeg_quality
+    if encoding.codec == ImageCodec.JPEG:
+        while len(data) > budget and quality > _JPEG_MIN_QUALITY:
+            quality = max(_JPEG_MIN_QUALITY, quality - _JPEG_QUALITY_STEP)
+            data = encode_pixmap(pix, encoding, jpeg_quality=quality)
+    source = pix
+    for _ in range(_MAX_DOWNSCALES):
+        if len(data) <= budget:
+            break
+        scale = math.sqrt(budget / len(data)) * _DOWNSCALE_MARGIN
+        width = max(1, int(pix.width * scale))
+        height = max(1, int(pix.height * scale))
+        pix = fitz.Pixmap(source, width, height, None)
+        data = encode_pixmap(pix, encoding, jpeg_quality=quality)
+    return data, pix
+
+
+def transcode_image(data: bytes, encoding: ImageEncoding) -> bytes:
+    """Re-encode stored image bytes with *encoding* (for extraction-time codecs)."""
+    pix = fitz.Pixmap(data)
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if pix.colorspace is not None and pix.colorspace.n not in (1, 3):
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    encoded, _ = encode_within_budget(pix, encoding)
+    return encoded
@@ -0,0 +1,45 @@
+"""Process memory probes for per-page peak-RSS reporting.
+
+On Linux the kernel's peak-RSS high-water mark (``VmHWM``) can be reset by
+writing ``5`` to ``/proc/self/clear_refs``, so the peak of each page can be
+measured on its own.  Elsewhere :func:`reset_peak_rss` is a no-op and
+:func:`peak_rss_bytes` falls back to ``getrusage``, whose peak covers the
+whole process lifetime.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+try:
+    import resource as _resource
+except ImportError:  # pragma: no cover - Windows
+    _resource = None  # type: ignore[assignment]
+
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+def reset_peak_rss() -> bool:
+    """Reset this process's peak-RSS mark; ``False`` when the platform cannot."""
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size since the last reset (or process start), in bytes."""
+    try:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if _resource is None:
+        return None
+    peak = _resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux/BSD.
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,385 @@
+"""Columnar per-page text-layer packs (``.tlpk``) with lazy, memory-mapped reads.
+
+A pack holds every tile text layer of one page.  Each tile's items are stored
+as packed little-endian columns (ids, local and global bboxes, font sizes,
+font indices and UTF-8 text offsets) behind a small JSON header that records
+per-tile metrics and byte offsets.  Opening a pack reads only the header; a
+tile's columns are decoded from the memory map as NumPy views when that tile
+is requested.
+
+Tiles inside a pack are addressed with a *member path*: the pack path joined
+with the tile id, e.g. ``text_layers/p14.tlpk/p14_r0_c1``.  Member paths are
+recorded in ``tiles_index.json`` and batch summaries exactly where JSON text
+layer paths used to go, and :func:`load_text_layer`,
+:func:`text_layer_exists` and :func:`text_layer_sha256` accept either form.
+
+Usage:
+    python -m src.utils.text_layer_pack pack output/intake/text_layers
+    python -m src.utils.text_layer_pack unpack output/intake/text_layers
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .io_json import canonical_json_sha256, sha256_file
+
+PACK_SUFFIX = ".tlpk"
+PACK_MAGIC = b"TLPK"
+PACK_VERSION = 1
+
+_PREFIX = struct.Struct("<4sII")  # magic, version, header length
+_METRIC_KEYS = (
+    "tile_id",
+    "page_number",
+    "coherence_score",
+    "total_spans",
+    "multi_char_spans",
+    "numeric_spans",
+    "primary_font",
+    "is_hybrid_viable",
+)
+_OPEN_PACK_LIMIT = 16
+# array typecode -> explicit little-endian NumPy dtype.
+_NP_DTYPES = {"q": "<i8", "d": "<f8", "I": "<u4"}
+
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _encode_tile(items: list[dict[str, Any]], font_ids: dict[str, int]) -> bytes:
+    ids = array("q")
+    local = array("d")
+    global_ = array("d")
+    sizes = array("d")
+    fonts = array("I")
+    text_ends = array("I")
+    texts = bytearray()
+    for item in items:
+        ids.append(int(item["text_id"]))
+        local.extend(float(v) for v in item["bbox_local"])
+        global_.extend(float(v) for v in item["bbox_global"])
+        sizes.append(float(item["font_size"]))
+        fonts.append(font_ids.setdefault(str(item["font"]), len(font_ids)))
+        texts += str(item["text"]).encode("utf-8")
+        text_ends.append(len(texts))
+    return b"".join(
+        _le_bytes(column) for column in (ids, local, global_, sizes, fonts, text_ends)
+    ) + bytes(texts)
+
+
+def _decode_tile(raw: bytes, count: int, fonts: list[str]) -> list[dict[str, Any]]:
+    offset = 0
+
+    def _take(typecode: str, n: int) -> list[Any]:
+        nonlocal offset
+        values = np.frombuffer(raw, dtype=_NP_DTYPES[typecode], count=n, offset=offset)
+        offset += values.nbytes
+        return values.tolist()
+
+    ids = _take("q", count)
+    local = _take("d", count * 4)
+    global_ = _take("d", count * 4)
+    sizes = _take("d", count)
+    font_idx = _take("I", count)
+    text_ends = _take("I", count)
+    text_blob = raw[offset:]
+
+    items: list[dict[str, Any]] = []
+    start = 0
+    for i in range(count):
+        end = text_ends[i]
+        items.append(
+            {
+                "text_id": ids[i],
+                "text": text_blob[start:end].decode("utf-8"),
+                "bbox_local": list(local[i * 4 : i * 4 + 4]),
+                "bbox_global": list(global_[i * 4 : i * 4 + 4]),
+                "font": fonts[font_idx[i]],
+                "font_size": sizes[i],
+            }
+        )
+        start = end
+    return items
+
+
+def write_text_layer_pack(layers: Iterable[dict[str, Any]], pack_path: Path) -> Path:
+    """Write text-layer payloads (``TextLayer.to_dict()`` shape) into one pack.
+
+    The file is written to a temporary name and atomically moved into place.
+    """
+    font_ids: dict[str, int] = {}
+    tiles: list[dict[str, Any]] = []
+    blocks: list[bytes] = []
+    offset = 0
+    for layer in layers:
+        items = list(layer.get("items", []))
+        block = _encode_tile(items, font_ids)
+        entry = {key: layer.get(key) for key in _METRIC_KEYS}
+        entry.update({"count": len(items), "offset": offset, "length": len(block)})
+        tiles.append(entry)
+        blocks.append(block)
+        offset += len(block)
+
+    header = json.dumps(
+        {"fonts": list(font_ids), "tiles": tiles}, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+    pack_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{pack_path.name}.", suffix=".tmp", dir=str(pack_path.parent)
+    )
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREFIX.pack(PACK_MAGIC, PACK_VERSION, len(header)))
+            f.write(header)
+            for block in blocks:
+                f.write(block)
+        os.replace(str(tmp_path), str(pack_path))
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink(missing_ok=True)
+    return pack_path
+
+
+class TextLayerPack:
+    """Read-only view of one ``.tlpk`` file.
+
+    Only the header is parsed on open; tile payloads are decoded on demand
+    from a memory map of the file.
+    """
+
+    def __init__(self, pack_path: Path) -> None:
+        self.path = pack_path
+        with pack_path.open("rb") as f:
+            prefix = f.read(_PREFIX.size)
+            if len(prefix) != _PREFIX.size:
+                raise ValueError(f"Truncated text layer pack: {pack_path}")
+            magic, version, header_len = _PREFIX.unpack(prefix)
+            if magic != PACK_MAGIC:
+                raise ValueError(f"Not a text layer pack: {pack_path}")
+            if version != PACK_VERSION:
+                raise ValueError(f"Unsupported text layer pack version {version}: {pack_path}")
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            self._data_start = _PREFIX.size + header_len
+            self._mmap: mmap.mmap | None = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._fonts: list[str] = list(header.get("fonts", []))
+        self._tiles: dict[str, dict[str, Any]] = {
+            str(entry["tile_id"]): entry for entry in header.get("tiles", [])
+        }
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "TextLayerPack":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __contains__(self, tile_id: object) -> bool:
+        return tile_id in self._tiles
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def tile_ids(self) -> list[str]:
+        """Tile ids in the order they were written."""
+        return list(self._tiles)
+
+    def _block(self, entry: dict[str, Any]) -> bytes:
+        if self._mmap is None:
+            raise ValueError(f"Text layer pack is closed: {self.path}")
+        start = self._data_start + int(entry["offset"])
+        return self._mmap[start : start + int(entry["length"])]
+
+    def load(self, tile_id: str) -> dict[str, Any]:
+        """Decode one tile into the same dict shape as its JSON text layer."""
+        entry = self._tiles.get(tile_id)
+        if entry is None:
+            raise KeyError(f"{tile_id} not in {self.path}")
+        payload = {key: entry.get(key) for key in _METRIC_KEYS}
+        payload["items"] = _decode_tile(self._block(entry), int(entry["count"]), self._fonts)
+        return payload
+
+    def sha256(self, tile_id: str) -> str:
+        """Canonical-JSON SHA-256 of one decoded tile.
+
+        Independent of the other tiles in the pack and of the pack layout, so
+        repacking a page leaves every member hash unchanged.
+        """
+        return canonical_json_sha256(self.load(tile_id))
+
+
+# Recently opened packs, keyed by path and file stamp so a rewritten pack is
+# reopened.  Extraction reads every tile of a page from the same pack.  Batch
+# workers share the cache, so it is locked; evicted packs are not closed here
+# because another worker may still be reading one, and their memory map is
+# released when the last reference goes away.
+_open_packs: OrderedDict[tuple[str, int, int], TextLayerPack] = OrderedDict()
+_open_packs_lock = threading.Lock()
+
+
+def open_text_layer_pack(pack_path: Path) -> TextLayerPack:
+    """Open *pack_path*, reusing a cached handle when the file is unchanged."""
+    stat = pack_path.stat()
+    key = (str(pack_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _open_packs_lock:
+        pack = _open_packs.get(key)
+        if pack is not None:
+            _open_packs.move_to_end(key)
+            return pack
+        pack = TextLayerPack(pack_path)
+        _open_packs[key] = pack
+        while len(_open_packs) > _OPEN_PACK_LIMIT:
+            _open_packs.popitem(last=False)
+    return pack
+
+
+def pack_member_path(pack_path: Path, tile_id: str) -> Path:
+    """Member path addressing *tile_id* inside *pack_path*."""
+    return pack_path / tile_id
+
+
+def split_member_path(path: Path) -> tuple[Path, str] | None:
+    """Return ``(pack_path, tile_id)`` for a member path, else ``None``."""
+    if path.parent.suffix == PACK_SUFFIX:
+        return path.parent, path.name
+    return None
+
+
+def load_text_layer(path: Path) -> dict[str, Any]:
+    """Load a text layer from a JSON file or a pack member path."""
+    member = split_member_path(path)
+    if member is not None:
+        pack_path, tile_id = member
+        return open_text_layer_pack(pack_path).load(tile_id)
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def text_layer_exists(path: Path) -> bool:
+    """``Path.exists()`` that also understands pack member paths."""
+    member = split_member_path(path)
+    if member is None:
+        return path.exists()
+    pack_path, tile_id = member
+    if not pack_path.is_file():
+        return False
+    try:
+        return tile_id in open_text_layer_pack(pack_path)
+    except (OSError, ValueError):
+        return False
+
+
+def text_layer_sha256(path: Path) -> str:
+    """SHA-256 of a JSON text layer file, or the content hash of a pack member."""
+    member = split_member_path(path)
+    if member is None:
+        return sha256_file(path)
+    pack_path, tile_id = member
+    return open_text_layer_pack(pack_path).sha256(tile_id)
+
+
+def find_pack_members(text_layers_dir: Path) -> dict[str, Path]:
+    """Map tile_id -> member path for every pack in *text_layers_dir*."""
+    members: dict[str, Path] = {}
+    for pack_path in sorted(text_layers_dir.glob(f"*{PACK_SUFFIX}")):
+        for tile_id in open_text_layer_pack(pack_path).tile_ids():
+            members[tile_id] = pack_member_path(pack_path, tile_id)
+    return members
+
+
+def pack_text_layer_dir(text_layers_dir: Path, *, remove_json: bool = False) -> list[Path]:
+    """Convert ``{tile_id}.json`` text layers into one ``p{page}.tlpk`` per page.
+
+    Returns the written pack paths.  With ``remove_json`` the source files are
+    deleted once their page pack is written.
+    """
+    by_page: dict[int, list[tuple[Path, dict[str, Any]]]] = {}
+    for json_path in sorted(text_layers_dir.glob("*.json")):
+        with json_path.open("r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if not isinstance(payload, dict) or "items" not in payload:
+            continue
+        by_page.setdefault(int(payload.get("page_number", 0)), []).append((json_path, payload))
+
+    written: list[Path] = []
+    for page_number, entries in sorted(by_page.items()):
+        pack_path = text_layers_dir / f"p{page_number}{PACK_SUFFIX}"
+        write_text_layer_pack((payload for _, payload in entries), pack_path)
+        written.append(pack_path)
+        if remove_json:
+            for json_path, _ in entries:
+                json_path.unlink()
+    return written
+
+
+def unpack_text_layer_pack(pack_path: Path, output_dir: Path) -> list[Path]:
+    """Write every tile in *pack_path* back out as ``{tile_id}.json``.
+
+    The JSON matches ``save_text_layer_json`` formatting byte for byte.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written: list[Path] = []
+    with TextLayerPack(pack_path) as pack:
+        for tile_id in pack.tile_ids():
+            json_path = output_dir / f"{tile_id}.json"
+            with json_path.open("w", encoding="utf-8") as f:
+                json.dump(pack.load(tile_id), f, indent=2, ensure_ascii=False)
+            written.append(json_path)
+    return written
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Convert tile text layers between JSON files and per-page .tlpk packs."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack_cmd = sub.add_parser("pack", help="Pack {tile_id}.json files into p{page}.tlpk.")
+    pack_cmd.add_argument("text_layers_dir", type=Path)
+    pack_cmd.add_argument(
+        "--remove-json", action="store_true", help="Delete JSON files after packing."
+    )
+    unpack_cmd = sub.add_parser("unpack", help="Expand .tlpk packs into {tile_id}.json.")
+    unpack_cmd.add_argument("text_layers_dir", type=Path)
+    unpack_cmd.add_argument("--output-dir", type=Path, default=None)
+    return parser
+
+
+def main() -> None:
+    args = _build_arg_parser().parse_args()
+    if args.command == "pack":
+        packs = pack_text_layer_dir(args.text_layers_dir, remove_json=args.remove_json)
+        print(f"Wrote {len(packs)} pack(s) to {args.text_layers_dir}")
+        return
+    output_dir = args.output_dir or args.text_layers_dir
+    count = 0
+    for pack_path in sorted(args.text_layers_dir.glob(f"*{PACK_SUFFIX}")):
+        count += len(unpack_text_layer_pack(pack_path, output_dir))
+    print(f"Wrote {count} text layer JSON file(s) to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Unit tests for incremental re-review against a baseline run."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import fitz
+
+from src.extraction.baseline import BaselineIndex, match_pages
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src.extraction.run_hybrid_batch import run_batch
+from src.intake.manifest import save_manifest
+from src.intake.models import SheetInfo
+from src.intake.tiler import _write_tiles_index, tile_pdf
+from src.utils.text_layer_pack import load_text_layer
+
+
+def _sheet(label: str, page_number: int) -> SheetInfo:
+    return SheetInfo(
+        page_number=page_number,
+        sheet_label=label,
+        sheet_type="plan_view",
+        description=None,
+        utility_types=["SD"],
+        needs_deep_extraction=True,
+    )
+
+
+def _write_plan_set(path: Path, sheets: list[tuple[str, str]]) -> None:
+    """One 612x396 page per ``(label, revision note)``; the note sits in the right half."""
+    doc = fitz.open()
+    for label, note in sheets:
+        page = doc.new_page(width=612, height=396)
+        for row in range(5):
+            page.insert_text((30, 40 + row * 50), f"{label} SDMH-{row} RIM 31{row}.25", fontsize=9)
+            page.draw_line((20, 55 + row * 50), (280, 60 + row * 50))
+        page.insert_text((420, 200), note, fontsize=9)
+    doc.save(str(path))
+    doc.close()
+
+
+def _tile_run(run_dir: Path, pdf_path: Path, labels: list[str]) -> Path:
+    intake = run_dir / "intake"
+    results = tile_pdf(
+        pdf_path, intake, dpi=72, grid_rows=1, grid_cols=2, skip_low_coherence=False
+    )
+    _write_tiles_index(results, intake)
+    save_manifest([_sheet(label, i + 1) for i, label in enumerate(labels)], intake / "manifest.json")
+    (run_dir / "run_metadata.json").write_text(json.dumps({"pdf_path": str(pdf_path)}))
+    return intake
+
+
+def _extraction(tile_id: str, page_number: int, text_ids: list[int]) -> dict:
+    return {
+        "tile_id": tile_id,
+        "page_number": page_number,
+        "sheet_type": "plan_view",
+        "utility_types_present": ["SD"],
+        "callouts": [{"callout_type": "note", "text": "RIM", "source_text_ids": text_ids}],
+    }
+
+
+class PageMatchingTests(unittest.TestCase):
+    def test_hash_match_then_unique_label(self) -> None:
+        baseline = [_sheet("C-101", 1), _sheet("C-102", 2), _sheet("D-1", 3), _sheet("D-1", 4)]
+        revised = [_sheet("C-102", 1), _sheet("C-101", 2), _sheet("D-1", 3), _sheet("D-1", 4)]
+        mapping = match_pages(
+            baseline,
+            revised,
+            baseline_hashes={1: "a", 2: "b", 3: "c", 4: "d"},
+            new_hashes={1: "b", 2: "x", 3: "y", 4: "z"},
+        )
+        # Page 1 moved (hash), page 2 changed (label), duplicate D-1 labels stay unmatched.
+        self.assertEqual(mapping, {1: 2, 2: 1})
+
+
+class CarryForwardTests(unittest.TestCase):
+    def test_only_changed_tiles_are_extracted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            old_pdf, new_pdf = root / "rev1.pdf", root / "rev2.pdf"
+            _write_plan_set(old_pdf, [("C-101", "REV 1"), ("C-102", "REV 1"), ("C-103", "REV 1")])
+            # C-102 moves to the front; C-103's right half is revised.
+            _write_plan_set(new_pdf, [("C-102", "REV 1"), ("C-101", "REV 1"), ("C-103", "REV 2")])
+
+            old_intake = _tile_run(root / "base", old_pdf, ["C-101", "C-102", "C-103"])
+            extractions = root / "base" / "extractions"
+            extractions.mkdir()
+            for text_layer_path in sorted((old_intake / "text_layers").glob("*.json")):
+                layer = load_text_layer(text_layer_path)
+                tile_id, page = layer["tile_id"], layer["page_number"]
+                ids = [item["text_id"] for item in layer["items"][:1]]
+                (extractions / f"{tile_id}.json").write_text(json.dumps(_extraction(tile_id, page, ids)))
+                (extractions / f"{tile_id}.json.meta.json").write_text(
+                    json.dumps({"status": "ok", "tile_id": tile_id, "model": "test/model"})
+                )
+
+            new_intake = _tile_run(root / "new", new_pdf, ["C-102", "C-101", "C-103"])
+            baseline = BaselineIndex.from_runs(
+                root / "base", pdf_path=new_pdf, manifest_path=new_intake / "manifest.json"
+            )
+            self.assertEqual(baseline.page_map, {1: 2, 2: 1, 3: 3})
+
+            out_dir = root / "new" / "extractions"
+            with patch(
+                "src.extraction.run_hybrid.call_openrouter_vision",
+                return_value=(json.dumps(_extraction("p3_r0_c1", 3, [])), {}),
+            ) as api:
+                exit_code = run_batch(
+                    tiles_dir=new_intake / "tiles",
+                    text_layers_dir=new_intake / "text_layers",
+                    out_dir=out_dir,
+                    tile_globs=["*.png"],
+                    max_tiles=None,
+                    config=ExtractionConfig(model="test/model", api_key="dummy"),
+                    escalation=EscalationConfig(enabled=False),
+                    allow_low_coherence=True,
+                    dry_run=False,
+                    no_cache=True,
+                    prompt_dir=None,
+                    fail_fast=False,
+                    summary_out=out_dir / "batch_summary.json",
+                    baseline=baseline,
+                )
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(api.call_count, 1)
+            summary = json.loads((out_dir / "batch_summary.json").read_text())
+            self.assertEqual(summary["carried_forward"]["tiles"], 5)
+            self.assertEqual(summary["counts"]["ok"], 6)
+
+            carried = json.loads((out_dir / "p1_r0_c0.json").read_text())
+            meta = json.loads((out_dir / "p1_r0_c0.json.meta.json").read_text())
+            self.assertEqual((carried["tile_id"], carried["page_number"]), ("p1_r0_c0", 1))
+            self.assertEqual(meta["carried_forward"]["source_tile_id"], "p2_r0_c0")
+            new_layer = load_text_layer(new_intake / "text_layers" / "p1_r0_c0.json")
+            new_ids = {item["text_id"] for item in new_layer["items"]}
+            self.assertTrue(set(carried["callouts"][0]["source_text_ids"]) <= new_ids)
+            revised_meta = json.loads((out_dir / "p3_r0_c1.json.meta.json").read_text())
+            self.assertNotIn("carried_forward", revised_meta)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Unit tests for multi-PDF intake: combined PDF, prefixed tile ids, manifest."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import fitz
+
+from src.extraction.package_contract import page_number_from_tile_id
+from src.graph.assembly import load_extractions_with_meta
+from src.intake.documents import (
+    collect_pdfs,
+    combine_pdfs,
+    document_for_page,
+    load_documents,
+    page_tile_prefixes,
+)
+from src.intake.manifest import build_manifest, load_manifest, save_manifest
+from src.intake.tiler import tile_pdf
+
+
+def _write_set(path: Path, pages: list[str]) -> None:
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page(width=792, height=612)
+        page.insert_text((72, 72), text, fontsize=12)
+    doc.save(str(path))
+    doc.close()
+
+
+class MultiPdfIntakeTests(unittest.TestCase):
+    def test_combined_run_numbers_pages_run_wide_with_document_prefixes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            sources = root / "submittal"
+            sources.mkdir()
+            _write_set(
+                sources / "b_utility.pdf",
+                ["SHEET INDEX\nU-1 WATER PLAN\nU-2 SEWER PROFILE", "U-1\nWATER MAIN 8 IN", "U-2"],
+            )
+            _write_set(
+                sources / "a_civil.pdf",
+                ["SHEET INDEX\nC-1 COVER SHEET\nU-1 STORM DRAIN PLAN", "U-1\nSTORM DRAIN 18 IN"],
+            )
+            (sources / "notes.txt").write_text("not a pdf", encoding="utf-8")
+
+            pdfs = collect_pdfs([sources / "b_utility.pdf"], sources)
+            self.assertEqual([p.name for p in pdfs], ["b_utility.pdf", "a_civil.pdf"])
+
+            intake = root / "run" / "intake"
+            combined, documents = combine_pdfs(pdfs, intake)
+            self.assertEqual(
+                [(d.index, d.first_page, d.last_page) for d in documents], [(1, 1, 3), (2, 4, 5)]
+            )
+            self.assertEqual(load_documents(intake), documents)
+            self.assertEqual(document_for_page(documents, 4).path.name, "a_civil.pdf")
+            with fitz.open(combined) as doc:
+                self.assertEqual(len(doc), 5)
+            mtime = combined.stat().st_mtime_ns
+            self.assertEqual(combine_pdfs(pdfs, intake), (combined, documents))
+            self.assertEqual(combined.stat().st_mtime_ns, mtime)
+
+            results = tile_pdf(
+                combined,
+                intake,
+                page_numbers=[2, 5],
+                dpi=36,
+                grid_rows=1,
+                grid_cols=2,
+                skip_low_coherence=False,
+                page_tile_prefixes=page_tile_prefixes(documents),
+            )
+            tile_ids = [t.tile_id for tiles in results.values() for t in tiles]
+            self.assertEqual(tile_ids, ["d1_p2_r0_c0", "d1_p2_r0_c1", "d2_p5_r0_c0", "d2_p5_r0_c1"])
+            self.assertTrue((intake / "tiles" / "d2_p5_r0_c1.png").exists())
+            self.assertEqual([page_number_from_tile_id(t) for t in tile_ids], [2, 2, 5, 5])
+
+            # Each document's cover index names its own sheets, even when labels repeat.
+            sheets = build_manifest(combined, documents=documents)
+            by_page = {s.page_number: s for s in sheets}
+            self.assertEqual(by_page[2].description, "WATER PLAN")
+            self.assertEqual(by_page[5].description, "STORM DRAIN PLAN")
+            self.assertEqual([s.document for s in sheets], [1, 1, 1, 2, 2])
+            save_manifest(sheets, intake / "manifest.json")
+            reloaded = load_manifest(intake / "manifest.json")
+            self.assertEqual([s.document for s in reloaded], [1, 1, 1, 2, 2])
+
+            single = build_manifest(sources / "a_civil.pdf")
+            self.assertNotIn("document", single[0].to_dict())
+
+    def test_graph_assembly_loads_prefixed_extractions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            extractions = Path(tmpdir)
+            for tile_id in ("p3_r0_c0", "d2_p14_a1"):
+                payload = {
+                    "tile_id": tile_id,
+                    "page_number": page_number_from_tile_id(tile_id),
+                    "sheet_type": "plan_view",
+                    "utility_types_present": ["SD"],
+                }
+                (extractions / f"{tile_id}.json").write_text(json.dumps(payload), encoding="utf-8")
+                (extractions / f"{tile_id}.json.meta.json").write_text(
+                    json.dumps({"tile_id": tile_id}), encoding="utf-8"
+                )
+            loaded, meta = load_extractions_with_meta(extractions)
+            self.assertEqual(sorted(e.tile_id for e in loaded), ["d2_p14_a1", "p3_r0_c0"])
+            self.assertEqual(sorted(meta), ["d2_p14_a1", "p3_r0_c0"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+"""Unit tests for the shared cross-run extraction cache."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from src.extraction import extraction_cache as extraction_cache_module
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src.extraction.extraction_cache import ExtractionCache
+from src.extraction.run_hybrid_async import AsyncProviderCalls, run_batch_async
+from src.extraction.run_hybrid_batch import run_batch
+
+_CONTENT = json.dumps(
+    {
+        "tile_id": "p1_r0_c0",
+        "page_number": 1,
+        "sheet_type": "plan_view",
+        "utility_types_present": ["SD"],
+        "structures": [],
+        "pipes": [],
+    }
+)
+_USAGE = {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+
+
+def _store(cache: ExtractionCache, key: str, *, tokens: int = 15) -> None:
+    cache.store(
+        key,
+        model="test/model",
+        extraction={"tile_id": key},
+        raw_text=f'{{"tile_id": "{key}"}}',
+        result_meta={"usage": {"total_tokens": tokens}, "sanitized": False},
+    )
+
+
+class ExtractionCacheTests(unittest.TestCase):
+    def test_store_fetch_stats_and_export(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ExtractionCache(Path(tmpdir))
+            self.assertIsNone(cache.fetch("ab" * 32))
+            _store(cache, "ab" * 32, tokens=100)
+            _store(cache, "cd" * 32)
+
+            hit = cache.fetch("ab" * 32)
+            self.assertIsNotNone(hit)
+            self.assertEqual(hit.extraction, {"tile_id": "ab" * 32})
+            self.assertEqual(hit.result_meta["usage"], {"total_tokens": 100})
+            cache.fetch("ab" * 32)
+
+            stats = cache.stats()
+            self.assertEqual((stats.entries, stats.hits, stats.tokens_saved), (2, 2, 200))
+            self.assertEqual(stats.models, {"test/model": 2})
+
+            out = io.StringIO()
+            self.assertEqual(cache.export(out), 2)
+            records = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertEqual([r["key"] for r in records], ["ab" * 32, "cd" * 32])
+            self.assertEqual(records[0]["hits"], 2)
+            self.assertEqual(records[1]["raw_text"], f'{{"tile_id": "{"cd" * 32}"}}')
+
+    def test_evicts_least_recently_used(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ExtractionCache(Path(tmpdir))
+            keys = [c * 64 for c in "abc"]
+            for key in keys:
+                _store(cache, key)
+            cache.fetch(keys[0])
+            entry_bytes = cache.stats().total_bytes // 3
+
+            self.assertEqual(cache.evict(max_bytes=2 * entry_bytes), 1)
+            self.assertIsNone(cache.fetch(keys[1]))
+            self.assertIsNotNone(cache.fetch(keys[0]))
+            self.assertFalse((Path(tmpdir) / "bb" / f"{keys[1]}.json").exists())
+            self.assertEqual(cache.evict(max_bytes=2 * entry_bytes), 0)
+
+    def test_fetch_reads_the_blob_outside_the_index_lock(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ExtractionCache(Path(tmpdir))
+            _store(cache, "ab" * 32)
+            locked: list[bool] = []
+            real_read_json = extraction_cache_module.read_json
+
+            def _read_json(path):
+                locked.append(cache._lock.locked())
+                return real_read_json(path)
+
+            with patch.object(extraction_cache_module, "read_json", side_effect=_read_json):
+                self.assertIsNotNone(cache.fetch("ab" * 32))
+            self.assertEqual(locked, [False])
+            self.assertEqual(cache.stats().hits, 1)
+
+
+class BatchExtractionCacheTests(unittest.TestCase):
+    def _write_tiles(self, root: Path, count: int) -> None:
+        for i in range(count):
+            tile_id = f"p{i + 1}_r0_c0"
+            (root / "tiles").mkdir(parents=True, exist_ok=True)
+            (root / "tiles" / f"{tile_id}.png").write_bytes(f"png-{i}".encode())
+            (root / "text_layers").mkdir(parents=True, exist_ok=True)
+            (root / "text_layers" / f"{tile_id}.json").write_text(
+                json.dumps(
+                    {
+                        "tile_id": tile_id,
+                        "page_number": i + 1,
+                        "coherence_score": 0.95,
+                        "is_hybrid_viable": True,
+                        "items": [{"text_id": 0, "text": "SDMH NO. 1", "bbox_local": [0, 0, 40, 8]}],
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+    def _run(self, root: Path, out_name: str, cache: ExtractionCache) -> dict:
+        exit_code = run_batch(
+            tiles_dir=root / "tiles",
+            text_layers_dir=root / "text_layers",
+            out_dir=root / out_name,
+            tile_globs=["*.png"],
+            max_tiles=None,
+            config=ExtractionConfig(model="test/model", api_key="dummy"),
+            escalation=EscalationConfig(enabled=False),
+            allow_low_coherence=False,
+            dry_run=False,
+            no_cache=False,
+            prompt_dir=None,
+            fail_fast=False,
+            summary_out=root / out_name / "batch_summary.json",
+            extraction_cache=cache,
+        )
+        self.assertEqual(exit_code, 0)
+        return json.loads((root / out_name / "batch_summary.json").read_text(encoding="utf-8"))
+
+    def test_new_run_directory_reuses_earlier_extractions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_tiles(root, 3)
+            cache = ExtractionCache(root / "cache")
+            with patch(
+                "src.extraction.run_hybrid.call_openrouter_vision",
+                return_value=(_CONTENT, {"usage": _USAGE, "_response_format_type": "json_schema"}),
+            ) as call:
+                first = self._run(root, "run1", cache)
+                self.assertEqual(call.call_count, 3)
+                second = self._run(root, "run2", cache)
+                self.assertEqual(call.call_count, 3)
+
+            self.assertEqual(first["extraction_cache"], {"decisions": {"miss": 3}, "hit_rate": 0.0})
+            self.assertEqual(second["extraction_cache"], {"decisions": {"hit": 3}, "hit_rate": 1.0})
+            self.assertEqual(second["counts"]["ok"], 3)
+            for row in second["results"]:
+                name = Path(row["out_path"]).name
+                self.assertEqual(
+                    (root / "run2" / name).read_text(encoding="utf-8"),
+                    (root / "run1" / name).read_text(encoding="utf-8"),
+                )
+                self.assertTrue(row["meta"]["cache_hit"])
+                self.assertEqual(row["meta"]["usage"], _USAGE)
+            self.assertEqual(cache.stats().tokens_saved, 45)
+
+    def test_hit_from_another_tile_keeps_this_tiles_identity(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for run_name, tile_id, page_number in (("rev1", "p14_r0_c1", 14), ("rev2", "p15_r0_c1", 15)):
+                run_root = root / run_name
+                (run_root / "tiles").mkdir(parents=True)
+                (run_root / "tiles" / f"{tile_id}.png").write_bytes(b"png-same-sheet")
+                (run_root / "text_layers").mkdir(parents=True)
+                (run_root / "text_layers" / f"{tile_id}.json").write_text(
+                    json.dumps(
+                        {
+                            "tile_id": tile_id,
+                            "page_number": page_number,
+                            "coherence_score": 0.95,
+                            "is_hybrid_viable": True,
+                            "items": [{"text_id": 0, "text": "SDMH NO. 1", "bbox_local": [0, 0, 40, 8]}],
+                        }
+                    ),
+                    encoding="utf-8",
+                )
+            cache = ExtractionCache(root / "cache")
+            with patch(
+                "src.extraction.run_hybrid.call_openrouter_vision",
+                return_value=(_CONTENT, {"usage": _USAGE, "_response_format_type": "json_schema"}),
+            ) as call:
+                self._run(root / "rev1", "out", cache)
+                second = self._run(root / "rev2", "out", cache)
+                self.assertEqual(call.call_count, 1)
+
+            self.assertEqual(second["extraction_cache"]["decisions"], {"hit": 1})
+            written = json.loads((root / "rev2" / "out" / "p15_r0_c1.json").read_text(encoding="utf-8"))
+            self.assertEqual((written["tile_id"], written["page_number"]), ("p15_r0_c1", 15))
+
+    def test_async_engine_keeps_cache_io_off_the_event_loop(self) -> None:
+        io_threads: list[str] = []
+
+        class _RecordingCache(ExtractionCache):
+            def fetch(self, key):
+                io_threads.append(threading.current_thread().name)
+                return super().fetch(key)
+
+            def store(self, key, **kwargs):
+                io_threads.append(threading.current_thread().name)
+                super().store(key, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_tiles(root, 2)
+            cache = _RecordingCache(root / "cache")
+
+            def _handler(request: httpx.Request) -> httpx.Response:
+                return httpx.Response(200, json={"choices": [{"message": {"content": _CONTENT}}], "usage": _USAGE})
+
+            async def _run(out_name: str) -> int:
+                client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+                with ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-io") as executor:
+                    async with client:
+                        return await run_batch_async(
+                            tiles_dir=root / "tiles",
+                            text_layers_dir=root / "text_layers",
+                            out_dir=root / out_name,
+                            tile_globs=["*.png"],
+                            max_tiles=None,
+                            config=ExtractionConfig(model="test/model", api_key="dummy"),
+                            escalation=EscalationConfig(enabled=False),
+                            allow_low_coherence=False,
+                            dry_run=False,
+                            no_cache=False,
+                            prompt_dir=None,
+                            fail_fast=False,
+                            summary_out=root / out_name / "batch_summary.json",
+                            extraction_cache=cache,
+                            calls=AsyncProviderCalls(client, executor),
+                        )
+
+            self.assertEqual(asyncio.run(_run("run1")), 0)
+            self.assertEqual(asyncio.run(_run("run2")), 0)
+            second = json.loads((root / "run2" / "batch_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(second["extraction_cache"]["decisions"], {"hit": 2})
+            # Two misses and two stores, then two hits.
+            self.assertEqual(len(io_threads), 6)
+            self.assertTrue(all(name.startswith("cache-io") for name in io_threads), io_threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
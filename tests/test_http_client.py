@@ -0,0 +1,166 @@
+"""Unit tests for pooled provider sessions against a local HTTP server."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src.extraction.http_client import HttpPoolSettings, close_thread_clients, pooled_session, thread_client
+from src.extraction.run_hybrid import call_openrouter_vision
+from src.extraction.run_hybrid_batch import run_batch
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:  # type: ignore[attr-defined]
+            self.server.connections.add(self.client_address)  # type: ignore[attr-defined]
+        body = json.dumps({"choices": [{"message": {"content": '{"tile_id": "p1_r0_c0"}'}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class PooledSessionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        self.server.lock = threading.Lock()  # type: ignore[attr-defined]
+        self.server.connections = set()  # type: ignore[attr-defined]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}/v1/chat/completions"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _run_calls(self, config: ExtractionConfig, *, calls: int, workers: int) -> int:
+        settings = HttpPoolSettings.from_config(config)
+
+        def _call(_: int) -> str:
+            raw_text, _ = call_openrouter_vision(
+                api_key="dummy",
+                model="test/model",
+                prompt="prompt",
+                image_data_url="data:image/png;base64,abcd",
+                referer="",
+                title="test",
+                temperature=0.0,
+                max_tokens=16,
+                timeout_sec=5,
+                endpoint=self.endpoint,
+                use_structured_output=False,
+                session=pooled_session(settings),
+                connect_timeout_sec=settings.connect_timeout_sec,
+            )
+            return raw_text
+
+        def _worker_calls(n: int) -> list[str]:
+            try:
+                return [_call(i) for i in range(n)]
+            finally:
+                close_thread_clients()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            texts = [t for batch in pool.map(_worker_calls, [calls // workers] * workers) for t in batch]
+        self.assertEqual(texts, ['{"tile_id": "p1_r0_c0"}'] * calls)
+        connections = len(self.server.connections)  # type: ignore[attr-defined]
+        self.server.connections.clear()  # type: ignore[attr-defined]
+        return connections
+
+    def test_each_worker_reuses_one_keep_alive_connection(self) -> None:
+        config = ExtractionConfig(model="test/model", api_key="dummy", timeout_sec=5)
+        self.assertEqual(HttpPoolSettings.from_config(config).timeout, (10.0, 5.0))
+        self.assertEqual(self._run_calls(config, calls=8, workers=2), 2)
+
+        no_keep_alive = ExtractionConfig(model="test/model", api_key="dummy", http_keep_alive=False)
+        self.assertEqual(self._run_calls(no_keep_alive, calls=8, workers=2), 8)
+
+
+class BatchWorkerClientTests(unittest.TestCase):
+    def test_run_batch_closes_each_workers_clients(self) -> None:
+        content = json.dumps(
+            {
+                "tile_id": "p1_r0_c0",
+                "page_number": 1,
+                "sheet_type": "plan_view",
+                "utility_types_present": ["SD"],
+                "structures": [],
+                "pipes": [],
+            }
+        )
+        clients: list[dict] = []
+        lock = threading.Lock()
+
+        class _Client:
+            def __init__(self) -> None:
+                self.state = {"thread": threading.get_ident(), "closed_on": None}
+                with lock:
+                    clients.append(self.state)
+
+            def close(self) -> None:
+                self.state["closed_on"] = threading.get_ident()
+
+        def _call(**kwargs):
+            thread_client(("test",), _Client)
+            return content, {"usage": {"total_tokens": 15}, "_response_format_type": "json_schema"}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "tiles").mkdir()
+            (root / "text_layers").mkdir()
+            for i in range(12):
+                tile_id = f"p{i + 1}_r0_c0"
+                (root / "tiles" / f"{tile_id}.png").write_bytes(f"png-{i}".encode())
+                (root / "text_layers" / f"{tile_id}.json").write_text(
+                    json.dumps(
+                        {
+                            "tile_id": tile_id,
+                            "page_number": i + 1,
+                            "coherence_score": 0.95,
+                            "is_hybrid_viable": True,
+                            "items": [{"text_id": 0, "text": "SDMH NO. 1", "bbox_local": [0, 0, 40, 8]}],
+                        }
+                    ),
+                    encoding="utf-8",
+                )
+            with patch("src.extraction.run_hybrid.call_openrouter_vision", side_effect=_call):
+                exit_code = run_batch(
+                    tiles_dir=root / "tiles",
+                    text_layers_dir=root / "text_layers",
+                    out_dir=root / "out",
+                    tile_globs=["*.png"],
+                    max_tiles=None,
+                    config=ExtractionConfig(model="test/model", api_key="dummy"),
+                    escalation=EscalationConfig(enabled=False),
+                    allow_low_coherence=False,
+                    dry_run=False,
+                    no_cache=True,
+                    prompt_dir=None,
+                    fail_fast=False,
+                    summary_out=root / "out" / "batch_summary.json",
+                    max_concurrency=3,
+                )
+
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(clients)
+        # One client per worker thread, each closed on the thread that made it.
+        self.assertEqual(len({state["thread"] for state in clients}), len(clients))
+        self.assertEqual([state["closed_on"] for state in clients], [state["thread"] for state in clients])
+
+if __name__ == "__main__":
+    unittest.main()
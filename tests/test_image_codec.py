@@ -0,0 +1,180 @@
+"""Unit tests for tile image codecs, byte budgets and upload media types."""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import fitz
+
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src import pipeline
+from src.extraction import run_hybrid, run_hybrid_batch
+from src.extraction.run_hybrid import run_hybrid_extraction
+from src.intake import tiler
+from src.intake.tiler import tile_pdf
+from src.utils.image_codec import (
+    codec_available,
+    ImageCodec,
+    ImageEncoding,
+    encode_pixmap,
+    encode_within_budget,
+    image_media_type,
+)
+
+
+def _line_art_pixmap() -> fitz.Pixmap:
+    doc = fitz.open()
+    page = doc.new_page(width=300, height=200)
+    page.draw_line((10, 20), (290, 180), width=1.5)
+    page.draw_circle((150, 100), 40, width=1)
+    page.insert_text((20, 40), "SDMH-4 RIM 301.25", fontsize=9)
+    pix = page.get_pixmap(dpi=150)
+    doc.close()
+    return pix
+
+
+def _gray(pix: fitz.Pixmap) -> list[int]:
+    if pix.n != 1:
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+    return [
+        pix.samples[row * pix.stride + col]
+        for row in range(pix.height)
+        for col in range(pix.width)
+    ]
+
+
+class ImageCodecTests(unittest.TestCase):
+    def test_png_variants_round_trip_and_shrink(self) -> None:
+        pix = _line_art_pixmap()
+        source = _gray(pix)
+        sizes = {}
+        for codec, tolerance in ((ImageCodec.PNG_GRAY, 9), (ImageCodec.PNG_1BIT, 255)):
+            data = encode_pixmap(pix, ImageEncoding(codec=codec))
+            decoded = fitz.Pixmap(data)
+            self.assertEqual((decoded.width, decoded.height), (pix.width, pix.height))
+            diffs = [abs(a - b) for a, b in zip(_gray(decoded), source)]
+            self.assertLessEqual(max(diffs), tolerance)
+            sizes[codec] = len(data)
+        plain = encode_pixmap(pix, ImageEncoding())
+        self.assertLess(sizes[ImageCodec.PNG_1BIT], sizes[ImageCodec.PNG_GRAY])
+        self.assertLess(sizes[ImageCodec.PNG_GRAY], len(plain))
+
+        jpeg = encode_pixmap(pix, ImageEncoding(codec=ImageCodec.JPEG))
+        self.assertEqual(
+            [image_media_type(b) for b in (plain, jpeg, b"RIFF\0\0\0\0WEBPVP8L")],
+            ["image/png", "image/jpeg", "image/webp"],
+        )
+
+    def test_byte_budget_lowers_quality_then_downscales(self) -> None:
+        pix = _line_art_pixmap()
+        full = encode_pixmap(pix, ImageEncoding(codec=ImageCodec.JPEG))
+        budget = len(full) // 4
+        data, encoded = encode_within_budget(
+            pix, ImageEncoding(codec=ImageCodec.JPEG, max_bytes=budget)
+        )
+        self.assertLessEqual(len(data), budget)
+        self.assertLessEqual(encoded.width, pix.width)
+        unbounded, same = encode_within_budget(pix, ImageEncoding(codec=ImageCodec.PNG_1BIT))
+        self.assertIs(same, pix)
+        self.assertEqual(unbounded, encode_pixmap(pix, ImageEncoding(codec=ImageCodec.PNG_1BIT)))
+
+    def test_webp_without_pillow_fails_at_argument_parsing(self) -> None:
+        real_find_spec = importlib.util.find_spec
+
+        def _find_spec(name, *args, **kwargs):
+            return None if name == "PIL" else real_find_spec(name, *args, **kwargs)
+
+        missing = "/nonexistent/plans.pdf"
+        commands = [
+            (tiler.main, ["tiler", "--pdf", missing, "--output", "/nonexistent/out", "--codec", "webp"]),
+            (pipeline.main, ["pipeline", "--pdf", missing, "--output-dir", "/nonexistent/out", "--tile-codec", "webp"]),
+            (
+                run_hybrid_batch.main,
+                ["batch", "--tiles-dir", "t", "--text-layers-dir", "l", "--out-dir", "o", "--image-codec", "webp"],
+            ),
+            (
+                run_hybrid.main,
+                ["extract", "--tile", "t.png", "--text-layer", "t.json", "--out", "o.json", "--image-codec", "webp"],
+            ),
+        ]
+        with patch("src.utils.image_codec.importlib.util.find_spec", side_effect=_find_spec):
+            self.assertFalse(codec_available(ImageCodec.WEBP))
+            self.assertTrue(codec_available(ImageCodec.PNG_GRAY))
+            for main, argv in commands:
+                with self.subTest(command=argv[0]):
+                    stderr = io.StringIO()
+                    with patch.object(sys, "argv", argv), contextlib.redirect_stderr(stderr):
+                        with self.assertRaises(SystemExit) as exc:
+                            main()
+                    self.assertEqual(exc.exception.code, 2)
+                    self.assertIn("requires Pillow", stderr.getvalue())
+
+    def test_tiler_and_extraction_follow_codec(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sheet.pdf"
+            doc = fitz.open()
+            page = doc.new_page(width=612, height=396)
+            for row in range(8):
+                page.insert_text((30, 40 + row * 40), f"MH-{row} RIM 31{row}.25 INV 30{row}.10", fontsize=8)
+                page.draw_line((20, 50 + row * 40), (590, 55 + row * 40))
+            doc.save(str(pdf_path))
+            doc.close()
+
+            tiles = tile_pdf(
+                pdf_path,
+                root / "intake",
+                dpi=150,
+                grid_rows=1,
+                grid_cols=2,
+                skip_low_coherence=False,
+                image_encoding=ImageEncoding(codec=ImageCodec.JPEG, max_bytes=20_000),
+            )[1]
+            self.assertTrue(all(tile.image_path.suffix == ".jpg" for tile in tiles))
+            self.assertTrue(all(tile.image_path.stat().st_size <= 20_000 for tile in tiles))
+
+            tile = tiles[0]
+            payload = {
+                "tile_id": tile.tile_id,
+                "page_number": 1,
+                "sheet_type": "plan_view",
+                "utility_types_present": [],
+            }
+            sent: list[str] = []
+            for upload, suffix in ((None, "as_stored"), (ImageEncoding(codec=ImageCodec.PNG_1BIT), "1bit")):
+                out_dir = root / "out" / suffix
+                with patch(
+                    "src.extraction.run_hybrid.call_openrouter_vision",
+                    return_value=(json.dumps(payload), {}),
+                ) as api:
+                    exit_code = run_hybrid_extraction(
+                        tile_path=tile.image_path,
+                        text_layer_path=tile.text_layer_path,
+                        output_path=out_dir / f"{tile.tile_id}.json",
+                        raw_output_path=out_dir / f"{tile.tile_id}.json.raw.txt",
+                        meta_output_path=out_dir / f"{tile.tile_id}.json.meta.json",
+                        config=ExtractionConfig(
+                            model="test/model", api_key="dummy", image_encoding=upload
+                        ),
+                        escalation=EscalationConfig(enabled=False),
+                        allow_low_coherence=True,
+                        dry_run=False,
+                        no_cache=True,
+                        prompt_output_path=None,
+                    )
+                self.assertEqual(exit_code, 0)
+                sent.append(api.call_args.kwargs["image_data_url"].split(";", 1)[0])
+
+        self.assertEqual(sent, ["data:image/jpeg", "data:image/png"])
+
+
+if __name__ == "__main__":
+    unittest.main()
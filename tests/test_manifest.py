@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import tempfile
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
 from src.intake import manifest
+from src.intake.models import SheetInfo, TilePlan
 
 
 class ManifestClassificationTests(unittest.TestCase):
@@ -116,6 +118,60 @@ class ManifestBuildTests(unittest.TestCase):
         self.assertTrue(utility.needs_deep_extraction)
 
 
+def _sheet(page_number: int, sheet_type: str, *, deep: bool, utilities: list[str]) -> SheetInfo:
+    return SheetInfo(
+        page_number=page_number,
+        sheet_label=f"C-{page_number}",
+        sheet_type=sheet_type,
+        description=None,
+        utility_types=utilities,
+        needs_deep_extraction=deep,
+    )
+
+
+class SelectiveTilingPlanTests(unittest.TestCase):
+    def test_tiling_profile_maps_deep_light_and_skip(self) -> None:
+        self.assertEqual(
+            manifest.tiling_profile(_sheet(1, "plan_view", deep=True, utilities=["SD"])),
+            manifest.TILING_FULL,
+        )
+        self.assertEqual(
+            manifest.tiling_profile(_sheet(2, "notes", deep=False, utilities=[])),
+            manifest.TILING_LIGHT,
+        )
+        self.assertEqual(
+            manifest.tiling_profile(_sheet(3, "other", deep=False, utilities=["W"])),
+            manifest.TILING_LIGHT,
+        )
+        self.assertEqual(
+            manifest.tiling_profile(_sheet(4, "landscape", deep=False, utilities=[])),
+            manifest.TILING_SKIP,
+        )
+
+    def test_plan_tiling_from_manifest_omits_skipped_sheets(self) -> None:
+        full = TilePlan(dpi=300)
+        light = TilePlan(dpi=150, grid_rows=1, grid_cols=2)
+        sheets = [
+            _sheet(1, "cover", deep=False, utilities=[]),
+            _sheet(2, "plan_view", deep=True, utilities=["SS"]),
+            _sheet(3, "other", deep=False, utilities=[]),
+        ]
+        plans = manifest.plan_tiling_from_manifest(sheets, full_plan=full, light_plan=light)
+        self.assertEqual(plans, {1: light, 2: full})
+
+    def test_load_manifest_round_trips_save_manifest(self) -> None:
+        sheets = [
+            _sheet(1, "cover", deep=False, utilities=[]),
+            _sheet(2, "profile", deep=True, utilities=["SD", "W"]),
+        ]
+        sheets[1].model_tier = "premium"
+        sheets[1].title_block_image_path = Path("title_blocks/p2_title_block.png")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "manifest.json"
+            manifest.save_manifest(sheets, path)
+            self.assertEqual(manifest.load_manifest(path), sheets)
+
+
 if __name__ == "__main__":
     unittest.main()
 
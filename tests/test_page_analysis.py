@@ -0,0 +1,122 @@
+"""Unit tests for src.intake.page_analysis — single-pass analysis and cache reuse."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import fitz
+
+from src.intake import page_analysis
+from src.intake.manifest import build_manifest
+from src.intake.page_analysis import PAGE_ANALYSIS_FILENAME, load_page_analyses
+from src.intake.text_layer import PageSpanIndex, score_pdf_coherence
+from src.utils.io_json import sha256_file
+
+
+def _write_sample_pdf(path: Path, *, pages: int = 2) -> None:
+    doc = fitz.open()
+    for page_idx in range(pages):
+        page = doc.new_page(width=792, height=612)
+        page.insert_text((700, 580), f"C-{page_idx + 1}", fontsize=10)
+        page.insert_text((700, 560), "STORM DRAIN PLAN", fontsize=6)
+        for row in range(4):
+            y = 60 + row * 110
+            page.insert_text((40, y), f"STA {row}+{page_idx}0.00 SDMH RIM 12{row}.50", fontsize=8)
+            page.draw_line((40, y + 20), (600, y + 25))
+    doc.save(str(path))
+    doc.close()
+
+
+class PageAnalysisTests(unittest.TestCase):
+    def test_analysis_matches_direct_page_parsing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_sample_pdf(pdf_path)
+            analyses = load_page_analyses(pdf_path, root / PAGE_ANALYSIS_FILENAME, drawings=True)
+
+            with fitz.open(pdf_path) as doc:
+                page = doc[0]
+                analysis = analyses[1]
+                self.assertEqual(analysis.full_text, page.get_text("text"))
+                direct = PageSpanIndex.from_page(page)
+                cached = PageSpanIndex.from_analysis(analysis)
+                self.assertEqual(cached.texts, direct.texts)
+                self.assertEqual(cached.bboxes, direct.bboxes)
+                self.assertEqual(cached.block_bboxes, direct.block_bboxes)
+                self.assertEqual(len(analysis.drawing_bboxes), len(page.get_drawings()))
+
+            self.assertEqual(
+                score_pdf_coherence(pdf_path, page_analyses=analyses),
+                score_pdf_coherence(pdf_path),
+            )
+            self.assertEqual(
+                build_manifest(pdf_path, page_analyses=analyses), build_manifest(pdf_path)
+            )
+
+    def test_cache_is_reused_and_extended(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_sample_pdf(pdf_path, pages=3)
+            cache_path = root / PAGE_ANALYSIS_FILENAME
+
+            first = load_page_analyses(pdf_path, cache_path, pages=[2])
+            self.assertEqual(list(first), [2])
+
+            with patch.object(
+                page_analysis, "analyze_page", wraps=page_analysis.analyze_page
+            ) as analyze:
+                second = load_page_analyses(pdf_path, cache_path)
+                self.assertEqual([call.args[1] for call in analyze.call_args_list], [1, 3])
+                self.assertEqual(second[2], first[2])
+
+                analyze.reset_mock()
+                load_page_analyses(pdf_path, cache_path)
+                analyze.assert_not_called()
+
+    def test_drawings_are_collected_only_on_request(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_sample_pdf(pdf_path)
+            cache_path = root / PAGE_ANALYSIS_FILENAME
+
+            with patch.object(fitz.Page, "get_drawings", autospec=True) as get_drawings:
+                grid = load_page_analyses(pdf_path, cache_path)
+                get_drawings.assert_not_called()
+            self.assertEqual([a.drawing_bboxes for a in grid.values()], [None, None])
+
+            with patch.object(
+                page_analysis, "analyze_page", wraps=page_analysis.analyze_page
+            ) as analyze:
+                masked = load_page_analyses(pdf_path, cache_path, drawings=True)
+                analyze.assert_not_called()
+            self.assertEqual([len(a.drawing_bboxes) for a in masked.values()], [4, 4])
+            self.assertEqual(masked[1].spans, grid[1].spans)
+
+            reloaded = load_page_analyses(pdf_path, cache_path)
+            self.assertEqual(reloaded[2].drawing_bboxes, masked[2].drawing_bboxes)
+
+    def test_cache_for_a_different_pdf_is_rebuilt(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_sample_pdf(pdf_path)
+            cache_path = root / PAGE_ANALYSIS_FILENAME
+            load_page_analyses(pdf_path, cache_path)
+
+            _write_sample_pdf(pdf_path, pages=1)
+            analyses = load_page_analyses(pdf_path, cache_path)
+            self.assertEqual(list(analyses), [1])
+            payload = json.loads(cache_path.read_text(encoding="utf-8"))
+            self.assertEqual(payload["pdf_sha256"], sha256_file(pdf_path))
+            self.assertEqual(list(payload["pages"]), ["1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
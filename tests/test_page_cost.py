@@ -0,0 +1,117 @@
+"""Unit tests for page cost estimates and heaviest-first scheduling."""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import fitz
+
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src.extraction.run_hybrid_batch import run_batch
+from src.intake.page_analysis import load_page_analyses
+from src.intake.page_cost import estimate_page_cost, lpt_order, tile_costs_from_index
+from src.intake.tiler import _write_tiles_index, tile_pdf
+
+
+def _write_mixed_set(path: Path) -> None:
+    """Page 1 is a sparse notes sheet, page 2 a dense profile, page 3 in between."""
+    doc = fitz.open()
+    for lines, labels in ((5, 3), (1500, 300), (300, 60)):
+        page = doc.new_page(width=792, height=612)
+        shape = page.new_shape()
+        for i in range(lines):
+            shape.draw_line((20 + i % 700, 40 + i % 500), (60 + i % 700, 80 + i % 500))
+            shape.finish(width=0.5)
+        shape.commit()
+        for i in range(labels):
+            page.insert_text((30 + (i * 37) % 650, 30 + (i * 13) % 560), f"INV {i}.25", fontsize=6)
+    doc.save(str(path))
+    doc.close()
+
+
+class PageCostTests(unittest.TestCase):
+    def test_dense_pages_cost_more_and_run_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = Path(tmpdir) / "set.pdf"
+            _write_mixed_set(pdf_path)
+            analyses = load_page_analyses(
+                pdf_path, Path(tmpdir) / "page_analysis.json", drawings=True
+            )
+            with fitz.open(pdf_path) as doc:
+                direct = {i + 1: estimate_page_cost(doc[i], dpi=150) for i in range(3)}
+                cached = {
+                    i + 1: estimate_page_cost(doc[i], dpi=150, analysis=analyses[i + 1])
+                    for i in range(3)
+                }
+                larger = estimate_page_cost(doc[0], dpi=300)
+
+            for costs in (direct, cached):
+                self.assertEqual(lpt_order([1, 2, 3], {p: c.cost for p, c in costs.items()}), [2, 3, 1])
+            self.assertEqual(direct[2].drawings, 1500)
+            self.assertGreater(larger.cost, direct[1].cost)
+            # Equal costs keep their input order.
+            self.assertEqual(lpt_order(["a", "b", "c"], {"b": 1.0}), ["b", "a", "c"])
+
+
+class SchedulingTests(unittest.TestCase):
+    def test_pool_and_batch_take_heaviest_work_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "set.pdf"
+            _write_mixed_set(pdf_path)
+            intake = root / "intake"
+            submitted: list[int] = []
+            real_submit = ProcessPoolExecutor.submit
+
+            def _record_submit(pool, fn, page_number, *args, **kwargs):
+                submitted.append(page_number)
+                return real_submit(pool, fn, page_number, *args, **kwargs)
+
+            with patch.object(ProcessPoolExecutor, "submit", _record_submit):
+                serial = tile_pdf(pdf_path, root / "serial", dpi=72, grid_rows=1, grid_cols=2)
+                results = tile_pdf(pdf_path, intake, dpi=72, grid_rows=1, grid_cols=2, workers=2)
+            self.assertEqual(submitted, [2, 3, 1])
+            self.assertEqual(list(results), list(serial))
+            _write_tiles_index(results, intake)
+
+            costs = tile_costs_from_index(intake / "tiles_index.json")
+            self.assertEqual(len(costs), 6)
+            heaviest = sorted(costs, key=costs.__getitem__, reverse=True)[:2]
+
+            started: list[str] = []
+            lock = threading.Lock()
+
+            def _extract(**kwargs):
+                with lock:
+                    started.append(kwargs["tile_path"].stem)
+                return 0
+
+            with patch("src.extraction.run_hybrid_batch.run_hybrid_extraction", side_effect=_extract):
+                run_batch(
+                    tiles_dir=intake / "tiles",
+                    text_layers_dir=intake / "text_layers",
+                    out_dir=root / "extractions",
+                    tile_globs=["*.png"],
+                    max_tiles=None,
+                    config=ExtractionConfig(model="test/model", api_key="dummy"),
+                    escalation=EscalationConfig(enabled=False),
+                    allow_low_coherence=True,
+                    dry_run=False,
+                    no_cache=True,
+                    prompt_dir=None,
+                    fail_fast=False,
+                    summary_out=root / "extractions" / "batch_summary.json",
+                    max_concurrency=2,
+                    tile_costs=costs,
+                )
+            self.assertEqual(len(started), 6)
+            self.assertEqual(set(started[:2]), set(heaviest))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,8 +9,12 @@ import tempfile
 import unittest
 from pathlib import Path
 
+import fitz
 import networkx as nx
 
+from src.intake.manifest import save_manifest
+from src.intake.models import SheetInfo
+
 from src.pipeline import (
     _checks_complete,
     _detect_utilities_from_manifest,
@@ -19,10 +23,16 @@ from src.pipeline import (
     _graphs_complete,
     _make_run_id,
     _manifest_complete,
+    _plan_selective_tiling,
     _report_complete,
     _run_dirs,
     _tiling_complete,
     _validation_complete,
+    run_phase_extraction,
+    run_phase_manifest,
+    run_phase_streaming,
+    run_phase_tiling,
+    run_phase_validation,
 )
 
 
@@ -359,5 +369,170 @@ class RunDirsTests(unittest.TestCase):
             self.assertIsInstance(val, Path, f"{key} should be a Path")
 
 
+def _write_plan_pdf(path: Path, *, pages: int = 3) -> None:
+    doc = fitz.open()
+    for page_idx in range(pages):
+        page = doc.new_page(width=792, height=612)
+        page.insert_text((620, 580), f"C-{page_idx + 1} STORM DRAIN PLAN", fontsize=8)
+        for row in range(5):
+            y = 60 + row * 100
+            page.insert_text((40, y), f"STA {10 + row}+{page_idx}5.00 SDMH RIM 123.{row}0", fontsize=8)
+            page.insert_text((400, y + 30), f"12\" RCP S=0.00{row + 2}", fontsize=6)
+            page.draw_line((40, y + 40), (760, y + 45))
+    doc.save(str(path))
+    doc.close()
+
+
+def _normalized_summary(path: Path, run_dir: Path) -> dict:
+    text = path.read_text(encoding="utf-8").replace(str(run_dir), "<RUN>")
+    summary = json.loads(text)
+    for key in ("run_id", "started_at", "completed_at"):
+        summary.pop(key, None)
+    return summary
+
+
+class StreamingModeTests(unittest.TestCase):
+    def test_streaming_outputs_match_phased_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_plan_pdf(pdf_path)
+
+            phased = root / "phased"
+            dirs = _run_dirs(phased)
+            run_phase_tiling(pdf_path=pdf_path, intake_dir=dirs["intake"], dpi=72)
+            manifest_path = run_phase_manifest(pdf_path=pdf_path, intake_dir=dirs["intake"])
+            phased_exit = run_phase_extraction(
+                intake_dir=dirs["intake"],
+                extractions_dir=dirs["extractions"],
+                manifest_path=manifest_path,
+                model="test/model",
+                provider="openrouter",
+                workers=1,
+                dry_run=True,
+            )
+
+            streamed = root / "streamed"
+            sdirs = _run_dirs(streamed)
+            s_manifest = run_phase_manifest(pdf_path=pdf_path, intake_dir=sdirs["intake"])
+            streamed_exit = run_phase_streaming(
+                pdf_path=pdf_path,
+                intake_dir=sdirs["intake"],
+                extractions_dir=sdirs["extractions"],
+                manifest_path=s_manifest,
+                dpi=72,
+                tile_workers=2,
+                model="test/model",
+                provider="openrouter",
+                workers=1,
+                dry_run=True,
+                queue_size=2,
+            )
+
+            self.assertEqual(phased_exit, 0)
+            self.assertEqual(streamed_exit, 0)
+            self.assertEqual(
+                (sdirs["intake"] / "tiles_index.json").read_text(encoding="utf-8").replace(
+                    str(streamed), str(phased)
+                ),
+                (dirs["intake"] / "tiles_index.json").read_text(encoding="utf-8"),
+            )
+            phased_summary = _normalized_summary(dirs["extractions"] / "batch_summary.json", phased)
+            streamed_summary = _normalized_summary(
+                sdirs["extractions"] / "batch_summary.json", streamed
+            )
+            self.assertEqual(phased_summary["counts"]["dry_run"], 18)
+            self.assertEqual(streamed_summary, phased_summary)
+
+
+class TextLayerPackPipelineTests(unittest.TestCase):
+    def test_packed_text_layers_extract_and_validate(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_plan_pdf(pdf_path)
+            dirs = _run_dirs(root / "run")
+
+            run_phase_tiling(
+                pdf_path=pdf_path, intake_dir=dirs["intake"], dpi=72, text_layer_format="pack"
+            )
+            self.assertEqual(list(dirs["intake"].glob("text_layers/*.json")), [])
+            manifest_path = run_phase_manifest(pdf_path=pdf_path, intake_dir=dirs["intake"])
+            exit_code = run_phase_extraction(
+                intake_dir=dirs["intake"],
+                extractions_dir=dirs["extractions"],
+                manifest_path=manifest_path,
+                model="test/model",
+                provider="openrouter",
+                workers=1,
+                dry_run=True,
+            )
+
+            self.assertEqual(exit_code, 0)
+            summary = json.loads(
+                (dirs["extractions"] / "batch_summary.json").read_text(encoding="utf-8")
+            )
+            self.assertEqual(summary["counts"]["dry_run"], 18)
+            self.assertEqual(summary["counts"]["missing_text_layers"], 0)
+            self.assertEqual(run_phase_validation(extractions_dir=dirs["extractions"]), "pass")
+
+
+class SelectiveTilingTests(unittest.TestCase):
+    def _write_manifest(self, path: Path, sheet_types: list[tuple[str, bool, list[str]]]) -> None:
+        save_manifest(
+            [
+                SheetInfo(
+                    page_number=idx,
+                    sheet_label=f"C-{idx}",
+                    sheet_type=sheet_type,
+                    description=None,
+                    utility_types=utilities,
+                    needs_deep_extraction=deep,
+                )
+                for idx, (sheet_type, deep, utilities) in enumerate(sheet_types, start=1)
+            ],
+            path,
+        )
+
+    def test_only_manifest_selected_pages_are_tiled(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_plan_pdf(pdf_path)
+            dirs = _run_dirs(root / "run")
+            dirs["intake"].mkdir(parents=True)
+            manifest_path = dirs["intake"] / "manifest.json"
+            self._write_manifest(
+                manifest_path,
+                [("cover", False, []), ("plan_view", True, ["SD"]), ("landscape", False, [])],
+            )
+
+            plans = _plan_selective_tiling(manifest_path, dpi=72)
+            self.assertEqual(sorted(plans), [1, 2])
+            self.assertEqual(plans[2].dpi, 72)
+            self.assertEqual((plans[1].grid_rows, plans[1].grid_cols), (1, 2))
+
+            total = run_phase_tiling(
+                pdf_path=pdf_path, intake_dir=dirs["intake"], dpi=72, page_plans=plans
+            )
+            self.assertEqual(total, 2 + 6)
+            index = json.loads((dirs["intake"] / "tiles_index.json").read_text(encoding="utf-8"))
+            self.assertEqual(sorted(index["pages"]), ["1", "2"])
+
+    def test_empty_selection_writes_empty_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_plan_pdf(pdf_path, pages=1)
+            dirs = _run_dirs(root / "run")
+            dirs["intake"].mkdir(parents=True)
+
+            total = run_phase_tiling(
+                pdf_path=pdf_path, intake_dir=dirs["intake"], dpi=72, page_plans={}
+            )
+            self.assertEqual(total, 0)
+            self.assertTrue(_tiling_complete(root / "run"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,174 @@
+"""Unit tests for the process-wide provider rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.extraction.rate_limit import (
+    ProviderLimiter,
+    RateLimitSettings,
+    header_delay,
+    provider_limiter,
+    reset_limiters,
+)
+from src.extraction.run_hybrid import call_openrouter_vision
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class HeaderDelayTests(unittest.TestCase):
+    def test_reads_retry_after_and_exhausted_rate_limit_headers(self) -> None:
+        now = 1_700_000_000.0
+        self.assertEqual(header_delay({"Retry-After": "2"}, now=now), 2.0)
+        self.assertEqual(header_delay({"retry-after": "Tue, 14 Nov 2023 22:13:30 GMT"}, now=now), 10.0)
+        self.assertEqual(
+            header_delay({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int((now + 3) * 1000))}, now=now),
+            3.0,
+        )
+        self.assertEqual(
+            header_delay(
+                {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1m30s"}, now=now
+            ),
+            90.0,
+        )
+        self.assertEqual(
+            header_delay(
+                {
+                    "anthropic-ratelimit-requests-remaining": "0",
+                    "anthropic-ratelimit-requests-reset": "2023-11-14T22:13:25Z",
+                },
+                now=now,
+            ),
+            5.0,
+        )
+        self.assertIsNone(header_delay({"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "9"}, now=now))
+        self.assertIsNone(header_delay(None))
+
+
+class ProviderLimiterTests(unittest.TestCase):
+    def test_aimd_halves_once_per_window_and_regrows(self) -> None:
+        clock = _Clock()
+        limiter = ProviderLimiter("p:m", RateLimitSettings(max_concurrency=8, min_concurrency=2), clock=clock)
+        burst = [limiter.acquire() for _ in range(4)]
+        clock.now += 1
+        for permit in burst:
+            limiter.release(permit, status=429, headers={"Retry-After": "0"})
+        snap = limiter.snapshot()
+        self.assertEqual(snap["concurrency_limit"], 4.0)
+        self.assertEqual((snap["throttled"], snap["decreases"]), (4, 1))
+
+        for _ in range(3):
+            clock.now += 1
+            limiter.release(limiter.acquire(), status=429, headers={"Retry-After": "0"})
+        self.assertEqual(limiter.snapshot()["concurrency_limit"], 2.0)
+
+        for _ in range(20):
+            limiter.release(limiter.acquire(), status=200)
+        self.assertGreater(limiter.snapshot()["concurrency_limit"], 5.0)
+
+    def test_retry_after_blocks_every_worker(self) -> None:
+        limiter = ProviderLimiter("p:m", RateLimitSettings(max_concurrency=8))
+        limiter.release(limiter.acquire(), status=429, headers={"Retry-After": "0.2"})
+        waited: list[float] = []
+
+        def _worker() -> None:
+            start = time.perf_counter()
+            limiter.release(limiter.acquire(), status=200)
+            waited.append(time.perf_counter() - start)
+
+        threads = [threading.Thread(target=_worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(waited), 4)
+        self.assertGreater(min(waited), 0.15)
+        snap = limiter.snapshot()
+        self.assertEqual(snap["waits"], 4)
+        self.assertEqual(snap["events"][0]["status"], 429)
+        self.assertEqual(snap["events"][0]["wait_sec"], 0.2)
+
+    def test_concurrency_window_caps_async_waiters(self) -> None:
+        limiter = ProviderLimiter("p:m", RateLimitSettings(max_concurrency=2))
+        in_flight = 0
+        peak = 0
+
+        async def _call() -> None:
+            nonlocal in_flight, peak
+            permit = await limiter.aacquire()
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            limiter.release(permit, status=200)
+
+        async def _run() -> None:
+            await asyncio.gather(*(_call() for _ in range(10)))
+            blocked = asyncio.ensure_future(_call())
+            held = [await limiter.aacquire(), await limiter.aacquire()]
+            waiter = asyncio.ensure_future(limiter.aacquire())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            for permit in held:
+                limiter.release(permit, status=200)
+            await blocked
+
+        asyncio.run(_run())
+        self.assertEqual(peak, 2)
+        self.assertEqual(limiter.snapshot()["in_flight"], 0)
+
+    def test_requests_per_minute_spaces_calls(self) -> None:
+        limiter = ProviderLimiter("p:m", RateLimitSettings(max_concurrency=8, requests_per_minute=600))
+        start = time.perf_counter()
+        for _ in range(13):
+            limiter.release(limiter.acquire(), status=200)
+        # Ten-call burst, then one call per 0.1 s.
+        self.assertGreater(time.perf_counter() - start, 0.25)
+
+
+class LimitedCallTests(unittest.TestCase):
+    def setUp(self) -> None:
+        reset_limiters()
+        self.addCleanup(reset_limiters)
+
+    def test_sync_retry_waits_on_limiter_instead_of_fixed_sleep(self) -> None:
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "0.05"})
+        ok = MagicMock(status_code=200, headers={})
+        ok.json.return_value = {"choices": [{"message": {"content": "{}"}}]}
+        limiter = provider_limiter("openrouter", "test/model", RateLimitSettings(max_concurrency=4))
+        with (
+            patch("src.extraction.run_hybrid.requests.post", side_effect=[throttled, ok]),
+            patch("src.extraction.run_hybrid.time.sleep") as sleep,
+        ):
+            raw_text, _ = call_openrouter_vision(
+                api_key="dummy",
+                model="test/model",
+                prompt="prompt",
+                image_data_url="data:image/png;base64,abcd",
+                referer="",
+                title="test",
+                temperature=0.0,
+                max_tokens=16,
+                timeout_sec=5,
+                use_structured_output=False,
+                limiter=limiter,
+            )
+        self.assertEqual(raw_text, "{}")
+        sleep.assert_called_once_with(0)
+        snap = limiter.snapshot()
+        self.assertEqual((snap["requests"], snap["throttled"], snap["waits"]), (2, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Unit tests for the shared content-addressed tile render cache."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import fitz
+
+from src.intake.render import PageRenderer
+from src.intake.render_cache import RenderCache, page_content_hash
+from src.intake.tiler import tile_pdf
+from src.utils.image_codec import ImageCodec, ImageEncoding
+
+
+def _write_sheet(path: Path, *, revision: str = "REV 1") -> None:
+    doc = fitz.open()
+    page = doc.new_page(width=612, height=396)
+    for row in range(6):
+        page.insert_text((30, 40 + row * 50), f"SDMH-{row} RIM 31{row}.25", fontsize=9)
+        page.draw_line((20, 55 + row * 50), (590, 60 + row * 50))
+    page.insert_text((500, 380), revision, fontsize=8)
+    doc.save(str(path))
+    doc.close()
+
+
+class PageContentHashTests(unittest.TestCase):
+    def test_hash_ignores_object_numbering_and_compression(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "sheet.pdf"
+            _write_sheet(path)
+            with fitz.open(path) as doc:
+                original = page_content_hash(doc, 0)
+                doc.save(str(Path(tmpdir) / "resaved.pdf"), garbage=4, deflate=True)
+                merged = fitz.open()
+                merged.new_page()
+                merged.insert_pdf(doc)
+                self.assertEqual(page_content_hash(merged, 1), original)
+                merged.close()
+            with fitz.open(Path(tmpdir) / "resaved.pdf") as resaved:
+                self.assertEqual(page_content_hash(resaved, 0), original)
+
+            _write_sheet(path, revision="REV 2")
+            with fitz.open(path) as revised:
+                self.assertNotEqual(page_content_hash(revised, 0), original)
+
+
+class RenderCacheTests(unittest.TestCase):
+    def test_second_run_reuses_renders_and_eviction_trims(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sheet.pdf"
+            _write_sheet(pdf_path)
+            cache = RenderCache(root / "cache")
+            options = {"dpi": 100, "grid_rows": 1, "grid_cols": 2, "skip_low_coherence": False}
+
+            first = tile_pdf(pdf_path, root / "run_1", render_cache=cache, **options)[1]
+            self.assertEqual(cache.stats().entries, 2)
+            with patch.object(PageRenderer, "_render_to_image") as render:
+                second = tile_pdf(pdf_path, root / "run_2", render_cache=cache, **options)[1]
+            render.assert_not_called()
+            for a, b in zip(first, second):
+                self.assertEqual(a.image_path.read_bytes(), b.image_path.read_bytes())
+                self.assertEqual(
+                    (a.image_width_px, a.image_height_px, a.dpi),
+                    (b.image_width_px, b.image_height_px, b.dpi),
+                )
+
+            # Re-tiling over a linked tile must not corrupt the cached copy.
+            cached_bytes = second[0].image_path.read_bytes()
+            gray = ImageEncoding(codec=ImageCodec.PNG_GRAY)
+            tile_pdf(pdf_path, root / "run_2", image_encoding=gray, **options)
+            self.assertNotEqual(second[0].image_path.read_bytes(), cached_bytes)
+            third = tile_pdf(pdf_path, root / "run_3", render_cache=cache, **options)[1]
+            self.assertEqual(third[0].image_path.read_bytes(), cached_bytes)
+
+            # A different codec is a different entry.
+            tile_pdf(
+                pdf_path,
+                root / "run_4",
+                render_cache=cache,
+                image_encoding=gray,
+                **options,
+            )
+            self.assertEqual(cache.stats().entries, 4)
+
+            stats = cache.stats()
+            removed = cache.evict(max_bytes=stats.total_bytes // 2)
+            self.assertGreaterEqual(removed, 1)
+            self.assertLessEqual(cache.stats().total_bytes, stats.total_bytes // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Unit tests for the rule-based text-layer extractor and its API bypass."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src.extraction.rule_based import extract_rule_based
+from src.extraction.run_hybrid import run_hybrid_extraction
+
+
+def _item(text_id: int, text: str, x: float, y: float, font_size: float = 8.0) -> dict:
+    return {
+        "text_id": text_id,
+        "text": text,
+        "bbox_local": [x, y, x + 4.0 * len(text), y + font_size],
+        "font_size": font_size,
+    }
+
+
+def _profile_layer(*extra: dict) -> dict:
+    """Two labelled manholes, a pipe callout and profile grid ticks."""
+    sdmh = ["SDMH NO. 3", "STA 16+82.45", "28.00' RT", "RIM 312.45", 'INV 12" N 305.10', 'INV 12" S 305.00']
+    ssmh = ["EXIST. SSMH NO. 7", "STA 18+10.00, 6.00' LT", "RIM 310.20", 'IE 8" SS E 301.55']
+    items = [_item(i, text, 100, 100 + 10 * i) for i, text in enumerate(sdmh)]
+    items += [_item(10 + i, text, 400, 100 + 10 * i) for i, text in enumerate(ssmh)]
+    items += [
+        _item(20, "310", 10, 10),
+        _item(21, "17+00", 10, 400),
+        _item(22, '120 LF 12" RCP @ 0.50%', 200, 300),
+        _item(23, "STORM DRAIN PROFILE", 200, 20),
+        *extra,
+    ]
+    return {
+        "tile_id": "p3_r0_c1",
+        "page_number": 3,
+        "coherence_score": 0.95,
+        "is_hybrid_viable": True,
+        "items": items,
+    }
+
+
+class RuleBasedExtractorTests(unittest.TestCase):
+    def test_profile_labels_become_structures_and_pipes(self) -> None:
+        result = extract_rule_based(_profile_layer())
+        assert result is not None
+        extraction = result.extraction
+
+        self.assertEqual(extraction.sheet_type, "profile_view")
+        self.assertEqual(extraction.utility_types_present, ["SD", "SS"])
+        sdmh, ssmh = extraction.structures
+        self.assertEqual((sdmh.id, sdmh.structure_type, sdmh.station), ("SDMH-3", "SDMH", "16+82.45"))
+        self.assertEqual((sdmh.offset, sdmh.rim_elevation), ("28.00' RT", 312.45))
+        self.assertEqual([(i.direction, i.pipe_size, i.elevation) for i in sdmh.inverts],
+                         [("N", '12"', 305.10), ("S", '12"', 305.00)])
+        self.assertEqual(sdmh.source_text_ids, [0, 1, 2, 3, 4, 5])
+        self.assertEqual((ssmh.offset, ssmh.is_existing, ssmh.inverts[0].pipe_type), ("6.00' LT", True, "SS"))
+        (pipe,) = extraction.pipes
+        self.assertEqual((pipe.pipe_type, pipe.length_lf, pipe.slope), ("SD", 120.0, 0.005))
+        # Grid ticks are not counted; the pipe type is inferred from RCP.
+        self.assertEqual(result.coverage, 1.0)
+        self.assertAlmostEqual(result.confidence, 0.9)
+
+        # A crown label the rules do not read lowers coverage below the gate.
+        result = extract_rule_based(_profile_layer(_item(30, "CR 329.28", 600, 500)))
+        assert result is not None
+        self.assertEqual(result.unexplained_text_ids, (30,))
+        self.assertLess(result.confidence, 0.9)
+
+        # Two stations in one label cluster are ambiguous: no structure is guessed.
+        crowded = _profile_layer(_item(31, "STA 16+90.00", 100, 160))
+        crowded_result = extract_rule_based(crowded)
+        assert crowded_result is not None
+        self.assertEqual([s.station for s in crowded_result.extraction.structures], ["18+10.00"])
+        self.assertIsNone(extract_rule_based({"tile_id": "p1_r0_c0", "items": [_item(0, "NOTES", 0, 0)]}))
+
+
+class RuleBasedBypassTests(unittest.TestCase):
+    def _run(self, root: Path, text_layer: dict, *, min_confidence: float) -> dict:
+        tile_path = root / f"{text_layer['tile_id']}.png"
+        tile_path.write_bytes(b"not-a-real-image")
+        text_layer_path = root / "text_layer.json"
+        text_layer_path.write_text(json.dumps(text_layer), encoding="utf-8")
+        out = root / "out.json"
+        meta = root / "out.json.meta.json"
+        llm_payload = {
+            "tile_id": text_layer["tile_id"],
+            "page_number": 3,
+            "sheet_type": "profile_view",
+            "utility_types_present": [],
+        }
+        with patch(
+            "src.extraction.run_hybrid.call_openrouter_vision",
+            return_value=(json.dumps(llm_payload), {"usage": {"total_tokens": 10}}),
+        ) as api_call:
+            exit_code = run_hybrid_extraction(
+                tile_path=tile_path,
+                text_layer_path=text_layer_path,
+                output_path=out,
+                raw_output_path=root / "out.raw.txt",
+                meta_output_path=meta,
+                config=ExtractionConfig(
+                    model="test/model", api_key="dummy", rule_based_min_confidence=min_confidence
+                ),
+                escalation=EscalationConfig(enabled=False),
+                allow_low_coherence=False,
+                dry_run=False,
+                no_cache=True,
+                prompt_output_path=None,
+            )
+        self.assertEqual(exit_code, 0)
+        payload = json.loads(meta.read_text(encoding="utf-8"))
+        payload["api_calls"] = api_call.call_count
+        payload["structures"] = len(json.loads(out.read_text(encoding="utf-8"))["structures"])
+        return payload
+
+    def test_confident_tiles_skip_the_api(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            accepted = self._run(root, _profile_layer(), min_confidence=0.9)
+            self.assertEqual(accepted["api_calls"], 0)
+            self.assertEqual(accepted["extractor"], "rule_based")
+            self.assertEqual(accepted["rule_based"]["decision"], "accepted")
+            self.assertEqual(accepted["structures"], 2)
+
+            below = self._run(root, _profile_layer(), min_confidence=0.95)
+            self.assertEqual(below["api_calls"], 1)
+            self.assertNotIn("extractor", below)
+            self.assertEqual(below["rule_based"]["decision"], "below_gate")
+
+            low = self._run(root, {**_profile_layer(), "coherence_score": 0.8}, min_confidence=0.9)
+            self.assertEqual(low["api_calls"], 1)
+            self.assertEqual(low["rule_based"], {"decision": "low_coherence"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+"""Unit tests for the asyncio extraction engine."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src.extraction.rate_limit import reset_limiters
+from src.extraction.run_hybrid_async import AsyncProviderCalls, run_batch_async
+from src.extraction.run_hybrid_batch import run_batch
+
+_CONTENT = json.dumps(
+    {
+        "tile_id": "p1_r0_c0",
+        "page_number": 1,
+        "sheet_type": "plan_view",
+        "utility_types_present": ["SD"],
+        "structures": [],
+        "pipes": [],
+    }
+)
+_USAGE = {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+
+
+def _write_tiles(root: Path, count: int) -> None:
+    for i in range(count):
+        tile_id = f"p{i + 1}_r0_c0"
+        (root / "tiles").mkdir(parents=True, exist_ok=True)
+        (root / "tiles" / f"{tile_id}.png").write_bytes(f"png-{i}".encode())
+        (root / "text_layers").mkdir(parents=True, exist_ok=True)
+        (root / "text_layers" / f"{tile_id}.json").write_text(
+            json.dumps(
+                {
+                    "tile_id": tile_id,
+                    "page_number": i + 1,
+                    "coherence_score": 0.95,
+                    "is_hybrid_viable": True,
+                    "items": [{"text_id": 0, "text": "SDMH NO. 1", "bbox_local": [0, 0, 40, 8]}],
+                }
+            ),
+            encoding="utf-8",
+        )
+
+
+def _batch_kwargs(root: Path, out_name: str) -> dict:
+    return {
+        "tiles_dir": root / "tiles",
+        "text_layers_dir": root / "text_layers",
+        "out_dir": root / out_name,
+        "tile_globs": ["*.png"],
+        "max_tiles": None,
+        "config": ExtractionConfig(model="test/model", api_key="dummy"),
+        "escalation": EscalationConfig(enabled=False),
+        "allow_low_coherence": False,
+        "dry_run": False,
+        "no_cache": True,
+        "prompt_dir": None,
+        "fail_fast": False,
+        "summary_out": root / out_name / "batch_summary.json",
+    }
+
+
+def _mock_calls(handler) -> tuple[AsyncProviderCalls, httpx.AsyncClient]:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncProviderCalls(client), client
+
+
+def _ok_response() -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": _CONTENT}}], "usage": _USAGE})
+
+
+class AsyncEngineTests(unittest.TestCase):
+    def test_matches_thread_engine_outputs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_tiles(root, 3)
+            with patch(
+                "src.extraction.run_hybrid.call_openrouter_vision",
+                return_value=(_CONTENT, {"usage": _USAGE, "_response_format_type": "json_schema"}),
+            ):
+                self.assertEqual(run_batch(**_batch_kwargs(root, "threads"), max_concurrency=2), 0)
+
+            async def _run() -> int:
+                calls, client = _mock_calls(lambda request: _ok_response())
+                async with client:
+                    return await run_batch_async(**_batch_kwargs(root, "asyncio"), calls=calls)
+
+            self.assertEqual(asyncio.run(_run()), 0)
+
+            for name in sorted(p.name for p in (root / "threads").iterdir()):
+                if name == "batch_summary.json" or name == "analysis_package.json":
+                    continue
+                self.assertEqual(
+                    (root / "asyncio" / name).read_text(encoding="utf-8"),
+                    (root / "threads" / name).read_text(encoding="utf-8"),
+                    name,
+                )
+            summaries = [
+                json.loads((root / engine / "batch_summary.json").read_text(encoding="utf-8"))
+                for engine in ("threads", "asyncio")
+            ]
+            self.assertEqual(summaries[0]["counts"], summaries[1]["counts"])
+            self.assertEqual(
+                [(r["tile_stem"], r["status"]) for r in summaries[0]["results"]],
+                [(r["tile_stem"], r["status"]) for r in summaries[1]["results"]],
+            )
+            self.assertNotIn("interrupted", summaries[1])
+
+    def test_hundreds_of_tiles_in_flight(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_tiles(root, 300)
+            in_flight = 0
+            peak = 0
+
+            async def _handler(request: httpx.Request) -> httpx.Response:
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.2)
+                in_flight -= 1
+                return _ok_response()
+
+            async def _run() -> int:
+                calls, client = _mock_calls(_handler)
+                async with client:
+                    return await run_batch_async(
+                        **_batch_kwargs(root, "extractions"), calls=calls, max_concurrency=300
+                    )
+
+            self.assertEqual(asyncio.run(_run()), 0)
+            summary = json.loads((root / "extractions" / "batch_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(summary["counts"]["ok"], 300)
+            self.assertGreater(peak, 200)
+
+    def test_sigint_drains_then_cancels_in_flight_tiles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_tiles(root, 10)
+            release = asyncio.Event()
+
+            async def _run(out_name: str, interrupts: int) -> tuple[int, dict]:
+                requests_seen = 0
+
+                async def _handler(request: httpx.Request) -> httpx.Response:
+                    nonlocal requests_seen
+                    requests_seen += 1
+                    if requests_seen == 2:
+                        for _ in range(interrupts):
+                            os.kill(os.getpid(), signal.SIGINT)
+                            await asyncio.sleep(0.01)
+                    if interrupts > 1:
+                        await release.wait()
+                    return _ok_response()
+
+                calls, client = _mock_calls(_handler)
+                async with client:
+                    exit_code = await run_batch_async(
+                        **_batch_kwargs(root, out_name), calls=calls, max_concurrency=2
+                    )
+                summary_path = root / out_name / "batch_summary.json"
+                return exit_code, json.loads(summary_path.read_text(encoding="utf-8"))
+
+            exit_code, drained = asyncio.run(_run("drained", interrupts=1))
+            self.assertEqual(exit_code, 0)
+            self.assertTrue(drained["interrupted"])
+            # In-flight tiles finish; no new tiles start after the interrupt.
+            self.assertLess(drained["counts"]["ok"], 10)
+            self.assertEqual(len(drained["results"]), drained["counts"]["ok"])
+            self.assertTrue(all(row["status"] == "ok" for row in drained["results"]))
+
+            exit_code, cancelled = asyncio.run(_run("cancelled", interrupts=2))
+            self.assertEqual(exit_code, 0)
+            self.assertTrue(cancelled["interrupted"])
+            self.assertEqual(cancelled["results"], [])
+
+    def test_summary_reports_shared_throttling(self) -> None:
+        reset_limiters()
+        self.addCleanup(reset_limiters)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_tiles(root, 6)
+            requests_seen = 0
+
+            async def _handler(request: httpx.Request) -> httpx.Response:
+                nonlocal requests_seen
+                requests_seen += 1
+                if requests_seen <= 3:
+                    return httpx.Response(429, headers={"Retry-After": "0.1"}, json={})
+                return _ok_response()
+
+            async def _run() -> int:
+                calls, client = _mock_calls(_handler)
+                async with client:
+                    return await run_batch_async(**_batch_kwargs(root, "extractions"), calls=calls, max_concurrency=6)
+
+            self.assertEqual(asyncio.run(_run()), 0)
+            summary = json.loads((root / "extractions" / "batch_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(summary["counts"]["ok"], 6)
+            limits = summary["rate_limits"]["openrouter:test/model"]
+            self.assertEqual((limits["requests"], limits["throttled"]), (9, 3))
+            self.assertGreaterEqual(limits["decreases"], 1)
+            self.assertGreater(limits["waits"], 0)
+            self.assertLess(limits["concurrency_limit"], 256)
+            self.assertEqual([event["status"] for event in limits["events"]], [429, 429, 429])
+
+
+    def test_blocking_calls_and_pair_source_get_their_own_threads(self) -> None:
+        reset_limiters()
+        self.addCleanup(reset_limiters)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_tiles(root, 6)
+            # All six calls must block at once, which the default executor
+            # (min(32, cpus + 4) threads) cannot guarantee.
+            barrier = threading.Barrier(6, timeout=5)
+            call_threads: list[str] = []
+            pair_threads: list[str] = []
+
+            def _call_anthropic(**kwargs):
+                call_threads.append(threading.current_thread().name)
+                barrier.wait()
+                return _CONTENT, {"usage": _USAGE}
+
+            def _pairs():
+                for tile_path in sorted((root / "tiles").glob("*.png")):
+                    pair_threads.append(threading.current_thread().name)
+                    yield tile_path, root / "text_layers" / f"{tile_path.stem}.json"
+
+            kwargs = _batch_kwargs(root, "extractions")
+            kwargs["config"] = ExtractionConfig(
+                provider="anthropic", model="test-model", api_key="dummy", use_instructor=False
+            )
+            with patch("src.extraction.run_hybrid.call_anthropic_vision", side_effect=_call_anthropic):
+                exit_code = asyncio.run(run_batch_async(**kwargs, max_concurrency=6, pair_source=_pairs()))
+
+            self.assertEqual(exit_code, 0)
+            summary = json.loads((root / "extractions" / "batch_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(summary["counts"]["ok"], 6)
+            self.assertEqual(len(call_threads), 6)
+            self.assertTrue(all(name.startswith("provider-call") for name in call_threads), call_threads)
+            self.assertTrue(all(name.startswith("pair-source") for name in pair_threads), pair_threads)
+
+if __name__ == "__main__":
+    unittest.main()
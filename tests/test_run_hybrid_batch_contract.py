@@ -6,7 +6,8 @@ import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-from src.extraction.run_hybrid_batch import run_batch
+from src.extraction.run_hybrid_batch import _load_empty_tile_ids, run_batch
+from src.extraction.validate_package import validate_extraction_package
 from src.extraction.config_models import EscalationConfig, ExtractionConfig
 
 
@@ -107,6 +108,154 @@ class RunHybridBatchContractTests(unittest.TestCase):
             self.assertEqual(len(package.get("artifacts", [])), 1)
             self.assertEqual(package["artifacts"][0]["tile_id"], tile_id)
 
+    def test_run_batch_streams_pairs_and_orders_results_by_tile(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            tiles_dir = root / "tiles"
+            text_layers_dir = root / "text_layers"
+            out_dir = root / "extractions"
+            summary_path = out_dir / "batch_summary.json"
+
+            tile_ids = ["p2_r0_c0", "p1_r0_c1", "p1_r0_c0", "p3_r1_c2"]
+            pairs: list[tuple[Path, Path]] = []
+            for tile_id in tile_ids:
+                tile_path = tiles_dir / f"{tile_id}.png"
+                tile_path.parent.mkdir(parents=True, exist_ok=True)
+                tile_path.write_bytes(b"png")
+                text_layer_path = text_layers_dir / f"{tile_id}.json"
+                _write_json(
+                    text_layer_path,
+                    {"tile_id": tile_id, "page_number": 1, "coherence_score": 0.95, "items": []},
+                )
+                pairs.append((tile_path, text_layer_path))
+
+            def fake_run_hybrid_extraction(**kwargs) -> int:
+                _write_json(Path(kwargs["meta_output_path"]), {"status": "ok"})
+                return 0
+
+            consumed: list[str] = []
+
+            def source():
+                for pair in pairs:
+                    consumed.append(pair[0].stem)
+                    yield pair
+
+            with patch(
+                "src.extraction.run_hybrid_batch.run_hybrid_extraction",
+                side_effect=fake_run_hybrid_extraction,
+            ):
+                exit_code = run_batch(
+                    tiles_dir=tiles_dir,
+                    text_layers_dir=text_layers_dir,
+                    out_dir=out_dir,
+                    tile_globs=["*.png"],
+                    max_tiles=None,
+                    config=ExtractionConfig(model="test/model", api_key="dummy"),
+                    escalation=EscalationConfig(enabled=False),
+                    allow_low_coherence=False,
+                    dry_run=False,
+                    no_cache=True,
+                    prompt_dir=None,
+                    fail_fast=False,
+                    summary_out=summary_path,
+                    max_concurrency=3,
+                    pair_source=source(),
+                )
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(consumed, tile_ids)
+            summary = json.loads(summary_path.read_text(encoding="utf-8"))
+            self.assertEqual(summary["counts"]["paired_tiles"], 4)
+            self.assertEqual(summary["counts"]["ok"], 4)
+            self.assertEqual(
+                [row["tile_stem"] for row in summary["results"]],
+                sorted(tile_ids),
+            )
+
+    def test_run_batch_records_empty_tiles_without_extraction(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            tiles_dir = root / "tiles"
+            text_layers_dir = root / "text_layers"
+            out_dir = root / "extractions"
+            summary_path = out_dir / "batch_summary.json"
+
+            index_tiles = []
+            for tile_id, status in (("p1_r0_c0", "ok"), ("p1_r0_c1", "skipped_empty")):
+                tile_path = tiles_dir / f"{tile_id}.png"
+                tile_path.parent.mkdir(parents=True, exist_ok=True)
+                tile_path.write_bytes(b"png")
+                _write_json(
+                    text_layers_dir / f"{tile_id}.json",
+                    {"tile_id": tile_id, "page_number": 1, "coherence_score": 0.95, "items": []},
+                )
+                index_tiles.append({"tile_id": tile_id, "status": status})
+            tiles_index_path = root / "tiles_index.json"
+            _write_json(tiles_index_path, {"pages": {"1": index_tiles}})
+
+            called: list[str] = []
+
+            def fake_run_hybrid_extraction(**kwargs) -> int:
+                called.append(Path(kwargs["tile_path"]).stem)
+                _write_json(Path(kwargs["meta_output_path"]), {"status": "dry_run"})
+                return 0
+
+            with patch(
+                "src.extraction.run_hybrid_batch.run_hybrid_extraction",
+                side_effect=fake_run_hybrid_extraction,
+            ):
+                exit_code = run_batch(
+                    tiles_dir=tiles_dir,
+                    text_layers_dir=text_layers_dir,
+                    out_dir=out_dir,
+                    tile_globs=["*.png"],
+                    max_tiles=None,
+                    config=ExtractionConfig(model="test/model", api_key="dummy"),
+                    escalation=EscalationConfig(enabled=False),
+                    allow_low_coherence=False,
+                    dry_run=True,
+                    no_cache=True,
+                    prompt_dir=None,
+                    fail_fast=False,
+                    summary_out=summary_path,
+                    empty_tile_ids=_load_empty_tile_ids(tiles_index_path),
+                )
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(called, ["p1_r0_c0"])
+            summary = json.loads(summary_path.read_text(encoding="utf-8"))
+            self.assertEqual(summary["counts"]["skipped_empty"], 1)
+            self.assertEqual(summary["counts"]["dry_run"], 1)
+            statuses = {row["tile_stem"]: row["status"] for row in summary["results"]}
+            self.assertEqual(statuses, {"p1_r0_c0": "dry_run", "p1_r0_c1": "skipped_empty"})
+            meta = json.loads((out_dir / "p1_r0_c1.json.meta.json").read_text(encoding="utf-8"))
+            self.assertEqual(meta["status"], "skipped_empty")
+
+            report = validate_extraction_package(extractions_dir=out_dir, verify_hashes=True)
+            self.assertEqual(report.result.value, "pass")
+            self.assertEqual(report.warnings, [])
+
+    def test_run_batch_rejects_max_tiles_with_pair_source(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            with self.assertRaises(ValueError):
+                run_batch(
+                    tiles_dir=root,
+                    text_layers_dir=root,
+                    out_dir=root / "out",
+                    tile_globs=["*.png"],
+                    max_tiles=5,
+                    config=ExtractionConfig(model="test/model", api_key="dummy"),
+                    escalation=EscalationConfig(enabled=False),
+                    allow_low_coherence=False,
+                    dry_run=True,
+                    no_cache=True,
+                    prompt_dir=None,
+                    fail_fast=False,
+                    summary_out=root / "out" / "batch_summary.json",
+                    pair_source=iter([]),
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
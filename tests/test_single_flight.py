@@ -0,0 +1,209 @@
+"""Unit tests for single-flight coalescing of identical provider calls."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import httpx
+
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src.extraction.run_hybrid_async import AsyncProviderCalls, run_batch_async
+from src.extraction.single_flight import SingleFlight
+
+_USAGE = {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_threads_share_one_call_and_its_error(self) -> None:
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = 0
+
+        def _call() -> str:
+            nonlocal calls
+            calls += 1
+            release.wait(5)
+            return "response"
+
+        results: list[tuple[str, bool]] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flights.run("k", _call))) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: flights.snapshot()["coalesced"] == 3)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, 1)
+        self.assertEqual(sorted(results), [("response", False)] + [("response", True)] * 3)
+
+        def _fail() -> str:
+            release.wait(5)
+            raise RuntimeError("provider down")
+
+        release.clear()
+        errors: list[BaseException] = []
+
+        def _run_failing() -> None:
+            try:
+                flights.run("k", _fail)
+            except RuntimeError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=_run_failing) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: flights.snapshot()["coalesced"] == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([str(exc) for exc in errors], ["provider down"] * 2)
+        self.assertEqual(flights.snapshot(), {"calls": 2, "coalesced": 4, "coalesced_keys": 1})
+        # Settled keys are forgotten: the next caller makes a fresh call.
+        self.assertEqual(flights.run("k", lambda: "again"), ("again", False))
+
+    def test_cancelled_async_leader_hands_the_call_to_a_waiter(self) -> None:
+        flights = SingleFlight()
+        made: list[str] = []
+
+        async def _call(name: str) -> str:
+            made.append(name)
+            await asyncio.sleep(0.05)
+            return name
+
+        async def _run() -> list[tuple[str, bool]]:
+            leader = asyncio.ensure_future(flights.arun("k", lambda: _call("leader")))
+            await asyncio.sleep(0)
+            waiters = [asyncio.ensure_future(flights.arun("k", lambda: _call("waiter"))) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            await asyncio.gather(leader, return_exceptions=True)
+            return await asyncio.gather(*waiters)
+
+        results = asyncio.run(_run())
+        self.assertEqual(made, ["leader", "waiter"])
+        self.assertEqual(sorted(results), [("waiter", False), ("waiter", True)])
+
+    def test_cancelled_async_waiter_leaves_the_shared_call_alone(self) -> None:
+        flights = SingleFlight()
+        made: list[str] = []
+
+        async def _call(name: str) -> str:
+            made.append(name)
+            await asyncio.sleep(0.05)
+            return name
+
+        async def _run() -> list:
+            leader = asyncio.ensure_future(flights.arun("k", lambda: _call("leader")))
+            await asyncio.sleep(0)
+            waiters = [asyncio.ensure_future(flights.arun("k", lambda: _call("waiter"))) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            waiters[0].cancel()
+            return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+        leader_result, cancelled, waiter_result = asyncio.run(_run())
+        self.assertEqual(made, ["leader"])
+        self.assertEqual(leader_result, ("leader", False))
+        self.assertEqual(waiter_result, ("leader", True))
+        self.assertIsInstance(cancelled, asyncio.CancelledError)
+
+
+class BatchSingleFlightTests(unittest.TestCase):
+    def _write_tile(self, root: Path, stem: str, tile_id: str, image: bytes) -> None:
+        (root / "tiles").mkdir(parents=True, exist_ok=True)
+        (root / "tiles" / f"{stem}.png").write_bytes(image)
+        (root / "text_layers").mkdir(parents=True, exist_ok=True)
+        (root / "text_layers" / f"{stem}.json").write_text(
+            json.dumps(
+                {
+                    "tile_id": tile_id,
+                    "page_number": int(tile_id[1]),
+                    "coherence_score": 0.95,
+                    "is_hybrid_viable": True,
+                    "items": [{"text_id": 0, "text": "SDMH NO. 1", "bbox_local": [0, 0, 40, 8]}],
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    def test_duplicate_tiles_in_flight_share_one_call(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            self._write_tile(root, "a", "p1_r0_c0", b"png-dup")
+            self._write_tile(root, "b", "p1_r0_c0", b"png-dup")
+            self._write_tile(root, "c", "p2_r0_c0", b"png-other")
+            requests: list[str] = []
+
+            async def _handler(request: httpx.Request) -> httpx.Response:
+                tile_id = "p2_r0_c0" if base64.b64encode(b"png-other") in request.content else "p1_r0_c0"
+                requests.append(tile_id)
+                await asyncio.sleep(0.05)
+                content = {
+                    "tile_id": tile_id,
+                    "page_number": int(tile_id[1]),
+                    "sheet_type": "plan_view",
+                    "utility_types_present": ["SD"],
+                    "structures": [],
+                    "pipes": [],
+                }
+                return httpx.Response(
+                    200, json={"choices": [{"message": {"content": json.dumps(content)}}], "usage": _USAGE}
+                )
+
+            async def _run() -> int:
+                client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+                async with client:
+                    return await run_batch_async(
+                        tiles_dir=root / "tiles",
+                        text_layers_dir=root / "text_layers",
+                        out_dir=root / "out",
+                        tile_globs=["*.png"],
+                        max_tiles=None,
+                        config=ExtractionConfig(model="test/model", api_key="dummy"),
+                        escalation=EscalationConfig(enabled=False),
+                        allow_low_coherence=False,
+                        dry_run=False,
+                        no_cache=True,
+                        prompt_dir=None,
+                        fail_fast=False,
+                        summary_out=root / "out" / "batch_summary.json",
+                        calls=AsyncProviderCalls(client),
+                    )
+
+            self.assertEqual(asyncio.run(_run()), 0)
+            self.assertEqual(sorted(requests), ["p1_r0_c0", "p2_r0_c0"])
+
+            summary = json.loads((root / "out" / "batch_summary.json").read_text(encoding="utf-8"))
+            self.assertEqual(summary["counts"]["ok"], 3)
+            self.assertEqual(summary["single_flight"], {"calls": 2, "coalesced": 1, "coalesced_keys": 1})
+            metas = {row["tile_stem"]: row["meta"] for row in summary["results"]}
+            self.assertEqual(metas["c"]["single_flight"], {"decision": "leader"})
+            self.assertEqual(
+                sorted(metas[stem]["single_flight"]["decision"] for stem in ("a", "b")), ["coalesced", "leader"]
+            )
+            follower = next(meta for meta in metas.values() if meta["single_flight"]["decision"] == "coalesced")
+            self.assertEqual(follower["usage"], {})
+            self.assertEqual(
+                (root / "out" / "a.json").read_text(encoding="utf-8"),
+                (root / "out" / "b.json").read_text(encoding="utf-8"),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
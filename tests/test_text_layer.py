@@ -0,0 +1,83 @@
+"""Unit tests for src.intake.text_layer span indexing and tile slicing."""
+
+from __future__ import annotations
+
+import unittest
+
+import fitz
+
+from src.intake.text_layer import PageSpanIndex, extract_text_layer
+
+
+def _sample_page(doc: fitz.Document) -> fitz.Page:
+    page = doc.new_page(width=792, height=612)
+    for row in range(8):
+        for col in range(6):
+            page.insert_text(
+                (20 + col * 130, 40 + row * 72),
+                f"STA {row}+{col}0.00",
+                fontsize=6 + (row % 3) * 2,
+            )
+    # Identical span drawn twice (common with layered CAD exports).
+    page.insert_text((300, 300), "RIM 123.45", fontsize=8)
+    page.insert_text((300, 300), "RIM 123.45", fontsize=8)
+    return page
+
+
+class PageSpanIndexTests(unittest.TestCase):
+    def test_query_matches_linear_scan(self) -> None:
+        with fitz.open() as doc:
+            page = _sample_page(doc)
+            index = PageSpanIndex.from_page(page, cell_size=50.0)
+            self.assertGreater(len(index), 0)
+
+            for rect in (
+                fitz.Rect(0, 0, 264, 306),
+                fitz.Rect(250, 280, 320, 310),
+                fitz.Rect(-10, -10, 5, 5),
+                fitz.Rect(600, 500, 900, 700),
+            ):
+                expected = [
+                    idx
+                    for idx, bbox in enumerate(index.bboxes)
+                    if fitz.Rect(bbox).intersects(rect)
+                ]
+                self.assertEqual(index.query(rect), expected)
+
+    def test_tile_slice_dedups_but_full_page_does_not(self) -> None:
+        with fitz.open() as doc:
+            page = _sample_page(doc)
+            index = PageSpanIndex.from_page(page)
+
+            full = extract_text_layer(page, span_index=index)
+            clip = fitz.Rect(264, 204, 528, 408)
+            tile = extract_text_layer(
+                page,
+                clip=clip,
+                clip_origin=(clip.x0, clip.y0),
+                tile_id="p1_r1_c1",
+                span_index=index,
+            )
+
+            full_rims = [item for item in full.items if item.text == "RIM 123.45"]
+            tile_rims = [item for item in tile.items if item.text == "RIM 123.45"]
+            self.assertEqual(len(full_rims), 2)
+            self.assertEqual(len(tile_rims), 1)
+            self.assertEqual([item.text_id for item in tile.items], list(range(len(tile.items))))
+            self.assertAlmostEqual(
+                tile_rims[0].bbox_local[0], tile_rims[0].bbox_global[0] - clip.x0
+            )
+
+    def test_shared_index_matches_per_call_parse(self) -> None:
+        with fitz.open() as doc:
+            page = _sample_page(doc)
+            index = PageSpanIndex.from_page(page)
+            clip = fitz.Rect(0, 0, 300, 250)
+
+            shared = extract_text_layer(page, clip=clip, span_index=index)
+            standalone = extract_text_layer(page, clip=clip)
+            self.assertEqual(shared.to_dict(), standalone.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
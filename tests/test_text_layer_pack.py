@@ -0,0 +1,195 @@
+"""Unit tests for src.utils.text_layer_pack — columnar text-layer packs."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import fitz
+
+from src.intake.models import TextLayerFormat
+from src.intake.tiler import tile_pdf
+from src.utils.text_layer_pack import (
+    TextLayerPack,
+    load_text_layer,
+    open_text_layer_pack,
+    pack_text_layer_dir,
+    split_member_path,
+    text_layer_exists,
+    text_layer_sha256,
+    unpack_text_layer_pack,
+    write_text_layer_pack,
+)
+
+
+def _write_sample_pdf(path: Path, *, pages: int = 2) -> None:
+    doc = fitz.open()
+    for page_idx in range(pages):
+        page = doc.new_page(width=792, height=612)
+        for row in range(5):
+            y = 60 + row * 100
+            page.insert_text((40, y), f"STA {row}+{page_idx}0.00 RIM 12{row}.50", fontsize=8)
+            page.insert_text((420, y + 30), f"8\" PVC Ø INV {110 + row}.25", fontsize=6)
+    doc.save(str(path))
+    doc.close()
+
+
+class TextLayerPackTests(unittest.TestCase):
+    def test_packed_tiles_match_json_tiles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_sample_pdf(pdf_path)
+
+            json_results = tile_pdf(pdf_path, root / "json", dpi=72)
+            pack_results = tile_pdf(
+                pdf_path, root / "pack", dpi=72, text_layer_format=TextLayerFormat.PACK
+            )
+
+            packs = sorted(p.name for p in (root / "pack" / "text_layers").iterdir())
+            self.assertEqual(packs, ["p1.tlpk", "p2.tlpk"])
+            for page_number, tiles in json_results.items():
+                for json_tile, pack_tile in zip(tiles, pack_results[page_number]):
+                    member = pack_tile.text_layer_path
+                    self.assertEqual(
+                        split_member_path(member),
+                        (root / "pack" / "text_layers" / f"p{page_number}.tlpk", json_tile.tile_id),
+                    )
+                    self.assertTrue(text_layer_exists(member))
+                    with json_tile.text_layer_path.open("r", encoding="utf-8") as f:
+                        self.assertEqual(load_text_layer(member), json.load(f))
+
+            self.assertFalse(
+                text_layer_exists(root / "pack" / "text_layers" / "p1.tlpk" / "p9_r0_c0")
+            )
+
+    def test_json_round_trip_is_byte_identical(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_sample_pdf(pdf_path)
+            tile_pdf(pdf_path, root / "out", dpi=72)
+            text_layers_dir = root / "out" / "text_layers"
+            originals = {p.name: p.read_bytes() for p in text_layers_dir.glob("*.json")}
+
+            packs = pack_text_layer_dir(text_layers_dir, remove_json=True)
+            self.assertEqual([p.name for p in packs], ["p1.tlpk", "p2.tlpk"])
+            self.assertEqual(list(text_layers_dir.glob("*.json")), [])
+
+            member = packs[0] / "p1_r0_c0"
+            hash_before = text_layer_sha256(member)
+
+            restored = root / "restored"
+            for pack_path in packs:
+                unpack_text_layer_pack(pack_path, restored)
+            self.assertEqual(
+                {p.name: p.read_bytes() for p in restored.glob("*.json")}, originals
+            )
+
+            # Member hashes depend only on the tile's content, not pack layout.
+            pack_text_layer_dir(restored)
+            self.assertEqual(text_layer_sha256(restored / "p1.tlpk" / "p1_r0_c0"), hash_before)
+
+    def test_decodes_columns_to_expected_items(self) -> None:
+        items = [
+            {
+                "text_id": 0,
+                "text": "8\" PVC Ø INV 110.25",
+                "bbox_local": [-1.5, 0.0, 40.25, 8.0],
+                "bbox_global": [418.5, 90.0, 460.25, 98.0],
+                "font": "Helvetica",
+                "font_size": 6.0,
+            },
+            {
+                "text_id": 7,
+                "text": "",
+                "bbox_local": [1.0, 2.0, 3.0, 4.0],
+                "bbox_global": [5.0, 6.0, 7.0, 8.0],
+                "font": "Courier",
+                "font_size": 8.5,
+            },
+            {
+                "text_id": 2**40,
+                "text": "STA 1+00",
+                "bbox_local": [0.0, 0.0, 1e-3, 1e6],
+                "bbox_global": [0.0, 0.0, 1e-3, 1e6],
+                "font": "Helvetica",
+                "font_size": 12.0,
+            },
+        ]
+        layer = {"tile_id": "p3_r0_c1", "page_number": 3, "coherence_score": 0.9, "items": items}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pack_path = write_text_layer_pack([layer], Path(tmpdir) / "p3.tlpk")
+            with TextLayerPack(pack_path) as pack:
+                decoded = pack.load("p3_r0_c1")
+        self.assertEqual(decoded["items"], items)
+        self.assertEqual(json.dumps(decoded["items"]), json.dumps(items))
+        self.assertEqual((decoded["tile_id"], decoded["page_number"]), ("p3_r0_c1", 3))
+
+    def test_concurrent_loads_across_more_packs_than_stay_open(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            members = []
+            for page_number in range(1, 41):
+                tile_id = f"p{page_number}_r0_c0"
+                layer = {
+                    "tile_id": tile_id,
+                    "page_number": page_number,
+                    "items": [
+                        {
+                            "text_id": 0,
+                            "text": f"MH-{page_number}",
+                            "bbox_local": [0.0, 0.0, 10.0, 4.0],
+                            "bbox_global": [0.0, 0.0, 10.0, 4.0],
+                            "font": "Helvetica",
+                            "font_size": 8.0,
+                        }
+                    ],
+                }
+                pack_path = write_text_layer_pack([layer], root / f"p{page_number}.tlpk")
+                members.append((pack_path / tile_id, f"MH-{page_number}"))
+
+            # A handle evicted from the open-pack cache stays readable.
+            held = open_text_layer_pack(members[0][0].parent)
+            for member, _ in members[1:]:
+                open_text_layer_pack(member.parent)
+            self.assertEqual(held.load("p1_r0_c0")["items"][0]["text"], "MH-1")
+
+            def _load_all(offset: int) -> list[str]:
+                texts = []
+                for i in range(len(members) * 3):
+                    member, _ = members[(offset + i) % len(members)]
+                    texts.append(load_text_layer(member)["items"][0]["text"])
+                return texts
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(_load_all, range(0, 40, 5)))
+            for offset, texts in zip(range(0, 40, 5), results):
+                expected = [members[(offset + i) % len(members)][1] for i in range(len(members) * 3)]
+                self.assertEqual(texts, expected)
+
+    def test_pack_opens_lazily_and_rejects_other_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "plans.pdf"
+            _write_sample_pdf(pdf_path, pages=1)
+            tile_pdf(pdf_path, root / "out", dpi=72, text_layer_format=TextLayerFormat.PACK)
+            pack_path = root / "out" / "text_layers" / "p1.tlpk"
+
+            with TextLayerPack(pack_path) as pack:
+                self.assertEqual(len(pack), 6)
+                self.assertIn("p1_r1_c2", pack)
+                with self.assertRaises(KeyError):
+                    pack.load("p1_r9_c9")
+
+            bogus = root / "bogus.tlpk"
+            bogus.write_bytes(b"{}" * 8)
+            with self.assertRaises(ValueError):
+                TextLayerPack(bogus)
+
+
+if __name__ == "__main__":
+    unittest.main()
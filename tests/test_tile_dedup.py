@@ -0,0 +1,243 @@
+"""Unit tests for perceptual tile dedup and extraction reuse."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import fitz
+
+from src.extraction.config_models import EscalationConfig, ExtractionConfig
+from src.extraction.run_hybrid import run_hybrid_extraction
+from src.extraction.tile_dedup import (
+    DEDUP_SCHEMA_VERSION,
+    TileDedupIndex,
+    TileFingerprint,
+    fingerprint_tile,
+    hamming_distance,
+    image_dhash,
+)
+
+_LABELS = ("SDMH-4", "STA 12+40.00", "RIM 301.25", 'INV 12" N 296.10')
+
+
+def _detail_png(*, dpi: int = 150, dx: float = 0.0, extra: str | None = None) -> bytes:
+    doc = fitz.open()
+    page = doc.new_page(width=360, height=288)
+    page.draw_circle((120 + dx, 140), 40, width=2)
+    page.draw_line((160 + dx, 140), (340, 140), width=3)
+    page.draw_rect(fitz.Rect(20 + dx, 20, 150 + dx, 70), width=1)
+    for row, label in enumerate(_LABELS):
+        page.insert_text((200 + dx, 40 + row * 16), label, fontsize=9)
+    if extra is not None:
+        page.draw_rect(fitz.Rect(30, 200, 340, 280), color=(0, 0, 0), fill=(0, 0, 0))
+        page.insert_text((40, 190), extra, fontsize=9)
+    png = page.get_pixmap(dpi=dpi).tobytes("png")
+    doc.close()
+    return png
+
+
+def _text_layer(tile_id: str, page_number: int, ids: list[int], *, dx: float = 0.0) -> dict:
+    items = [
+        {
+            "text_id": text_id,
+            "text": label,
+            "bbox_local": [200 + dx, 32 + row * 16, 260 + dx, 42 + row * 16],
+            "font_size": 9.0,
+        }
+        for row, (text_id, label) in enumerate(zip(ids, _LABELS))
+    ]
+    return {
+        "tile_id": tile_id,
+        "page_number": page_number,
+        "coherence_score": 0.95,
+        "is_hybrid_viable": True,
+        "items": items,
+    }
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+_SIGNATURE = "ab" * 32
+
+
+def _fingerprint(image_hash: int) -> TileFingerprint:
+    return TileFingerprint(image_hash=image_hash, text_signature=_SIGNATURE, text_ids=(0, 1))
+
+
+def _record_from_process(index_dir: str, worker: int, barrier) -> None:
+    index = TileDedupIndex(Path(index_dir))
+    barrier.wait()
+    for j in range(2):
+        index.record(
+            _fingerprint(1 << (worker * 2 + j)),
+            model="test/model",
+            tile_id=f"p{worker + 1}_r0_c{j}",
+            page_number=worker + 1,
+            extraction={"tile_id": f"p{worker + 1}_r0_c{j}"},
+        )
+
+
+class TileFingerprintTests(unittest.TestCase):
+    def test_image_hash_tolerates_dpi_and_rejects_different_linework(self) -> None:
+        base = image_dhash(_detail_png(dpi=150))
+        self.assertLessEqual(hamming_distance(base, image_dhash(_detail_png(dpi=200))), 12)
+        self.assertGreater(hamming_distance(base, image_dhash(_detail_png(extra="NOTE 3"))), 12)
+
+    def test_text_signature_ignores_ids_and_offset_but_not_text(self) -> None:
+        png = _detail_png()
+        first = fingerprint_tile(png, _text_layer("p3_r0_c0", 3, [0, 1, 2, 3]))
+        moved = fingerprint_tile(png, _text_layer("p9_r1_c2", 9, [7, 4, 9, 5], dx=40.0))
+        edited = _text_layer("p3_r0_c0", 3, [0, 1, 2, 3])
+        edited["items"][2]["text"] = "RIM 301.75"
+        assert first is not None and moved is not None
+        self.assertEqual(first.text_signature, moved.text_signature)
+        self.assertNotEqual(first.text_signature, fingerprint_tile(png, edited).text_signature)
+        self.assertIsNone(fingerprint_tile(png, {"items": []}))
+
+
+class DedupReuseTests(unittest.TestCase):
+    def test_matching_tile_reuses_extraction_with_remapped_text_ids(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            index = TileDedupIndex(root / "dedup")
+            config = ExtractionConfig(model="test/model", api_key="dummy")
+
+            def _run(tile_id: str, page_number: int, ids: list[int], png: bytes) -> tuple[int, Path]:
+                out_dir = root / tile_id
+                tile_path = out_dir / f"{tile_id}.png"
+                tile_path.parent.mkdir(parents=True, exist_ok=True)
+                tile_path.write_bytes(png)
+                text_layer_path = out_dir / "text_layers" / f"{tile_id}.json"
+                _write_json(text_layer_path, _text_layer(tile_id, page_number, ids))
+                exit_code = run_hybrid_extraction(
+                    tile_path=tile_path,
+                    text_layer_path=text_layer_path,
+                    output_path=out_dir / f"{tile_id}.json",
+                    raw_output_path=out_dir / f"{tile_id}.json.raw.txt",
+                    meta_output_path=out_dir / f"{tile_id}.json.meta.json",
+                    config=config,
+                    escalation=EscalationConfig(enabled=False),
+                    allow_low_coherence=False,
+                    dry_run=False,
+                    no_cache=False,
+                    prompt_output_path=None,
+                    dedup_index=index,
+                )
+                return exit_code, out_dir
+
+            payload = {
+                "tile_id": "p3_r0_c0",
+                "page_number": 3,
+                "sheet_type": "detail_sheet",
+                "utility_types_present": ["SD"],
+                "structures": [
+                    {
+                        "id": "SDMH-4",
+                        "structure_type": "SDMH",
+                        "station": "12+40.00",
+                        "offset": "0.00'",
+                        "rim_elevation": 301.25,
+                        "inverts": [
+                            {
+                                "direction": "N",
+                                "pipe_size": '12"',
+                                "elevation": 296.10,
+                                "source_text_ids": [3],
+                            }
+                        ],
+                        "source_text_ids": [0, 1, 2],
+                    }
+                ],
+            }
+            with patch(
+                "src.extraction.run_hybrid.call_openrouter_vision",
+                return_value=(json.dumps(payload), {"usage": {"cost": 0.001}}),
+            ) as api:
+                first_exit, first_dir = _run("p3_r0_c0", 3, [0, 1, 2, 3], _detail_png(dpi=150))
+                second_exit, second_dir = _run("p8_r1_c1", 8, [40, 41, 42, 43], _detail_png(dpi=200))
+
+            self.assertEqual((first_exit, second_exit), (0, 0))
+            self.assertEqual(api.call_count, 1)
+            first_meta = json.loads((first_dir / "p3_r0_c0.json.meta.json").read_text(encoding="utf-8"))
+            self.assertEqual(first_meta["dedup"]["decision"], "miss")
+
+            reused = json.loads((second_dir / "p8_r1_c1.json").read_text(encoding="utf-8"))
+            self.assertEqual((reused["tile_id"], reused["page_number"]), ("p8_r1_c1", 8))
+            structure = reused["structures"][0]
+            self.assertEqual(structure["source_text_ids"], [40, 41, 42])
+            self.assertEqual(structure["inverts"][0]["source_text_ids"], [43])
+            meta = json.loads((second_dir / "p8_r1_c1.json.meta.json").read_text(encoding="utf-8"))
+            self.assertEqual(meta["status"], "ok")
+            self.assertEqual(meta["dedup"]["decision"], "hit")
+            self.assertEqual(meta["dedup"]["source_tile_id"], "p3_r0_c0")
+            self.assertLessEqual(meta["dedup"]["image_distance"], meta["dedup"]["max_distance"])
+
+
+class DedupIndexStoreTests(unittest.TestCase):
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_concurrent_processes_keep_every_record(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ctx = multiprocessing.get_context("fork")
+            barrier = ctx.Barrier(4)
+            workers = [ctx.Process(target=_record_from_process, args=(tmpdir, w, barrier)) for w in range(4)]
+            for process in workers:
+                process.start()
+            for process in workers:
+                process.join(30)
+            self.assertEqual([process.exitcode for process in workers], [0] * 4)
+
+            index = TileDedupIndex(Path(tmpdir), max_distance=0)
+            for worker in range(4):
+                for j in range(2):
+                    match = index.lookup(_fingerprint(1 << (worker * 2 + j)), model="test/model")
+                    self.assertIsNotNone(match)
+                    self.assertEqual(match.source_tile_id, f"p{worker + 1}_r0_c{j}")
+            index.close()
+
+    def test_keeps_newest_candidates_and_imports_json_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            _write_json(
+                root / _SIGNATURE[:2] / f"{_SIGNATURE}.json",
+                {
+                    "schema_version": DEDUP_SCHEMA_VERSION,
+                    "text_signature": _SIGNATURE,
+                    "entries": [
+                        {
+                            "model": "test/model",
+                            "image_hash": f"{1:064x}",
+                            "tile_id": "p9_r0_c0",
+                            "page_number": 9,
+                            "text_ids": [4, 5],
+                            "extraction": {"tile_id": "p9_r0_c0"},
+                        }
+                    ],
+                },
+            )
+            index = TileDedupIndex(root, max_distance=0)
+            match = index.lookup(_fingerprint(1), model="test/model")
+            self.assertEqual((match.source_tile_id, match.source_page_number), ("p9_r0_c0", 9))
+            self.assertEqual(match.id_map, {4: 0, 5: 1})
+            self.assertIsNone(index.lookup(_fingerprint(1), model="other/model"))
+
+            # Re-recording the imported candidate makes it the newest; eight
+            # more push out everything older.
+            index.record(_fingerprint(1), model="test/model", tile_id="p1_r0_c0", page_number=1, extraction={})
+            for bit in range(1, 9):
+                index.record(
+                    _fingerprint(1 << bit), model="test/model", tile_id=f"p{bit}_r1_c0", page_number=bit, extraction={}
+                )
+            self.assertIsNone(index.lookup(_fingerprint(1), model="test/model"))
+            self.assertEqual(index.lookup(_fingerprint(1 << 8), model="test/model").source_tile_id, "p8_r1_c0")
+            index.close()
+
+if __name__ == "__main__":
+    unittest.main()
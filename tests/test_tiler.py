@@ -0,0 +1,543 @@
+"""Unit tests for src.intake.tiler on small synthetic PDFs."""
+
+from __future__ import annotations
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import fitz
+import numpy as np
+
+from src.intake.models import (
+    DpiPolicy,
+    EmptyTilePolicy,
+    ImageBudget,
+    MaskPolicy,
+    RenderMode,
+    TilePlan,
+    TileStatus,
+    TilingStrategy,
+)
+from src.intake.masking import detect_page_mask
+from src.intake.page_analysis import load_page_analyses
+from src.intake import tiler
+from src.intake.render import PageRenderer, choose_tile_dpi
+from src.intake.text_layer import PageSpanIndex
+from src.intake.tile_planner import image_budget_for_tier, plan_tile_geometry
+from src.intake.tiler import _write_tiles_index, tile_pdf
+from src.utils.image_codec import ImageCodec, ImageEncoding
+
+
+def _write_sample_pdf(path: Path, *, pages: int = 3) -> None:
+    """Write a small multi-page PDF with callout text and linework."""
+    doc = fitz.open()
+    for page_idx in range(pages):
+        page = doc.new_page(width=792, height=612)
+        for row in range(6):
+            y = 60 + row * 90
+            page.insert_text(
+                (40 + page_idx * 10, y),
+                f"STA {10 + row}+{page_idx}5.00 RIM 123.{row}{page_idx}",
+                fontsize=8,
+            )
+            page.insert_text((420, y + 20), f"INV 8\" PVC (N) {118 + row}.40", fontsize=6)
+            page.draw_line((40, y + 30), (760, y + 30 + page_idx * 5))
+        page.draw_rect(fitz.Rect(600, 480, 780, 600))
+    doc.save(str(path))
+    doc.close()
+
+
+class TilePdfWorkersTests(unittest.TestCase):
+    def test_parallel_tiling_matches_serial_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path)
+
+            serial_dir = root / "serial"
+            parallel_dir = root / "parallel"
+            serial = tile_pdf(pdf_path, serial_dir, workers=1)
+            parallel = tile_pdf(pdf_path, parallel_dir, workers=3)
+
+            self.assertEqual(list(serial.keys()), [1, 2, 3])
+            self.assertEqual(list(parallel.keys()), list(serial.keys()))
+            self.assertEqual(
+                [t.tile_id for tiles in parallel.values() for t in tiles],
+                [t.tile_id for tiles in serial.values() for t in tiles],
+            )
+
+            # Index entries embed output paths; write both against one root so
+            # the serialized bytes are directly comparable.
+            serial_index = _write_tiles_index(serial, serial_dir).read_bytes()
+            parallel_index = _write_tiles_index(parallel, parallel_dir).read_bytes()
+            self.assertEqual(
+                parallel_index.replace(b"parallel", b"serial"),
+                serial_index,
+            )
+
+            for sub in ("tiles", "text_layers"):
+                serial_files = sorted(p.name for p in (serial_dir / sub).iterdir())
+                parallel_files = sorted(p.name for p in (parallel_dir / sub).iterdir())
+                self.assertEqual(parallel_files, serial_files)
+                for name in serial_files:
+                    self.assertEqual(
+                        (parallel_dir / sub / name).read_bytes(),
+                        (serial_dir / sub / name).read_bytes(),
+                        msg=f"{sub}/{name} differs",
+                    )
+
+    def test_parallel_tiling_preserves_selection_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path)
+
+            results = tile_pdf(pdf_path, root / "out", page_numbers=[3, 1], workers=2)
+            self.assertEqual(list(results.keys()), [3, 1])
+
+    def test_page_plans_override_geometry_per_page(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path)
+
+            light = TilePlan(dpi=72, grid_rows=1, grid_cols=2, overlap_pct=0.0)
+            results = tile_pdf(
+                pdf_path,
+                root / "out",
+                page_numbers=[1, 3],
+                dpi=100,
+                page_plans={3: light},
+                workers=2,
+            )
+
+            self.assertEqual(list(results.keys()), [1, 3])
+            self.assertEqual(len(results[1]), 6)
+            self.assertEqual([t.tile_id for t in results[3]], ["p3_r0_c0", "p3_r0_c1"])
+            self.assertEqual(
+                [(t.image_width_px, t.image_height_px) for t in results[3]],
+                [(396, 612), (396, 612)],
+            )
+
+    def test_cached_page_analyses_do_not_change_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path, pages=2)
+            analyses = load_page_analyses(pdf_path, root / "page_analysis.json")
+
+            for strategy in TilingStrategy:
+                direct_dir = root / f"direct_{strategy.value}"
+                cached_dir = root / f"cached_{strategy.value}"
+                direct = tile_pdf(pdf_path, direct_dir, dpi=72, strategy=strategy)
+                cached = tile_pdf(
+                    pdf_path, cached_dir, dpi=72, strategy=strategy, page_analyses=analyses
+                )
+                self.assertEqual(
+                    [t.clip_rect for tiles in cached.values() for t in tiles],
+                    [t.clip_rect for tiles in direct.values() for t in tiles],
+                )
+                for name in sorted(p.name for p in (direct_dir / "text_layers").iterdir()):
+                    self.assertEqual(
+                        (cached_dir / "text_layers" / name).read_bytes(),
+                        (direct_dir / "text_layers" / name).read_bytes(),
+                    )
+
+    def test_invalid_workers_raises(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path, pages=1)
+            with self.assertRaises(ValueError):
+                tile_pdf(pdf_path, root / "out", workers=0)
+
+
+class ContentRegionVectorizationTests(unittest.TestCase):
+    # Infinite, zero-width and off-page rects mark nothing; the rest are
+    # clamped to the page.  Two rects that meet at (240..250, 170..180) join.
+    _BBOXES = [
+        tuple(fitz.INFINITE_RECT()),
+        (50, 50, 50, 80),
+        (900, 10, 950, 40),
+        (-30, -20, 60, 40),
+        (100, 100, 250, 180),
+        (240, 170, 300, 260),
+        (500, 80, 620, 140),
+        (700, 500, 820, 650),
+        (400, 400, 401, 401),
+    ]
+
+    def test_occupancy_components_match_expected_cells(self) -> None:
+        page_rect = fitz.Rect(0, 0, 792, 612)
+        expected = {
+            (24, 16): (45, [(0, 0, 1, 1), (2, 3, 6, 9), (2, 15, 3, 18), (10, 12, 10, 12), (13, 21, 15, 23)]),
+            (96, 64): (552, [(0, 0, 4, 7), (8, 60, 14, 75), (10, 12, 27, 36), (41, 48, 41, 48), (52, 84, 63, 95)]),
+            (7, 5): (13, [(0, 0, 2, 2), (0, 4, 1, 5), (3, 3, 3, 3), (4, 6, 4, 6)]),
+        }
+        for (grid_cols, grid_rows), (cells, bounds) in expected.items():
+            with self.subTest(grid=(grid_cols, grid_rows)):
+                occupied = tiler._occupancy_grid(self._BBOXES, page_rect, grid_cols=grid_cols, grid_rows=grid_rows)
+                self.assertEqual(occupied.shape, (grid_rows, grid_cols))
+                self.assertEqual(int(occupied.sum()), cells)
+                self.assertEqual(tiler._component_bounds(occupied), bounds)
+
+        doc = fitz.open()
+        page = doc.new_page(width=792, height=612)
+        regions = tiler._compute_content_regions(
+            page,
+            span_index=PageSpanIndex.from_page(page),
+            drawing_bboxes=self._BBOXES,
+            max_regions=1000,
+            min_area_pct=0.0,
+        )
+        self.assertEqual(
+            [tuple(round(v, 2) for v in region) for region in regions],
+            [
+                (0.0, 0.0, 105.6, 107.1),
+                (59.4, 45.9, 369.6, 298.35),
+                (455.4, 45.9, 666.6, 183.6),
+                (356.4, 351.9, 468.6, 451.35),
+                (653.4, 466.65, 792.0, 612.0),
+            ],
+        )
+
+    def test_region_grid_reaches_tile_pdf(self) -> None:
+        # Two drawing blocks 20pt apart share a 24x16 cell boundary but not a
+        # 96x64 one.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "blocks.pdf"
+            doc = fitz.open()
+            page = doc.new_page(width=792, height=612)
+            for x0, x1 in ((100, 380), (400, 700)):
+                page.draw_rect(fitz.Rect(x0, 100, x1, 500), color=(0, 0, 0), fill=(0.5, 0.5, 0.5))
+            doc.save(str(pdf_path))
+            doc.close()
+
+            def _tile_ids(out_name: str, **kwargs) -> list[str]:
+                results = tile_pdf(
+                    pdf_path,
+                    root / out_name,
+                    dpi=36,
+                    skip_low_coherence=False,
+                    strategy=TilingStrategy.ADAPTIVE,
+                    **kwargs,
+                )
+                return [tile.tile_id for tile in results[1]]
+
+            self.assertEqual(_tile_ids("coarse"), [f"p1_r{r}_c{c}" for r in range(2) for c in range(3)])
+            self.assertEqual(_tile_ids("fine", region_grid_cols=96, region_grid_rows=64), ["p1_a0", "p1_a1"])
+
+    def test_labelling_orders_components_by_first_cell(self) -> None:
+        # A serpentine component whose first cell is not its minimum column,
+        # plus two isolated blobs.
+        grid = [
+            [False, False, True, True, True, False, True],
+            [False, False, True, False, True, False, False],
+            [True, True, True, False, True, False, False],
+            [False, False, False, False, True, False, True],
+        ]
+        self.assertEqual(
+            tiler._component_bounds(np.array(grid)), [(0, 0, 3, 4), (0, 6, 0, 6), (3, 6, 3, 6)]
+        )
+
+
+class AdaptiveDpiTests(unittest.TestCase):
+    def test_choose_tile_dpi_targets_smallest_text_within_bounds(self) -> None:
+        policy = DpiPolicy(min_dpi=150, max_dpi=300, target_text_px=25.0)
+        self.assertEqual(choose_tile_dpi([6.0, 10.0, 12.0], policy), 300)
+        self.assertEqual(choose_tile_dpi([9.0, 12.0], policy), 200)
+        self.assertEqual(choose_tile_dpi([14.0, 18.0], policy), 150)
+        self.assertEqual(choose_tile_dpi([], policy), 150)
+        # A lone superscript far below the median does not drive the DPI.
+        self.assertEqual(choose_tile_dpi([3.0, 12.0, 12.0, 12.0], policy), 150)
+        # The page DPI caps the policy, including its floor.
+        self.assertEqual(choose_tile_dpi([6.0], policy, ceiling=200), 200)
+        self.assertEqual(choose_tile_dpi([14.0], policy, ceiling=100), 100)
+
+    def test_large_text_tiles_render_at_lower_dpi(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "mixed.pdf"
+            doc = fitz.open()
+            page = doc.new_page(width=792, height=612)
+            for row in range(4):
+                y = 60 + row * 140
+                page.insert_text((40, y), f"INV 8\" PVC {118 + row}.40", fontsize=5)
+                page.insert_text((320, y), f"MH-{row} RIM 123.{row}", fontsize=14)
+                page.insert_text((580, y), f"STA {10 + row}+00", fontsize=14)
+            doc.save(str(pdf_path))
+            doc.close()
+
+            fixed = tile_pdf(pdf_path, root / "fixed", skip_low_coherence=False)[1]
+            adaptive = tile_pdf(
+                pdf_path, root / "adaptive", skip_low_coherence=False, dpi_policy=DpiPolicy()
+            )[1]
+
+        self.assertEqual([tile.dpi for tile in fixed], [300] * 6)
+        by_id = {tile.tile_id: tile for tile in adaptive}
+        self.assertEqual(by_id["p1_r0_c0"].dpi, 300)
+        self.assertEqual(by_id["p1_r0_c2"].dpi, 150)
+        for fixed_tile in fixed:
+            tile = by_id[fixed_tile.tile_id]
+            self.assertEqual(tile.clip_rect, fixed_tile.clip_rect)
+            scale = tile.dpi / 300
+            self.assertAlmostEqual(tile.image_width_px, fixed_tile.image_width_px * scale, delta=1)
+            self.assertEqual(tile.to_dict()["dpi"], tile.dpi)
+
+
+class EmptyTileTests(unittest.TestCase):
+    def test_margin_tiles_are_marked_skipped_empty(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sparse.pdf"
+            doc = fitz.open()
+            page = doc.new_page(width=792, height=612)
+            # Sheet border frame spans every tile and must not count as content.
+            page.draw_rect(fitz.Rect(12, 12, 780, 600), width=1.5)
+            for row in range(10):
+                y = 40 + row * 50
+                page.insert_text((30, y), f"MH-{row} RIM 123.{row}", fontsize=8)
+                page.draw_line((30, y + 6), (220, y + 6))
+            doc.save(str(pdf_path))
+            doc.close()
+
+            plain = tile_pdf(pdf_path, root / "plain", skip_low_coherence=False)[1]
+            filtered = tile_pdf(
+                pdf_path,
+                root / "filtered",
+                skip_low_coherence=False,
+                empty_tile_policy=EmptyTilePolicy(),
+            )[1]
+            _write_tiles_index({1: filtered}, root / "filtered")
+            index = (root / "filtered" / "tiles_index.json").read_text(encoding="utf-8")
+
+        self.assertTrue(all(tile.status == TileStatus.OK and tile.content is None for tile in plain))
+        statuses = {tile.tile_id: tile.status for tile in filtered}
+        self.assertEqual(statuses["p1_r0_c0"], TileStatus.OK)
+        self.assertEqual(statuses["p1_r1_c0"], TileStatus.OK)
+        for tile_id in ("p1_r0_c1", "p1_r0_c2", "p1_r1_c1", "p1_r1_c2"):
+            self.assertEqual(statuses[tile_id], TileStatus.SKIPPED_EMPTY, tile_id)
+        empty = next(tile for tile in filtered if tile.tile_id == "p1_r0_c2")
+        self.assertEqual((empty.content.text_items, empty.content.drawings), (0, 0))
+        self.assertLess(empty.content.ink_coverage, 0.02)
+        self.assertIn('"status": "skipped_empty"', index)
+
+
+def _write_titled_sheet(path: Path) -> None:
+    """Sheet with a frame, plan text, and a right-edge title strip of stacked boxes."""
+    doc = fitz.open()
+    page = doc.new_page(width=1224, height=792)
+    page.draw_rect(fitz.Rect(40, 30, 1110, 760), width=2)
+    y = 30.0
+    for height in (150.0, 120.0, 180.0, 140.0, 140.0):
+        page.draw_rect(fitz.Rect(1122, y, 1195, y + height), width=1)
+        page.insert_text((1128, y + 20), f"TITLE {int(y)}", fontsize=7)
+        y += height
+    rng = random.Random(5)
+    for idx in range(80):
+        x, y = rng.uniform(60, 1060), rng.uniform(50, 740)
+        page.insert_text((x, y), f"MH-{idx} RIM 31{idx % 10}.25", fontsize=8)
+        # Short plan linework inside the strip must not read as a title block.
+        page.draw_line((1115 + idx % 60, y), (1118 + idx % 60, y + 6))
+    doc.save(str(path))
+    doc.close()
+
+
+class MaskingTests(unittest.TestCase):
+    def test_title_strip_is_masked_from_clips_and_text_layers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sheet.pdf"
+            _write_titled_sheet(pdf_path)
+
+            plain = tile_pdf(pdf_path, root / "plain", dpi=72, skip_low_coherence=False)[1]
+            masked = tile_pdf(
+                pdf_path,
+                root / "masked",
+                dpi=72,
+                skip_low_coherence=False,
+                mask_policy=MaskPolicy(),
+            )[1]
+            plain_layers = [tile.text_layer_path.read_text(encoding="utf-8") for tile in plain]
+            masked_layers = [tile.text_layer_path.read_text(encoding="utf-8") for tile in masked]
+            _write_tiles_index({1: masked}, root / "masked")
+            index = (root / "masked" / "tiles_index.json").read_text(encoding="utf-8")
+
+        self.assertTrue(any("TITLE" in layer for layer in plain_layers))
+        self.assertFalse(any("TITLE" in layer for layer in masked_layers))
+        self.assertEqual(len(masked), len(plain))
+        mask = masked[0].mask
+        self.assertIsNotNone(mask)
+        self.assertAlmostEqual(mask.title_block[0], 1122.0, delta=1.0)
+        self.assertIsNone(mask.border)
+        self.assertTrue(all(tile.clip_rect[2] <= mask.title_block[0] for tile in masked))
+        self.assertIn('"title_block"', index)
+
+    def test_border_and_unmarked_pages(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = Path(tmpdir) / "sheet.pdf"
+            _write_titled_sheet(pdf_path)
+            page = fitz.open(str(pdf_path))[0]
+            drawings = tiler._page_drawing_bboxes(page)
+            bordered = detect_page_mask(page.rect, drawings, MaskPolicy(border=True))
+
+        self.assertEqual(bordered.border, bordered.content_rect)
+        self.assertAlmostEqual(bordered.content_rect[2], 1110.0, delta=1.5)
+        self.assertIsNotNone(bordered.title_block)
+
+        blank = fitz.open().new_page(width=1224, height=792)
+        unmarked = detect_page_mask(blank.rect, [(100.0, 100.0, 300.0, 200.0)], MaskPolicy(border=True))
+        self.assertEqual(unmarked.content_rect, (0.0, 0.0, 1224.0, 792.0))
+        self.assertIsNone(unmarked.title_block)
+        self.assertIsNone(unmarked.border)
+
+
+class TilePlanningTests(unittest.TestCase):
+    def test_plan_fits_budget_and_caps_dpi_and_tiles(self) -> None:
+        arch_d = fitz.Rect(0, 0, 2448, 1584)
+        standard = plan_tile_geometry(
+            arch_d, image_budget_for_tier("standard"), max_dpi=300, max_tiles=6
+        )
+        self.assertEqual((standard.grid_rows, standard.grid_cols), (2, 3))
+        self.assertTrue(100 <= standard.dpi < 300)
+        widest = 2448 / 3 * (1 + 2 * standard.overlap_pct) * standard.dpi / 72
+        self.assertLessEqual(widest, 2048)
+        self.assertGreaterEqual(2 * 2448 / 3 * standard.overlap_pct, 144.0 - 0.5)
+
+        # A small sheet reaches the DPI ceiling with fewer tiles than allowed.
+        small = plan_tile_geometry(
+            fitz.Rect(0, 0, 792, 612), image_budget_for_tier("premium"), max_dpi=300, max_tiles=6
+        )
+        self.assertEqual(small.dpi, 300)
+        self.assertLess(small.grid_rows * small.grid_cols, 6)
+
+        # Below the DPI floor the planner adds tiles rather than blur the text.
+        single = plan_tile_geometry(arch_d, ImageBudget(1024, 1.0), max_dpi=300, max_tiles=1)
+        self.assertGreater(single.grid_rows * single.grid_cols, 1)
+        self.assertGreaterEqual(single.dpi, 100)
+
+    def test_tile_pdf_renders_within_budget_and_records_plan(self) -> None:
+        budget = ImageBudget(max_long_edge_px=900, max_megapixels=0.5)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path, pages=2)
+            results = tile_pdf(
+                pdf_path,
+                root / "out",
+                dpi=300,
+                skip_low_coherence=False,
+                image_budget=budget,
+                page_image_budgets={2: ImageBudget(max_long_edge_px=2048, max_megapixels=4.2)},
+            )
+            _write_tiles_index(results, root / "out")
+            index = json.loads((root / "out" / "tiles_index.json").read_text(encoding="utf-8"))
+
+        for tile in results[1]:
+            self.assertLessEqual(max(tile.image_width_px, tile.image_height_px), 900)
+            self.assertLessEqual(tile.image_width_px * tile.image_height_px, 500_000)
+            self.assertEqual(tile.dpi, tile.plan.dpi)
+        self.assertGreater(results[2][0].plan.dpi, results[1][0].plan.dpi)
+        recorded = index["pages"]["1"][0]["plan"]
+        self.assertEqual(recorded, results[1][0].plan.to_dict())
+
+
+class RenderModeTests(unittest.TestCase):
+    def test_display_list_matches_clip_render(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path, pages=2)
+
+            clip_dir = root / "clip"
+            dl_dir = root / "display_list"
+            tile_pdf(pdf_path, clip_dir, dpi=150, render_mode=RenderMode.CLIP)
+            tile_pdf(pdf_path, dl_dir, dpi=150, render_mode=RenderMode.DISPLAY_LIST)
+
+            names = sorted(p.name for p in (clip_dir / "tiles").iterdir())
+            self.assertEqual(len(names), 12)
+            for name in names:
+                self.assertEqual(
+                    (dl_dir / "tiles" / name).read_bytes(),
+                    (clip_dir / "tiles" / name).read_bytes(),
+                    msg=f"{name} differs",
+                )
+
+    def test_banded_render_respects_cap_and_geometry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path, pages=1)
+
+            with fitz.open(pdf_path) as doc:
+                page = doc[0]
+                clip = fitz.Rect(100, 50, 500, 400)
+                full = PageRenderer(page, dpi=100).render(clip)
+                cap = full.width * 3 * 40  # ~40 rows per band
+
+                banded_path = root / "banded.png"
+                rendered = PageRenderer(page, dpi=100, max_raster_bytes=cap).render_to_image(
+                    clip, banded_path
+                )
+
+            self.assertTrue(rendered.banded)
+            self.assertEqual((rendered.width, rendered.height), (full.width, full.height))
+            banded = fitz.Pixmap(str(banded_path))
+            self.assertEqual((banded.width, banded.height, banded.n), (full.width, full.height, 3))
+            # Bands are pixel-aligned; only anti-aliasing along linework may
+            # differ slightly from the single-pass render.
+            diffs = [abs(a - b) for a, b in zip(banded.samples, full.samples)]
+            self.assertLess(sum(diffs) / len(diffs), 1.0)
+
+    def test_small_tiles_are_not_banded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path, pages=1)
+            with fitz.open(pdf_path) as doc:
+                rendered = PageRenderer(doc[0], dpi=72, max_raster_bytes=10**9).render_to_image(
+                    fitz.Rect(0, 0, 100, 100), root / "tile.png"
+                )
+            self.assertFalse(rendered.banded)
+            self.assertEqual((rendered.width, rendered.height), (100, 100))
+
+
+class RasterCapTests(unittest.TestCase):
+    def test_oversized_tiles_are_banded_or_split_under_the_cap(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            pdf_path = root / "sample.pdf"
+            _write_sample_pdf(pdf_path, pages=1)
+            cap = 1024 * 1024  # a whole 792x612 pt page at 150 DPI is ~3 MiB
+            options = {"dpi": 150, "grid_rows": 1, "grid_cols": 1, "max_raster_bytes": cap}
+
+            with self.assertLogs("src.intake.tiler", level="INFO") as logs:
+                png = tile_pdf(pdf_path, root / "png", **options)[1]
+            self.assertEqual([t.tile_id for t in png], ["p1_r0_c0"])
+            self.assertEqual((png[0].image_width_px, png[0].image_height_px), (1650, 1275))
+            self.assertTrue(any("peak RSS" in line and "1 banded" in line for line in logs.output))
+
+            jpeg = ImageEncoding(codec=ImageCodec.JPEG)
+            grid = tile_pdf(pdf_path, root / "jpeg", image_encoding=jpeg, **options)[1]
+            adaptive = tile_pdf(
+                pdf_path,
+                root / "adaptive",
+                image_encoding=jpeg,
+                strategy=TilingStrategy.ADAPTIVE,
+                **options,
+            )[1]
+            for tiles in (grid, adaptive):
+                self.assertGreater(len(tiles), 1)
+                for tile in tiles:
+                    self.assertLessEqual(tile.image_width_px * tile.image_height_px * 3, cap)
+            self.assertEqual(grid[0].tile_id, "p1_r0_c0")
+            # Sub-tiles still cover the whole page.
+            self.assertEqual(grid[-1].clip_rect[2:], (792.0, 612.0))
+
+
+if __name__ == "__main__":
+    unittest.main()